@@ -0,0 +1,7 @@
+"""
+Performance benchmarks. Each benchmark is a module that can be run from the repository root, like:
+
+.. code-block:: text
+
+    python -m src.benchmarks.entity_output resource
+"""
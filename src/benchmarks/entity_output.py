@@ -0,0 +1,227 @@
+"""
+Benchmarks :meth:`~src.system.projection_entity.ProjectionEntity.write_projection_values` output assembly, against
+the previous approach of outer-joining each value history in turn.
+
+Usage (from the repository root):
+
+.. code-block:: text
+
+    python -m src.benchmarks.entity_output <resource dir path> [projection years] [repeats]
+"""
+
+from sys import argv
+from time import perf_counter
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from typing import (
+    Callable,
+    List
+)
+
+from pandas import DataFrame
+
+from src.system.projection.parameters import ProjectionParameters
+from src.system.projection_entity import ProjectionEntity
+from src.system.projection_entity.projection_value import ProjectionValue
+from src.system.output import OutputWriter
+from src.system.constants import DEFAULT_COL
+from src.system.enums import ProcessingType
+from src.system.logger import Logger
+
+from src.data_sources.annuity import AnnuityDataSources
+from src.projections.annuity.base.economic_liability import EconomicLiabilityProjection
+
+
+class _CollectOutputWriter(
+    OutputWriter
+):
+
+    """
+    Output writer that keeps assembled entity values in memory, instead of writing them.
+    """
+
+    values: List[DataFrame]
+
+    def __init__(
+        self
+    ):
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=''
+        )
+
+        self.values = []
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        self.values.append(values)
+
+
+def join_projection_values(
+    projection_entity: ProjectionEntity
+) -> DataFrame:
+
+    """
+    Previous output assembly: outer-joins each printed value history onto the output, one at a time.
+
+    :param projection_entity: Projection entity.
+    :return: Assembled values.
+    """
+
+    output_dataframe = DataFrame()
+
+    for attribute_name, attribute in projection_entity.__dict__.items():
+
+        if issubclass(type(attribute), ProjectionValue):
+
+            if attribute.print_values:
+
+                output_dataframe = output_dataframe.join(
+                    other=attribute.history.rename(
+                        columns={
+                            DEFAULT_COL: attribute_name
+                        }
+                    ),
+                    how='outer'
+                )
+
+    return output_dataframe
+
+
+def assemble_projection_values(
+    projection_entity: ProjectionEntity
+) -> DataFrame:
+
+    """
+    Current output assembly, using :meth:`~src.system.projection_entity.ProjectionEntity.write_projection_values`.
+
+    :param projection_entity: Projection entity.
+    :return: Assembled values.
+    """
+
+    output_writer = _CollectOutputWriter()
+
+    projection_entity.write_projection_values(
+        output_writer=output_writer
+    )
+
+    return output_writer.values[0]
+
+
+def time_function(
+    function: Callable[[ProjectionEntity], DataFrame],
+    projection_entity: ProjectionEntity,
+    repeats: int
+) -> float:
+
+    """
+    Times a function, taking the best of several repeats.
+
+    :param function: Function to time.
+    :param projection_entity: Projection entity to pass to the function.
+    :param repeats: Number of repeats.
+    :return: Best runtime, in seconds.
+    """
+
+    best_time = float('inf')
+
+    for _ in range(repeats):
+
+        start_time = perf_counter()
+
+        function(projection_entity)
+
+        best_time = min(best_time, perf_counter() - start_time)
+
+    return best_time
+
+
+def main() -> None:
+
+    """
+    Runs a single annuity projection, then times output assembly for the base contract and annuitants entities,
+    checking that both approaches produce the same values.
+
+    :return: Nothing.
+    """
+
+    resource_dir_path = argv[1]
+    projection_years = int(argv[2]) if len(argv) > 2 else 30
+    repeats = int(argv[3]) if len(argv) > 3 else 20
+
+    projection_parameters = ProjectionParameters(
+        start_t=date(
+            year=2023,
+            month=3,
+            day=16
+        ),
+        projection_length=relativedelta(
+            years=projection_years
+        ),
+        time_step=relativedelta(
+            months=1
+        ),
+        resource_dir_path=resource_dir_path,
+        output_dir_path='',
+        processing_type=ProcessingType.SINGLE_PROCESS,
+        projection='src.projections.annuity.base.economic_liability.EconomicLiabilityProjection',
+        data_source='src.data_sources.annuity.AnnuityDataSources',
+        scenarios=[range(0, 1)]
+    )
+
+    data_sources = AnnuityDataSources(
+        projection_parameters=projection_parameters
+    )
+
+    projection = EconomicLiabilityProjection(
+        projection_parameters=projection_parameters,
+        data_sources=next(iter(data_sources.configured_data_sources()))
+    )
+
+    Logger().print(
+        message=f'Running projection: {projection} for {projection_years} years ...'
+    )
+
+    projection.run_projection()
+
+    for projection_entity in [
+        projection.base_contract,
+        projection.base_contract.annuitants
+    ]:
+
+        if not join_projection_values(projection_entity).equals(assemble_projection_values(projection_entity)):
+
+            Logger().raise_expr(
+                expr=AssertionError(
+                    f'Output assembly does not match for entity: {projection_entity} !'
+                )
+            )
+
+        join_time = time_function(
+            function=join_projection_values,
+            projection_entity=projection_entity,
+            repeats=repeats
+        )
+
+        assemble_time = time_function(
+            function=assemble_projection_values,
+            projection_entity=projection_entity,
+            repeats=repeats
+        )
+
+        Logger().print(
+            message=f'Entity: {projection_entity}, '
+                    f'join: {join_time * 1000.0:.2f} ms, '
+                    f'single pass: {assemble_time * 1000.0:.2f} ms, '
+                    f'speed-up: {join_time / assemble_time:.1f}x'
+        )
+
+
+if __name__ == '__main__':
+
+    main()
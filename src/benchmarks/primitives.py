@@ -0,0 +1,449 @@
+"""
+Microbenchmarks for core primitives that projections call millions of times: projection value access and
+arithmetic, :func:`~src.system.projection_entity.projection_value.use_latest_value` wrapping, date math, decrement
+rate conversion, economic scenario rate lookups and assumption table lookups.
+
+Each primitive is timed with a calibrated iteration count, and reported in nanoseconds per call. The first run
+writes a baseline file. Later runs compare against the baseline, and flag every primitive that is slower than the
+baseline by more than a threshold. Baselines are only comparable on the same machine.
+
+Usage (from the repository root):
+
+.. code-block:: text
+
+    python -m src.benchmarks.primitives <resource dir path> <baseline file path> [threshold] [update]
+
+The threshold is a fraction, and defaults to ``0.2`` (20% slower). Pass ``update`` to overwrite the baseline with
+this run's results. Exits with status ``1`` if any primitive regressed.
+"""
+
+from sys import (
+    argv,
+    exit
+)
+from os.path import exists
+from json import (
+    load,
+    dump
+)
+from time import perf_counter
+from gc import (
+    disable,
+    enable,
+    isenabled
+)
+from datetime import (
+    date,
+    datetime
+)
+from dateutil.relativedelta import relativedelta
+from typing import (
+    Callable,
+    Dict,
+    Any
+)
+
+from src.system.projection.parameters import ProjectionParameters
+from src.system.projection.time_steps import TimeSteps
+from src.system.projection_entity.projection_value import (
+    ProjectionValue,
+    use_latest_value
+)
+from src.system.projection.scripts.get_xversaries import get_xversaries
+from src.system.date import (
+    calc_whole_years,
+    calc_partial_years
+)
+from src.system.actuarial_math import convert_decrement_rate
+from src.system.enums import (
+    ProcessingType,
+    Gender,
+    LoggerLevel
+)
+from src.system.logger import Logger
+
+from src.data_sources.annuity import AnnuityDataSources
+from src.benchmarks.scaling import machine_info
+
+
+START_T = date(2023, 3, 16)     #: First time step.
+HISTORY_LENGTH = 361            #: Time steps in a 30-year monthly projection.
+MIN_BATCH_TIME = 0.1            #: Minimum seconds per timed batch, used to calibrate iteration counts.
+REPEATS = 7                     #: Timed batches per primitive. The fastest is kept.
+
+
+def primitives(
+    resource_dir_path: str
+) -> Dict[str, Callable[[], Any]]:
+
+    """
+    Prepares each primitive as a function with no arguments, so that only the call itself is timed.
+
+    :param resource_dir_path: Resource directory path, for economic scenarios and assumption tables.
+    :return: Primitives, by name.
+    """
+
+    time_steps = TimeSteps(
+        start_t=START_T,
+        end_t=START_T + relativedelta(months=HISTORY_LENGTH - 1),
+        time_step=relativedelta(months=1)
+    ).all_t
+
+    data_sources = AnnuityDataSources(
+        projection_parameters=ProjectionParameters(
+            start_t=START_T,
+            projection_length=relativedelta(months=HISTORY_LENGTH - 1),
+            time_step=relativedelta(months=1),
+            resource_dir_path=resource_dir_path,
+            output_dir_path='',
+            processing_type=ProcessingType.SINGLE_PROCESS,
+            projection='src.projections.annuity.base.economic_liability.EconomicLiabilityProjection',
+            data_source='src.data_sources.annuity.AnnuityDataSources',
+            scenarios=[range(0, 1)]
+        )
+    )
+
+    economic_scenario = next(iter(data_sources.economic_scenarios))
+    mortality = data_sources.mortality
+    policyholder_behaviors = data_sources.policyholder_behaviors
+    base_product = data_sources.product.base_product
+    gmdb_rider = data_sources.product.gmdb_rider
+    gmwb_rider = data_sources.product.gmwb_rider
+
+    # Projection values with a complete 30-year monthly history
+    projection_value = ProjectionValue(
+        init_t=time_steps[0],
+        init_value=1.0
+    )
+
+    other_projection_value = ProjectionValue(
+        init_t=time_steps[0],
+        init_value=2.0
+    )
+
+    for t in time_steps[1:]:
+
+        projection_value[t] = 1.0
+        other_projection_value[t] = 2.0
+
+    # Recording new values: restarts the history every 30 years, so its length matches a projection
+    recording = {
+        'projection_value': None,
+        'step': 0
+    }
+
+    def set_item() -> None:
+
+        step = recording['step'] % len(time_steps)
+
+        if step == 0:
+
+            recording['projection_value'] = ProjectionValue(
+                init_t=time_steps[0],
+                init_value=0.0
+            )
+
+        else:
+
+            recording['projection_value'][time_steps[step]] = 1.0
+
+        recording['step'] += 1
+
+    @use_latest_value
+    def wrapped(
+        x: Any,
+        y: Any
+    ) -> Any:
+
+        return x
+
+    interval = relativedelta(months=1)
+    t = time_steps[-1]
+
+    return {
+        'ProjectionValue.__setitem__': set_item,
+        'ProjectionValue.latest_value': lambda: projection_value.latest_value,
+        'ProjectionValue.__add__': lambda: projection_value + 1.0,
+        'ProjectionValue.__mul__': lambda: projection_value * other_projection_value,
+        'ProjectionValue.__rsub__': lambda: 1.0 - projection_value,
+        'ProjectionValue.__iadd__': lambda: projection_value.__iadd__(0.0),
+        'use_latest_value': lambda: wrapped(projection_value, y=other_projection_value),
+        'get_xversaries': lambda: get_xversaries(
+            issue_date=START_T,
+            start_date=time_steps[-2],
+            end_date=t,
+            frequency=12
+        ),
+        'calc_whole_years': lambda: calc_whole_years(
+            dt1=t,
+            dt2=START_T
+        ),
+        'calc_partial_years': lambda: calc_partial_years(
+            dt1=t,
+            dt2=date(1958, 7, 29)
+        ),
+        'convert_decrement_rate': lambda: convert_decrement_rate(
+            q_x=0.01,
+            interval=interval
+        ),
+        'EconomicScenario.get_rate': lambda: economic_scenario.get_rate(
+            name='SPX',
+            t=t
+        ),
+        'BaseMortality.base_mortality_rate': lambda: mortality.base_mortality.base_mortality_rate(
+            gender=Gender.MALE,
+            attained_age=65
+        ),
+        'MortalityImprovement.mortality_improvement_rate':
+            lambda: mortality.mortality_improvement.mortality_improvement_rate(
+                gender=Gender.FEMALE,
+                attained_age=65
+            ),
+        'BaseLapse.base_lapse_rate': lambda: policyholder_behaviors.base_lapse.base_lapse_rate(
+            policy_year=3
+        ),
+        'ShockLapse.shock_lapse_multiplier': lambda: policyholder_behaviors.shock_lapse.shock_lapse_multiplier(
+            years_after_cdsc_period=1
+        ),
+        'Annuitization.annuitization_rate': lambda: policyholder_behaviors.annuitization.annuitization_rate(
+            attained_age=70
+        ),
+        'SurrenderCharge.surrender_charge_rate': lambda: base_product.surrender_charge.surrender_charge_rate(
+            policy_year=3,
+            product_name='FutureSecure'
+        ),
+        'SurrenderCharge.cdsc_period': lambda: base_product.surrender_charge.cdsc_period(
+            product_name='FutureSecure'
+        ),
+        'FixedCreditingRate.crediting_rate': lambda: base_product.crediting_rate.fixed.crediting_rate(
+            account_name='Fixed'
+        ),
+        'IndexedCreditingRate.index': lambda: base_product.crediting_rate.indexed.index(
+            account_name='2-Year-Point-To-Point-Cap'
+        ),
+        'IndexedCreditingRate.term': lambda: base_product.crediting_rate.indexed.term(
+            account_name='2-Year-Point-To-Point-Cap'
+        ),
+        'IndexedCreditingRate.cap': lambda: base_product.crediting_rate.indexed.cap(
+            account_name='2-Year-Point-To-Point-Cap'
+        ),
+        'IndexedCreditingRate.spread': lambda: base_product.crediting_rate.indexed.spread(
+            account_name='1-Year-Point-To-Point-Spread'
+        ),
+        'IndexedCreditingRate.participation_rate': lambda: base_product.crediting_rate.indexed.participation_rate(
+            account_name='1-Year-Point-To-Point-Participation'
+        ),
+        'IndexedCreditingRate.floor': lambda: base_product.crediting_rate.indexed.floor(
+            account_name='2-Year-Point-To-Point-Cap'
+        ),
+        'GmdbCharge.charge_rate': lambda: gmdb_rider.gmdb_charge.charge_rate(
+            rider_name='EstateMax'
+        ),
+        'GmdbTypes.gmdb_type': lambda: gmdb_rider.gmdb_types.gmdb_type(
+            rider_name='EstateMax'
+        ),
+        'GmwbCharge.charge_rate': lambda: gmwb_rider.gmwb_charge.charge_rate(
+            product_name='ProtectPlus'
+        ),
+        'GmwbBenefit.av_active_withdrawal_rate': lambda: gmwb_rider.gmwb_benefit.av_active_withdrawal_rate(
+            rider_name='ProtectPlus',
+            age_first_withdrawal=65
+        ),
+        'GmwbBenefit.av_exhaust_withdrawal_rate': lambda: gmwb_rider.gmwb_benefit.av_exhaust_withdrawal_rate(
+            rider_name='ProtectPlus',
+            age_first_withdrawal=65
+        )
+    }
+
+
+def calibrate(
+    function: Callable[[], Any]
+) -> int:
+
+    """
+    Doubles a primitive's iteration count until a batch takes at least :data:`MIN_BATCH_TIME` seconds.
+
+    :param function: Primitive to time.
+    :return: Iterations per batch.
+    """
+
+    iterations = 1
+
+    while True:
+
+        start_time = perf_counter()
+
+        for _ in range(iterations):
+
+            function()
+
+        if perf_counter() - start_time >= MIN_BATCH_TIME:
+
+            return iterations
+
+        iterations *= 2
+
+
+def time_primitives(
+    functions: Dict[str, Callable[[], Any]]
+) -> Dict[str, float]:
+
+    """
+    Times primitives with :func:`calibrated <calibrate>` iteration counts. Batches are timed in :data:`REPEATS`
+    rounds, one batch per primitive in each round, so that a slow period on a busy machine slows down one batch of
+    every primitive, rather than every batch of one primitive. The fastest batch of each primitive is kept. Garbage
+    collection is turned off while timing, like `timeit <https://docs.python.org/3/library/timeit.html>`_ does.
+
+    :param functions: Primitives to time, by name.
+    :return: Nanoseconds per call, by primitive name.
+    """
+
+    iterations = {
+        name: calibrate(
+            function=function
+        ) for name, function in functions.items()
+    }
+
+    best_times = {name: float('inf') for name in functions}
+
+    gc_enabled = isenabled()
+
+    disable()
+
+    for _ in range(REPEATS):
+
+        for name, function in functions.items():
+
+            start_time = perf_counter()
+
+            for _ in range(iterations[name]):
+
+                function()
+
+            best_times[name] = min(best_times[name], perf_counter() - start_time)
+
+    if gc_enabled:
+
+        enable()
+
+    return {name: best_times[name] / iterations[name] * 1e9 for name in functions}
+
+
+def compare(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float
+) -> Dict[str, float]:
+
+    """
+    Compares results to a baseline, and logs each primitive's ratio to its baseline.
+
+    :param results: Nanoseconds per call, by primitive name.
+    :param baseline: Baseline nanoseconds per call, by primitive name.
+    :param threshold: Fraction slower than the baseline that counts as a regression.
+    :return: Ratio to baseline of every regressed primitive, by primitive name.
+    """
+
+    regressions = {}
+
+    for name, nanoseconds in results.items():
+
+        if name not in baseline:
+
+            Logger().print(
+                message=f'{name}: {nanoseconds:,.0f} ns (no baseline)'
+            )
+
+            continue
+
+        ratio = nanoseconds / baseline[name]
+        regressed = ratio > 1.0 + threshold
+
+        if regressed:
+
+            regressions[name] = ratio
+
+        Logger().print(
+            message=f'{name}: {nanoseconds:,.0f} ns, baseline {baseline[name]:,.0f} ns, {ratio:.2f}x'
+                    f'{" REGRESSION" if regressed else ""}',
+            level=LoggerLevel.WARNING if regressed else LoggerLevel.MESSAGE
+        )
+
+    return regressions
+
+
+def main() -> None:
+
+    """
+    Times every primitive, then writes a baseline file, or compares against an existing one.
+
+    :return: Nothing.
+    """
+
+    resource_dir_path = argv[1]
+    baseline_file_path = argv[2]
+    threshold = float(argv[3]) if len(argv) > 3 else 0.2
+    update = len(argv) > 4 and argv[4] == 'update'
+
+    results = time_primitives(
+        functions=primitives(
+            resource_dir_path=resource_dir_path
+        )
+    )
+
+    regressions = {}
+
+    if exists(baseline_file_path):
+
+        with open(file=baseline_file_path, mode='r') as json_file:
+
+            baseline = load(
+                fp=json_file
+            )
+
+        regressions = compare(
+            results=results,
+            baseline=baseline['results'],
+            threshold=threshold
+        )
+
+        Logger().print(
+            message=f'{len(regressions)} regression(s) beyond {threshold:.0%} against baseline from commit: '
+                    f'{baseline["machine"]["commit"]}',
+            level=LoggerLevel.WARNING if regressions else LoggerLevel.MESSAGE
+        )
+
+    else:
+
+        for name, nanoseconds in results.items():
+
+            Logger().print(
+                message=f'{name}: {nanoseconds:,.0f} ns'
+            )
+
+    if update or not exists(baseline_file_path):
+
+        Logger().print(
+            message=f'Writing baseline to: {baseline_file_path} ...'
+        )
+
+        with open(file=baseline_file_path, mode='w') as json_file:
+
+            dump(
+                obj={
+                    'timestamp': datetime.now().isoformat(timespec='seconds'),
+                    'machine': machine_info(),
+                    'results': results
+                },
+                fp=json_file,
+                indent=4
+            )
+
+    if regressions:
+
+        exit(1)
+
+
+if __name__ == '__main__':
+
+    main()
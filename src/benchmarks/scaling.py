@@ -0,0 +1,536 @@
+"""
+End-to-end scaling benchmark. Runs
+:class:`~src.projections.annuity.base.economic_liability.EconomicLiabilityProjection` through the
+:class:`single-process <src.system.projection.processor.single_process.SingleProcessProjectionProcessor>` and
+:class:`multi-process <src.system.projection.processor.multiple_process.MultiProcessProjectionProcessor>` processors,
+over :mod:`synthetic workloads <src.benchmarks.workload>`:
+
+- Strong scaling: a fixed workload, over an increasing number of CPU's.
+- Weak scaling: a workload that grows with the number of CPU's.
+
+Results are written as JSON to ``scaling.json`` in the work directory, and logged as a table. Workloads are generated
+from a fixed seed, and each result records the commit and machine it was measured on, so results from different
+commits on the same machine are comparable.
+
+Usage (from the repository root):
+
+.. code-block:: text
+
+    python -m src.benchmarks.scaling <work dir path> [projection years] [model points] [max cpus] [repeats]
+"""
+
+from sys import (
+    argv,
+    version
+)
+from os import makedirs
+from os.path import (
+    join,
+    exists,
+    dirname,
+    abspath
+)
+from shutil import rmtree
+from subprocess import (
+    run,
+    PIPE,
+    DEVNULL
+)
+from platform import platform
+from json import dump
+from time import perf_counter
+from datetime import (
+    date,
+    datetime
+)
+from dateutil.relativedelta import relativedelta
+from threading import (
+    Thread,
+    Event
+)
+from typing import (
+    Dict,
+    List,
+    Any
+)
+
+from pandas import (
+    DataFrame,
+    read_csv
+)
+from psutil import (
+    Process,
+    NoSuchProcess,
+    cpu_count,
+    virtual_memory
+)
+
+from src.system.projection.parameters import ProjectionParameters
+from src.system.projection.processor.single_process import SingleProcessProjectionProcessor
+from src.system.projection.processor.multiple_process import MultiProcessProjectionProcessor
+from src.system.projection.time_steps import TimeSteps
+from src.system.odometer import Profile
+from src.system.enums import ProcessingType
+from src.system.logger import Logger
+
+from src.benchmarks.workload import WorkloadGenerator
+
+
+START_T = date(2023, 3, 16)     #: Projection start date.
+SCENARIO_COUNT = 2              #: Economic scenarios per workload.
+SEED = 0                        #: Workload random seed.
+RESULT_FILE_NAME = 'scaling.json'   #: Result file name, in the work directory.
+WRITE_SPANS = ['Projection.write_output', 'Projection.flush_output']    #: Profiled spans that write output.
+
+
+class PeakMemorySampler:
+
+    """
+    Samples the total resident set size of this process and all its child processes on a background thread, and
+    keeps the peak. Child processes include the multi-process processor's workers.
+    """
+
+    interval: float     #: Seconds between samples.
+    peak_rss: int       #: Highest total resident set size sampled so far.
+    _stop: Event
+    _thread: Thread
+
+    def __init__(
+        self,
+        interval: float = 0.05
+    ):
+
+        """
+        Constructor method. Starts sampling.
+
+        :param interval: Seconds between samples.
+        """
+
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = Event()
+        self._thread = Thread(
+            target=self._sample,
+            name='memory-sampler',
+            daemon=True
+        )
+
+        self._thread.start()
+
+    def _sample(
+        self
+    ) -> None:
+
+        process = Process()
+
+        while not self._stop.is_set():
+
+            rss = process.memory_info().rss
+
+            for child_process in process.children(recursive=True):
+
+                try:
+
+                    rss += child_process.memory_info().rss
+
+                except NoSuchProcess:
+
+                    pass
+
+            self.peak_rss = max(self.peak_rss, rss)
+
+            self._stop.wait(self.interval)
+
+    def stop(
+        self
+    ) -> int:
+
+        """
+        Stops sampling.
+
+        :return: Peak total resident set size, in bytes.
+        """
+
+        self._stop.set()
+        self._thread.join()
+
+        return self.peak_rss
+
+
+def machine_info() -> Dict[str, Any]:
+
+    """
+    Describes the commit and machine that results are measured on.
+
+    :return: Commit hash (if the repository is a git repository), platform, Python version, CPU counts, and total
+        memory.
+    """
+
+    try:
+
+        commit = run(
+            args=['git', 'rev-parse', 'HEAD'],
+            cwd=dirname(abspath(__file__)),
+            stdout=PIPE,
+            stderr=DEVNULL,
+            text=True
+        ).stdout.strip() or None
+
+    except OSError:
+
+        commit = None
+
+    return {
+        'commit': commit,
+        'platform': platform(),
+        'python': version,
+        'physical_cpus': cpu_count(logical=False),
+        'logical_cpus': cpu_count(logical=True),
+        'memory_bytes': virtual_memory().total
+    }
+
+
+def workload(
+    work_dir_path: str,
+    model_point_count: int,
+    projection_years: int
+) -> str:
+
+    """
+    Generates a workload, unless it was generated by an earlier run.
+
+    :param work_dir_path: Work directory path.
+    :param model_point_count: Number of model points.
+    :param projection_years: Projection length, in years.
+    :return: Resource directory path of the workload.
+    """
+
+    resource_dir_path = join(
+        work_dir_path,
+        f'workload_{model_point_count}x{SCENARIO_COUNT}_{projection_years}y_{SEED}'
+    )
+
+    if not exists(join(resource_dir_path, 'annuity', 'economic_scenarios.csv')):
+
+        WorkloadGenerator(
+            model_point_count=model_point_count,
+            scenario_count=SCENARIO_COUNT,
+            seed=SEED,
+            start_t=START_T,
+            projection_years=projection_years
+        ).write(
+            resource_dir_path=resource_dir_path
+        )
+
+    return resource_dir_path
+
+
+def run_once(
+    resource_dir_path: str,
+    output_dir_path: str,
+    projection_years: int,
+    cpus: int | None
+) -> Dict[str, Any]:
+
+    """
+    Runs every projection in a workload once, and measures it. Output is written in the default format, and
+    projection phases are :class:`profiled <src.system.odometer.Profiler>` to measure output-write time.
+
+    :param resource_dir_path: Resource directory path of the workload.
+    :param output_dir_path: Output directory path. Emptied if it exists.
+    :param projection_years: Projection length, in years.
+    :param cpus: Number of worker processes. If ``None``, uses the single-process processor.
+    :return: Measurements.
+    """
+
+    if exists(output_dir_path):
+
+        rmtree(output_dir_path)
+
+    makedirs(output_dir_path)
+
+    projection_parameters = ProjectionParameters(
+        start_t=START_T,
+        projection_length=relativedelta(
+            years=projection_years
+        ),
+        time_step=relativedelta(
+            months=1
+        ),
+        resource_dir_path=resource_dir_path,
+        output_dir_path=output_dir_path,
+        processing_type=ProcessingType.SINGLE_PROCESS if cpus is None else ProcessingType.MULTI_PROCESS,
+        projection='src.projections.annuity.base.economic_liability.EconomicLiabilityProjection',
+        data_source='src.data_sources.annuity.AnnuityDataSources',
+        profile=True
+    )
+
+    memory_sampler = PeakMemorySampler()
+
+    start_time = perf_counter()
+
+    if cpus is None:
+
+        projection_processor = SingleProcessProjectionProcessor(
+            projection_parameters=projection_parameters
+        )
+
+    else:
+
+        projection_processor = MultiProcessProjectionProcessor(
+            projection_parameters=projection_parameters
+        )
+
+    projection_processor.setup_output()
+
+    startup_time = perf_counter() - start_time
+
+    if cpus is None:
+
+        projection_processor.run_projections()
+
+    else:
+
+        projection_processor.run_projections(
+            cpus=cpus
+        )
+
+    run_time = perf_counter() - start_time - startup_time
+
+    peak_rss = memory_sampler.stop()
+
+    profile = read_csv(
+        join(
+            output_dir_path,
+            Profile.report_file_name
+        )
+    )
+
+    write_time = profile[(profile['depth'] == 0) & profile['span'].isin(WRITE_SPANS)]['total_ns'].sum() / 1e9
+
+    projection_count = len(projection_processor.projections)
+
+    time_step_count = projection_count * (
+        len(
+            TimeSteps(
+                start_t=projection_parameters.start_t,
+                end_t=projection_parameters.end_t,
+                time_step=projection_parameters.time_step
+            ).all_t
+        ) - 1
+    )
+
+    return {
+        'processing_type': str(projection_parameters.processing_type),
+        'cpus': 1 if cpus is None else cpus,
+        'projections': projection_count,
+        'startup_seconds': startup_time,
+        'run_seconds': run_time,
+        'write_seconds': write_time,
+        'projections_per_second': projection_count / run_time,
+        'time_step_ms': run_time * (1 if cpus is None else cpus) / time_step_count * 1000.0,
+        'peak_rss_bytes': peak_rss
+    }
+
+
+def run_best(
+    resource_dir_path: str,
+    output_dir_path: str,
+    projection_years: int,
+    cpus: int | None,
+    repeats: int
+) -> Dict[str, Any]:
+
+    """
+    Runs a workload several times, and keeps the fastest run.
+
+    :param resource_dir_path: Resource directory path of the workload.
+    :param output_dir_path: Output directory path.
+    :param projection_years: Projection length, in years.
+    :param cpus: Number of worker processes. If ``None``, uses the single-process processor.
+    :param repeats: Number of repeats.
+    :return: Measurements of the fastest run.
+    """
+
+    return min(
+        (
+            run_once(
+                resource_dir_path=resource_dir_path,
+                output_dir_path=output_dir_path,
+                projection_years=projection_years,
+                cpus=cpus
+            ) for _ in range(repeats)
+        ),
+        key=lambda result: result['run_seconds']
+    )
+
+
+def run_scaling(
+    work_dir_path: str,
+    projection_years: int,
+    model_point_count: int,
+    max_cpus: int,
+    repeats: int
+) -> List[Dict[str, Any]]:
+
+    r"""
+    Runs the strong and weak scaling benchmarks.
+
+    Parallel efficiency compares each multi-process run to the 1-CPU multi-process run of the same benchmark:
+
+    - Strong scaling: :math:`T_{1} / (p \cdot T_{p})`, for the same workload on :math:`p` CPU's.
+    - Weak scaling: :math:`T_{1} / T_{p}`, for a workload :math:`p` times as large on :math:`p` CPU's.
+
+    :param work_dir_path: Work directory path, for workloads and output.
+    :param projection_years: Projection length, in years.
+    :param model_point_count: Model points in the strong scaling workload, and per CPU in the weak scaling workload.
+    :param max_cpus: Largest number of CPU's to run.
+    :param repeats: Number of repeats for each run. The fastest is kept.
+    :return: Measurements, one per run.
+    """
+
+    cpu_counts = sorted({2 ** power for power in range(max_cpus.bit_length()) if 2 ** power <= max_cpus} | {max_cpus})
+    output_dir_path = join(work_dir_path, 'output')
+    results = []
+
+    for benchmark in ['strong', 'weak']:
+
+        for cpus in [None] + cpu_counts if benchmark == 'strong' else cpu_counts:
+
+            Logger().print(
+                message=f'Running {benchmark} scaling benchmark with '
+                        f'{"a single process" if cpus is None else f"{cpus} CPU(s)"} ...'
+            )
+
+            result = run_best(
+                resource_dir_path=workload(
+                    work_dir_path=work_dir_path,
+                    model_point_count=model_point_count * (cpus if benchmark == 'weak' else 1),
+                    projection_years=projection_years
+                ),
+                output_dir_path=output_dir_path,
+                projection_years=projection_years,
+                cpus=cpus,
+                repeats=repeats
+            )
+
+            result['benchmark'] = benchmark
+            result['parallel_efficiency'] = None
+
+            if cpus is not None:
+
+                baseline = next(
+                    other for other in results
+                    if other['benchmark'] == benchmark and
+                    other['processing_type'] == ProcessingType.MULTI_PROCESS and
+                    other['cpus'] == 1
+                ) if cpus > 1 else result
+
+                result['parallel_efficiency'] = baseline['run_seconds'] / result['run_seconds'] / \
+                    (cpus if benchmark == 'strong' else 1)
+
+            results.append(result)
+
+    rmtree(output_dir_path)
+
+    return results
+
+
+def format_table(
+    results: List[Dict[str, Any]]
+) -> str:
+
+    """
+    Formats measurements as a readable table.
+
+    :param results: Measurements.
+    :return: Table.
+    """
+
+    table = DataFrame(
+        data=results
+    )[
+        [
+            'benchmark',
+            'processing_type',
+            'cpus',
+            'projections',
+            'startup_seconds',
+            'run_seconds',
+            'write_seconds',
+            'projections_per_second',
+            'time_step_ms',
+            'peak_rss_bytes',
+            'parallel_efficiency'
+        ]
+    ]
+
+    table['peak_rss_bytes'] = table['peak_rss_bytes'] / 2 ** 20
+
+    return table.rename(
+        columns={
+            'processing_type': 'processing',
+            'startup_seconds': 'startup_s',
+            'run_seconds': 'run_s',
+            'write_seconds': 'write_s',
+            'projections_per_second': 'proj/s',
+            'peak_rss_bytes': 'peak_rss_mib',
+            'parallel_efficiency': 'efficiency'
+        }
+    ).to_string(
+        index=False,
+        float_format=lambda value: f'{value:.3f}',
+        na_rep='-'
+    )
+
+
+def main() -> None:
+
+    """
+    Runs the strong and weak scaling benchmarks, writes the results to ``scaling.json`` in the work directory, and
+    logs a table.
+
+    :return: Nothing.
+    """
+
+    work_dir_path = argv[1]
+    projection_years = int(argv[2]) if len(argv) > 2 else 5
+    model_point_count = int(argv[3]) if len(argv) > 3 else 8
+    max_cpus = int(argv[4]) if len(argv) > 4 else max(cpu_count(logical=False) - 1, 1)
+    repeats = int(argv[5]) if len(argv) > 5 else 1
+
+    results = run_scaling(
+        work_dir_path=work_dir_path,
+        projection_years=projection_years,
+        model_point_count=model_point_count,
+        max_cpus=max_cpus,
+        repeats=repeats
+    )
+
+    with open(file=join(work_dir_path, RESULT_FILE_NAME), mode='w') as json_file:
+
+        dump(
+            obj={
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'machine': machine_info(),
+                'workload': {
+                    'projection_years': projection_years,
+                    'model_points': model_point_count,
+                    'scenarios': SCENARIO_COUNT,
+                    'seed': SEED,
+                    'repeats': repeats
+                },
+                'results': results
+            },
+            fp=json_file,
+            indent=4
+        )
+
+    Logger().print(
+        message=f'Scaling benchmark results:\n{format_table(results=results)}'
+    )
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,330 @@
+"""
+Startup benchmark. Measures how long it takes from launching an interpreter to running the first
+:class:`projection <src.system.projection.Projection>`, for the parent process and for each worker process of the
+:class:`multi-process processor <src.system.projection.processor.multiple_process.MultiProcessProjectionProcessor>`,
+over a small :mod:`synthetic workload <src.benchmarks.workload>`.
+
+Each run launches the :mod:`startup probe <src.benchmarks.startup_probe>` in a fresh interpreter, which records:
+
+- Import time: from launch until the projection framework is imported.
+- Compile time: from import until data sources are loaded and projections are created.
+- First projection: from launch until the first projection starts, in the parent process (single-process runs), and
+  in the first worker process (multi-process runs).
+- Worker startup: from each worker process's creation until it starts its first projection. Spawned workers start a
+  fresh interpreter, and re-import everything they need; forked workers do not.
+
+Launch overhead is measured separately, as the time to run an empty interpreter and to import :mod:`src.main`.
+
+Results are written as JSON to ``startup.json`` in the work directory, and logged as a table.
+
+Usage (from the repository root):
+
+.. code-block:: text
+
+    python -m src.benchmarks.startup <work dir path> [projection years] [model points] [cpus] [repeats]
+"""
+
+from sys import (
+    argv,
+    executable
+)
+from os import (
+    environ,
+    listdir,
+    makedirs
+)
+from os.path import (
+    join,
+    dirname,
+    abspath
+)
+from shutil import rmtree
+from subprocess import (
+    run,
+    DEVNULL
+)
+from multiprocessing import get_all_start_methods
+from json import (
+    load,
+    dump
+)
+from time import (
+    time,
+    perf_counter
+)
+from datetime import datetime
+from typing import (
+    Dict,
+    List,
+    Any
+)
+
+from pandas import DataFrame
+from psutil import cpu_count
+
+from src.system.logger import Logger
+
+from src.benchmarks.scaling import (
+    SCENARIO_COUNT,
+    SEED,
+    machine_info,
+    workload
+)
+from src.benchmarks.startup_probe import (
+    PROBE_DIR_VARIABLE,
+    PARENT_PID_VARIABLE
+)
+
+
+RESULT_FILE_NAME = 'startup.json'   #: Result file name, in the work directory.
+REPOSITORY_DIR_PATH = abspath(join(dirname(__file__), '..', '..'))     #: Repository root, to launch probes from.
+
+
+def launch_time(
+    code: str
+) -> float:
+
+    """
+    Runs Python code in a fresh interpreter.
+
+    :param code: Python code.
+    :return: Seconds from launch until the interpreter exits.
+    """
+
+    start_time = perf_counter()
+
+    run(
+        args=[executable, '-c', code],
+        cwd=REPOSITORY_DIR_PATH,
+        check=True
+    )
+
+    return perf_counter() - start_time
+
+
+def run_probe(
+    resource_dir_path: str,
+    work_dir_path: str,
+    projection_years: int,
+    cpus: int,
+    start_method: str
+) -> Dict[str, Any]:
+
+    """
+    Runs a workload once in a fresh interpreter, with the :mod:`startup probe <src.benchmarks.startup_probe>`, and
+    measures startup.
+
+    :param resource_dir_path: Resource directory path of the workload.
+    :param work_dir_path: Work directory path, for output and milestones. Emptied if it exists.
+    :param projection_years: Projection length, in years.
+    :param cpus: Number of worker processes. If ``0``, uses the single-process processor.
+    :param start_method: Multiprocessing start method, like ``fork`` or ``spawn``.
+    :return: Measurements.
+    """
+
+    output_dir_path = join(work_dir_path, 'output')
+    probe_dir_path = join(work_dir_path, 'probe')
+
+    rmtree(work_dir_path, ignore_errors=True)
+    makedirs(output_dir_path)
+    makedirs(probe_dir_path)
+
+    launched_time = time()
+
+    run(
+        args=[
+            executable,
+            '-m',
+            'src.benchmarks.startup_probe',
+            resource_dir_path,
+            output_dir_path,
+            str(projection_years),
+            str(cpus),
+            start_method
+        ],
+        cwd=REPOSITORY_DIR_PATH,
+        env=environ | {PROBE_DIR_VARIABLE: probe_dir_path},
+        stdout=DEVNULL,
+        stderr=DEVNULL,
+        check=True
+    )
+
+    milestones = []
+
+    for file_name in listdir(probe_dir_path):
+
+        with open(file=join(probe_dir_path, file_name), mode='r') as json_file:
+
+            milestones.append(
+                load(
+                    fp=json_file
+                )
+            )
+
+    parent = next(milestone for milestone in milestones if milestone['role'] == 'parent')
+    workers = [milestone for milestone in milestones if milestone['role'] == 'worker']
+
+    worker_startup_times = [worker['first_projection'] - worker['started'] for worker in workers]
+
+    first_projection_time = parent['first_projection'] if cpus == 0 else \
+        min(worker['first_projection'] for worker in workers)
+
+    return {
+        'processing': 'single' if cpus == 0 else start_method,
+        'cpus': max(cpus, 1),
+        'projections': parent['projections'],
+        'import_seconds': parent['imported'] - launched_time,
+        'compile_seconds': parent['compiled'] - parent['imported'],
+        'first_projection_seconds': first_projection_time - launched_time,
+        'pool_seconds': None if cpus == 0 else first_projection_time - parent['compiled'],
+        'worker_startup_seconds': max(worker_startup_times) if worker_startup_times else None,
+        'total_seconds': parent['finished'] - launched_time
+    }
+
+
+def run_startup(
+    work_dir_path: str,
+    projection_years: int,
+    model_point_count: int,
+    cpus: int,
+    repeats: int
+) -> List[Dict[str, Any]]:
+
+    """
+    Runs the startup benchmark, single-process and with each available multiprocessing start method.
+
+    :param work_dir_path: Work directory path, for the workload and output.
+    :param projection_years: Projection length, in years.
+    :param model_point_count: Model points in the workload.
+    :param cpus: Number of worker processes in multi-process runs.
+    :param repeats: Number of repeats for each run. The run with the fastest first projection is kept.
+    :return: Measurements, one per run.
+    """
+
+    resource_dir_path = workload(
+        work_dir_path=work_dir_path,
+        model_point_count=model_point_count,
+        projection_years=projection_years
+    )
+
+    runs = [(0, 'spawn' if 'fork' not in get_all_start_methods() else 'fork')] + \
+        [(cpus, start_method) for start_method in ['fork', 'spawn'] if start_method in get_all_start_methods()]
+
+    results = []
+
+    for run_cpus, start_method in runs:
+
+        Logger().print(
+            message=f'Running startup benchmark with '
+                    f'{"a single process" if run_cpus == 0 else f"{run_cpus} CPU(s), {start_method}"} ...'
+        )
+
+        results.append(
+            min(
+                (
+                    run_probe(
+                        resource_dir_path=resource_dir_path,
+                        work_dir_path=join(work_dir_path, 'startup'),
+                        projection_years=projection_years,
+                        cpus=run_cpus,
+                        start_method=start_method
+                    ) for _ in range(repeats)
+                ),
+                key=lambda result: result['first_projection_seconds']
+            )
+        )
+
+    rmtree(join(work_dir_path, 'startup'))
+
+    return results
+
+
+def format_table(
+    results: List[Dict[str, Any]]
+) -> str:
+
+    """
+    Formats measurements as a readable table.
+
+    :param results: Measurements.
+    :return: Table.
+    """
+
+    return DataFrame(
+        data=results
+    ).rename(
+        columns={
+            'import_seconds': 'import_s',
+            'compile_seconds': 'compile_s',
+            'first_projection_seconds': 'first_projection_s',
+            'pool_seconds': 'pool_s',
+            'worker_startup_seconds': 'worker_startup_s',
+            'total_seconds': 'total_s'
+        }
+    ).to_string(
+        index=False,
+        float_format=lambda value: f'{value:.3f}',
+        na_rep='-'
+    )
+
+
+def main() -> None:
+
+    """
+    Runs the startup benchmark, writes the results to ``startup.json`` in the work directory, and logs a table.
+
+    :return: Nothing.
+    """
+
+    work_dir_path = argv[1]
+    projection_years = int(argv[2]) if len(argv) > 2 else 1
+    model_point_count = int(argv[3]) if len(argv) > 3 else 4
+    cpus = int(argv[4]) if len(argv) > 4 else max(cpu_count(logical=False) - 1, 1)
+    repeats = int(argv[5]) if len(argv) > 5 else 3
+
+    launch = {
+        'interpreter_seconds': min(launch_time(code='pass') for _ in range(repeats)),
+        'import_main_seconds': min(launch_time(code='import src.main') for _ in range(repeats))
+    }
+
+    results = run_startup(
+        work_dir_path=work_dir_path,
+        projection_years=projection_years,
+        model_point_count=model_point_count,
+        cpus=cpus,
+        repeats=repeats
+    )
+
+    with open(file=join(work_dir_path, RESULT_FILE_NAME), mode='w') as json_file:
+
+        dump(
+            obj={
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'machine': machine_info(),
+                'workload': {
+                    'projection_years': projection_years,
+                    'model_points': model_point_count,
+                    'scenarios': SCENARIO_COUNT,
+                    'seed': SEED,
+                    'repeats': repeats
+                },
+                'launch': launch,
+                'results': results
+            },
+            fp=json_file,
+            indent=4
+        )
+
+    Logger().print(
+        message=f'Interpreter launch: {launch["interpreter_seconds"]:.3f} s, '
+                f'import src.main: {launch["import_main_seconds"]:.3f} s'
+    )
+
+    Logger().print(
+        message=f'Startup benchmark results:\n{format_table(results=results)}'
+    )
+
+
+if __name__ == '__main__':
+
+    main()
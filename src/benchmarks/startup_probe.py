@@ -0,0 +1,210 @@
+"""
+Startup probe, run in a fresh interpreter by the :mod:`startup benchmark <src.benchmarks.startup>`. Runs a workload
+the way :mod:`src.main` does, and records when each process starts its first projection.
+
+This module only imports the standard library at the top level, so that it measures the projection framework's own
+imports. Processes that are spawned, rather than forked, re-import this module; pool workers install the same
+first-projection hook, while other helper processes, like the queue manager, import nothing else.
+
+Usage (from the repository root):
+
+.. code-block:: text
+
+    python -m src.benchmarks.startup_probe <resource dir path> <output dir path> <projection years> <cpus> \
+        <start method>
+"""
+
+from sys import argv
+from os import (
+    environ,
+    getpid
+)
+from os.path import join
+from json import dump
+from multiprocessing import (
+    current_process,
+    set_start_method
+)
+from time import time
+from datetime import date
+from typing import (
+    Dict,
+    Any
+)
+
+
+PROBE_DIR_VARIABLE = 'STARTUP_PROBE_DIR'    #: Environment variable with the directory that milestones are written to.
+PARENT_PID_VARIABLE = 'STARTUP_PROBE_PID'   #: Environment variable with the parent process ID.
+START_T = date(2023, 3, 16)                 #: Projection start date.
+
+
+def process_start_time() -> float:
+
+    """
+    Gets the wall-clock time this process was created.
+
+    :return: Seconds since the epoch.
+    """
+
+    from psutil import Process
+
+    return Process().create_time()
+
+
+def write_milestones(
+    milestones: Dict[str, Any]
+) -> None:
+
+    """
+    Writes this process's milestones to the probe directory, as ``<process ID>.json``.
+
+    :param milestones: Milestones, as wall-clock times, plus any other details.
+    :return: Nothing.
+    """
+
+    with open(file=join(environ[PROBE_DIR_VARIABLE], f'{getpid()}.json'), mode='w') as json_file:
+
+        dump(
+            obj=milestones,
+            fp=json_file
+        )
+
+
+def install_hook() -> None:
+
+    """
+    Wraps :meth:`~src.system.projection.processor.ProjectionProcessor.run_projection`, so that the first projection
+    this process runs records a milestone. The wrapper removes itself after the first call.
+
+    :return: Nothing.
+    """
+
+    from src.system.projection.processor import ProjectionProcessor
+
+    run_projection = ProjectionProcessor.run_projection
+
+    def first_projection(
+        *args,
+        **kwargs
+    ) -> None:
+
+        first_projection_time = time()
+
+        ProjectionProcessor.run_projection = staticmethod(run_projection)
+
+        if str(getpid()) != environ[PARENT_PID_VARIABLE]:
+
+            write_milestones(
+                milestones={
+                    'role': 'worker',
+                    'started': process_start_time(),
+                    'first_projection': first_projection_time
+                }
+            )
+
+        else:
+
+            first_projection.time = first_projection_time
+
+        return run_projection(
+            *args,
+            **kwargs
+        )
+
+    first_projection.time = None
+
+    ProjectionProcessor.run_projection = staticmethod(first_projection)
+
+
+def main() -> None:
+
+    """
+    Runs a workload like :mod:`src.main` does, and records when this process finished importing the projection
+    framework, finished compiling projections, and started its first projection.
+
+    :return: Nothing.
+    """
+
+    resource_dir_path = argv[1]
+    output_dir_path = argv[2]
+    projection_years = int(argv[3])
+    cpus = int(argv[4])
+    start_method = argv[5]
+
+    environ[PARENT_PID_VARIABLE] = str(getpid())
+
+    set_start_method(start_method)
+
+    # Same imports as src.main
+    from dateutil.relativedelta import relativedelta
+    from src.system.projection.parameters import ProjectionParameters
+    from src.system.enums import ProcessingType
+
+    if cpus > 0:
+
+        from src.system.projection.processor.multiple_process import \
+            MultiProcessProjectionProcessor as ProjectionProcessor
+
+    else:
+
+        from src.system.projection.processor.single_process import \
+            SingleProcessProjectionProcessor as ProjectionProcessor
+
+    imported_time = time()
+
+    projection_parameters = ProjectionParameters(
+        start_t=START_T,
+        projection_length=relativedelta(
+            years=projection_years
+        ),
+        time_step=relativedelta(
+            months=1
+        ),
+        resource_dir_path=resource_dir_path,
+        output_dir_path=output_dir_path,
+        processing_type=ProcessingType.MULTI_PROCESS if cpus > 0 else ProcessingType.SINGLE_PROCESS,
+        projection='src.projections.annuity.base.economic_liability.EconomicLiabilityProjection',
+        data_source='src.data_sources.annuity.AnnuityDataSources'
+    )
+
+    projection_processor = ProjectionProcessor(
+        projection_parameters=projection_parameters
+    )
+
+    projection_processor.setup_output()
+
+    compiled_time = time()
+
+    install_hook()
+
+    first_projection = projection_processor.run_projection
+
+    if cpus > 0:
+
+        projection_processor.run_projections(
+            cpus=cpus
+        )
+
+    else:
+
+        projection_processor.run_projections()
+
+    write_milestones(
+        milestones={
+            'role': 'parent',
+            'imported': imported_time,
+            'compiled': compiled_time,
+            'first_projection': first_projection.time,
+            'finished': time(),
+            'projections': len(projection_processor.projections)
+        }
+    )
+
+
+if __name__ == '__main__':
+
+    main()
+
+elif __name__ == '__mp_main__' and PROBE_DIR_VARIABLE in environ and 'PoolWorker' in current_process().name:
+
+    install_hook()
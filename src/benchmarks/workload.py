@@ -0,0 +1,538 @@
+"""
+Deterministic synthetic workload generator. Writes a complete annuity resource directory at any scale: ``N`` model
+points and ``M`` economic scenarios of ``K`` indices, which
+:class:`~src.data_sources.annuity.AnnuityDataSources` (and every projection engine) reads like the bundled inputs.
+
+Usage (from the repository root):
+
+.. code-block:: text
+
+    python -m src.benchmarks.workload <output resource dir path> <model points> <scenarios> [indices] [seed]
+"""
+
+from sys import argv
+from os import makedirs
+from os.path import (
+    join,
+    exists
+)
+from shutil import (
+    copytree,
+    rmtree
+)
+from json import (
+    load,
+    dump
+)
+from uuid import UUID
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from typing import (
+    Dict,
+    List,
+    Tuple,
+    Any
+)
+
+from numpy import (
+    arange,
+    cumsum,
+    exp,
+    concatenate,
+    repeat,
+    tile,
+    zeros
+)
+from numpy.random import (
+    Generator,
+    default_rng
+)
+from pandas import (
+    DataFrame,
+    read_csv
+)
+
+from src.system.projection.time_steps import TimeSteps
+from src.system.logger import Logger
+
+
+class WorkloadGenerator:
+
+    """
+    Generates synthetic annuity model points and economic scenarios from a seed, so that every run with the same
+    arguments writes the same workload.
+
+    Products, accounts and riders are drawn from a template resource directory (the bundled
+    ``resource/annuity`` inputs, by default), so that every generated model point refers to product, account and
+    rider names that the template's product tables define:
+
+    - Product names and types are taken from the template's model points.
+    - Fixed and indexed account names are taken from the fixed and indexed crediting rate tables.
+    - Separate accounts are named after the generated indices.
+    - GMDB and GMWB rider names are taken from the rider tables.
+
+    The template's mortality, policyholder behavior and product tables are copied as-is.
+    """
+
+    template_dir_path: str              #: Template annuity resource directory path.
+    model_point_count: int              #: Number of model points to generate.
+    scenario_count: int                 #: Number of economic scenarios to generate.
+    index_count: int                    #: Number of indices in each economic scenario.
+    seed: int                           #: Random seed.
+    start_t: date                       #: Issue date of every model point, and first economic scenario date.
+    projection_years: int               #: Number of years that economic scenarios cover.
+    product_mix: Dict[str, float]       #: Relative weight of each product, by product name.
+    max_accounts: int                   #: Maximum number of accounts per model point.
+    premium_counts: Tuple[int, int]     #: Minimum and maximum number of premiums per account.
+    premium_interval: int               #: Months between premiums.
+    gmwb_share: float                   #: Share of model points with a GMWB rider.
+    joint_share: float                  #: Share of model points with joint annuitants.
+    issue_ages: Tuple[int, int]         #: Minimum and maximum annuitant issue age.
+    drift: float                        #: Annual index drift.
+    volatility: float                   #: Annual index volatility.
+
+    def __init__(
+        self,
+        model_point_count: int,
+        scenario_count: int,
+        index_count: int = 3,
+        seed: int = 0,
+        template_dir_path: str = join('resource', 'annuity'),
+        start_t: date = date(2023, 3, 16),
+        projection_years: int = 30,
+        product_mix: Dict[str, float] | None = None,
+        max_accounts: int = 3,
+        premium_counts: Tuple[int, int] = (1, 4),
+        premium_interval: int = 3,
+        gmwb_share: float = 0.6,
+        joint_share: float = 0.4,
+        issue_ages: Tuple[int, int] = (35, 75),
+        drift: float = 0.05,
+        volatility: float = 0.1
+    ):
+
+        """
+        Constructor method. Reads the product catalog from the template resource directory.
+
+        :param model_point_count: Number of model points to generate.
+        :param scenario_count: Number of economic scenarios to generate.
+        :param index_count: Number of indices in each economic scenario. Must be at least the number of indices that
+            the template's indexed crediting rate table refers to.
+        :param seed: Random seed.
+        :param template_dir_path: Template annuity resource directory path.
+        :param start_t: Issue date of every model point, and first economic scenario date.
+        :param projection_years: Number of years that economic scenarios cover, with monthly time steps.
+        :param product_mix: Relative weight of each product, by product name. Defaults to equal weights for every
+            product in the template.
+        :param max_accounts: Maximum number of accounts per model point. Fixed annuities hold one account.
+        :param premium_counts: Minimum and maximum number of premiums per account.
+        :param premium_interval: Months between premiums.
+        :param gmwb_share: Share of model points with a GMWB rider. Every model point has a GMDB rider.
+        :param joint_share: Share of model points with joint annuitants.
+        :param issue_ages: Minimum and maximum annuitant issue age. The maximum is lowered, if needed, so that every
+            annuitant stays within the template's mortality tables to the end of the projection.
+        :param drift: Annual index drift.
+        :param volatility: Annual index volatility.
+        """
+
+        self.template_dir_path = template_dir_path
+        self.model_point_count = model_point_count
+        self.scenario_count = scenario_count
+        self.index_count = index_count
+        self.seed = seed
+        self.start_t = start_t
+        self.projection_years = projection_years
+        self.max_accounts = max_accounts
+        self.premium_counts = premium_counts
+        self.premium_interval = premium_interval
+        self.gmwb_share = gmwb_share
+        self.joint_share = joint_share
+        self.drift = drift
+        self.volatility = volatility
+
+        # Product catalog
+        with open(file=join(template_dir_path, 'model_points.json'), mode='r') as json_file:
+
+            self._product_types = {
+                model_point['product_name']: model_point['product_type'] for model_point in load(fp=json_file)
+            }
+
+        self.product_mix = {product_name: 1.0 for product_name in self._product_types} if product_mix is None \
+            else product_mix
+
+        unknown_products = sorted(set(self.product_mix) - set(self._product_types))
+
+        if unknown_products:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Unknown products: {unknown_products} ! Expected products from: {sorted(self._product_types)}.'
+                )
+            )
+
+        self._fixed_accounts = read_csv(
+            join(template_dir_path, 'product', 'base', 'crediting_rate_fixed.csv')
+        )['account_name'].to_list()
+
+        indexed_accounts = read_csv(
+            join(template_dir_path, 'product', 'base', 'crediting_rate_indexed.csv')
+        )
+
+        self._indexed_accounts = indexed_accounts['account_name'].to_list()
+
+        self._gmdb_riders = read_csv(
+            join(template_dir_path, 'product', 'gmdb', 'types.csv'),
+            index_col='value'
+        ).columns.to_list()
+
+        self._gmwb_riders = read_csv(
+            join(template_dir_path, 'product', 'gmwb', 'charge.csv'),
+            index_col='value'
+        ).columns.to_list()
+
+        # Issue ages: stay within the mortality tables
+        max_table_age = min(
+            read_csv(
+                join(template_dir_path, 'mortality', table_file_name)
+            )['age_nearest_birthday'].max() for table_file_name in [
+                '2012_individual_annuity_mortality_basic_table.csv',
+                'mortality_improvement_projection_scale_g2.csv'
+            ]
+        )
+
+        self.issue_ages = (
+            issue_ages[0],
+            min(
+                issue_ages[1],
+                int(max_table_age) - projection_years - 1
+            )
+        )
+
+        if self.issue_ages[1] < self.issue_ages[0]:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid issue ages: {issue_ages} ! Annuitants must be at most {self.issue_ages[1]} at issue '
+                    f'to stay within the mortality tables for {projection_years} years.'
+                )
+            )
+
+        # Indices: template indices first, then numbered indices
+        template_levels = read_csv(
+            join(template_dir_path, 'economic_scenarios.csv'),
+            nrows=1
+        ).drop(
+            columns=['path', 't']
+        ).iloc[0]
+
+        self.indices = (template_levels.index.to_list() + [
+            f'INDEX_{index + 1}' for index in range(len(template_levels), index_count)
+        ])[:index_count]
+
+        self._initial_levels = [float(template_levels.get(index_name, 100.0)) for index_name in self.indices]
+
+        missing_indices = sorted(set(indexed_accounts['index']) - set(self.indices))
+
+        if missing_indices:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Indexed accounts refer to indices: {missing_indices}, which {index_count} indices do not '
+                    f'include ! Generate more indices.'
+                )
+            )
+
+    @staticmethod
+    def _uuid(
+        generator: Generator
+    ) -> str:
+
+        return str(
+            UUID(
+                bytes=generator.bytes(16),
+                version=4
+            )
+        )
+
+    def _accounts(
+        self,
+        generator: Generator,
+        product_type: str
+    ) -> List[Dict[str, Any]]:
+
+        if product_type == 'fa':
+
+            account_names = [(self._fixed_accounts[generator.integers(len(self._fixed_accounts))], 'fixed')]
+
+        elif product_type == 'ia':
+
+            account_names = [
+                (account_name, 'indexed') for account_name in generator.choice(
+                    self._indexed_accounts,
+                    size=min(generator.integers(1, self.max_accounts + 1), len(self._indexed_accounts)),
+                    replace=False
+                )
+            ]
+
+        else:
+
+            account_names = [(self._fixed_accounts[0], 'fixed')] + [
+                (account_name, 'separate') for account_name in generator.choice(
+                    self.indices,
+                    size=min(generator.integers(0, self.max_accounts), len(self.indices)),
+                    replace=False
+                )
+            ]
+
+        accounts = []
+
+        for account_name, account_type in account_names:
+
+            premium_count = generator.integers(self.premium_counts[0], self.premium_counts[1] + 1)
+
+            accounts.append(
+                {
+                    'id': self._uuid(generator=generator),
+                    'account_name': str(account_name),
+                    'account_type': account_type,
+                    'account_value': 0.0,
+                    'premiums': [
+                        {
+                            'date': (self.start_t + relativedelta(months=premium * self.premium_interval)).isoformat(),
+                            'amount': float(round(generator.lognormal(mean=11.0, sigma=0.8), -3) or 1000.0)
+                        } for premium in range(premium_count)
+                    ]
+                }
+            )
+
+        return accounts
+
+    def _annuitants(
+        self,
+        generator: Generator
+    ) -> List[Dict[str, Any]]:
+
+        annuitant_count = 2 if generator.random() < self.joint_share else 1
+
+        return [
+            {
+                'id': self._uuid(generator=generator),
+                'gender': str(generator.choice(['male', 'female'])),
+                'dob': (
+                    self.start_t - relativedelta(
+                        years=int(generator.integers(self.issue_ages[0], self.issue_ages[1] + 1)),
+                        days=int(generator.integers(0, 365))
+                    )
+                ).isoformat()
+            } for _ in range(annuitant_count)
+        ]
+
+    def _riders(
+        self,
+        generator: Generator
+    ) -> List[Dict[str, Any]]:
+
+        riders = [
+            {
+                'rider_type': 'gmdb',
+                'rider_name': str(generator.choice(self._gmdb_riders))
+            }
+        ]
+
+        if generator.random() < self.gmwb_share:
+
+            deferral_years = int(generator.choice([0, 10, 15, 20, 30]))
+
+            riders.append(
+                {
+                    'rider_type': 'gmwb',
+                    'rider_name': str(generator.choice(self._gmwb_riders)),
+                    'benefit_base': 0.0,
+                    'first_withdrawal_date': None if deferral_years == 0
+                    else (self.start_t + relativedelta(years=deferral_years)).isoformat()
+                }
+            )
+
+        return riders
+
+    def model_points(
+        self
+    ) -> List[Dict[str, Any]]:
+
+        """
+        Generates model points, in the same JSON layout as the bundled ``model_points.json``.
+
+        :return: Model points.
+        """
+
+        generator = default_rng(
+            seed=[self.seed, 0]
+        )
+
+        product_names = list(self.product_mix)
+        weights = [self.product_mix[product_name] for product_name in product_names]
+
+        model_points = []
+
+        for product_name in generator.choice(
+            product_names,
+            size=self.model_point_count,
+            p=[weight / sum(weights) for weight in weights]
+        ):
+
+            product_type = self._product_types[product_name]
+
+            model_points.append(
+                {
+                    'id': self._uuid(generator=generator),
+                    'issue_date': self.start_t.isoformat(),
+                    'product_type': product_type,
+                    'product_name': str(product_name),
+                    'accounts': self._accounts(
+                        generator=generator,
+                        product_type=product_type
+                    ),
+                    'annuitants': self._annuitants(
+                        generator=generator
+                    ),
+                    'riders': self._riders(
+                        generator=generator
+                    )
+                }
+            )
+
+        return model_points
+
+    def economic_scenarios(
+        self
+    ) -> DataFrame:
+
+        """
+        Generates economic scenarios as monthly geometric Brownian motion paths, one per index, in the same layout as
+        the bundled ``economic_scenarios.csv``: a ``path`` column, a ``t`` column, then one column per index.
+
+        :return: Economic scenarios.
+        """
+
+        generator = default_rng(
+            seed=[self.seed, 1]
+        )
+
+        time_steps = TimeSteps(
+            start_t=self.start_t,
+            end_t=self.start_t + relativedelta(years=self.projection_years),
+            time_step=relativedelta(months=1)
+        ).all_t
+
+        dt = 1.0 / 12.0
+
+        log_returns = generator.normal(
+            loc=(self.drift - 0.5 * self.volatility ** 2) * dt,
+            scale=self.volatility * dt ** 0.5,
+            size=(self.scenario_count, len(time_steps) - 1, len(self.indices))
+        )
+
+        levels = exp(
+            concatenate(
+                [
+                    zeros((self.scenario_count, 1, len(self.indices))),
+                    cumsum(log_returns, axis=1)
+                ],
+                axis=1
+            )
+        ) * self._initial_levels
+
+        economic_scenarios = DataFrame(
+            data=levels.reshape(-1, len(self.indices)),
+            columns=self.indices
+        )
+
+        economic_scenarios.insert(
+            loc=0,
+            column='t',
+            value=tile([f'{t.month}/{t.day}/{t.year}' for t in time_steps], self.scenario_count)
+        )
+
+        economic_scenarios.insert(
+            loc=0,
+            column='path',
+            value=repeat(arange(self.scenario_count), len(time_steps))
+        )
+
+        return economic_scenarios
+
+    def write(
+        self,
+        resource_dir_path: str
+    ) -> None:
+
+        """
+        Writes a complete resource directory: ``<resource dir path>/annuity``, with generated model points and
+        economic scenarios, and the template's other tables. An existing ``annuity`` directory is replaced.
+
+        :param resource_dir_path: Output resource directory path.
+        :return: Nothing.
+        """
+
+        annuity_dir_path = join(
+            resource_dir_path,
+            'annuity'
+        )
+
+        if exists(annuity_dir_path):
+
+            rmtree(annuity_dir_path)
+
+        makedirs(annuity_dir_path)
+
+        for table_dir_name in ['mortality', 'policyholder_behaviors', 'product']:
+
+            copytree(
+                src=join(self.template_dir_path, table_dir_name),
+                dst=join(annuity_dir_path, table_dir_name)
+            )
+
+        Logger().print(
+            message=f'Writing {self.model_point_count} model points to: {annuity_dir_path} ...'
+        )
+
+        with open(file=join(annuity_dir_path, 'model_points.json'), mode='w') as json_file:
+
+            dump(
+                obj=self.model_points(),
+                fp=json_file,
+                indent=1
+            )
+
+        Logger().print(
+            message=f'Writing {self.scenario_count} economic scenarios of {len(self.indices)} indices to: '
+                    f'{annuity_dir_path} ...'
+        )
+
+        self.economic_scenarios().to_csv(
+            path_or_buf=join(annuity_dir_path, 'economic_scenarios.csv'),
+            index=False
+        )
+
+
+def main() -> None:
+
+    """
+    Writes a synthetic workload to a resource directory.
+
+    :return: Nothing.
+    """
+
+    WorkloadGenerator(
+        model_point_count=int(argv[2]),
+        scenario_count=int(argv[3]),
+        index_count=int(argv[4]) if len(argv) > 4 else 3,
+        seed=int(argv[5]) if len(argv) > 5 else 0
+    ).write(
+        resource_dir_path=argv[1]
+    )
+
+
+if __name__ == '__main__':
+
+    main()
@@ -4,18 +4,27 @@
 
 from os.path import join
 from typing import (
+    List,
     Generator,
     Self,
     Any
 )
 
+from pandas import DataFrame
+
+from src.system.enums import AccountType
 from src.system.data_sources import DataSourcesRoot
 from src.system.projection.parameters import ProjectionParameters
-from src.system.data_sources.namespace import DataSourceNamespace
+from src.system.projection.time_steps import TimeSteps
+from src.system.data_sources.namespace import (
+    DataSourceNamespace,
+    DataSourceLoader
+)
 
 
 from src.data_sources.economic_scenarios import EconomicScenarios
 from src.data_sources.economic_scenarios.economic_scenario import EconomicScenario
+from src.data_sources.economic_scenarios.store import EconomicScenarioStore
 from src.data_sources.annuity.model_points import ModelPoints
 from src.data_sources.annuity.model_points.model_point import ModelPoint
 from src.data_sources.annuity.mortality import Mortality
@@ -41,13 +50,22 @@ class AnnuityDataSources(
     economic_scenario: EconomicScenario                     #: Current stochastic economic scenario.
     model_point: ModelPoint                                 #: Current model point.
 
+    shard: range                    #: Model point and scenario cross-product positions in this shard.
+    model_point_offset: int         #: Cross-product position of the first loaded model point.
+
     def __init__(
         self,
         projection_parameters: ProjectionParameters
     ):
 
         """
-        Constructor method. Initializes annuity inputs package.
+        Constructor method. Initializes annuity inputs package. Only the scenarios and model points selected by the
+        projection parameters are instantiated. Mortality, policyholder behavior and product assumptions are
+        :meth:`bundled <src.system.data_sources.DataSourcesRoot.bundled>`, if turned on.
+
+        Data sources are :meth:`loaded <src.system.data_sources.namespace.DataSourceNamespace.load_data_sources>`
+        concurrently, if :attr:`~src.system.projection.parameters.ProjectionParameters.data_source_threads` is more
+        than ``1``.
 
         :param projection_parameters: Set of projection parameters that contains a resource directory.
         """
@@ -65,62 +83,223 @@ class AnnuityDataSources(
             )
         )
 
-        # Economic scenarios
-        self.economic_scenarios = EconomicScenarios(
+        self.load_data_sources(
+            loaders={
+                # Economic scenarios
+                'economic_scenarios': DataSourceLoader(
+                    create=self._load_economic_scenarios
+                ),
+                # Model points, sharded across the model point and scenario cross-product
+                'model_points': DataSourceLoader(
+                    create=lambda: ModelPoints(
+                        path=join(
+                            self.path,
+                            'model_points.json'
+                        ),
+                        select=self._select_model_points
+                    )
+                ),
+                # Mortality
+                'mortality': DataSourceLoader(
+                    create=lambda: self.bundled(
+                        data_source_type=Mortality,
+                        path=join(
+                            self.path,
+                            'mortality'
+                        )
+                    )
+                ),
+                # Policyholder behaviors
+                'policyholder_behaviors': DataSourceLoader(
+                    create=lambda: self.bundled(
+                        data_source_type=PolicyholderBehaviors,
+                        path=join(
+                            self.path,
+                            'policyholder_behaviors'
+                        )
+                    )
+                ),
+                # Product
+                'product': DataSourceLoader(
+                    create=lambda: self.bundled(
+                        data_source_type=Product,
+                        path=join(
+                            self.path,
+                            'product'
+                        )
+                    )
+                )
+            },
+            threads=self.projection_parameters.data_source_threads
+        )
+
+        self.write_bundle()
+
+        self.economic_scenarios.select_rates(
+            rates=self.required_rates()
+        )
+
+    def _load_economic_scenarios(
+        self
+    ) -> EconomicScenarios:
+
+        """
+        Loads the selected economic scenarios, and maps them to projection time steps.
+
+        :return: Economic scenarios.
+        """
+
+        economic_scenarios = EconomicScenarios(
             path=join(
                 self.path,
                 'economic_scenarios.csv'
-            )
+            ),
+            select=self.projection_parameters.select_scenario
         )
 
-        # Model points
-        self.model_points = ModelPoints(
-            path=join(
-                self.path,
-                'model_points.json'
-            )
+        economic_scenarios.map_time_steps(
+            time_steps=TimeSteps(
+                start_t=self.projection_parameters.start_t,
+                end_t=self.projection_parameters.end_t,
+                time_step=self.projection_parameters.time_step
+            ).all_t
         )
 
-        # Mortality
-        self.mortality = Mortality(
-            path=join(
+        return economic_scenarios
+
+    def required_rates(
+        self
+    ) -> List[str]:
+
+        """
+        Works out which economic scenario rates are needed by the loaded model points and products:
+
+        - Separate accounts are credited using the rate named by the account.
+        - Indexed accounts are credited using the
+          :meth:`underlying index <src.data_sources.annuity.product.base.crediting_rate.indexed.IndexedCreditingRate.index>`
+          of the account.
+
+        The :attr:`discount index <src.system.projection.parameters.ProjectionParameters.discount_index>` is also
+        required, if one is set.
+
+        Only these rates are read from the economic scenario file and projected. Override this method to add rates
+        used elsewhere in a model.
+
+        :return: Required rate names.
+        """
+
+        rates = set()
+
+        for model_point in self.model_points:
+
+            for account in model_point.accounts:
+
+                if account.account_type == AccountType.SEPARATE:
+
+                    rates.add(account.account_name)
+
+                elif account.account_type == AccountType.INDEXED:
+
+                    rates.add(
+                        self.product.base_product.crediting_rate.indexed.index(
+                            account_name=account.account_name
+                        )
+                    )
+
+        if self.projection_parameters.discount_index is not None:
+
+            rates.add(self.projection_parameters.discount_index)
+
+        return sorted(rates)
+
+    def _selected_scenario_count(
+        self
+    ) -> int:
+
+        """
+        Counts the economic scenarios selected by
+        :meth:`~src.system.projection.parameters.ProjectionParameters.select_scenario`. Scenario numbers are
+        :meth:`read <src.data_sources.economic_scenarios.store.EconomicScenarioStore.read_scenario_indices>` without
+        opening the scenario store, so counting never waits for :attr:`economic_scenarios` to be loaded or converted.
+
+        :return: Number of selected economic scenarios.
+        """
+
+        scenario_indices = EconomicScenarioStore.read_scenario_indices(
+            csv_path=join(
                 self.path,
-                'mortality'
+                'economic_scenarios.csv'
             )
         )
 
-        # Policyholder behaviors
-        self.policyholder_behaviors = PolicyholderBehaviors(
-            path=join(
-                self.path,
-                'policyholder_behaviors'
-            )
+        return len(
+            [
+                scenario_index for scenario_index in scenario_indices
+                if self.projection_parameters.select_scenario(scenario_index=scenario_index)
+            ]
         )
 
-        # Product
-        self.product = Product(
-            path=join(
-                self.path,
-                'product'
-            )
+    def _select_model_points(
+        self,
+        data: DataFrame
+    ) -> DataFrame:
+
+        """
+        Selects the unparsed model points to instantiate. Model points are first selected by
+        :meth:`~src.system.projection.parameters.ProjectionParameters.select_model_point`. The cross-product of
+        selected model points and scenarios is then
+        :meth:`sharded <src.system.projection.parameters.ProjectionParameters.shard_range>`, and only the model points
+        that appear in this shard are kept.
+
+        Scenarios are :meth:`counted <_selected_scenario_count>` without opening the scenario store, so that model
+        points can be loaded while economic scenarios are being loaded.
+
+        :param data: Unparsed model point data, one row per model point.
+        :return: Model point rows to instantiate.
+        """
+
+        data = data.loc[
+            [self.projection_parameters.select_model_point(data=row) for _, row in data.iterrows()]
+        ]
+
+        scenario_count = self._selected_scenario_count()
+
+        self.shard = self.projection_parameters.shard_range(
+            count=len(data) * scenario_count
         )
 
+        if len(self.shard) == 0:
+
+            self.model_point_offset = 0
+
+            return data.iloc[0:0]
+
+        self.model_point_offset = self.shard.start // scenario_count
+
+        return data.iloc[self.model_point_offset:(self.shard.stop - 1) // scenario_count + 1]
+
     def configured_data_sources(
         self
     ) -> Generator[Self, Any, None]:
 
         """
-        Generator that cycles through each model point and economic scenario combination, setting the
-        :attr:`model_point` and :attr:`economic_scenario` attributes as it goes.
+        Generator that cycles through each model point and economic scenario combination in this :attr:`shard`,
+        setting the :attr:`model_point` and :attr:`economic_scenario` attributes as it goes.
 
         :return: Data source, with cycling ``model_point`` and ``economic_scenario`` attributes.
         """
 
-        for model_point in self.model_points:
+        scenario_count = len(self.economic_scenarios.keys)
+
+        for model_point_position, model_point in enumerate(self.model_points, start=self.model_point_offset):
 
             self.model_point = model_point
 
-            for economic_scenario in self.economic_scenarios:
+            for scenario_position, economic_scenario in enumerate(self.economic_scenarios):
+
+                if model_point_position * scenario_count + scenario_position not in self.shard:
+
+                    continue
 
                 self.economic_scenario = economic_scenario
 
@@ -0,0 +1,96 @@
+"""
+:class:`Root data source <src.system.data_sources.DataSourcesRoot>` for the batch annuity model.
+"""
+
+from typing import (
+    Generator,
+    Self,
+    Any
+)
+
+from pandas import DataFrame
+
+from src.system.projection.parameters import ProjectionParameters
+
+from src.data_sources.annuity import AnnuityDataSources
+from src.data_sources.annuity.model_points.arrays import ModelPointArrays
+
+
+class AnnuityBatchDataSources(
+    AnnuityDataSources
+):
+
+    """
+    :class:`Root data source <src.system.data_sources.DataSourcesRoot>` input package for the batch annuity model.
+    Contains the same data sources as :class:`~src.data_sources.annuity.AnnuityDataSources`, plus a columnar copy of
+    the model points. Run configurations are economic scenarios only, since every model point is projected at once,
+    so shards partition scenarios rather than the model point and scenario cross-product.
+    """
+
+    model_point_arrays: ModelPointArrays        #: Columnar annuity model points.
+
+    def __init__(
+        self,
+        projection_parameters: ProjectionParameters
+    ):
+
+        """
+        Constructor method. Initializes annuity inputs package, then flattens model points into arrays.
+
+        :param projection_parameters: Set of projection parameters that contains a resource directory.
+        """
+
+        AnnuityDataSources.__init__(
+            self=self,
+            projection_parameters=projection_parameters
+        )
+
+        self.model_point_arrays = ModelPointArrays(
+            model_points=self.model_points
+        )
+
+    def _select_model_points(
+        self,
+        data: DataFrame
+    ) -> DataFrame:
+
+        """
+        Selects the unparsed model points to instantiate, using
+        :meth:`~src.system.projection.parameters.ProjectionParameters.select_model_point`, then shards scenarios.
+
+        :param data: Unparsed model point data, one row per model point.
+        :return: Model point rows to instantiate.
+        """
+
+        self.shard = self.projection_parameters.shard_range(
+            count=self._selected_scenario_count()
+        )
+
+        self.model_point_offset = 0
+
+        return data.loc[
+            [self.projection_parameters.select_model_point(data=row) for _, row in data.iterrows()]
+        ]
+
+    def configured_data_sources(
+        self
+    ) -> Generator[Self, Any, None]:
+
+        """
+        Generator that cycles through each economic scenario in this :attr:`shard`, setting the
+        :attr:`economic_scenario` attribute as it goes. :attr:`model_point` is not used, and is always ``None``.
+
+        :return: Data source, with cycling ``economic_scenario`` attribute.
+        """
+
+        self.model_point = None
+
+        for scenario_position, economic_scenario in enumerate(self.economic_scenarios):
+
+            if scenario_position not in self.shard:
+
+                continue
+
+            self.economic_scenario = economic_scenario
+
+            yield self
@@ -3,6 +3,10 @@
 that holds all annuity model points.
 """
 
+from typing import Callable
+
+from pandas import DataFrame
+
 from src.data_sources.model_points import ModelPointsBase
 from src.data_sources.annuity.model_points.model_point import ModelPoint
 
@@ -18,7 +22,8 @@ class ModelPoints(
 
     def __init__(
         self,
-        path: str
+        path: str,
+        select: Callable[[DataFrame], DataFrame] | None = None
     ):
 
         """
@@ -30,10 +35,13 @@ class ModelPoints(
         ``resource/annuity/model_points.json``
 
         :param path: Path to an annuity model point file.
+        :param select: Function that selects the unparsed model point rows to instantiate. See
+            :class:`~src.data_sources.model_points.ModelPointsBase`.
         """
 
         ModelPointsBase.__init__(
             self=self,
             path=path,
-            model_point_type=ModelPoint
+            model_point_type=ModelPoint,
+            select=select
         )
@@ -0,0 +1,176 @@
+"""
+Columnar (array) representation of :class:`annuity model points <src.data_sources.annuity.model_points.ModelPoints>`.
+"""
+
+from numpy import (
+    ndarray,
+    array,
+    zeros,
+    full
+)
+
+from src.system.enums import (
+    Rider,
+    AccountType
+)
+from src.system.date import dates_to_array
+
+from src.data_sources.annuity.model_points import ModelPoints
+
+
+class ModelPointArrays:
+
+    """
+    Columnar representation of :class:`annuity model points <src.data_sources.annuity.model_points.ModelPoints>`.
+    Each attribute is a `NumPy <https://numpy.org/doc/stable/>`_ array whose first axis is the policy axis, in
+    model point file order. Nested collections (annuitants, accounts, and premiums) are padded to the largest
+    collection size, with ``NaT``, empty strings, or zeros in the padded positions.
+
+    Riders are represented as flags, so each model point may hold at most one GMDB rider and one GMWB rider.
+    """
+
+    ids: ndarray                                #: Model point IDs, shape ``(policies,)``.
+    product_type: ndarray                       #: Product types, shape ``(policies,)``.
+    product_name: ndarray                       #: Product names, shape ``(policies,)``.
+    issue_date: ndarray                         #: Issue dates, shape ``(policies,)``.
+
+    annuitant_count: ndarray                    #: Number of annuitants, shape ``(policies,)``.
+    annuitant_date_of_birth: ndarray            #: Annuitant dates of birth, shape ``(policies, annuitants)``.
+    annuitant_gender: ndarray                   #: Annuitant genders, shape ``(policies, annuitants)``.
+
+    account_id: ndarray                         #: Account IDs, shape ``(policies, accounts)``.
+    account_type: ndarray                       #: Account types, shape ``(policies, accounts)``.
+    account_name: ndarray                       #: Account names, shape ``(policies, accounts)``.
+    account_date: ndarray                       #: Account opening dates, shape ``(policies, accounts)``.
+
+    premium_date: ndarray                       #: Premium dates, shape ``(policies, accounts, premiums)``.
+    premium_amount: ndarray                     #: Premium amounts, shape ``(policies, accounts, premiums)``.
+
+    has_gmdb: ndarray                           #: GMDB rider flag, shape ``(policies,)``.
+    gmdb_name: ndarray                          #: GMDB rider names, shape ``(policies,)``.
+    gmdb_order: ndarray                         #: GMDB position in the rider list, shape ``(policies,)``.
+    has_gmwb: ndarray                           #: GMWB rider flag, shape ``(policies,)``.
+    gmwb_name: ndarray                          #: GMWB rider names, shape ``(policies,)``.
+    gmwb_order: ndarray                         #: GMWB position in the rider list, shape ``(policies,)``.
+    gmwb_benefit_base: ndarray                  #: Initial GMWB benefit base, shape ``(policies,)``.
+    gmwb_first_withdrawal_date: ndarray         #: GMWB withdrawal program start date, shape ``(policies,)``.
+
+    def __init__(
+        self,
+        model_points: ModelPoints
+    ):
+
+        """
+        Constructor method. Flattens each model point's nested data sources into padded arrays.
+
+        :param model_points: Annuity model points.
+        """
+
+        model_point_list = list(model_points)
+        policies = len(model_point_list)
+
+        max_annuitants = max([len(model_point.annuitants.keys) for model_point in model_point_list], default=0)
+        max_accounts = max([len(model_point.accounts.keys) for model_point in model_point_list], default=0)
+        max_premiums = max(
+            [
+                len(account.premiums.keys) for model_point in model_point_list for account in model_point.accounts
+            ],
+            default=0
+        )
+
+        # Policy
+        self.ids = array([model_point.id for model_point in model_point_list], dtype=object)
+        self.product_type = array([str(model_point.product_type) for model_point in model_point_list], dtype=object)
+        self.product_name = array([model_point.product_name for model_point in model_point_list], dtype=object)
+        self.issue_date = dates_to_array(
+            dates=[model_point.issue_date for model_point in model_point_list]
+        )
+
+        # Annuitants
+        self.annuitant_count = zeros(policies, dtype=int)
+        self.annuitant_date_of_birth = full((policies, max_annuitants), 'NaT', dtype='datetime64[D]')
+        self.annuitant_gender = full((policies, max_annuitants), '', dtype=object)
+
+        # Accounts
+        self.account_id = full((policies, max_accounts), '', dtype=object)
+        self.account_type = full((policies, max_accounts), '', dtype=object)
+        self.account_name = full((policies, max_accounts), '', dtype=object)
+        self.account_date = full((policies, max_accounts), 'NaT', dtype='datetime64[D]')
+
+        # Premiums
+        self.premium_date = full((policies, max_accounts, max_premiums), 'NaT', dtype='datetime64[D]')
+        self.premium_amount = zeros((policies, max_accounts, max_premiums))
+
+        # Riders
+        self.has_gmdb = zeros(policies, dtype=bool)
+        self.gmdb_name = full(policies, '', dtype=object)
+        self.gmdb_order = full(policies, -1, dtype=int)
+        self.has_gmwb = zeros(policies, dtype=bool)
+        self.gmwb_name = full(policies, '', dtype=object)
+        self.gmwb_order = full(policies, -1, dtype=int)
+        self.gmwb_benefit_base = zeros(policies)
+        self.gmwb_first_withdrawal_date = full(policies, 'NaT', dtype='datetime64[D]')
+
+        for policy, model_point in enumerate(model_point_list):
+
+            annuitants = list(model_point.annuitants)
+
+            self.annuitant_count[policy] = len(annuitants)
+
+            for position, annuitant in enumerate(annuitants):
+
+                self.annuitant_date_of_birth[policy, position] = annuitant.date_of_birth
+                self.annuitant_gender[policy, position] = str(annuitant.gender)
+
+            for position, account in enumerate(model_point.accounts):
+
+                self.account_id[policy, position] = account.id
+                self.account_type[policy, position] = str(account.account_type)
+                self.account_name[policy, position] = account.account_name
+                self.account_date[policy, position] = account.account_date
+
+                for premium_position, premium in enumerate(account.premiums):
+
+                    self.premium_date[policy, position, premium_position] = premium.premium_date
+                    self.premium_amount[policy, position, premium_position] = premium.premium_amount
+
+            for position, rider in enumerate(model_point.riders):
+
+                if rider.rider_type == Rider.GUARANTEED_MINIMUM_DEATH_BENEFIT:
+
+                    self.has_gmdb[policy] = True
+                    self.gmdb_name[policy] = rider.rider_name
+                    self.gmdb_order[policy] = position
+
+                elif rider.rider_type == Rider.GUARANTEED_MINIMUM_WITHDRAWAL_BENEFIT:
+
+                    self.has_gmwb[policy] = True
+                    self.gmwb_name[policy] = rider.rider_name
+                    self.gmwb_order[policy] = position
+                    self.gmwb_benefit_base[policy] = rider.benefit_base
+
+                    if rider.first_withdrawal_date is not None:
+
+                        self.gmwb_first_withdrawal_date[policy] = rider.first_withdrawal_date
+
+    def __len__(
+        self
+    ) -> int:
+
+        return len(
+            self.ids
+        )
+
+    def account_mask(
+        self,
+        account_type: AccountType
+    ) -> ndarray:
+
+        """
+        Boolean mask over the ``(policies, accounts)`` axes that selects accounts of a single type.
+
+        :param account_type: Account type to select.
+        :return: Account type mask.
+        """
+
+        return self.account_type == str(account_type)
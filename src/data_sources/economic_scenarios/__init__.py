@@ -3,34 +3,60 @@
 that holds all economic stochastic scenarios.
 """
 
-from typing import List
-from pandas import to_datetime
-
+from os.path import exists
+from datetime import date
+from typing import (
+    List,
+    Callable,
+    Dict,
+    Any
+)
+
+from pandas import DataFrame
+
+from src.system.logger import Logger
 from src.system.data_sources.collection import DataSourceCollection
-from src.system.data_sources.data_source.file_csv import DataSourceCsvFile
+from src.system.data_sources.data_source.base import DataSourceBase
 
 from src.data_sources.economic_scenarios.economic_scenario import EconomicScenario
+from src.data_sources.economic_scenarios.store import EconomicScenarioStore
 
 
 class EconomicScenarios(
-    DataSourceCsvFile,
+    DataSourceBase,
     DataSourceCollection
 ):
 
     """
     :class:`Data source collection <src.system.data_sources.collection.DataSourceCollection>`
     that holds all economic stochastic scenarios.
+
+    Scenarios are read from a :class:`binary, memory-mapped store <src.data_sources.economic_scenarios.store.EconomicScenarioStore>`,
+    which is converted from the economic scenario CSV file the first time it is read.
+
+    Scenarios can be restricted to a selection, and rates can be restricted to the subset that a model needs.
+    Excluded scenarios are never instantiated, and rates outside the subset are never looked up, projected, or paged
+    in from the store.
+
+    The :attr:`cache` is a view onto the store, built on first access, so copying or unpickling scenarios does not
+    touch scenario values.
     """
 
-    rates: List[str]    #: List of rates in the economic scenario file.
+    path: str                       #: Path to the economic scenario file.
+    store: EconomicScenarioStore    #: Binary, memory-mapped scenario store.
+    rates: List[str]                #: List of rates in use, in economic scenario file order.
+
+    _cache: DataFrame | None
 
     def __init__(
         self,
-        path: str
+        path: str,
+        select: Callable[[int], bool] | None = None
     ):
 
         """
-        Constructor method. Reads data from a CSV file and instantiates economic scenarios, organized by
+        Constructor method. Opens the scenario store for an economic scenario file and instantiates economic
+        scenarios, organized by
         :attr:`scenario index <src.data_sources.economic_scenarios.economic_scenario.EconomicScenario.scenario_index>`.
 
         Relative path to the economic scenario file:
@@ -38,34 +64,125 @@ class EconomicScenarios(
         ``resource/annuity/economic_scenarios.csv``
 
         :param path: Path to an economic scenario file.
+        :param select: Function that takes a scenario number and returns whether to instantiate the scenario. If
+            omitted, every scenario is instantiated.
         """
 
-        DataSourceCsvFile.__init__(
-            self=self,
-            path=path
+        DataSourceBase.__init__(
+            self=self
         )
 
         DataSourceCollection.__init__(
             self=self
         )
 
-        # Construct scenarios
-        self.cache['t'] = to_datetime(
-            self.cache['t']
-        ).dt.date
+        self.path = path
+
+        if not exists(path=self.path):
+
+            Logger().raise_expr(
+                expr=FileNotFoundError(
+                    f'Could not locate data source file for {type(self).__qualname__} at: {self.path} !'
+                )
+            )
 
-        self.cache.set_index(
-            keys=['path', 't'],
-            inplace=True
+        self.store = EconomicScenarioStore.from_csv(
+            csv_path=self.path
         )
 
-        self.rates = list(self.cache.columns)
+        # Built from the store on first access
+        self.cache = None
+
+        self.rates = list(self.store.rates)
+
+        # Construct scenarios
+        for scenario_index in self.store.scenario_indices:
+
+            if select is not None and not select(scenario_index):
 
-        for scenario_index in self.cache.index.levels[0].unique():
+                continue
 
             instance = EconomicScenario(
-                data=self.cache.loc[scenario_index],
+                store=self.store,
                 scenario_index=scenario_index
             )
 
             self[instance.scenario_index] = instance
+
+    def __getstate__(
+        self
+    ) -> Dict[str, Any]:
+
+        # Scenario values stay in the store, and are re-mapped on first access after unpickling
+        state = self.__dict__.copy()
+        state['_cache'] = None
+
+        return state
+
+    @property
+    def cache(
+        self
+    ) -> DataFrame:
+
+        """
+        Values for all scenarios, as a view onto the
+        :meth:`scenario store <src.data_sources.economic_scenarios.store.EconomicScenarioStore.data>`. Built on first
+        access.
+
+        :return: Scenario values.
+        """
+
+        if self._cache is None:
+
+            self._cache = self.store.data()
+
+        return self._cache
+
+    @cache.setter
+    def cache(
+        self,
+        value: DataFrame | None
+    ) -> None:
+
+        self._cache = value
+
+    def select_rates(
+        self,
+        rates: List[str]
+    ) -> None:
+
+        """
+        Restricts :attr:`rates` to the rates in use.
+
+        :param rates: Rates in use.
+        :return: Nothing.
+        """
+
+        missing_rates = sorted(set(rates) - set(self.store.rates))
+
+        if missing_rates:
+
+            Logger().raise_expr(
+                expr=KeyError(
+                    f'Economic scenario file {self.path} does not contain rates: {missing_rates} !'
+                )
+            )
+
+        self.rates = [rate for rate in self.store.rates if rate in rates]
+
+    def map_time_steps(
+        self,
+        time_steps: List[date]
+    ) -> None:
+
+        """
+        Resolves the scenario row position of each projection time step once. See
+        :meth:`~src.data_sources.economic_scenarios.store.EconomicScenarioStore.map_time_steps`.
+
+        :param time_steps: Every time step in the projection, in chronological order.
+        :return: Nothing.
+        """
+
+        self.store.map_time_steps(
+            time_steps=time_steps
+        )
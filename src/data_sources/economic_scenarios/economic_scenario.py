@@ -3,11 +3,23 @@
 """
 
 from datetime import date
-
+from typing import (
+    Dict,
+    List,
+    Any
+)
+
+from numpy import (
+    ndarray,
+    isnan
+)
 from pandas import DataFrame
 
 from src.system.data_sources.data_source.pandas_data_frame import DataSourcePandasDataFrame
 from src.system.projection_entity.projection_value import use_latest_value
+from src.system.logger import Logger
+
+from src.data_sources.economic_scenarios.store import EconomicScenarioStore
 
 
 class EconomicScenario(
@@ -16,42 +28,218 @@ class EconomicScenario(
 
     """
     :mod:`Data source <src.system.data_sources.data_source>` for a single economic scenario.
+
+    Rates are read from a dense ``(dates, rates)`` array, using date-to-row and rate-to-column maps that are resolved
+    once by the :class:`scenario store <src.data_sources.economic_scenarios.store.EconomicScenarioStore>`. Rates at
+    projection time steps are also gathered once per rate, so that looking a rate up by time step position is a
+    single list lookup.
+
+    The :attr:`values` array and the :attr:`cache` are views onto the store, built on first access, so that only
+    scenarios that are projected are mapped, and copying or unpickling a scenario does not touch scenario values.
     """
 
-    scenario_index: int     #: Stochastic scenario number.
+    scenario_index: int             #: Stochastic scenario number.
+    store: EconomicScenarioStore    #: Binary, memory-mapped scenario store that holds this scenario.
+
+    _cache: DataFrame | None
+    _values: ndarray | None
+    _step_rates: Dict[str, List[float | None]]
 
     def __init__(
         self,
-        data: DataFrame,
+        store: EconomicScenarioStore,
         scenario_index: int
     ):
 
         """
-        Constructor method. Initializes an economic scenario based on data within an economic scenario file.
+        Constructor method. Initializes an economic scenario as a view onto a scenario store.
 
-        :param data: Economic scenario data.
+        :param store: Binary, memory-mapped scenario store.
+        :param scenario_index: Stochastic scenario number.
         """
 
+        # Scenario values are viewed on first access
         DataSourcePandasDataFrame.__init__(
             self=self,
-            data=data
+            data=None
         )
 
+        self.store = store
         self.scenario_index = scenario_index
 
+        self._values = None
+        self._step_rates = {}
+
+    def __getstate__(
+        self
+    ) -> Dict[str, Any]:
+
+        # Scenario values stay in the store, and are re-mapped on first access after unpickling
+        state = self.__dict__.copy()
+        state['_cache'] = None
+        state['_values'] = None
+        state['_step_rates'] = {}
+
+        return state
+
+    @property
+    def cache(
+        self
+    ) -> DataFrame:
+
+        """
+        Scenario values, indexed by date with one column per rate, as a view onto the
+        :meth:`scenario store <src.data_sources.economic_scenarios.store.EconomicScenarioStore.scenario_data>`.
+        Built on first access.
+
+        :return: Scenario values.
+        """
+
+        if self._cache is None:
+
+            self._cache = self.store.scenario_data(
+                scenario_index=self.scenario_index
+            )
+
+        return self._cache
+
+    @cache.setter
+    def cache(
+        self,
+        value: DataFrame | None
+    ) -> None:
+
+        self._cache = value
+
+    @property
+    def values(
+        self
+    ) -> ndarray:
+
+        """
+        Scenario values, of shape ``(dates, rates)``, as a view onto the memory-mapped store. Built on first access.
+
+        :return: Scenario values.
+        """
+
+        if self._values is None:
+
+            self._values = self.store.scenario_values(
+                scenario_index=self.scenario_index
+            )
+
+        return self._values
+
+    def step_rates(
+        self,
+        name: str
+    ) -> List[float | None]:
+
+        """
+        Rates at every projection time step, using the time step positions resolved by
+        :meth:`~src.data_sources.economic_scenarios.store.EconomicScenarioStore.map_time_steps`. Time steps the
+        scenario has no rate for are ``None``. Gathered on first access, for each rate.
+
+        :param name: Rate name.
+        :return: Rates, by projection time step position.
+        """
+
+        if name not in self._step_rates:
+
+            rows = self.store.step_rows
+
+            rates = self.values[rows, self.store.rate_columns[name]]
+            missing = (rows < 0) | isnan(rates)
+
+            self._step_rates[name] = [None if missing[step] else rate for step, rate in enumerate(rates.tolist())]
+
+        return self._step_rates[name]
+
     @use_latest_value
     def get_rate(
         self,
         name: str,
-        t: date
+        t: date,
+        step: int | None = None
     ) -> float:
 
         """
-        Returns a rate from the scenario file.
+        Returns a rate from the scenario file. Raises an error if the scenario has no rate at the time step,
+        including dates that are only stored because other scenarios have them.
+
+        If the position of the time step within the projection is known, and projection time steps have been
+        :meth:`mapped <src.data_sources.economic_scenarios.store.EconomicScenarioStore.map_time_steps>`, the rate is
+        looked up by position in :meth:`step_rates`, without a date lookup.
 
         :param name: Rate name.
         :param t: Time step.
+        :param step: Projection time step position of ``t``, starting at zero.
         :return: Rate.
         """
 
-        return self.cache[name][t]
+        if step is not None and self.store.step_rows is not None:
+
+            rate = self.step_rates(
+                name=name
+            )[step]
+
+        else:
+
+            row = self.store.date_rows.get(t, -1)
+
+            rate = self.values[row, self.store.rate_columns[name]] if row >= 0 else None
+
+            if rate is not None and isnan(rate):
+
+                rate = None
+
+        if rate is None:
+
+            Logger().raise_expr(
+                expr=KeyError(
+                    f'Economic scenario {self.scenario_index} has no {name} rate at: {t} !'
+                )
+            )
+
+        return rate
+
+    def get_rates(
+        self,
+        name: str,
+        steps: ndarray
+    ) -> ndarray:
+
+        """
+        Vectorized version of :meth:`get_rate`. Returns rates for several projection time steps at once, using the
+        time step positions resolved by
+        :meth:`~src.data_sources.economic_scenarios.store.EconomicScenarioStore.map_time_steps`.
+
+        :param name: Rate name.
+        :param steps: Projection time step positions, starting at zero.
+        :return: Rates.
+        """
+
+        if self.store.step_rows is None:
+
+            Logger().raise_expr(
+                expr=RuntimeError(
+                    f'Projection time steps have not been mapped for economic scenario: {self.scenario_index} !'
+                )
+            )
+
+        rows = self.store.step_rows[steps]
+
+        rates = self.values[
+            rows,
+            self.store.rate_columns[name]
+        ]
+
+        if (rows < 0).any() or isnan(rates).any():
+
+            Logger().raise_expr(
+                expr=KeyError(
+                    f'Economic scenario {self.scenario_index} has no {name} rate for some projection time steps !'
+                )
+            )
+
+        return rates
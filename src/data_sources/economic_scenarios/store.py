@@ -0,0 +1,624 @@
+"""
+Binary, memory-mapped store for economic stochastic scenarios.
+"""
+
+from os import (
+    replace,
+    remove,
+    close,
+    stat
+)
+from os.path import (
+    exists,
+    splitext,
+    basename,
+    dirname,
+    abspath
+)
+from tempfile import mkstemp
+from json import (
+    load,
+    dump
+)
+from hashlib import file_digest
+from datetime import date
+from threading import Lock
+from typing import (
+    List,
+    Dict,
+    Iterable,
+    ClassVar,
+    Any
+)
+
+from numpy import (
+    ndarray,
+    array,
+    float64,
+    nan
+)
+from numpy.lib.format import open_memmap
+from pandas import (
+    DataFrame,
+    Index,
+    MultiIndex,
+    read_csv,
+    to_datetime
+)
+
+from src.system.date import (
+    str_to_date,
+    date_to_str
+)
+from src.system.logger import Logger
+
+
+class EconomicScenarioStore:
+
+    r"""
+    Binary, memory-mapped store for economic stochastic scenarios. Scenario values are held in a single
+    ``float64`` array of shape ``(rates, scenarios, time steps)``, saved as a
+    `NumPy .npy file <https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html>`_ and opened with
+    `numpy.memmap <https://numpy.org/doc/stable/reference/generated/numpy.memmap.html>`_. Scenario numbers, dates, and
+    rate names are saved alongside, in a JSON metadata file:
+
+    .. code-block:: text
+
+        \ economic_scenarios.csv     <- Source file
+        \ economic_scenarios.npy     <- Scenario values
+        \ economic_scenarios.json    <- Scenario metadata
+
+    The metadata also records the source file's size and modification time, and a SHA-256 hash of its contents. The
+    source file is only hashed if its size or modification time changed, and the store is rebuilt if its contents no
+    longer match the hash.
+
+    Values are read-only and paged in by the operating system on demand. Rates are the outer axis, so each rate's
+    values are stored together, and rates that a model does not
+    :meth:`use <src.data_sources.economic_scenarios.EconomicScenarios.select_rates>` are never paged in. When a store is pickled (for example, when a
+    projection is sent to a worker process), only its path and metadata are pickled. Each process re-opens the same
+    file, so all processes share the same physical pages through the OS page cache.
+
+    Scenarios are stored on a common date grid. Dates missing from a scenario are stored as ``NaN``, and looking up a
+    rate at such a date raises an error.
+    """
+
+    conversion_lock: ClassVar[Lock] = Lock()    #: Prevents concurrent loaders in a process from converting twice.
+    format_version: ClassVar[int] = 2           #: Store layout version. Stores with another version are rebuilt.
+
+    path: str                       #: Store path, without file extension.
+    scenario_indices: List[int]     #: Scenario numbers, in store order.
+    dates: List[date]               #: Scenario dates, in store order.
+    rates: List[str]                #: Rate names, in store order.
+    source_digest: str | None       #: SHA-256 hash of the source file the store was converted from.
+    source_stat: List[int] | None   #: Size and modification time (ns) of the source file, when last hashed.
+    version: int                    #: Store layout version the store was converted with.
+    date_rows: Dict[date, int]      #: Date to row position map.
+    rate_columns: Dict[str, int]    #: Rate name to column position map.
+    step_rows: ndarray | None       #: Row position for each projection time step, or -1 if the date is not stored.
+
+    _values: ndarray | None
+
+    def __init__(
+        self,
+        path: str
+    ):
+
+        """
+        Constructor method. Reads store metadata. Scenario values are memory-mapped on first access.
+
+        :param path: Store path, without file extension.
+        """
+
+        self.path = path
+
+        if not (exists(path=self.values_path) and exists(path=self.metadata_path)):
+
+            Logger().raise_expr(
+                expr=FileNotFoundError(
+                    f'Could not locate economic scenario store at: {self.path} !'
+                )
+            )
+
+        with open(self.metadata_path, 'r') as metadata_file:
+
+            metadata: Dict[str, Any] = load(metadata_file)
+
+        self.scenario_indices = metadata['scenario_indices']
+        self.dates = [str_to_date(target_str=target_str) for target_str in metadata['dates']]
+        self.rates = metadata['rates']
+        self.source_digest = metadata.get('source_digest')
+        self.source_stat = metadata.get('source_stat')
+        self.version = metadata.get('format_version', 1)
+
+        self.date_rows = {target_date: row for row, target_date in enumerate(self.dates)}
+        self.rate_columns = {rate: column for column, rate in enumerate(self.rates)}
+        self.step_rows = None
+
+        self._values = None
+
+    def __getstate__(
+        self
+    ) -> Dict[str, Any]:
+
+        state = self.__dict__.copy()
+        state['_values'] = None
+
+        return state
+
+    @property
+    def values_path(
+        self
+    ) -> str:
+
+        """
+        Path to the scenario values file.
+
+        :return: Scenario values file path.
+        """
+
+        return f'{self.path}.npy'
+
+    @property
+    def metadata_path(
+        self
+    ) -> str:
+
+        """
+        Path to the scenario metadata file.
+
+        :return: Scenario metadata file path.
+        """
+
+        return f'{self.path}.json'
+
+    @property
+    def values(
+        self
+    ) -> ndarray:
+
+        """
+        Read-only, memory-mapped scenario values, of shape ``(rates, scenarios, time steps)``.
+
+        :return: Scenario values.
+        """
+
+        if self._values is None:
+
+            self._values = open_memmap(
+                filename=self.values_path,
+                mode='r'
+            )
+
+        return self._values
+
+    def get_rows(
+        self,
+        dates: Iterable[date]
+    ) -> ndarray:
+
+        """
+        Returns the row position of each date. Dates that are not stored are returned as -1.
+
+        :param dates: Dates to look up.
+        :return: Row positions.
+        """
+
+        return array(
+            [self.date_rows.get(target_date, -1) for target_date in dates],
+            dtype=int
+        )
+
+    def map_time_steps(
+        self,
+        time_steps: List[date]
+    ) -> None:
+
+        """
+        Resolves the row position of each projection time step once, so that rates can be looked up by time step
+        position with :meth:`EconomicScenario.get_rates() <src.data_sources.economic_scenarios.economic_scenario.EconomicScenario.get_rates>`.
+
+        :param time_steps: Every time step in the projection, in chronological order.
+        :return: Nothing.
+        """
+
+        self.step_rows = self.get_rows(
+            dates=time_steps
+        )
+
+    def scenario_values(
+        self,
+        scenario_index: int
+    ) -> ndarray:
+
+        """
+        Values for a single scenario, of shape ``(time steps, rates)``. The array is a view onto the memory-mapped
+        file, and does not copy scenario values.
+
+        :param scenario_index: Scenario number.
+        :return: Scenario values.
+        """
+
+        return self.values[:, self.scenario_indices.index(scenario_index), :].T
+
+    def scenario_data(
+        self,
+        scenario_index: int
+    ) -> DataFrame:
+
+        """
+        Values for a single scenario, indexed by date with one column per rate. The
+        `DataFrame <https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html>`_ is a view onto the
+        memory-mapped file, and does not copy scenario values.
+
+        :param scenario_index: Scenario number.
+        :return: Scenario values.
+        """
+
+        return DataFrame(
+            data=self.scenario_values(
+                scenario_index=scenario_index
+            ),
+            index=Index(
+                data=self.dates,
+                name='t'
+            ),
+            columns=self.rates,
+            copy=False
+        )
+
+    def data(
+        self
+    ) -> DataFrame:
+
+        """
+        Values for all scenarios, indexed by scenario number and date with one column per rate. The
+        `DataFrame <https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html>`_ is a view onto the
+        memory-mapped file, and does not copy scenario values.
+
+        :return: Scenario values.
+        """
+
+        return DataFrame(
+            data=self.values.reshape(len(self.rates), -1).T,
+            index=MultiIndex.from_product(
+                iterables=[self.scenario_indices, self.dates],
+                names=['path', 't']
+            ),
+            columns=self.rates,
+            copy=False
+        )
+
+    @classmethod
+    def from_csv(
+        cls,
+        csv_path: str
+    ) -> 'EconomicScenarioStore':
+
+        """
+        Opens the store for an economic scenario CSV file. The store is placed beside the CSV file. It is
+        (re)built first if it does not exist, if the CSV file's contents do not match the
+        :attr:`source file hash <source_digest>` the store was converted from, or if the store was converted with
+        another :attr:`format_version`. The CSV file is only hashed if its size or modification time no longer match
+        :attr:`source_stat`.
+
+        :param csv_path: Path to an economic scenario CSV file.
+        :return: Economic scenario store.
+        """
+
+        path = splitext(csv_path)[0]
+
+        with cls.conversion_lock:
+
+            source_stat = cls.stat(
+                csv_path=csv_path
+            )
+
+            source_digest = None
+
+            if exists(path=f'{path}.npy') and exists(path=f'{path}.json'):
+
+                store = cls(
+                    path=path
+                )
+
+                if store.version == cls.format_version:
+
+                    if store.source_stat == source_stat:
+
+                        return store
+
+                    source_digest = cls.digest(
+                        csv_path=csv_path
+                    )
+
+                    if store.source_digest == source_digest:
+
+                        # Contents are unchanged, so record the new size and modification time to skip hashing
+                        store.source_stat = source_stat
+                        store.write_metadata()
+
+                        return store
+
+            cls.convert(
+                csv_path=csv_path,
+                path=path,
+                source_digest=source_digest,
+                source_stat=source_stat
+            )
+
+        return cls(
+            path=path
+        )
+
+    @classmethod
+    def read_scenario_indices(
+        cls,
+        csv_path: str
+    ) -> List[int]:
+
+        """
+        Reads the scenario numbers in an economic scenario CSV file, without opening, hashing, or converting its
+        store, so that it never waits for a conversion in progress. Scenario numbers are read from the store metadata
+        if the CSV file's size and modification time still match it. Otherwise, only the ``path`` column of the CSV
+        file is read.
+
+        :param csv_path: Path to an economic scenario CSV file.
+        :return: Scenario numbers, in store order.
+        """
+
+        metadata_path = f'{splitext(csv_path)[0]}.json'
+
+        if exists(path=metadata_path):
+
+            # Metadata is replaced in a single rename, so it is never read partially written
+            with open(metadata_path, 'r') as metadata_file:
+
+                metadata: Dict[str, Any] = load(metadata_file)
+
+            if metadata.get('format_version') == cls.format_version and \
+                    metadata.get('source_stat') == cls.stat(csv_path=csv_path):
+
+                return metadata['scenario_indices']
+
+        return sorted(
+            int(scenario_index) for scenario_index in read_csv(
+                csv_path,
+                usecols=['path']
+            )['path'].unique()
+        )
+
+    @staticmethod
+    def stat(
+        csv_path: str
+    ) -> List[int]:
+
+        """
+        Gets the size and modification time of an economic scenario CSV file.
+
+        :param csv_path: Path to an economic scenario CSV file.
+        :return: Size, in bytes, and modification time, in nanoseconds.
+        """
+
+        stat_result = stat(csv_path)
+
+        return [stat_result.st_size, stat_result.st_mtime_ns]
+
+    @staticmethod
+    def digest(
+        csv_path: str
+    ) -> str:
+
+        """
+        Hashes the contents of an economic scenario CSV file.
+
+        :param csv_path: Path to an economic scenario CSV file.
+        :return: SHA-256 hex digest.
+        """
+
+        with open(csv_path, 'rb') as csv_file:
+
+            return file_digest(csv_file, 'sha256').hexdigest()
+
+    @staticmethod
+    def temp_path(
+        path: str,
+        suffix: str
+    ) -> str:
+
+        """
+        Creates an empty, uniquely named file beside a store, to write a store file to before it is renamed. Names are
+        unique across threads and processes, so concurrent conversions never write to the same file.
+
+        :param path: Store path, without file extension.
+        :param suffix: File extension.
+        :return: Temporary file path.
+        """
+
+        file_descriptor, temp_path = mkstemp(
+            suffix=suffix,
+            prefix=f'{basename(path)}.',
+            dir=dirname(abspath(path))
+        )
+
+        close(file_descriptor)
+
+        return temp_path
+
+    @staticmethod
+    def write_json(
+        path: str,
+        metadata: Dict[str, Any]
+    ) -> None:
+
+        """
+        Writes store metadata under a temporary name, then renames it, so partially written metadata is never read.
+
+        :param path: Store path, without file extension.
+        :param metadata: Store metadata.
+        :return: Nothing.
+        """
+
+        temp_path = EconomicScenarioStore.temp_path(
+            path=path,
+            suffix='.json'
+        )
+
+        try:
+
+            with open(temp_path, 'w') as metadata_file:
+
+                dump(
+                    obj=metadata,
+                    fp=metadata_file,
+                    indent=4
+                )
+
+            replace(
+                temp_path,
+                f'{path}.json'
+            )
+
+        finally:
+
+            if exists(path=temp_path):
+
+                remove(temp_path)
+
+    def write_metadata(
+        self
+    ) -> None:
+
+        """
+        Rewrites the store metadata file from this store's attributes.
+
+        :return: Nothing.
+        """
+
+        self.write_json(
+            path=self.path,
+            metadata={
+                'scenario_indices': self.scenario_indices,
+                'dates': [date_to_str(target_date=target_date) for target_date in self.dates],
+                'rates': self.rates,
+                'source_digest': self.source_digest,
+                'source_stat': self.source_stat,
+                'format_version': self.version
+            }
+        )
+
+    @staticmethod
+    def convert(
+        csv_path: str,
+        path: str,
+        source_digest: str | None = None,
+        source_stat: List[int] | None = None
+    ) -> None:
+
+        """
+        One-time conversion from an economic scenario CSV file to a binary store. The CSV file must have ``path`` and
+        ``t`` columns, followed by one column per rate.
+
+        Files are written under unique temporary names, then renamed, so a partially written store is never opened,
+        even if several processes convert the same store at once. Metadata is renamed last.
+
+        :param csv_path: Path to an economic scenario CSV file.
+        :param path: Store path, without file extension.
+        :param source_digest: SHA-256 hash of the CSV file, saved in the metadata. Hashed from the CSV file, if
+            omitted.
+        :param source_stat: Size and modification time of the CSV file, saved in the metadata. Read from the CSV
+            file, if omitted.
+        :return: Nothing.
+        """
+
+        # Read before the CSV file, so that any later change is detected on the next open
+        if source_stat is None:
+
+            source_stat = EconomicScenarioStore.stat(
+                csv_path=csv_path
+            )
+
+        if source_digest is None:
+
+            source_digest = EconomicScenarioStore.digest(
+                csv_path=csv_path
+            )
+
+        Logger().print(
+            message=f'Converting economic scenarios to binary store: {csv_path} -> {path} ...'
+        )
+
+        csv_data = read_csv(
+            csv_path
+        )
+
+        csv_data['t'] = to_datetime(
+            csv_data['t']
+        ).dt.date
+
+        csv_data.set_index(
+            keys=['path', 't'],
+            inplace=True
+        )
+
+        scenario_indices = sorted(csv_data.index.get_level_values('path').unique())
+        dates = sorted(csv_data.index.get_level_values('t').unique())
+        rates = list(csv_data.columns)
+
+        csv_data = csv_data.reindex(
+            index=MultiIndex.from_product(
+                iterables=[scenario_indices, dates],
+                names=['path', 't']
+            ),
+            fill_value=nan
+        )
+
+        values_temp_path = EconomicScenarioStore.temp_path(
+            path=path,
+            suffix='.npy'
+        )
+
+        try:
+
+            # Scenario values
+            values = open_memmap(
+                filename=values_temp_path,
+                mode='w+',
+                dtype=float64,
+                shape=(len(rates), len(scenario_indices), len(dates))
+            )
+
+            values[:] = csv_data.to_numpy(
+                dtype=float64
+            ).reshape(
+                len(scenario_indices),
+                len(dates),
+                len(rates)
+            ).transpose(2, 0, 1)
+
+            values.flush()
+
+            del values
+
+            replace(
+                values_temp_path,
+                f'{path}.npy'
+            )
+
+        finally:
+
+            if exists(path=values_temp_path):
+
+                remove(values_temp_path)
+
+        # Scenario metadata
+        EconomicScenarioStore.write_json(
+            path=path,
+            metadata={
+                'scenario_indices': [int(scenario_index) for scenario_index in scenario_indices],
+                'dates': [date_to_str(target_date=target_date) for target_date in dates],
+                'rates': rates,
+                'source_digest': source_digest,
+                'source_stat': source_stat,
+                'format_version': EconomicScenarioStore.format_version
+            }
+        )
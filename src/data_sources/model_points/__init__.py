@@ -4,7 +4,12 @@ that holds model points.
 """
 
 from abc import ABC
-from typing import Type
+from typing import (
+    Type,
+    Callable
+)
+
+from pandas import DataFrame
 
 from src.system.data_sources.collection import DataSourceCollection
 from src.system.data_sources.data_source.file_json import DataSourceJsonFile
@@ -26,7 +31,8 @@ class ModelPointsBase(
     def __init__(
         self,
         path: str,
-        model_point_type: Type[ModelPoint]
+        model_point_type: Type[ModelPoint],
+        select: Callable[[DataFrame], DataFrame] | None = None
     ):
 
         """
@@ -35,6 +41,9 @@ class ModelPointsBase(
 
         :param path: Path to a model point file.
         :param model_point_type: Class definition of model point data source to instantiate.
+        :param select: Function that takes unparsed model point data, one row per model point, and returns the rows
+            to instantiate. Rows that are not returned are never parsed. If omitted, every model point is
+            instantiated.
         """
 
         DataSourceJsonFile.__init__(
@@ -46,7 +55,15 @@ class ModelPointsBase(
             self=self
         )
 
-        for data in [row[1] for row in self.cache.iterrows()]:
+        selected_data = self.cache
+
+        if select is not None:
+
+            selected_data = select(
+                selected_data
+            )
+
+        for data in [row[1] for row in selected_data.iterrows()]:
 
             instance = model_point_type(
                 data=data
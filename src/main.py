@@ -1,13 +1,8 @@
 from sys import argv
 from datetime import date
-from dateutil.relativedelta import relativedelta
 
 from src.system.odometer import odometer
-from src.system.projection.processor.multiple_process import MultiProcessProjectionProcessor
-from src.system.projection.processor.single_process import SingleProcessProjectionProcessor
-
 from src.system.enums import ProcessingType
-from src.system.projection.parameters import ProjectionParameters
 from src.system.logger import Logger
 
 
@@ -17,6 +12,8 @@ def main() -> None:
     r"""
     Sample function that:
 
+    #. Reads command-line arguments.
+    #. Imports the projection framework, which pulls in heavy dependencies like pandas.
     #. Constructs a :class:`~src.system.projection.parameters.ProjectionParameters` object.
     #. Constructs a :class:`~src.system.projection.processor.ProjectionProcessor` object.
     #. Uses the :class:`~src.system.projection.processor.ProjectionProcessor` to run the projections
@@ -29,6 +26,11 @@ def main() -> None:
     resource_dir_path = argv[1]
     output_dir_path = argv[2]
 
+    # Import the projection framework on first use, once arguments are read. Worker processes that re-import this
+    # module skip these imports, and only import what they unpickle.
+    from dateutil.relativedelta import relativedelta
+    from src.system.projection.parameters import ProjectionParameters
+
     # Construct projection parameters
     projection_parameters = ProjectionParameters(
         start_t=date(
@@ -54,12 +56,16 @@ def main() -> None:
 
     if projection_parameters.processing_type == ProcessingType.MULTI_PROCESS:
 
+        from src.system.projection.processor.multiple_process import MultiProcessProjectionProcessor
+
         projection_processor = MultiProcessProjectionProcessor(
             projection_parameters=projection_parameters
         )
 
     elif projection_parameters.processing_type == ProcessingType.SINGLE_PROCESS:
 
+        from src.system.projection.processor.single_process import SingleProcessProjectionProcessor
+
         projection_processor = SingleProcessProjectionProcessor(
             projection_parameters=projection_parameters
         )
@@ -6,6 +6,8 @@ from typing import List
 
 from src.system.projection_entity import ProjectionEntity
 from src.system.projection.time_steps import TimeSteps
+from src.system.enums import OutputScope
+from src.system.odometer import span
 
 from src.data_sources.annuity import AnnuityDataSources
 from src.projection_entities.economy.index import Index
@@ -21,6 +23,8 @@ class Economy(
 
     data_sources: AnnuityDataSources
 
+    output_scope: OutputScope = OutputScope.SCENARIO     #: Values depend only on the scenario.
+
     indexes: List[Index]    #: List of indices.
 
     def __init__(
@@ -30,8 +34,10 @@ class Economy(
     ):
 
         """
-        Constructor method. Initializes a list of indices from the
-        :class:`economic scenarios data source <src.data_sources.economic_scenarios.EconomicScenarios>`.
+        Constructor method. Initializes a list of indices from the rates in use by the
+        :class:`economic scenarios data source <src.data_sources.economic_scenarios.EconomicScenarios>`. Rates that
+        no loaded product or account references are not projected. See
+        :meth:`~src.data_sources.annuity.AnnuityDataSources.required_rates`.
 
         :param time_steps: Projection-wide timekeeping object.
         :param data_sources: Annuity data sources.
@@ -57,6 +63,7 @@ class Economy(
 
         return 'economy'
 
+    @span
     def age_economy(
         self
     ) -> None:
@@ -8,6 +8,8 @@ from datetime import date
 from src.system.projection_entity import ProjectionEntity
 from src.system.projection.time_steps import TimeSteps
 from src.system.projection_entity.projection_value import ProjectionValue
+from src.system.enums import OutputScope
+from src.system.odometer import span
 
 from src.data_sources.annuity import AnnuityDataSources
 from src.data_sources.economic_scenarios.economic_scenario import EconomicScenario
@@ -24,6 +26,8 @@ class Index(
 
     data_sources: AnnuityDataSources
 
+    output_scope: OutputScope = OutputScope.SCENARIO     #: Values depend only on the scenario.
+
     economic_scenario: EconomicScenario     #: The current economic scenario.
     index_name: str                         #: Index name.
 
@@ -76,7 +80,9 @@ class Index(
     def calc_pct_change(
         self,
         t1: date,
-        t2: date
+        t2: date,
+        step1: int | None = None,
+        step2: int | None = None
     ) -> float:
 
         r"""
@@ -90,23 +96,28 @@ class Index(
 
         :param t1: Start date.
         :param t2: End date.
+        :param step1: Projection time step position of the start date, if known.
+        :param step2: Projection time step position of the end date, if known.
         :return: Percent change.
         """
 
         curr_rate = self.economic_scenario.get_rate(
             name=self.index_name,
-            t=t1
+            t=t1,
+            step=step1
         )
 
         next_rate = self.economic_scenario.get_rate(
             name=self.index_name,
-            t=t2
+            t=t2,
+            step=step2
         )
 
         pct_change = (next_rate / curr_rate) - 1.0
 
         return pct_change
 
+    @span
     def age_index(
         self
     ) -> None:
@@ -122,10 +133,13 @@ class Index(
 
         self.pct_change[self.time_steps.t] = self.calc_pct_change(
             t1=self.time_steps.prev_t,
-            t2=self.time_steps.t
+            t2=self.time_steps.t,
+            step1=self.time_steps.prev_index,
+            step2=self.time_steps.index
         )
 
         self.index_value[self.time_steps.t] = self.economic_scenario.get_rate(
             name=self.index_name,
-            t=self.time_steps.t
+            t=self.time_steps.t,
+            step=self.time_steps.index
         )
@@ -9,6 +9,8 @@ from src.system.projection.time_steps import TimeSteps
 from src.system.projection_entity.projection_value import ProjectionValue
 from src.system.date import calc_whole_years
 from src.system.actuarial_math import convert_decrement_rate
+from src.system.enums import OutputScope
+from src.system.odometer import span
 
 from src.data_sources.annuity import AnnuityDataSources
 from src.projection_entities.people.annuitants.annuitant import Annuitant
@@ -24,6 +26,8 @@ class Annuitants(
 
     data_sources: AnnuityDataSources
 
+    output_scope: OutputScope = OutputScope.MODEL_POINT     #: Values depend only on the model point.
+
     annuitants: List[Annuitant]             #: List of annuitants
 
     t_q_x: ProjectionValue                  #: :math:`{_t}q_x` - Probability of death for the primary annuitant.
@@ -250,6 +254,7 @@ class Annuitants(
             interval=self.time_steps.time_step
         )
 
+    @span
     def update_decrements(
         self
     ) -> None:
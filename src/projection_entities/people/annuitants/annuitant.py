@@ -14,7 +14,10 @@ from src.system.date import (
 
 from src.data_sources.annuity import AnnuityDataSources
 from src.data_sources.annuity.model_points.model_point.annuitants.annuitant import Annuitant as AnnuitantDataSource
-from src.system.enums import Gender
+from src.system.enums import (
+    Gender,
+    OutputScope
+)
 
 
 class Annuitant(
@@ -27,6 +30,8 @@ class Annuitant(
 
     data_sources: AnnuityDataSources
 
+    output_scope: OutputScope = OutputScope.MODEL_POINT     #: Values depend only on the model point.
+
     id: str                                             #: Annuitant ID.
     gender: Gender                                      #: Gender.
     date_of_birth: date                                 #: Date of birth.
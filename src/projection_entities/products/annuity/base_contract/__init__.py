@@ -15,6 +15,7 @@ from src.system.enums import (
 )
 from src.system.logger import Logger
 from src.system.projection.scripts.get_xversaries import get_xversaries
+from src.system.odometer import span
 
 from src.data_sources.annuity import AnnuityDataSources
 from src.data_sources.annuity.model_points.model_point.accounts.account import Account as AccountDataSource
@@ -323,6 +324,7 @@ class BaseContract(
 
         return self.annuitants.primary_annuitant
 
+    @span
     def age_contract(
         self
     ) -> None:
@@ -356,6 +358,7 @@ class BaseContract(
             frequency=12
         )]
 
+    @span
     def process_premiums(
         self
     ) -> None:
@@ -408,6 +411,7 @@ class BaseContract(
                 base_contract=self
             )
 
+    @span
     def credit_interest(
         self
     ) -> None:
@@ -484,6 +488,7 @@ class BaseContract(
         self.account_value[self.time_steps.t] = self._calc_account_value()
         self.update_cash_surrender_value()
 
+    @span
     def assess_charges(
         self
     ) -> None:
@@ -543,6 +548,7 @@ class BaseContract(
         self.account_value[self.time_steps.t] = self._calc_account_value()
         self.update_cash_surrender_value()
 
+    @span
     def process_withdrawals(
         self
     ) -> None:
@@ -562,6 +568,7 @@ class BaseContract(
                     base_contract=self
                 )
 
+    @span
     def update_gmdb_naar(
         self
     ) -> None:
@@ -581,6 +588,7 @@ class BaseContract(
                     base_contract=self
                 )
 
+    @span
     def update_cash_surrender_value(
         self
     ) -> None:
@@ -11,6 +11,7 @@ from src.system.date import (
     date_to_str,
     calc_whole_years
 )
+from src.system.enums import OutputScope
 
 from src.data_sources.annuity import AnnuityDataSources
 from src.data_sources.annuity.model_points.model_point.accounts.account.premiums.premium import Premium as \
@@ -27,6 +28,8 @@ class Premium(
 
     data_sources: AnnuityDataSources
 
+    output_scope: OutputScope = OutputScope.MODEL_POINT     #: Values depend only on the model point.
+
     _product_name: str
     _account_id: str
 
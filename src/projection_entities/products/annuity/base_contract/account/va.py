@@ -51,12 +51,14 @@ class SeparateAccount(
 
         start_index = self.data_sources.economic_scenario.get_rate(
             name=self.account_data_source.account_name,
-            t=self.time_steps.prev_t
+            t=self.time_steps.prev_t,
+            step=self.time_steps.prev_index
         )
 
         end_index = self.data_sources.economic_scenario.get_rate(
             name=self.account_data_source.account_name,
-            t=self.time_steps.t
+            t=self.time_steps.t,
+            step=self.time_steps.index
         )
 
         crediting_rate = (end_index / start_index) - 1.0
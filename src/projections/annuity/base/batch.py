@@ -0,0 +1,1352 @@
+"""
+Model-point-vectorised annuity economic liability projection.
+"""
+
+from os.path import (
+    exists,
+    join
+)
+from os import mkdir
+from typing import (
+    Callable,
+    List,
+    Dict,
+    Tuple,
+    Any
+)
+
+from numpy import (
+    ndarray,
+    array,
+    zeros,
+    full,
+    where,
+    unique,
+    searchsorted,
+    minimum,
+    maximum,
+    isnan,
+    isnat,
+    argmin,
+    argmax,
+    arange,
+    datetime64,
+    generic,
+    int64,
+    broadcast_to
+)
+from pandas import (
+    DataFrame,
+    Index
+)
+
+from src.system.projection import Projection
+from src.system.output import OutputWriter
+from src.system.output.aggregate import Aggregate
+from src.system.projection.parameters import ProjectionParameters
+from src.system.projection.scripts.get_xversaries import get_xversaries
+from src.system.actuarial_math import (
+    convert_decrement_rate,
+    index_discount_factors
+)
+from src.system.date import (
+    calc_partial_years,
+    calc_whole_years_array,
+    dates_to_array
+)
+from src.system.enums import (
+    AccountType,
+    OutputFormat,
+    OutputScope
+)
+from src.system.logger import Logger
+from src.system.odometer import span
+
+from src.data_sources.annuity.batch import AnnuityBatchDataSources
+from src.data_sources.annuity.model_points.arrays import ModelPointArrays
+
+
+class BatchEconomicLiabilityProjection(
+    Projection
+):
+
+    """
+    Model-point-vectorised version of :class:`~src.projections.annuity.base.economic_liability.EconomicLiabilityProjection`.
+
+    Instead of building a :class:`projection entity <src.system.projection_entity.ProjectionEntity>` graph for each
+    model point, a single projection runs every model point under one economic scenario. Contract, account, rider,
+    and annuitant values are held as arrays over the policy axis, and accounts are credited by masking on account type.
+    Transaction order within a time step matches
+    :meth:`EconomicLiabilityProjection.project_time_step() <src.projections.annuity.base.economic_liability.EconomicLiabilityProjection.project_time_step>`.
+
+    Output uses the same directory structure and file layout as the entity-based projection, for the contract,
+    annuitants, and riders. Values are written for every time step. Where the entity-based projection leaves a value
+    unwritten for a time step, the latest value is repeated instead.
+
+    Requires :class:`~src.data_sources.annuity.batch.AnnuityBatchDataSources`.
+    """
+
+    data_sources: AnnuityBatchDataSources       #: Batch annuity data sources.
+    model_points: ModelPointArrays              #: Columnar model points.
+
+    contract: Dict[str, ndarray]                #: Contract value histories, each of shape ``(time steps, policies)``.
+    annuitants: Dict[str, ndarray]              #: Annuitant value histories, each of shape ``(time steps, policies)``.
+    gmdb: Dict[str, ndarray]                    #: GMDB rider value histories, each of shape ``(time steps, policies)``.
+    gmwb: Dict[str, ndarray]                    #: GMWB rider value histories, each of shape ``(time steps, policies)``.
+
+    _t: ndarray
+    _issue_dates: ndarray
+    _account_step: ndarray
+    _premium_step: ndarray
+    _account_value: ndarray
+    _interest_credited: ndarray
+    _term_start_date: ndarray
+    _monthiversaries: ndarray
+    _quarterversaries: ndarray
+
+    def __init__(
+        self,
+        projection_parameters: ProjectionParameters,
+        data_sources: AnnuityBatchDataSources
+    ):
+
+        Projection.__init__(
+            self=self,
+            projection_parameters=projection_parameters,
+            data_sources=data_sources
+        )
+
+        self.model_points = self.data_sources.model_point_arrays
+
+        time_step_count = len(self.time_steps)
+        policy_count = len(self.model_points)
+
+        self._t = dates_to_array(
+            dates=self.time_steps.all_t
+        )
+
+        self._issue_dates = unique(
+            self.model_points.issue_date
+        )
+
+        # Time step index when each account and premium enters the projection, or -1 if it never does
+        self._account_step = self._get_arrival_steps(
+            dates=self.model_points.account_date
+        )
+
+        account_step = self._account_step[:, :, None]
+
+        self._premium_step = where(
+            (account_step >= 0) & (self.model_points.premium_date == self.model_points.account_date[:, :, None]),
+            account_step,
+            where(
+                (account_step >= 0) & (self._get_arrival_steps(dates=self.model_points.premium_date) > account_step),
+                self._get_arrival_steps(dates=self.model_points.premium_date),
+                -1
+            )
+        )
+
+        # Account state
+        self._account_value = zeros(self._account_step.shape)
+        self._interest_credited = zeros(self._account_step.shape)
+        self._term_start_date = full(self._account_step.shape, 'NaT', dtype='datetime64[D]')
+
+        self._monthiversaries = zeros(policy_count, dtype=int)
+        self._quarterversaries = zeros(policy_count, dtype=int)
+
+        self._init_account_assumptions()
+        self._init_annuitant_assumptions()
+
+        # Value histories
+        def _history(
+            init_value: Any = 0.0,
+            dtype: Any = float
+        ) -> ndarray:
+
+            history = zeros((time_step_count, policy_count), dtype=dtype)
+            history[0] = init_value
+
+            return history
+
+        self.contract = {
+            'premium_new': _history(),
+            'premium_cumulative': _history(),
+            'interest_credited': _history(),
+            'gmdb_charge': _history(),
+            'gmwb_charge': _history(),
+            'withdrawal': _history(),
+            'account_value': _history(),
+            'surrender_charge': _history(),
+            'cash_surrender_value': _history()
+        }
+
+        self.annuitants = {
+            't_q_x': _history(),
+            't_q_y': _history(),
+            'base_lapse_rate': _history(),
+            'lapse_multiplier': _history(),
+            't_q_lapse': _history(),
+            't_q_annuitization': _history(),
+            'l_xy': _history(init_value=where(self._has_secondary_annuitant, 1.0, 0.0)),
+            'l_x_d_y': _history(init_value=where(self._has_secondary_annuitant, 0.0, 1.0)),
+            'l_y_d_x': _history(),
+            'd_xy': _history(),
+            'd_lapse': _history(),
+            'd_annuitization': _history()
+        }
+
+        self.gmdb = {
+            'benefit_base': _history(),
+            'charge_rate': _history(),
+            'charge_amount': _history(),
+            'net_amount_at_risk': _history()
+        }
+
+        self.gmwb = {
+            'benefit_base': _history(init_value=self.model_points.gmwb_benefit_base),
+            'charge_rate': _history(),
+            'charge_amount': _history(),
+            'withdrawal_program_active': _history(init_value=False, dtype=bool),
+            'av_active_withdrawal_rate': _history(),
+            'av_exhaust_withdrawal_rate': _history(),
+            'withdrawal': _history(),
+            'claim': _history()
+        }
+
+    def __str__(
+        self
+    ) -> str:
+
+        return f'batch || {self.data_sources.economic_scenario.scenario_index}'
+
+    @staticmethod
+    def _lookup(
+        function: Callable,
+        dtype: Any = float,
+        **kwargs: ndarray
+    ) -> ndarray:
+
+        """
+        Evaluates a scalar data source method over equally-shaped argument arrays. The method is called once per
+        unique combination of arguments, and results are broadcast back to the argument shape.
+
+        :param function: Data source method.
+        :param dtype: Result data type.
+        :param kwargs: Argument arrays, keyed by argument name.
+        :return: Array of results.
+        """
+
+        arguments = {key: value.ravel() for key, value in kwargs.items()}
+        shape = next(iter(kwargs.values())).shape
+
+        if not next(iter(arguments.values())).size:
+
+            return zeros(shape, dtype=dtype)
+
+        codes = zeros(next(iter(arguments.values())).size, dtype=int64)
+
+        for value in arguments.values():
+
+            _, inverse = unique(
+                value,
+                return_inverse=True
+            )
+
+            codes = codes * (inverse.max() + 1) + inverse
+
+        _, first_positions, inverse = unique(
+            codes,
+            return_index=True,
+            return_inverse=True
+        )
+
+        results = array(
+            [
+                function(
+                    **{
+                        key: value[position].item() if isinstance(value[position], generic) else value[position]
+                        for key, value in arguments.items()
+                    }
+                ) for position in first_positions
+            ],
+            dtype=dtype
+        )
+
+        return results[inverse].reshape(shape)
+
+    def _get_arrival_steps(
+        self,
+        dates: ndarray
+    ) -> ndarray:
+
+        # Dates on the first time step arrive immediately, later dates arrive on the first time step on or after them
+        steps = searchsorted(
+            self._t,
+            dates,
+            side='left'
+        )
+
+        return where(
+            dates == self._t[0],
+            0,
+            where(
+                (steps >= 1) & (steps < len(self._t)),
+                steps,
+                -1
+            )
+        )
+
+    def _get_rates(
+        self,
+        names: ndarray,
+        dates: ndarray
+    ) -> ndarray:
+
+        return self._lookup(
+            function=self.data_sources.economic_scenario.get_rate,
+            name=names,
+            t=dates
+        )
+
+    def _init_account_assumptions(
+        self
+    ) -> None:
+
+        crediting_rate = self.data_sources.product.base_product.crediting_rate
+
+        account_name = self.model_points.account_name
+
+        self._fixed = self.model_points.account_mask(
+            account_type=AccountType.FIXED
+        )
+
+        self._indexed = self.model_points.account_mask(
+            account_type=AccountType.INDEXED
+        )
+
+        self._separate = self.model_points.account_mask(
+            account_type=AccountType.SEPARATE
+        )
+
+        unhandled = (self._account_step >= 0) & ~(self._fixed | self._indexed | self._separate)
+
+        if unhandled.any():
+
+            Logger().raise_expr(
+                expr=NotImplementedError(
+                    f'Unhandled account type: {self.model_points.account_type[unhandled][0]} !'
+                )
+            )
+
+        # Fixed account crediting rates
+        self._fixed_crediting_rate = zeros(account_name.shape)
+        self._fixed_crediting_rate[self._fixed] = self._lookup(
+            function=crediting_rate.fixed.crediting_rate,
+            account_name=account_name[self._fixed]
+        )
+
+        # Indexed account crediting parameters
+        self._index_name = full(account_name.shape, '', dtype=object)
+        self._index_name[self._indexed] = self._lookup(
+            function=crediting_rate.indexed.index,
+            dtype=object,
+            account_name=account_name[self._indexed]
+        )
+
+        self._crediting_term_months = zeros(account_name.shape, dtype=int)
+        self._crediting_term_months[self._indexed] = self._lookup(
+            function=crediting_rate.indexed.term,
+            dtype=int,
+            account_name=account_name[self._indexed]
+        ) * 12
+
+        # None is stored as NaN, and skipped during crediting
+        self._cap = full(account_name.shape, float('nan'))
+        self._spread = full(account_name.shape, float('nan'))
+        self._participation_rate = full(account_name.shape, float('nan'))
+        self._floor = full(account_name.shape, float('nan'))
+
+        for parameter, function in (
+            (self._cap, crediting_rate.indexed.cap),
+            (self._spread, crediting_rate.indexed.spread),
+            (self._participation_rate, crediting_rate.indexed.participation_rate),
+            (self._floor, crediting_rate.indexed.floor)
+        ):
+
+            parameter[self._indexed] = self._lookup(
+                function=function,
+                account_name=account_name[self._indexed]
+            )
+
+    def _init_annuitant_assumptions(
+        self
+    ) -> None:
+
+        policies = arange(len(self.model_points))
+
+        valid = arange(self.model_points.annuitant_date_of_birth.shape[1])[None, :] < \
+            self.model_points.annuitant_count[:, None]
+
+        # Primary annuitant is the annuitant with the earliest date of birth, secondary is the latest
+        primary = argmin(
+            where(valid, self.model_points.annuitant_date_of_birth, datetime64('9999-12-31')),
+            axis=1
+        )
+
+        secondary = argmax(
+            where(valid, self.model_points.annuitant_date_of_birth, datetime64('0001-01-01')),
+            axis=1
+        )
+
+        self._has_secondary_annuitant = self.model_points.annuitant_count > 1
+
+        self._primary_date_of_birth = self.model_points.annuitant_date_of_birth[policies, primary]
+        self._primary_gender = self.model_points.annuitant_gender[policies, primary]
+        self._secondary_date_of_birth = self.model_points.annuitant_date_of_birth[policies, secondary]
+        self._secondary_gender = self.model_points.annuitant_gender[policies, secondary]
+
+        # Constant assumptions
+        self._mortality_improvement_duration = calc_partial_years(
+            dt1=self.data_sources.mortality.mortality_improvement_dates.mortality_improvement_end_date,
+            dt2=self.data_sources.mortality.mortality_improvement_dates.mortality_improvement_start_date
+        )
+
+        self._cdsc_period = self._lookup(
+            function=self.data_sources.product.base_product.surrender_charge.cdsc_period,
+            dtype=int,
+            product_name=self.model_points.product_name
+        )
+
+    def setup_output(
+        self
+    ) -> None:
+
+        r"""
+        Creates a nested output directory structure for each model point, with the following form:
+
+        .. code-block:: text
+
+            \ Model point ID
+                \ Economic scenario number
+
+        Output written to a :class:`run-level results store <src.system.output.results_store.ResultsStore>`, or
+        aggregate-only output, does not need a directory structure, so none is created.
+
+        :return: Nothing.
+        """
+
+        self.output_dir_path = self.projection_parameters.output_dir_path
+
+        if self.projection_parameters.output_format == OutputFormat.SQLITE or \
+                not self.projection_parameters.write_seriatim:
+
+            return
+
+        for model_point_id in self.model_points.ids:
+
+            model_point_dir_path = join(
+                self.projection_parameters.output_dir_path,
+                model_point_id
+            )
+
+            if not exists(path=model_point_dir_path):
+
+                mkdir(
+                    path=model_point_dir_path
+                )
+
+            economic_scenario_dir_path = join(
+                model_point_dir_path,
+                str(self.data_sources.economic_scenario.scenario_index)
+            )
+
+            if not exists(path=economic_scenario_dir_path):
+
+                mkdir(
+                    path=economic_scenario_dir_path
+                )
+
+    @span
+    def project_time_step(
+        self
+    ) -> None:
+
+        """
+        Annuity Economic Liability Projection transaction order within a single time step, for all model points.
+
+        :return: Nothing.
+        """
+
+        # Roll previous values forward
+        if self.time_steps.index:
+
+            for values in (self.contract, self.annuitants, self.gmdb, self.gmwb):
+
+                for history in values.values():
+
+                    history[self.time_steps.index] = history[self.time_steps.index - 1]
+
+        self.age_contract()
+
+        self.process_premiums()
+
+        self.credit_interest()
+
+        self.assess_charges()
+
+        self.process_withdrawals()
+
+        self.update_gmdb_naar()
+
+        self.update_cash_surrender_value()
+
+        self.update_decrements()
+
+    def _count_xversaries(
+        self,
+        frequency: int
+    ) -> ndarray:
+
+        counts = zeros(len(self.model_points), dtype=int)
+
+        for issue_date in self._issue_dates:
+
+            counts[self.model_points.issue_date == issue_date] = len(
+                get_xversaries(
+                    issue_date=issue_date.item(),
+                    start_date=self.time_steps.prev_t,
+                    end_date=self.time_steps.t,
+                    frequency=frequency
+                )
+            )
+
+        return counts
+
+    @span
+    def age_contract(
+        self
+    ) -> None:
+
+        """
+        Counts monthiversaries and quarterversaries within the current time step, for each model point.
+
+        :return: Nothing.
+        """
+
+        self._monthiversaries = self._count_xversaries(
+            frequency=1
+        )
+
+        self._quarterversaries = self._count_xversaries(
+            frequency=3
+        )
+
+    @span
+    def process_premiums(
+        self
+    ) -> None:
+
+        """
+        Opens accounts and adds premiums that arrive within the current time step, then adds new premiums to
+        rider benefit bases.
+
+        :return: Nothing.
+        """
+
+        k = self.time_steps.index
+
+        # Initialize crediting terms for new indexed accounts
+        new_indexed = (self._account_step == k) & self._indexed
+
+        self._term_start_date[new_indexed] = self._lookup(
+            function=lambda issue_date, account_date, term_months: max(
+                get_xversaries(
+                    issue_date=issue_date,
+                    start_date=account_date,
+                    end_date=self.time_steps.t,
+                    frequency=term_months
+                ),
+                default=issue_date
+            ),
+            dtype='datetime64[D]',
+            issue_date=broadcast_to(self.model_points.issue_date[:, None], self._account_step.shape)[new_indexed],
+            account_date=self.model_points.account_date[new_indexed],
+            term_months=self._crediting_term_months[new_indexed]
+        )
+
+        # Add new premiums
+        premium_new = (self.model_points.premium_amount * (self._premium_step == k)).sum(axis=2)
+
+        self._account_value += premium_new
+
+        self.contract['premium_new'][k] = premium_new.sum(axis=1)
+        self.contract['premium_cumulative'][k] = self.contract['premium_cumulative'][k] + self.contract['premium_new'][k]
+        self.contract['account_value'][k] = self._account_value.sum(axis=1)
+
+        # Process premiums for riders
+        self.gmdb['benefit_base'][k] += where(self.model_points.has_gmdb, self.contract['premium_new'][k], 0.0)
+        self.gmwb['benefit_base'][k] += where(self.model_points.has_gmwb, self.contract['premium_new'][k], 0.0)
+
+    @span
+    def credit_interest(
+        self
+    ) -> None:
+
+        """
+        Credits interest to fixed, separate, and indexed accounts, masking on account type.
+
+        :return: Nothing.
+        """
+
+        k = self.time_steps.index
+
+        active = (self._account_step >= 0) & (self._account_step <= k)
+
+        self._interest_credited[:] = 0.0
+
+        # Fixed accounts
+        fixed = active & self._fixed
+
+        self._interest_credited[fixed] = self._account_value[fixed] * (
+            self._fixed_crediting_rate[fixed] *
+            calc_partial_years(
+                dt1=self.time_steps.t,
+                dt2=self.time_steps.prev_t
+            )
+        )
+
+        # Separate accounts
+        separate = active & self._separate
+
+        for account_name in unique(self.model_points.account_name[separate]):
+
+            group = separate & (self.model_points.account_name == account_name)
+
+            start_index, end_index = self.data_sources.economic_scenario.get_rates(
+                name=account_name,
+                steps=array([max(k - 1, 0), k])
+            )
+
+            self._interest_credited[group] = self._account_value[group] * ((end_index / start_index) - 1.0)
+
+        self._account_value[fixed | separate] += self._interest_credited[fixed | separate]
+
+        # Indexed accounts, grouped by crediting term schedule
+        indexed = active & self._indexed
+
+        for issue_date in self._issue_dates:
+
+            for term_months in unique(self._crediting_term_months[indexed]):
+
+                group = indexed & (self.model_points.issue_date[:, None] == issue_date) & \
+                    (self._crediting_term_months == term_months)
+
+                if not group.any():
+
+                    continue
+
+                term_end_dates = get_xversaries(
+                    issue_date=issue_date.item(),
+                    start_date=self.time_steps.prev_t,
+                    end_date=self.time_steps.t,
+                    frequency=int(term_months)
+                )
+
+                for term_end_date in dates_to_array(dates=term_end_dates):
+
+                    start_index = self._get_rates(
+                        names=self._index_name[group],
+                        dates=self._term_start_date[group]
+                    )
+
+                    end_index = self._get_rates(
+                        names=self._index_name[group],
+                        dates=full(group.sum(), term_end_date)
+                    )
+
+                    crediting_rate = (end_index / start_index) - 1.0
+
+                    cap = self._cap[group]
+                    spread = self._spread[group]
+                    participation_rate = self._participation_rate[group]
+                    floor = self._floor[group]
+
+                    crediting_rate = where(isnan(cap), crediting_rate, minimum(cap, crediting_rate))
+                    crediting_rate = where(isnan(spread), crediting_rate, crediting_rate - spread)
+                    crediting_rate = where(isnan(participation_rate), crediting_rate, crediting_rate * participation_rate)
+                    crediting_rate = where(isnan(floor), crediting_rate, maximum(floor, crediting_rate))
+
+                    self._interest_credited[group] = self._account_value[group] * crediting_rate
+                    self._account_value[group] += self._interest_credited[group]
+                    self._term_start_date[group] = term_end_date
+
+        self.contract['interest_credited'][k] = self._interest_credited.sum(axis=1)
+        self.contract['account_value'][k] = self._account_value.sum(axis=1)
+
+    def _assess_charge(
+        self,
+        charge_amount: ndarray,
+        charge_account_name: str,
+        mask: ndarray
+    ) -> None:
+
+        k = self.time_steps.index
+
+        # Apply charge pro rata across accounts
+        account_value = self.contract['account_value'][k][:, None]
+
+        pro_rata_factor = where(
+            account_value != 0.0,
+            self._account_value / where(account_value != 0.0, account_value, 1.0),
+            0.0
+        )
+
+        self._account_value -= where(mask, charge_amount, 0.0)[:, None] * pro_rata_factor
+
+        self.contract[charge_account_name][k] = where(mask, charge_amount, self.contract[charge_account_name][k])
+        self.contract['account_value'][k] = self._account_value.sum(axis=1)
+
+    def _process_gmdb_charge(
+        self,
+        mask: ndarray
+    ) -> None:
+
+        k = self.time_steps.index
+
+        charge_rate = zeros(len(self.model_points))
+        charge_rate[mask] = self._lookup(
+            function=self.data_sources.product.gmdb_rider.gmdb_charge.charge_rate,
+            rider_name=self.model_points.gmdb_name[mask]
+        )
+
+        charged = mask & (self._monthiversaries > 0)
+
+        self.gmdb['charge_rate'][k] = where(charged, charge_rate, self.gmdb['charge_rate'][k])
+        self.gmdb['charge_amount'][k] = where(
+            mask,
+            self._monthiversaries * self.contract['account_value'][k] * (charge_rate / 12.0),
+            self.gmdb['charge_amount'][k]
+        )
+
+        self._assess_charge(
+            charge_amount=self.gmdb['charge_amount'][k],
+            charge_account_name='gmdb_charge',
+            mask=mask
+        )
+
+    def _process_gmwb_charge(
+        self,
+        mask: ndarray
+    ) -> None:
+
+        k = self.time_steps.index
+
+        charge_rate = zeros(len(self.model_points))
+        charge_rate[mask] = self._lookup(
+            function=self.data_sources.product.gmwb_rider.gmwb_charge.charge_rate,
+            product_name=self.model_points.gmwb_name[mask]
+        )
+
+        charge_amount = zeros(len(self.model_points))
+        account_value = self.contract['account_value'][k].copy()
+
+        for quarterversary in range(self._quarterversaries.max(initial=0)):
+
+            charged = mask & (self._quarterversaries > quarterversary)
+
+            charge_amount = where(
+                charged,
+                charge_amount + minimum(self.gmwb['benefit_base'][k] * (charge_rate / 4.0), account_value),
+                charge_amount
+            )
+
+            account_value = where(charged, account_value - charge_amount, account_value)
+
+        self.gmwb['charge_rate'][k] = where(
+            mask,
+            where(self._quarterversaries > 0, charge_rate, 0.0),
+            self.gmwb['charge_rate'][k]
+        )
+        self.gmwb['charge_amount'][k] = where(mask, charge_amount, self.gmwb['charge_amount'][k])
+
+        self._assess_charge(
+            charge_amount=self.gmwb['charge_amount'][k],
+            charge_account_name='gmwb_charge',
+            mask=mask
+        )
+
+    @span
+    def assess_charges(
+        self
+    ) -> None:
+
+        """
+        Assesses GMDB and GMWB rider charges, in the order riders appear on each model point.
+
+        :return: Nothing.
+        """
+
+        rider_count = max(
+            self.model_points.gmdb_order.max(initial=-1),
+            self.model_points.gmwb_order.max(initial=-1)
+        ) + 1
+
+        for position in range(rider_count):
+
+            gmdb = self.model_points.has_gmdb & (self.model_points.gmdb_order == position)
+
+            if gmdb.any():
+
+                self._process_gmdb_charge(
+                    mask=gmdb
+                )
+
+            gmwb = self.model_points.has_gmwb & (self.model_points.gmwb_order == position)
+
+            if gmwb.any():
+
+                self._process_gmwb_charge(
+                    mask=gmwb
+                )
+
+    def _set_withdrawal_program(
+        self
+    ) -> None:
+
+        k = self.time_steps.index
+        t = dates_to_array(dates=[self.time_steps.t])[0]
+
+        first_withdrawal_date = self.model_points.gmwb_first_withdrawal_date
+
+        # Determine whether withdrawal program starts
+        starting = self.model_points.has_gmwb & ~self.gmwb['withdrawal_program_active'][k] & (
+            (~isnat(first_withdrawal_date) & (t >= first_withdrawal_date)) |
+            (self.contract['account_value'][k] == 0.0)
+        )
+
+        if not starting.any():
+
+            return
+
+        if isnat(first_withdrawal_date[starting]).any():
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'GMWB withdrawal program started without a first withdrawal date for model point: '
+                    f'{self.model_points.ids[starting & isnat(first_withdrawal_date)][0]} !'
+                )
+            )
+
+        self.gmwb['withdrawal_program_active'][k] |= starting
+
+        # Set withdrawal rates
+        age_first_withdrawal = calc_whole_years_array(
+            dt1=first_withdrawal_date[starting],
+            dt2=self._primary_date_of_birth[starting]
+        )
+
+        self.gmwb['av_active_withdrawal_rate'][k][starting] = self._lookup(
+            function=self.data_sources.product.gmwb_rider.gmwb_benefit.av_active_withdrawal_rate,
+            rider_name=self.model_points.gmwb_name[starting],
+            age_first_withdrawal=age_first_withdrawal
+        )
+
+        self.gmwb['av_exhaust_withdrawal_rate'][k][starting] = self._lookup(
+            function=self.data_sources.product.gmwb_rider.gmwb_benefit.av_exhaust_withdrawal_rate,
+            rider_name=self.model_points.gmwb_name[starting],
+            age_first_withdrawal=age_first_withdrawal
+        )
+
+    @span
+    def process_withdrawals(
+        self
+    ) -> None:
+
+        """
+        Processes GMWB withdrawals and claims on every monthiversary, then applies withdrawals pro rata across
+        accounts.
+
+        :return: Nothing.
+        """
+
+        k = self.time_steps.index
+
+        self._set_withdrawal_program()
+
+        active = self.model_points.has_gmwb & self.gmwb['withdrawal_program_active'][k]
+
+        benefit_base = self.gmwb['benefit_base'][k]
+
+        withdrawal = zeros(len(self.model_points))
+        claim = zeros(len(self.model_points))
+        account_value = self.contract['account_value'][k].copy()
+
+        for monthiversary in range(self._monthiversaries.max(initial=0)):
+
+            withdrawing = active & (self._monthiversaries > monthiversary)
+
+            # Take withdrawal at AV active rate, and remainder as claim
+            withdrawal_requested = self.gmwb['av_active_withdrawal_rate'][k] * benefit_base
+
+            av_active = withdrawing & (account_value != 0.0)
+
+            withdrawal = where(av_active, withdrawal + minimum(withdrawal_requested, account_value), withdrawal)
+            account_value = where(av_active, account_value - withdrawal, account_value)
+            claim = where(av_active, withdrawal_requested - withdrawal, claim)
+
+            # Take claim at AV exhaust rate
+            av_exhausted = withdrawing & ~av_active
+
+            claim = where(av_exhausted, self.gmwb['av_exhaust_withdrawal_rate'][k] * benefit_base, claim)
+
+        self.gmwb['withdrawal'][k] = where(self.model_points.has_gmwb, withdrawal, self.gmwb['withdrawal'][k])
+        self.gmwb['claim'][k] = where(self.model_points.has_gmwb, claim, self.gmwb['claim'][k])
+
+        # Apply withdrawal pro rata across accounts
+        contract_account_value = self.contract['account_value'][k][:, None]
+
+        pro_rata_factor = where(
+            contract_account_value != 0.0,
+            self._account_value / where(contract_account_value != 0.0, contract_account_value, 1.0),
+            0.0
+        )
+
+        self._account_value -= where(self.model_points.has_gmwb, withdrawal, 0.0)[:, None] * pro_rata_factor
+
+        self.contract['withdrawal'][k] = where(self.model_points.has_gmwb, withdrawal, self.contract['withdrawal'][k])
+        self.contract['account_value'][k] = self._account_value.sum(axis=1)
+
+    @span
+    def update_gmdb_naar(
+        self
+    ) -> None:
+
+        """
+        Updates GMDB Net Amount At Risk (NAAR).
+
+        :return: Nothing.
+        """
+
+        k = self.time_steps.index
+
+        self.gmdb['net_amount_at_risk'][k] = where(
+            self.model_points.has_gmdb,
+            maximum(self.gmdb['benefit_base'][k] - self.contract['account_value'][k], 0.0),
+            self.gmdb['net_amount_at_risk'][k]
+        )
+
+    @span
+    def update_cash_surrender_value(
+        self
+    ) -> None:
+
+        """
+        Updates surrender charges for every premium received, then calculates account and contract surrender charges,
+        and the contract cash surrender value.
+
+        :return: Nothing.
+        """
+
+        k = self.time_steps.index
+        t = dates_to_array(dates=[self.time_steps.t])[0]
+
+        received = (self._premium_step >= 0) & (self._premium_step <= k)
+
+        premium_surrender_charge = zeros(self._premium_step.shape)
+
+        premium_surrender_charge[received] = self.model_points.premium_amount[received] * self._lookup(
+            function=self.data_sources.product.base_product.surrender_charge.surrender_charge_rate,
+            policy_year=calc_whole_years_array(
+                dt1=t,
+                dt2=self.model_points.premium_date[received]
+            ),
+            product_name=broadcast_to(self.model_points.product_name[:, None, None], self._premium_step.shape)[received]
+        )
+
+        account_surrender_charge = minimum(
+            premium_surrender_charge.sum(axis=2),
+            self._account_value
+        )
+
+        self.contract['surrender_charge'][k] = account_surrender_charge.sum(axis=1)
+        self.contract['cash_surrender_value'][k] = maximum(
+            self.contract['account_value'][k] - self.contract['surrender_charge'][k],
+            0.0
+        )
+
+    def _mortality_rate(
+        self,
+        gender: ndarray,
+        date_of_birth: ndarray
+    ) -> ndarray:
+
+        t = dates_to_array(dates=[self.time_steps.t])[0]
+
+        attained_age = calc_whole_years_array(
+            dt1=t,
+            dt2=date_of_birth
+        )
+
+        base_mortality_rate = self._lookup(
+            function=self.data_sources.mortality.base_mortality.base_mortality_rate,
+            gender=gender,
+            attained_age=attained_age
+        )
+
+        mortality_improvement_rate = self._lookup(
+            function=self.data_sources.mortality.mortality_improvement.mortality_improvement_rate,
+            gender=gender,
+            attained_age=attained_age
+        )
+
+        return base_mortality_rate * (1.0 - mortality_improvement_rate) ** self._mortality_improvement_duration
+
+    @span
+    def update_decrements(
+        self
+    ) -> None:
+
+        """
+        Updates mortality, lapse, and annuitization rates, then projects policy counts forward by one time step.
+        See :meth:`Annuitants.update_decrements() <src.projection_entities.people.annuitants.Annuitants.update_decrements>`.
+
+        :return: Nothing.
+        """
+
+        if self.time_steps.prev_t == self.time_steps.t:
+
+            return
+
+        k = self.time_steps.index
+        t = dates_to_array(dates=[self.time_steps.t])[0]
+
+        annuitants = self.annuitants
+
+        # Mortality
+        annuitants['t_q_x'][k] = convert_decrement_rate(
+            q_x=self._mortality_rate(
+                gender=self._primary_gender,
+                date_of_birth=self._primary_date_of_birth
+            ),
+            interval=self.time_steps.time_step
+        )
+
+        annuitants['t_q_y'][k] = 0.0
+        annuitants['t_q_y'][k][self._has_secondary_annuitant] = convert_decrement_rate(
+            q_x=self._mortality_rate(
+                gender=self._secondary_gender[self._has_secondary_annuitant],
+                date_of_birth=self._secondary_date_of_birth[self._has_secondary_annuitant]
+            ),
+            interval=self.time_steps.time_step
+        )
+
+        # Lapse
+        policy_year = calc_whole_years_array(
+            dt1=t,
+            dt2=self.model_points.issue_date
+        )
+
+        annuitants['base_lapse_rate'][k] = self._lookup(
+            function=self.data_sources.policyholder_behaviors.base_lapse.base_lapse_rate,
+            policy_year=policy_year
+        )
+
+        annuitants['lapse_multiplier'][k] = self._lookup(
+            function=self.data_sources.policyholder_behaviors.shock_lapse.shock_lapse_multiplier,
+            years_after_cdsc_period=maximum(policy_year - self._cdsc_period, 0)
+        )
+
+        annuitants['t_q_lapse'][k] = convert_decrement_rate(
+            q_x=annuitants['base_lapse_rate'][k] * annuitants['lapse_multiplier'][k],
+            interval=self.time_steps.time_step
+        )
+
+        # Annuitization
+        annuitants['t_q_annuitization'][k] = convert_decrement_rate(
+            q_x=self._lookup(
+                function=self.data_sources.policyholder_behaviors.annuitization.annuitization_rate,
+                attained_age=calc_whole_years_array(
+                    dt1=t,
+                    dt2=self._primary_date_of_birth
+                )
+            ),
+            interval=self.time_steps.time_step
+        )
+
+        # Update lives
+        t_q_x = annuitants['t_q_x'][k]
+        t_q_y = annuitants['t_q_y'][k]
+        t_q_lapse = annuitants['t_q_lapse'][k]
+        t_q_annuitization = annuitants['t_q_annuitization'][k]
+
+        l_xy = annuitants['l_xy'][k - 1]
+        l_x_d_y = annuitants['l_x_d_y'][k - 1]
+        l_y_d_x = annuitants['l_y_d_x'][k - 1]
+
+        p_pb = (1.0 - t_q_lapse) * (1.0 - t_q_annuitization)
+
+        annuitants['l_xy'][k] = l_xy * (1.0 - t_q_x) * (1.0 - t_q_y) * p_pb
+        annuitants['l_x_d_y'][k] = (l_x_d_y * (1.0 - t_q_x) + l_xy * t_q_y * (1.0 - t_q_x)) * p_pb
+        annuitants['l_y_d_x'][k] = (l_y_d_x * (1.0 - t_q_y) + l_xy * t_q_x * (1.0 - t_q_y)) * p_pb
+        annuitants['d_xy'][k] = annuitants['d_xy'][k - 1] + (
+            l_xy * t_q_x * t_q_y +
+            l_x_d_y * t_q_x +
+            l_y_d_x * t_q_y
+        ) * p_pb
+        annuitants['d_lapse'][k] = annuitants['d_lapse'][k - 1] + (
+            l_xy + l_x_d_y + l_y_d_x
+        ) * t_q_lapse * (1.0 - t_q_annuitization)
+        annuitants['d_annuitization'][k] = annuitants['d_annuitization'][k - 1] + (
+            l_xy + l_x_d_y + l_y_d_x
+        ) * t_q_annuitization
+
+    def _write_values(
+        self,
+        output_writer: OutputWriter,
+        entity_name: str,
+        values: Dict[str, ndarray],
+        policy: int,
+        output_scope: OutputScope = OutputScope.PROJECTION
+    ) -> None:
+
+        time_step_count = self.time_steps.index + 1
+
+        values = DataFrame(
+            data={name: history[:time_step_count, policy] for name, history in values.items()},
+            index=Index(
+                data=self.time_steps.all_t[:time_step_count],
+                name='t'
+            )
+        )
+
+        if output_scope == OutputScope.PROJECTION:
+
+            output_writer.write_entity(
+                entity_name=entity_name,
+                values=values
+            )
+
+        else:
+
+            output_writer.write_shared_entity(
+                entity_name=entity_name,
+                values=values,
+                output_scope=output_scope
+            )
+
+    def discount_factors(
+        self
+    ) -> ndarray:
+
+        """
+        Discounts using the
+        :attr:`discount index <src.system.projection.parameters.ProjectionParameters.discount_index>`, read from the
+        economic scenario as an accumulation index, if one is set. Otherwise, discounts at the flat discount rate.
+
+        :return: Discount factors, for each time step.
+        """
+
+        if self.projection_parameters.discount_index is None:
+
+            return Projection.discount_factors(
+                self=self
+            )
+
+        return index_discount_factors(
+            index_values=self.data_sources.economic_scenario.get_rates(
+                name=self.projection_parameters.discount_index,
+                steps=arange(len(self.time_steps))
+            )
+        )
+
+    def output_keys(
+        self
+    ) -> List[Tuple[str, int]]:
+
+        return [
+            (model_point_id, self.data_sources.economic_scenario.scenario_index)
+            for model_point_id in self.model_points.ids
+        ]
+
+    def _policy_dimensions(
+        self,
+        policy: int
+    ) -> Dict[str, Any]:
+
+        return {
+            'model_point': self.model_points.ids[policy],
+            'scenario': self.data_sources.economic_scenario.scenario_index,
+            'product_name': self.model_points.product_name[policy],
+            'product_type': self.model_points.product_type[policy]
+        }
+
+    def _aggregate_values(
+        self,
+        aggregate: Aggregate
+    ) -> None:
+
+        """
+        Folds contract, annuitant, and rider values into an aggregate, summing across the policies in each group
+        at once. Values that are not selected by the
+        :attr:`output spec <src.system.projection.parameters.ProjectionParameters.output_spec>` are skipped.
+
+        :param aggregate: Aggregate to fold values into.
+        :return: Nothing.
+        """
+
+        time_step_count = self.time_steps.index + 1
+
+        groups = {}
+
+        for policy in range(len(self.model_points)):
+
+            groups.setdefault(
+                aggregate.group(
+                    dimensions=self._policy_dimensions(
+                        policy=policy
+                    )
+                ),
+                []
+            ).append(policy)
+
+        for group, policies in groups.items():
+
+            policies = array(policies)
+
+            for entity_name, values, mask in [
+                ('contract', self.contract, None),
+                ('annuitants', self.annuitants, None),
+                ('contract.riders.gmdb', self.gmdb, self.model_points.has_gmdb),
+                ('contract.riders.gmwb', self.gmwb, self.model_points.has_gmwb)
+            ]:
+
+                entity_policies = policies if mask is None else policies[mask[policies]]
+
+                if len(entity_policies) == 0:
+
+                    continue
+
+                for variable, history in values.items():
+
+                    if self.projection_parameters.output_spec is not None and \
+                            not self.projection_parameters.output_spec.select_variable(
+                                entity_name=entity_name,
+                                variable=variable
+                            ):
+
+                        continue
+
+                    aggregated_values = zeros(len(self.time_steps))
+                    aggregated_values[:time_step_count] = history[:time_step_count, entity_policies].sum(axis=1)
+
+                    aggregate.add(
+                        group=group,
+                        scenario=self.data_sources.economic_scenario.scenario_index,
+                        entity_name=entity_name,
+                        variable=variable,
+                        values=aggregated_values
+                    )
+
+    def stream_output(
+        self,
+        aggregates: List[Aggregate] | None = None
+    ) -> None:
+
+        """
+        Does nothing. Batch values are kept in compact arrays, with one row per time step and one column per model
+        point, and are written once the projection finishes.
+
+        :param aggregates: Aggregates to fold output into.
+        :return: Nothing.
+        """
+
+        pass
+
+    @span
+    def write_output(
+        self,
+        aggregates: List[Aggregate] | None = None
+    ) -> None:
+
+        """
+        Writes contract, annuitant, and rider values for each model point, using the same entity names and output
+        directory layout as :meth:`~src.system.projection_entity.ProjectionEntity.write_projection_values`, and
+        folds them into aggregates, if any are provided.
+
+        :param aggregates: Aggregates to fold output into.
+        :return: Nothing.
+        """
+
+        self.prepare_aggregates(
+            aggregates=aggregates or []
+        )
+
+        for aggregate in aggregates or []:
+
+            with aggregate.lock:
+
+                self._aggregate_values(
+                    aggregate=aggregate
+                )
+
+                aggregate.end_projection(
+                    scenario=self.data_sources.economic_scenario.scenario_index,
+                    model_points=len(self.model_points)
+                )
+
+        if not self.projection_parameters.write_seriatim:
+
+            return
+
+        for policy, output_key in enumerate(self.output_keys()):
+
+            model_point_id, scenario_index = output_key
+
+            output_writer = self.select_output(
+                output_writer=self.share_output(
+                    output_writer=self.create_output_writer(
+                        output_dir_path=join(
+                            self.output_dir_path,
+                            model_point_id,
+                            str(scenario_index)
+                        ),
+                        output_key=output_key
+                    ),
+                    output_key=output_key
+                )
+            )
+
+            self._write_values(
+                output_writer=output_writer,
+                entity_name='contract',
+                values=self.contract,
+                policy=policy
+            )
+
+            self._write_values(
+                output_writer=output_writer,
+                entity_name='annuitants',
+                values=self.annuitants,
+                policy=policy,
+                output_scope=OutputScope.MODEL_POINT
+            )
+
+            if self.model_points.has_gmdb[policy]:
+
+                self._write_values(
+                    output_writer=output_writer,
+                    entity_name='contract.riders.gmdb',
+                    values=self.gmdb,
+                    policy=policy
+                )
+
+            if self.model_points.has_gmwb[policy]:
+
+                self._write_values(
+                    output_writer=output_writer,
+                    entity_name='contract.riders.gmwb',
+                    values=self.gmwb,
+                    policy=policy
+                )
+
+            output_writer.close()
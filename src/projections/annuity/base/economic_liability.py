@@ -7,9 +7,21 @@ from os.path import (
     join
 )
 from os import mkdir
+from typing import (
+    Dict,
+    Any
+)
+
+from numpy import (
+    ndarray,
+    arange
+)
 
+from src.system.enums import OutputFormat
 from src.system.projection import Projection
 from src.system.projection.parameters import ProjectionParameters
+from src.system.actuarial_math import index_discount_factors
+from src.system.odometer import span
 
 from src.data_sources.annuity import AnnuityDataSources
 
@@ -58,6 +70,42 @@ class EconomicLiabilityProjection(
 
         return f'{self.data_sources.model_point.id} || {self.data_sources.economic_scenario.scenario_index}'
 
+    def discount_factors(
+        self
+    ) -> ndarray:
+
+        """
+        Discounts using the
+        :attr:`discount index <src.system.projection.parameters.ProjectionParameters.discount_index>`, read from the
+        economic scenario as an accumulation index, if one is set. Otherwise, discounts at the flat discount rate.
+
+        :return: Discount factors, for each time step.
+        """
+
+        if self.projection_parameters.discount_index is None:
+
+            return Projection.discount_factors(
+                self=self
+            )
+
+        return index_discount_factors(
+            index_values=self.data_sources.economic_scenario.get_rates(
+                name=self.projection_parameters.discount_index,
+                steps=arange(len(self.time_steps))
+            )
+        )
+
+    def output_dimensions(
+        self
+    ) -> Dict[str, Any]:
+
+        return {
+            'model_point': self.data_sources.model_point.id,
+            'scenario': self.data_sources.economic_scenario.scenario_index,
+            'product_name': self.data_sources.model_point.product_name,
+            'product_type': str(self.data_sources.model_point.product_type)
+        }
+
     def setup_output(
         self
     ) -> None:
@@ -70,9 +118,19 @@ class EconomicLiabilityProjection(
             \ Model point ID
                 \ Economic scenario number
 
+        Output written to a :class:`run-level results store <src.system.output.results_store.ResultsStore>`, or
+        aggregate-only output, does not need a directory structure, so none is created.
+
         :return: Nothing.
         """
 
+        if self.projection_parameters.output_format == OutputFormat.SQLITE or \
+                not self.projection_parameters.write_seriatim:
+
+            self.output_dir_path = self.projection_parameters.output_dir_path
+
+            return
+
         model_point_dir_path = join(
             self.projection_parameters.output_dir_path,
             self.data_sources.model_point.id
@@ -96,6 +154,7 @@ class EconomicLiabilityProjection(
 
         self.output_dir_path = economic_scenario_dir_path
 
+    @span
     def project_time_step(
         self
     ) -> None:
@@ -3,6 +3,7 @@ Convenience functions for common actuarial math operations.
 """
 
 from dateutil.relativedelta import relativedelta
+from numpy import ndarray
 
 from src.system.projection_entity.projection_value import use_latest_value
 from src.system.date import relativedelta_to_partial_years
@@ -37,3 +38,63 @@ def convert_decrement_rate(
     t_q_x = 1.0 - t_p_x
 
     return t_q_x
+
+
+def discount_factors(
+    times: ndarray,
+    discount_rate: float
+) -> ndarray:
+
+    """
+    Calculates discount factors at a flat, annual effective discount rate, using this formula:
+
+    .. math::
+
+        v_{t} = (1 + i) ^ {-t}
+
+    :param times: Fractional years from the start of the projection, for each time step.
+    :param discount_rate: Annual effective discount rate :math:`i`.
+    :return: Discount factors :math:`v_{t}`, for each time step.
+    """
+
+    return (1.0 + discount_rate) ** -times
+
+
+def index_discount_factors(
+    index_values: ndarray
+) -> ndarray:
+
+    r"""
+    Calculates discount factors from the values of an accumulation index (like a money market or cash index),
+    using this formula:
+
+    .. math::
+
+        v_{t} = \frac{I_{0}}{I_{t}}
+
+    :param index_values: Index values :math:`I_{t}`, for each time step.
+    :return: Discount factors :math:`v_{t}`, for each time step.
+    """
+
+    return index_values[0] / index_values
+
+
+def present_value(
+    cash_flows: ndarray,
+    discount_factors: ndarray
+) -> ndarray:
+
+    r"""
+    Calculates the present value of one or more cash flow histories:
+
+    .. math::
+
+        PV = \sum_{t} CF_{t} v_{t}
+
+    :param cash_flows: Cash flows, with time steps on the first axis.
+    :param discount_factors: Discount factors, for each time step.
+    :return: Present values, one for each cash flow history.
+    """
+
+    return discount_factors @ cash_flows
+
@@ -6,14 +6,18 @@ from abc import (
     ABC,
     abstractmethod
 )
+from threading import Lock
 from typing import (
     TYPE_CHECKING,
+    ClassVar,
     Generator,
+    Type,
     Self,
     Any
 )
 
 from src.system.data_sources.namespace import DataSourceNamespace
+from src.system.data_sources.bundle import DataSourceBundle
 if TYPE_CHECKING:
     from src.system.projection.parameters import ProjectionParameters
 
@@ -29,6 +33,8 @@ class DataSourcesRoot(
     """
 
     projection_parameters: 'ProjectionParameters'     #: Projection parameters.
+    bundle: DataSourceBundle | None     #: Compiled namespaces, while data sources are being created, if turned on.
+    bundle_lock: ClassVar[Lock] = Lock()    #: Lock object to prevent race conditions when opening the bundle.
 
     def __init__(
         self,
@@ -48,6 +54,60 @@ class DataSourcesRoot(
         )
 
         self.projection_parameters = projection_parameters
+        self.bundle = None
+
+    def bundled(
+        self,
+        data_source_type: Type[DataSourceNamespace],
+        path: str
+    ) -> DataSourceNamespace:
+
+        """
+        Creates a namespace whose contents only depend on its source files, like an assumption table folder. If
+        :attr:`~src.system.projection.parameters.ProjectionParameters.bundle_data_sources` is set, the namespace is
+        loaded from a :class:`compiled bundle <src.system.data_sources.bundle.DataSourceBundle>` in this root's path
+        instead, unless its source files have changed. Call :meth:`write_bundle` once every namespace is created.
+
+        :param data_source_type: Namespace class. Called with ``path`` to create the namespace.
+        :param path: Path to the namespace's source files.
+        :return: Namespace.
+        """
+
+        if not self.projection_parameters.bundle_data_sources:
+
+            return data_source_type(
+                path=path
+            )
+
+        with self.bundle_lock:
+
+            if self.bundle is None:
+
+                self.bundle = DataSourceBundle(
+                    dir_path=self.path
+                )
+
+        return self.bundle.load(
+            data_source_type=data_source_type,
+            path=path
+        )
+
+    def write_bundle(
+        self
+    ) -> None:
+
+        """
+        Writes the :class:`compiled bundle <src.system.data_sources.bundle.DataSourceBundle>`, if any namespace was
+        (re)compiled, then releases it, so that it is not copied into each projection.
+
+        :return: Nothing.
+        """
+
+        if self.bundle is not None:
+
+            self.bundle.write()
+
+            self.bundle = None
 
     @abstractmethod
     def configured_data_sources(
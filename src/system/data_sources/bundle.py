@@ -0,0 +1,272 @@
+"""
+Compiled, binary snapshot of :mod:`data source namespaces <src.system.data_sources.namespace>`.
+"""
+
+from os import (
+    walk,
+    replace,
+    getpid
+)
+from os.path import (
+    join,
+    exists,
+    isdir,
+    abspath,
+    relpath,
+    dirname,
+    basename
+)
+from sys import modules
+from hashlib import sha256
+from pickle import (
+    load,
+    dump,
+    HIGHEST_PROTOCOL,
+    UnpicklingError
+)
+from typing import (
+    Dict,
+    Tuple,
+    Type
+)
+
+from src.system.data_sources.namespace import DataSourceNamespace
+from src.system.logger import Logger
+from src.system.enums import LoggerLevel
+
+
+class DataSourceBundle:
+
+    r"""
+    Compiled, binary snapshot of :mod:`data source namespaces <src.system.data_sources.namespace>`, like assumption
+    tables that are parsed the same way every run. Namespaces are saved fully parsed, as a single
+    `pickle <https://docs.python.org/3/library/pickle.html>`_ file, beside the files they are parsed from:
+
+    .. code-block:: text
+
+        \ mortality\                 <- Source files
+        \ policyholder_behaviors\    <- Source files
+        \ product\                   <- Source files
+        \ data_sources.bundle        <- Compiled namespaces
+
+    Each namespace is keyed by its class and path, and stored with a SHA-256 hash of the contents of every file under
+    its path, plus a :meth:`code fingerprint <code_digest>` of the namespace's package. A namespace is only loaded
+    from the bundle if both still hash the same, so any change to its files or to the code that parses them
+    invalidates it, and it is parsed again on the next run.
+
+    .. note::
+        The code fingerprint only covers the namespace's own package. Increment
+        :attr:`~src.system.data_sources.namespace.DataSourceNamespace.bundle_version` after changing code elsewhere
+        that affects how a namespace parses its files.
+
+    WARNING: Loading a bundle allows arbitrary code execution. Only load bundles that you wrote.
+    """
+
+    file_name: str = 'data_sources.bundle'  #: Bundle file name.
+
+    path: str       #: Bundle file path.
+    entries: Dict[str, Tuple[str, DataSourceNamespace]]     #: Source file and code hashes, and namespace, by key.
+    modified: bool  #: Whether any namespace was (re)compiled since the bundle was read.
+
+    def __init__(
+        self,
+        dir_path: str
+    ):
+
+        """
+        Constructor method. Reads a bundle, if one exists. A bundle that cannot be read is ignored, and rewritten.
+
+        :param dir_path: Directory that contains the bundle.
+        """
+
+        self.path = join(
+            dir_path,
+            self.file_name
+        )
+
+        self.entries = {}
+        self.modified = False
+
+        if exists(path=self.path):
+
+            try:
+
+                with open(self.path, 'rb') as bundle_file:
+
+                    self.entries = load(bundle_file)
+
+            except (OSError, EOFError, UnpicklingError, AttributeError, ImportError) as error:
+
+                Logger().print(
+                    message=f'Ignoring unreadable data source bundle: {self.path} ({error}) !',
+                    level=LoggerLevel.WARNING
+                )
+
+    @classmethod
+    def digest(
+        cls,
+        path: str
+    ) -> str:
+
+        """
+        Hashes the contents and relative paths of every file under a path.
+
+        :param path: Path to a file or a directory.
+        :return: SHA-256 hex digest.
+        """
+
+        hasher = sha256()
+
+        if isdir(path):
+
+            file_paths = sorted(
+                join(walk_dir_path, file_name)
+                for walk_dir_path, _, file_names in walk(path)
+                for file_name in file_names
+                if file_name != cls.file_name
+            )
+
+        else:
+
+            file_paths = [path]
+
+        for file_path in file_paths:
+
+            hasher.update(
+                relpath(file_path, path).encode()
+            )
+
+            with open(file_path, 'rb') as source_file:
+
+                hasher.update(
+                    source_file.read()
+                )
+
+        return hasher.hexdigest()
+
+    @classmethod
+    def code_digest(
+        cls,
+        data_source_type: Type[DataSourceNamespace]
+    ) -> str:
+
+        """
+        Fingerprints the code that parses a namespace: its
+        :attr:`~src.system.data_sources.namespace.DataSourceNamespace.bundle_version`, and the source of its module.
+        If the module is a package, the source of every module in the package is included.
+
+        :param data_source_type: Namespace class.
+        :return: SHA-256 hex digest.
+        """
+
+        hasher = sha256()
+
+        hasher.update(
+            str(data_source_type.bundle_version).encode()
+        )
+
+        module_path = modules[data_source_type.__module__].__file__
+        package_path = dirname(module_path)
+
+        if basename(module_path) == '__init__.py':
+
+            module_paths = sorted(
+                join(walk_dir_path, file_name)
+                for walk_dir_path, _, file_names in walk(package_path)
+                for file_name in file_names
+                if file_name.endswith('.py')
+            )
+
+        else:
+
+            module_paths = [module_path]
+
+        for module_path in module_paths:
+
+            hasher.update(
+                relpath(module_path, package_path).encode()
+            )
+
+            with open(module_path, 'rb') as module_file:
+
+                hasher.update(
+                    module_file.read()
+                )
+
+        return hasher.hexdigest()
+
+    def load(
+        self,
+        data_source_type: Type[DataSourceNamespace],
+        path: str
+    ) -> DataSourceNamespace:
+
+        """
+        Loads a namespace from the bundle, if neither its source files nor its code have changed. Otherwise, creates
+        the namespace from its source files, and adds it to the bundle.
+
+        :param data_source_type: Namespace class. Called with ``path`` to create the namespace.
+        :param path: Path to the namespace's source files.
+        :return: Namespace.
+        """
+
+        key = f'{data_source_type.__module__}.{data_source_type.__qualname__}:{abspath(path)}'
+
+        digest = self.digest(
+            path=path
+        ) + ':' + self.code_digest(
+            data_source_type=data_source_type
+        )
+
+        if key in self.entries and self.entries[key][0] == digest:
+
+            return self.entries[key][1]
+
+        Logger().print(
+            message=f'Compiling data source bundle entry: {key} ...'
+        )
+
+        data_source = data_source_type(
+            path=path
+        )
+
+        self.entries[key] = (digest, data_source)
+        self.modified = True
+
+        return data_source
+
+    def write(
+        self
+    ) -> None:
+
+        """
+        Writes the bundle, if any namespace was (re)compiled. The bundle is written under a temporary name, then
+        renamed, so a partially written bundle is never read.
+
+        :return: Nothing.
+        """
+
+        if not self.modified:
+
+            return
+
+        Logger().print(
+            message=f'Writing data source bundle: {self.path} ...'
+        )
+
+        temp_path = f'{self.path}.{getpid()}.tmp'
+
+        with open(temp_path, 'wb') as bundle_file:
+
+            dump(
+                obj=self.entries,
+                file=bundle_file,
+                protocol=HIGHEST_PROTOCOL
+            )
+
+        replace(
+            temp_path,
+            self.path
+        )
+
+        self.modified = False
@@ -51,6 +51,6 @@ class DataSourceFile(
 
             Logger().raise_expr(
                 expr=FileNotFoundError(
-                    f'Could not locate data source file for {self.__qualname__} at: {self.path} !'
+                    f'Could not locate data source file for {type(self).__qualname__} at: {self.path} !'
                 )
             )
@@ -4,10 +4,49 @@ Container that holds a pre-defined collection of :mod:`data sources <src.system.
 
 from abc import ABC
 from os.path import isdir
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    wait,
+    FIRST_COMPLETED
+)
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Any
+)
 
 from src.system.logger import Logger
 
 
+class DataSourceLoader:
+
+    """
+    Declares a child data source of a :class:`namespace <DataSourceNamespace>`: how to create it, and which other
+    child data sources must be loaded first. See :meth:`DataSourceNamespace.load_data_sources`.
+    """
+
+    create: Callable[[], Any]   #: Creates the data source.
+    depends_on: List[str]       #: Names of child data sources that must be loaded before this one.
+
+    def __init__(
+        self,
+        create: Callable[[], Any],
+        depends_on: List[str] | None = None
+    ):
+
+        """
+        Constructor method.
+
+        :param create: Creates the data source. May read child data sources named in ``depends_on``.
+        :param depends_on: Names of child data sources that must be loaded before this one.
+        """
+
+        self.create = create
+        self.depends_on = [] if depends_on is None else depends_on
+
+
 class DataSourceNamespace(
     ABC
 ):
@@ -22,6 +61,8 @@ class DataSourceNamespace(
 
     path: str  #: Path to the namespace.
 
+    bundle_version: int = 1     #: Version of how this namespace parses its files. Changing it invalidates bundles.
+
     def __init__(
         self,
         path: str
@@ -43,10 +84,130 @@ class DataSourceNamespace(
                 )
             )
 
+    def _load_order(
+        self,
+        loaders: Dict[str, DataSourceLoader]
+    ) -> List[str]:
+
+        order = []
+        loaded = set()
+
+        for name, loader in loaders.items():
+
+            unknown_names = [dependency for dependency in loader.depends_on if dependency not in loaders]
+
+            if unknown_names:
+
+                Logger().raise_expr(
+                    expr=KeyError(
+                        f'Data source {name} in {type(self).__qualname__} depends on undeclared data sources: '
+                        f'{unknown_names} !'
+                    )
+                )
+
+        while len(order) < len(loaders):
+
+            ready_names = [
+                name for name, loader in loaders.items()
+                if name not in loaded and all(dependency in loaded for dependency in loader.depends_on)
+            ]
+
+            if not ready_names:
+
+                Logger().raise_expr(
+                    expr=ValueError(
+                        f'Data sources in {type(self).__qualname__} have circular dependencies: '
+                        f'{sorted(set(loaders) - loaded)} !'
+                    )
+                )
+
+            order += ready_names
+            loaded.update(ready_names)
+
+        return order
+
+    def load_data_sources(
+        self,
+        loaders: Dict[str, DataSourceLoader],
+        threads: int = 1
+    ) -> None:
+
+        """
+        Creates child data sources, and sets each one as an attribute of this namespace, under its name. A data
+        source is only created once every data source it :attr:`depends on <DataSourceLoader.depends_on>` is set.
+
+        If ``threads`` is more than ``1``, data sources are created concurrently on a thread pool, as soon as their
+        dependencies are set, so loading takes roughly as long as the slowest chain of dependent data sources. File
+        reads, and parts of CSV parsing, run in parallel; pure Python parsing does not. If a data source cannot be
+        created, data sources that have not started are cancelled, and the error is raised.
+
+        :param loaders: Child data sources to create, by attribute name, in declaration order.
+        :param threads: Number of threads. If ``1``, data sources are created one at a time, in dependency order.
+        :return: Nothing.
+        """
+
+        order = self._load_order(
+            loaders=loaders
+        )
+
+        if threads <= 1:
+
+            for name in order:
+
+                setattr(
+                    self,
+                    name,
+                    loaders[name].create()
+                )
+
+            return
+
+        loaded = set()
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='data-source-loader') as executor:
+
+            while len(loaded) < len(order):
+
+                for name in order:
+
+                    if name not in loaded and name not in running.values() and \
+                            all(dependency in loaded for dependency in loaders[name].depends_on):
+
+                        running[executor.submit(loaders[name].create)] = name
+
+                done, _ = wait(
+                    fs=running,
+                    return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+
+                    name = running.pop(future)
+
+                    if future.exception() is not None:
+
+                        executor.shutdown(
+                            wait=False,
+                            cancel_futures=True
+                        )
+
+                        Logger().raise_expr(
+                            expr=future.exception()
+                        )
+
+                    setattr(
+                        self,
+                        name,
+                        future.result()
+                    )
+
+                    loaded.add(name)
+
     def __str__(
         self
     ) -> str:
 
         return str(
-            self.__qualname__
+            type(self).__qualname__
         )
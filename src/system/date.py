@@ -7,7 +7,15 @@ from datetime import (
     datetime
 )
 
+from typing import Iterable
+
 from dateutil.relativedelta import relativedelta
+from numpy import (
+    ndarray,
+    array,
+    where,
+    minimum
+)
 
 from src.system.constants import DATE_FORMAT
 
@@ -140,3 +148,85 @@ def calc_whole_years(
         years = 1
 
     return years
+
+
+def dates_to_array(
+    dates: Iterable[date | None]
+) -> ndarray:
+
+    """
+    Converts an iterable of `date` objects to a `NumPy <https://numpy.org/doc/stable/>`_ ``datetime64[D]`` array.
+    ``None`` is converted to ``NaT``.
+
+    :param dates: Dates to convert.
+    :return: Array of dates.
+    """
+
+    return array(
+        [target_date if target_date is not None else 'NaT' for target_date in dates],
+        dtype='datetime64[D]'
+    )
+
+
+def _add_months_array(
+    dt: ndarray,
+    months: ndarray | int
+) -> ndarray:
+
+    # Same day-of-month clipping as relativedelta(months=...)
+    month_start = dt.astype('datetime64[M]')
+    day = (dt - month_start.astype('datetime64[D]')).astype(int)
+
+    target_month_start = month_start + months
+
+    target_month_days = (
+        (target_month_start + 1).astype('datetime64[D]') - target_month_start.astype('datetime64[D]')
+    ).astype(int)
+
+    return target_month_start.astype('datetime64[D]') + minimum(
+        day,
+        target_month_days - 1
+    )
+
+
+def calc_whole_years_array(
+    dt1: ndarray,
+    dt2: ndarray
+) -> ndarray:
+
+    """
+    Vectorized version of :func:`calc_whole_years`, for ``datetime64[D]`` arrays. Arrays are broadcast against
+    each other.
+
+    :param dt1: Later dates.
+    :param dt2: Earlier dates.
+    :return: Whole years between each pair of dates.
+    """
+
+    month_1 = dt1.astype('datetime64[M]')
+    month_2 = dt2.astype('datetime64[M]')
+
+    months = (month_1 - month_2).astype(int)
+
+    # Step back one month if the day-of-month has not been reached yet
+    months -= _add_months_array(
+        dt=dt2,
+        months=months
+    ) > dt1
+
+    years = months // 12
+
+    anniversary = _add_months_array(
+        dt=dt2,
+        months=years * 12
+    )
+
+    return where(
+        dt1 == dt2,
+        1,
+        where(
+            anniversary == dt1,
+            years,
+            years + 1
+        )
+    )
@@ -30,6 +30,33 @@ class ProcessingType(
     MULTI_PROCESS = 'multi_process'         #: Multi-process (using the `multiprocessing` module).
 
 
+class OutputFormat(
+    StrEnum
+):
+
+    """
+    Enum for different projection output formats.
+    """
+
+    CSV = 'csv'         #: One CSV file per projection entity.
+    NPZ = 'npz'         #: One columnar, binary NumPy .npz file per projection.
+    SQLITE = 'sqlite'   #: One run-level SQLite results store, shared by all projections.
+
+
+class OutputScope(
+    StrEnum
+):
+
+    """
+    Enum for the dimensions that a projection entity's values depend on, used to avoid writing the same values
+    more than once.
+    """
+
+    PROJECTION = 'projection'       #: Values depend on both the model point and the scenario.
+    MODEL_POINT = 'model_point'     #: Values depend only on the model point, and are the same in every scenario.
+    SCENARIO = 'scenario'           #: Values depend only on the scenario, and are the same for every model point.
+
+
 class Gender(
     StrEnum
 ):
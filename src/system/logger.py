@@ -4,6 +4,10 @@ System-wide message and event logging.
 
 from typing import (
     ClassVar,
+    Callable,
+    Dict,
+    List,
+    Tuple,
     Self,
     TextIO,
     NoReturn
@@ -14,8 +18,14 @@ from os.path import (
     dirname,
     abspath
 )
+from sys import stdout
 from datetime import datetime
-from multiprocessing import Lock
+from multiprocessing import (
+    Lock,
+    Queue
+)
+from queue import Empty
+from threading import Thread
 
 from src.system.constants import DATETIME_FORMAT
 from src.system.enums import LoggerLevel
@@ -25,11 +35,30 @@ class Logger:
 
     """
     Singleton logger class. Writes messages to disk and prints messages to console.
+
+    By default, each process writes its own log file. To write a single log for a multi-process run, the parent
+    process :meth:`listens <listen>` to a queue, and each worker process :meth:`connects <connect>` to the same queue.
+    Workers then push log records onto the queue, instead of writing them, and a listener thread in the parent process
+    writes them to the parent's log file and console in batches.
+
+    Messages below the logging :attr:`level` are dropped before they are formatted. Pass a callable as the message to
+    defer expensive formatting until the message is known to be written, or check :meth:`enabled` before building
+    several messages at once.
     """
 
     instance: ClassVar[Self] = None     #: Global singleton instance.
     log_file: ClassVar[TextIO] = None   #: Log file object; console output is piped here.
     lock: ClassVar[Lock] = Lock()       #: Lock object to prevent race conditions when writing to the log file.
+    level: ClassVar[LoggerLevel] = LoggerLevel.MESSAGE  #: Minimum logging level. Lower levels are dropped.
+    queue: ClassVar[Queue] = None       #: Log record queue. If set, log records are pushed here instead of written.
+    listener: ClassVar[Thread] = None   #: Thread that writes log records from worker processes, if listening.
+    batch_size: ClassVar[int] = 1024    #: Maximum number of log records written at once by the listener.
+
+    severities: ClassVar[Dict[LoggerLevel, int]] = {
+        LoggerLevel.MESSAGE: 0,
+        LoggerLevel.WARNING: 1,
+        LoggerLevel.ERROR: 2
+    }   #: Severity of each logging level, from lowest to highest.
 
     def __new__(
         cls
@@ -38,6 +67,9 @@ class Logger:
         """
         Singleton constructor. If an instance does not exist, create a new instance and store it. If an instance
         does exist, return the existing instance.
+
+        The log file is created the first time a message is written to it, so worker processes that
+        :meth:`connect <connect>` to a log queue never create their own log file.
         """
 
         if cls.instance is None:
@@ -49,25 +81,6 @@ class Logger:
                 cls
             )
 
-            log_file_path = abspath(
-                join(
-                    dirname(
-                        __file__
-                    ),
-                    r'..\..\log',
-                    f'{str(uuid4())}.log'
-                )
-            )
-
-            cls.log_file = open(
-                file=log_file_path,
-                mode='w'
-            )
-
-            cls.instance.print(
-                f'Created new log file here: {log_file_path} !'
-            )
-
         return cls.instance
 
     @property
@@ -85,34 +98,149 @@ class Logger:
             DATETIME_FORMAT
         )
 
-    def print(
+    def _open_log_file(
+        self
+    ) -> TextIO:
+
+        log_file_path = abspath(
+            join(
+                dirname(
+                    __file__
+                ),
+                '..',
+                '..',
+                'log',
+                f'{str(uuid4())}.log'
+            )
+        )
+
+        Logger.log_file = open(
+            file=log_file_path,
+            mode='w'
+        )
+
+        created_message = f'{LoggerLevel.MESSAGE} || {self.timestamp} || ' \
+                          f'Created new log file here: {log_file_path} !'
+
+        print(
+            created_message
+        )
+
+        print(
+            created_message,
+            file=self.log_file
+        )
+
+        return self.log_file
+
+    def _write(
         self,
+        records: List[Tuple[LoggerLevel, str, str, bool]]
+    ) -> None:
+
+        """
+        Writes log records to the log file, and to console if requested, with one write and flush to each.
+
+        :param records: Log records, as level, timestamp, message, and whether to print to console.
+        :return: Nothing.
+        """
+
+        lines = [f'{level} || {timestamp} || {message}\n' for level, timestamp, message, _ in records]
+        console_lines = [line for line, (_, _, _, console) in zip(lines, records) if console]
+
+        with self.lock:
+
+            log_file = self.log_file if self.log_file is not None else self._open_log_file()
+
+            if console_lines:
+
+                stdout.write(
+                    ''.join(console_lines)
+                )
+
+            log_file.write(
+                ''.join(lines)
+            )
+
+            log_file.flush()
+
+    def _emit(
+        self,
+        level: LoggerLevel,
         message: str,
+        console: bool = True
+    ) -> None:
+
+        record = (level, self.timestamp, message, console)
+
+        if self.queue is not None:
+
+            self.queue.put(
+                record
+            )
+
+        else:
+
+            self._write(
+                records=[record]
+            )
+
+    def enabled(
+        self,
+        level: LoggerLevel
+    ) -> bool:
+
+        """
+        Checks whether messages at a logging level are written.
+
+        :param level: Logging level and severity.
+        :return: Whether messages at this level are at or above the logging :attr:`level`.
+        """
+
+        return self.severities[level] >= self.severities[self.level]
+
+    def set_level(
+        self,
+        level: LoggerLevel
+    ) -> None:
+
+        """
+        Sets the minimum logging level for this process. Messages below this level are dropped.
+
+        :param level: Minimum logging level.
+        :return: Nothing.
+        """
+
+        Logger.level = level
+
+    def print(
+        self,
+        message: str | Callable[[], str],
         level: LoggerLevel = LoggerLevel.MESSAGE
     ) -> None:
 
         """
-        Prints a message to both console and log file.
+        Prints a message to both console and log file. Messages below the logging :attr:`level` are dropped.
 
-        :param message: Message to print.
+        :param message: Message to print, or a callable that returns the message. A callable is only called if the
+            message is written, and is called in this process, so only the formatted message is pushed onto a log
+            queue.
         :param level: Logging level and severity.
         :return: Nothing.
         """
 
-        wrapped_message = f'{level} || {self.timestamp} || {message}'
+        if self.severities[level] < self.severities[self.level]:
 
-        self.lock.acquire()
+            return
 
-        print(
-            wrapped_message
-        )
+        if callable(message):
 
-        print(
-            wrapped_message,
-            file=self.log_file
-        )
+            message = message()
 
-        self.lock.release()
+        self._emit(
+            level=level,
+            message=message
+        )
 
     def raise_expr(
         self,
@@ -131,13 +259,132 @@ class Logger:
             level=LoggerLevel.ERROR
         )
 
-        self.lock.acquire()
+        self._emit(
+            level=LoggerLevel.ERROR,
+            message=str(expr),
+            console=False
+        )
 
-        print(
-            expr,
-            file=self.log_file
+        raise expr
+
+    def connect(
+        self,
+        queue: Queue,
+        level: LoggerLevel | None = None
+    ) -> None:
+
+        """
+        Pushes this process's log records onto a queue, instead of writing them. Call this first thing in a worker
+        process (for example, from a pool initializer), so that a :meth:`listener <listen>` in the parent process
+        writes its log records.
+
+        :param queue: Log record queue, shared with the parent process.
+        :param level: Minimum logging level. If ``None``, keeps the current level.
+        :return: Nothing.
+        """
+
+        Logger.queue = queue
+
+        if level is not None:
+
+            self.set_level(
+                level=level
+            )
+
+    def disconnect(
+        self
+    ) -> None:
+
+        """
+        Stops pushing this process's log records onto a queue, and goes back to writing them.
+
+        :return: Nothing.
+        """
+
+        Logger.queue = None
+
+    def _listen(
+        self,
+        queue: Queue
+    ) -> None:
+
+        while True:
+
+            records = [queue.get()]
+
+            while len(records) < self.batch_size and records[-1] is not None:
+
+                try:
+
+                    records.append(
+                        queue.get_nowait()
+                    )
+
+                except Empty:
+
+                    break
+
+            stop = records[-1] is None
+
+            if stop:
+
+                records.pop()
+
+            if records:
+
+                self._write(
+                    records=records
+                )
+
+            if stop:
+
+                break
+
+    def listen(
+        self,
+        queue: Queue
+    ) -> None:
+
+        """
+        Starts a listener thread that writes log records pushed onto a queue by worker processes to this process's
+        log file and console. Records are written in batches of up to :attr:`batch_size` records, as they arrive.
+
+        :param queue: Log record queue, shared with worker processes.
+        :return: Nothing.
+        """
+
+        Logger.listener = Thread(
+            target=self._listen,
+            kwargs={
+                'queue': queue
+            },
+            name='log-listener',
+            daemon=True
         )
 
-        self.lock.release()
+        self.listener.start()
 
-        raise expr
+    def stop_listening(
+        self,
+        queue: Queue
+    ) -> None:
+
+        """
+        Writes every log record left on the queue, then stops the listener thread. Call this once every worker
+        process has finished.
+
+        :param queue: Log record queue that is being listened to.
+        :return: Nothing.
+        """
+
+        if self.listener is None:
+
+            return
+
+        queue.put(
+            None
+        )
+
+        self.listener.join()
+
+        Logger.listener = None
@@ -1,16 +1,32 @@
 """
-Performance-profiling decorator function.
+Performance-profiling decorator functions.
 """
 
 from typing import (
+    TYPE_CHECKING,
+    ClassVar,
     Callable,
+    Dict,
+    List,
+    Set,
+    Tuple,
+    Hashable,
+    Self,
     Any
 )
 from functools import wraps
 from datetime import datetime
+from time import perf_counter_ns
+from threading import (
+    Lock,
+    local
+)
+from os.path import join
 from uuid import uuid4
 
 from src.system.logger import Logger
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 def odometer(
@@ -35,7 +51,7 @@ def odometer(
         function_id = str(uuid4())
 
         Logger().print(
-            message=f'Function: {function.__qualname__}, ID: {function_id} starting ...'
+            message=lambda: f'Function: {function.__qualname__}, ID: {function_id} starting ...'
         )
 
         return_value = function(
@@ -46,10 +62,547 @@ def odometer(
         run_time = datetime.now() - start_time
 
         Logger().print(
-            message=f'Function: {function.__qualname__}, ID: {function_id} complete! '
-                    f'Runtime was {round(run_time.seconds, 2)} seconds.'
+            message=lambda: f'Function: {function.__qualname__}, ID: {function_id} complete! '
+                            f'Runtime was {round(run_time.total_seconds(), 2)} seconds.'
         )
 
         return return_value
 
     return wrapper
+
+
+class Profile:
+
+    """
+    Hierarchical timings of :func:`profiled <span>` function calls. Each span is identified by its call stack: the
+    names of every enclosing span, outermost first. Profiles from different processes can be
+    :meth:`merged <merge>`.
+    """
+
+    report_file_name: str = 'profile.csv'       #: Per-span report file name.
+    folded_file_name: str = 'profile.folded'    #: Flame graph file name.
+
+    spans: Dict[Tuple[str, ...], List[int]]     #: Call count and total (inclusive) nanoseconds, by call stack.
+
+    def __init__(
+        self
+    ):
+
+        """
+        Constructor method. Creates an empty profile.
+        """
+
+        self.spans = {}
+
+    def add(
+        self,
+        stack: Tuple[str, ...],
+        elapsed_ns: int
+    ) -> None:
+
+        """
+        Records a single span.
+
+        :param stack: Call stack of the span, outermost first, ending with the span itself.
+        :param elapsed_ns: Elapsed time, in nanoseconds.
+        :return: Nothing.
+        """
+
+        timing = self.spans.get(stack)
+
+        if timing is None:
+
+            self.spans[stack] = [1, elapsed_ns]
+
+        else:
+
+            timing[0] += 1
+            timing[1] += elapsed_ns
+
+    def merge(
+        self,
+        other: Self
+    ) -> None:
+
+        """
+        Merges another profile into this profile.
+
+        :param other: Profile to merge.
+        :return: Nothing.
+        """
+
+        for stack, (calls, elapsed_ns) in other.spans.items():
+
+            timing = self.spans.setdefault(stack, [0, 0])
+
+            timing[0] += calls
+            timing[1] += elapsed_ns
+
+    def self_time(
+        self
+    ) -> Dict[Tuple[str, ...], int]:
+
+        """
+        Exclusive time of each span: its total time, less the total time of the spans directly nested within it.
+
+        :return: Exclusive nanoseconds, by call stack.
+        """
+
+        self_ns = {stack: elapsed_ns for stack, (_, elapsed_ns) in self.spans.items()}
+
+        for stack, (_, elapsed_ns) in self.spans.items():
+
+            if len(stack) > 1 and stack[:-1] in self_ns:
+
+                self_ns[stack[:-1]] -= elapsed_ns
+
+        return self_ns
+
+    def to_dataframe(
+        self
+    ) -> 'DataFrame':
+
+        """
+        Per-span report, with one row per call stack, sorted by call stack, and these columns:
+
+        - ``stack``: Call stack, with span names separated by ``;``.
+        - ``span``: Span name.
+        - ``depth``: Nesting depth, starting at zero.
+        - ``calls``: Number of calls.
+        - ``total_ns``: Total (inclusive) time, in nanoseconds.
+        - ``self_ns``: Exclusive time, in nanoseconds.
+        - ``mean_ns``: Mean inclusive time per call, in nanoseconds.
+        - ``share``: Share of the total time of every outermost span.
+
+        :return: Per-span report.
+        """
+
+        # Pandas is imported on first use, so that importing this module stays cheap
+        from pandas import DataFrame
+
+        self_ns = self.self_time()
+        root_ns = sum(elapsed_ns for stack, (_, elapsed_ns) in self.spans.items() if len(stack) == 1)
+
+        return DataFrame(
+            data=[
+                (
+                    ';'.join(stack),
+                    stack[-1],
+                    len(stack) - 1,
+                    calls,
+                    elapsed_ns,
+                    self_ns[stack],
+                    elapsed_ns / calls,
+                    elapsed_ns / root_ns if root_ns else 0.0
+                ) for stack, (calls, elapsed_ns) in sorted(self.spans.items())
+            ],
+            columns=['stack', 'span', 'depth', 'calls', 'total_ns', 'self_ns', 'mean_ns', 'share']
+        )
+
+    def write(
+        self,
+        output_dir_path: str
+    ) -> None:
+
+        """
+        Writes the :meth:`per-span report <to_dataframe>` to :attr:`report_file_name`, and exclusive times in
+        `folded stack format <https://github.com/brendangregg/FlameGraph#2-fold-stacks>`_ to
+        :attr:`folded_file_name`, which flame graph tools (like ``flamegraph.pl`` or speedscope) can read. Existing
+        files will be overwritten.
+
+        :param output_dir_path: Output directory path.
+        :return: Nothing.
+        """
+
+        self.to_dataframe().to_csv(
+            path_or_buf=join(
+                output_dir_path,
+                self.report_file_name
+            ),
+            index=False
+        )
+
+        with open(
+            file=join(
+                output_dir_path,
+                self.folded_file_name
+            ),
+            mode='w'
+        ) as folded_file:
+
+            for stack, elapsed_ns in sorted(self.self_time().items()):
+
+                folded_file.write(
+                    f'{";".join(stack)} {max(elapsed_ns, 0)}\n'
+                )
+
+
+class Profiler:
+
+    """
+    Singleton profiler that records :func:`profiled <span>` function calls into a :class:`Profile`, one per
+    process. Each thread keeps its own call stack.
+
+    Profiling is off by default. While it is off, profiled functions only check :attr:`enabled`, then call through.
+    """
+
+    instance: ClassVar[Self] = None     #: Global singleton instance.
+    enabled: ClassVar[bool] = False     #: Whether profiled function calls are recorded.
+    profile: ClassVar[Profile] = None   #: Profile of this process.
+    lock: ClassVar[Lock] = Lock()       #: Lock object to prevent race conditions when recording spans.
+    stacks: ClassVar[local] = local()   #: Call stack of each thread.
+
+    def __new__(
+        cls
+    ):
+
+        """
+        Singleton constructor. If an instance does not exist, create a new instance and store it. If an instance
+        does exist, return the existing instance.
+        """
+
+        if cls.instance is None:
+
+            cls.instance = super(
+                Profiler,
+                cls
+            ).__new__(
+                cls
+            )
+
+            cls.profile = Profile()
+
+        return cls.instance
+
+    def start(
+        self
+    ) -> None:
+
+        """
+        Turns profiling on, with an empty profile.
+
+        :return: Nothing.
+        """
+
+        Profiler.profile = Profile()
+        Profiler.enabled = True
+
+    def stop(
+        self
+    ) -> Profile:
+
+        """
+        Turns profiling off.
+
+        :return: Profile recorded since profiling was turned on.
+        """
+
+        Profiler.enabled = False
+
+        return self.profile
+
+    def record(
+        self,
+        name: str,
+        function: Callable,
+        *args,
+        **kwargs
+    ) -> Any:
+
+        """
+        Calls a function, and records its runtime as a span nested within the current thread's enclosing spans.
+
+        :param name: Span name.
+        :param function: Function to call.
+        :return: Function return value.
+        """
+
+        stack = getattr(self.stacks, 'stack', ())
+        span_stack = stack + (name,)
+
+        self.stacks.stack = span_stack
+        start_ns = perf_counter_ns()
+
+        try:
+
+            return function(
+                *args,
+                **kwargs
+            )
+
+        finally:
+
+            elapsed_ns = perf_counter_ns() - start_ns
+            self.stacks.stack = stack
+
+            with self.lock:
+
+                self.profile.add(
+                    stack=span_stack,
+                    elapsed_ns=elapsed_ns
+                )
+
+
+def span(
+    function: Callable
+) -> Callable:
+
+    """
+    Decorator that records the runtime of a decorated function as a nested span, using a nanosecond timer, while the
+    :class:`Profiler` is turned on. Spans are named after the function's qualified name, like
+    ``BaseContract.credit_interest``.
+
+    :param function: Function to wrap.
+    :return: A wrapped function.
+    """
+
+    name = function.__qualname__
+
+    @wraps(function)
+    def wrapper(
+        *args,
+        **kwargs
+    ) -> Any:
+
+        if not Profiler.enabled:
+
+            return function(
+                *args,
+                **kwargs
+            )
+
+        return Profiler().record(
+            name,
+            function,
+            *args,
+            **kwargs
+        )
+
+    return wrapper
+
+
+class Counts:
+
+    """
+    Counts of hot-path operations, like :class:`projection value <src.system.projection_entity.projection_value.ProjectionValue>`
+    writes and data source lookups, recorded by :class:`Counters`. Counts from different processes can be
+    :meth:`merged <merge>`.
+
+    Alongside each count, a count of *repeats* records how many operations had the same arguments as an earlier
+    operation of the same name within the same projection, which is how often a per-projection cache would have hit.
+    """
+
+    report_file_name: str = 'counters.csv'   #: Report file name.
+
+    counts: Dict[str, List[int]]    #: Operation count and repeat count, by counter name.
+    projections: int                #: Number of projections counted.
+
+    def __init__(
+        self
+    ):
+
+        """
+        Constructor method. Creates empty counts.
+        """
+
+        self.counts = {}
+        self.projections = 0
+
+    def merge(
+        self,
+        other: Self
+    ) -> None:
+
+        """
+        Merges other counts into these counts.
+
+        :param other: Counts to merge.
+        :return: Nothing.
+        """
+
+        for name, (count, repeats) in other.counts.items():
+
+            total = self.counts.setdefault(name, [0, 0])
+
+            total[0] += count
+            total[1] += repeats
+
+        self.projections += other.projections
+
+    def to_dataframe(
+        self
+    ) -> 'DataFrame':
+
+        """
+        Counter report, with one row per counter, sorted by count (highest first), and these columns:
+
+        - ``counter``: Counter name.
+        - ``count``: Number of operations.
+        - ``per_projection``: Mean number of operations per projection.
+        - ``repeats``: Number of operations that repeated an earlier operation's arguments within a projection.
+        - ``hit_rate``: Share of operations that a per-projection cache would have served.
+
+        :return: Counter report.
+        """
+
+        from pandas import DataFrame
+
+        return DataFrame(
+            data=[
+                (
+                    name,
+                    count,
+                    count / self.projections if self.projections else float(count),
+                    repeats,
+                    repeats / count if count else 0.0
+                ) for name, (count, repeats) in sorted(self.counts.items(), key=lambda item: -item[1][0])
+            ],
+            columns=['counter', 'count', 'per_projection', 'repeats', 'hit_rate']
+        )
+
+    def write(
+        self,
+        output_dir_path: str
+    ) -> None:
+
+        """
+        Writes the :meth:`counter report <to_dataframe>` to :attr:`report_file_name`. An existing file will be
+        overwritten.
+
+        :param output_dir_path: Output directory path.
+        :return: Nothing.
+        """
+
+        self.to_dataframe().to_csv(
+            path_or_buf=join(
+                output_dir_path,
+                self.report_file_name
+            ),
+            index=False
+        )
+
+
+class Counters:
+
+    """
+    Singleton registry that counts hot-path operations into :class:`Counts`, one per process.
+
+    Counting is off by default. Instrumented code checks :attr:`enabled` before calling the registry, so that counting
+    costs a single attribute check while it is off:
+
+    .. code-block:: python
+
+        if Counters.enabled:
+
+            Counters().increment(
+                name='ProjectionValue.__setitem__'
+            )
+    """
+
+    instance: ClassVar[Self] = None     #: Global singleton instance.
+    enabled: ClassVar[bool] = False     #: Whether operations are counted.
+    counts: ClassVar[Counts] = None     #: Counts of this process.
+    seen: ClassVar[Set[Hashable]] = set()   #: Operation keys seen in the current projection.
+    lock: ClassVar[Lock] = Lock()       #: Lock object to prevent race conditions when counting.
+
+    def __new__(
+        cls
+    ):
+
+        """
+        Singleton constructor. If an instance does not exist, create a new instance and store it. If an instance
+        does exist, return the existing instance.
+        """
+
+        if cls.instance is None:
+
+            cls.instance = super(
+                Counters,
+                cls
+            ).__new__(
+                cls
+            )
+
+            cls.counts = Counts()
+
+        return cls.instance
+
+    def start(
+        self
+    ) -> None:
+
+        """
+        Turns counting on, with empty counts.
+
+        :return: Nothing.
+        """
+
+        Counters.counts = Counts()
+        Counters.seen = set()
+        Counters.enabled = True
+
+    def stop(
+        self
+    ) -> Counts:
+
+        """
+        Turns counting off.
+
+        :return: Counts recorded since counting was turned on.
+        """
+
+        Counters.enabled = False
+
+        return self.counts
+
+    def increment(
+        self,
+        name: str,
+        key: Hashable | None = None
+    ) -> None:
+
+        """
+        Counts an operation.
+
+        :param name: Counter name.
+        :param key: Operation arguments. If the same name and key were counted earlier in the current projection,
+            the operation is also counted as a repeat. If ``None``, repeats are not tracked.
+        :return: Nothing.
+        """
+
+        with self.lock:
+
+            count = self.counts.counts.get(name)
+
+            if count is None:
+
+                count = self.counts.counts[name] = [0, 0]
+
+            count[0] += 1
+
+            if key is not None:
+
+                key = (name, key)
+
+                if key in self.seen:
+
+                    count[1] += 1
+
+                else:
+
+                    self.seen.add(key)
+
+    def end_projection(
+        self
+    ) -> None:
+
+        """
+        Marks the end of a projection. Repeats are only tracked within a projection.
+
+        :return: Nothing.
+        """
+
+        with self.lock:
+
+            self.counts.projections += 1
+            self.seen.clear()
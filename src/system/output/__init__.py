@@ -0,0 +1,229 @@
+"""
+Modeling framework projection output writers.
+"""
+
+from abc import (
+    ABC,
+    abstractmethod
+)
+from datetime import date
+from typing import (
+    Dict,
+    Tuple
+)
+
+from numpy import (
+    ndarray,
+    array,
+    full,
+    isnan,
+    promote_types,
+    float64,
+    nan
+)
+from pandas import DataFrame
+
+from src.system.enums import OutputScope
+from src.system.logger import Logger
+
+
+class OutputWriter(
+    ABC
+):
+
+    """
+    Abstract class that writes :class:`projection entity <src.system.projection_entity.ProjectionEntity>` values
+    for a single output directory. Each entity is written as a table with one row per time step and one column per
+    :class:`projection value <src.system.projection_entity.projection_value.ProjectionValue>`. Inherit this class
+    to implement a custom output format.
+    """
+
+    output_dir_path: str    #: Output directory path.
+
+    def __init__(
+        self,
+        output_dir_path: str
+    ):
+
+        """
+        Constructor method.
+
+        :param output_dir_path: Output directory path.
+        """
+
+        self.output_dir_path = output_dir_path
+
+    @abstractmethod
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        """
+        Abstract method that writes values for a single projection entity.
+
+        :param entity_name: Projection entity name.
+        :param values: Projection entity values, indexed by time step (``t``), with one column per projection value.
+            May be empty.
+        :return: Nothing.
+        """
+
+        ...
+
+    def write_shared_entity(
+        self,
+        entity_name: str,
+        values: DataFrame,
+        output_scope: OutputScope
+    ) -> None:
+
+        """
+        Writes values for a single projection entity that depends only on the model point, or only on the scenario,
+        so its values can be written once and shared by several projections.
+        :ref:`Override <inheritance_override>` this method to share output.
+
+        The default behavior is to :meth:`write <write_entity>` the values like any other entity.
+
+        :param entity_name: Projection entity name.
+        :param values: Projection entity values, indexed by time step (``t``), with one column per projection value.
+            May be empty.
+        :param output_scope: Dimensions that the values depend on.
+        :return: Nothing.
+        """
+
+        self.write_entity(
+            entity_name=entity_name,
+            values=values
+        )
+
+    def close(
+        self
+    ) -> None:
+
+        """
+        Finishes writing output. Called once, after every entity has been written.
+        :ref:`Override <inheritance_override>` this method to flush buffered output.
+
+        The default behavior is to do nothing.
+
+        :return: Nothing.
+        """
+
+        pass
+
+    @staticmethod
+    def align_columns(
+        values: DataFrame,
+        time_axis_rows: Dict[date, int]
+    ) -> Dict[str, Tuple[str, ndarray]]:
+
+        """
+        Aligns each column of an entity's values to a shared time axis. Numeric and boolean columns are converted to
+        ``float64``, with ``NaN`` at time steps without a value. Other columns are converted to strings, with empty
+        strings at time steps without a value.
+
+        :param values: Projection entity values, indexed by time step.
+        :param time_axis_rows: Time step to row position map for the shared time axis.
+        :return: Column type (``float64`` or ``str``) and aligned values, by column name.
+        """
+
+        rows = array(
+            [time_axis_rows[t] for t in values.index],
+            dtype=int
+        )
+
+        columns = {}
+
+        for column_name, column in values.items():
+
+            try:
+
+                column_values = column.to_numpy(
+                    dtype=float64,
+                    na_value=nan
+                )
+
+                column_type = 'float64'
+                aligned_column = full(len(time_axis_rows), nan, dtype=float64)
+
+            except (TypeError, ValueError):
+
+                column_values = column.fillna('').astype(str).to_numpy(
+                    dtype=str
+                )
+
+                column_type = 'str'
+                aligned_column = full(len(time_axis_rows), '', dtype=column_values.dtype)
+
+            aligned_column[rows] = column_values
+
+            columns[column_name] = (column_type, aligned_column)
+
+        return columns
+
+    @classmethod
+    def merge_columns(
+        cls,
+        columns: Dict[str, Tuple[str, ndarray]],
+        values: DataFrame,
+        time_axis_rows: Dict[date, int]
+    ) -> None:
+
+        """
+        :meth:`Aligns <align_columns>` each column of an entity's values to a shared time axis, then merges them
+        into columns aligned earlier for the same entity, in place. Lets an entity be written in several blocks of
+        time steps, for example when output is streamed while a projection runs.
+
+        :param columns: Column type and aligned values, by column name, from earlier blocks. Updated in place.
+        :param values: Projection entity values for one block of time steps, indexed by time step.
+        :param time_axis_rows: Time step to row position map for the shared time axis.
+        :return: Nothing.
+        """
+
+        rows = array(
+            [time_axis_rows[t] for t in values.index],
+            dtype=int
+        )
+
+        for column_name, (column_type, column) in cls.align_columns(
+            values=values,
+            time_axis_rows=time_axis_rows
+        ).items():
+
+            if column_name not in columns:
+
+                columns[column_name] = (column_type, column)
+
+                continue
+
+            merged_type, merged_column = columns[column_name]
+
+            if column_type != merged_type:
+
+                # A block without any values for a column is aligned as float64, whatever the column's type
+                if column_type == 'float64' and isnan(column[rows]).all():
+
+                    continue
+
+                if merged_type == 'float64' and isnan(merged_column).all():
+
+                    columns[column_name] = (column_type, column)
+
+                    continue
+
+                Logger().raise_expr(
+                    expr=TypeError(
+                        f'Column {column_name} changed type between blocks, from {merged_type} to {column_type} !'
+                    )
+                )
+
+            if merged_column.dtype != column.dtype:
+
+                merged_column = merged_column.astype(
+                    promote_types(merged_column.dtype, column.dtype)
+                )
+
+            merged_column[rows] = column[rows]
+
+            columns[column_name] = (merged_type, merged_column)
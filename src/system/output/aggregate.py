@@ -0,0 +1,419 @@
+"""
+Streaming aggregation of projection output.
+"""
+
+from os.path import join
+from threading import Lock
+from re import (
+    compile,
+    Pattern
+)
+from datetime import date
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Set,
+    Any,
+    Self
+)
+
+from numpy import (
+    ndarray,
+    zeros,
+    nan_to_num
+)
+from pandas import (
+    DataFrame,
+    MultiIndex
+)
+
+from src.system.output import OutputWriter
+from src.system.logger import Logger
+
+
+class Aggregate:
+
+    """
+    Running totals of projection values, grouped by a configurable set of dimensions (for example, product name,
+    product type, and scenario). Projections are folded in one at a time, so memory use depends on the number of
+    groups, not on the number of projections.
+
+    Each worker process folds its projections into its own partial aggregate. Partial aggregates are then
+    :meth:`merged <merge>` in the parent process. Within a process, output writer threads fold projections into the
+    same aggregate, one projection at a time, while holding its :attr:`lock`.
+
+    Values are summed by :meth:`entity role <entity_role>`, not by entity name, so that entities that exist once per
+    model point (like ``annuitant.<id>``) or once per time step (like ``contract.account.<id>.premium.<date>``) are
+    summed together, instead of each adding its own rows.
+    """
+
+    file_name: str = 'aggregate.csv'    #: Output file name.
+
+    #: Entity name segments that identify an instance of an entity: UUIDs and dates.
+    instance_id_pattern: Pattern = compile(
+        pattern=r'[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}|\d{4}-\d{2}-\d{2}'
+    )
+
+    group_by: List[str]                             #: Group-by dimension names.
+    variables: List[Tuple[str, str]] | None         #: Entity and variable names to aggregate, or ``None`` for all.
+    time_axis: List[date]                           #: Shared time axis.
+    time_axis_rows: Dict[date, int]                 #: Time step to row position map.
+    sums: Dict[Tuple, ndarray]                      #: Running sums, by group, entity, and variable.
+    scenarios: Dict[Tuple, Set[Any]]                #: Scenarios folded into each group.
+    lock: Lock                                      #: Held while a projection's output is folded in.
+
+    def __init__(
+        self,
+        group_by: List[str],
+        variables: List[Tuple[str, str]] | None,
+        time_axis: List[date]
+    ):
+
+        """
+        Constructor method. Creates an empty aggregate.
+
+        :param group_by: Group-by dimension names.
+        :param variables: Entity and variable names to aggregate. If ``None``, every numeric variable is aggregated.
+        :param time_axis: Every time step in the projection, in chronological order.
+        """
+
+        self.group_by = group_by
+        self.variables = None if variables is None else [tuple(variable) for variable in variables]
+        self.time_axis = time_axis
+        self.time_axis_rows = {t: row for row, t in enumerate(self.time_axis)}
+        self.sums = {}
+        self.scenarios = {}
+        self.lock = Lock()
+
+    def __getstate__(
+        self
+    ) -> Dict[str, Any]:
+
+        # Locks cannot be pickled, and are re-created after unpickling
+        state = self.__dict__.copy()
+        del state['lock']
+
+        return state
+
+    def __setstate__(
+        self,
+        state: Dict[str, Any]
+    ) -> None:
+
+        self.__dict__.update(state)
+        self.lock = Lock()
+
+    def group(
+        self,
+        dimensions: Dict[str, Any]
+    ) -> Tuple:
+
+        """
+        Selects the group-by dimensions for a single projection.
+
+        :param dimensions: Every output dimension of a projection, by name.
+        :return: Group key.
+        """
+
+        missing_dimensions = [name for name in self.group_by if name not in dimensions]
+
+        if missing_dimensions:
+
+            Logger().raise_expr(
+                expr=KeyError(
+                    f'Cannot group projection output by: {missing_dimensions} ! '
+                    f'Available dimensions: {list(dimensions)}'
+                )
+            )
+
+        return tuple(dimensions[name] for name in self.group_by)
+
+    @classmethod
+    def entity_role(
+        cls,
+        entity_name: str
+    ) -> str:
+
+        """
+        Strips instance IDs from an entity name, leaving the entity's role in the projection. For example,
+        ``contract.account.<id>.premium.<date>`` becomes ``contract.account.premium``, and ``annuitant.<id>``
+        becomes ``annuitant``.
+
+        :param entity_name: Projection entity name.
+        :return: Entity role.
+        """
+
+        return '.'.join(
+            segment for segment in entity_name.split('.')
+            if not cls.instance_id_pattern.fullmatch(segment)
+        )
+
+    def fold(
+        self,
+        group: Tuple,
+        scenario: Any,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        """
+        Adds one projection entity's values to the running sums for a group. Values are aligned to the shared
+        time axis. Time steps without a value count as zero, and non-numeric variables are skipped.
+
+        :param group: Group key.
+        :param scenario: Scenario of the projection that produced the values.
+        :param entity_name: Projection entity name.
+        :param values: Projection entity values.
+        :return: Nothing.
+        """
+
+        for variable, (column_type, column) in OutputWriter.align_columns(
+            values=values,
+            time_axis_rows=self.time_axis_rows
+        ).items():
+
+            if column_type != 'float64':
+
+                continue
+
+            self.add(
+                group=group,
+                scenario=scenario,
+                entity_name=entity_name,
+                variable=variable,
+                values=nan_to_num(column)
+            )
+
+    def add(
+        self,
+        group: Tuple,
+        scenario: Any,
+        entity_name: str,
+        variable: str,
+        values: ndarray
+    ) -> None:
+
+        """
+        Adds values for a single variable, already aligned to the shared time axis, to the running sums for a group
+        and :meth:`entity role <entity_role>`. Variables that are not selected for aggregation are skipped.
+
+        :param group: Group key.
+        :param scenario: Scenario of the projection that produced the values.
+        :param entity_name: Projection entity name.
+        :param variable: Variable name.
+        :param values: Values, one per time step on the shared time axis.
+        :return: Nothing.
+        """
+
+        self.scenarios.setdefault(group, set()).add(scenario)
+
+        entity_name = self.entity_role(
+            entity_name=entity_name
+        )
+
+        if self.variables is not None and (entity_name, variable) not in self.variables:
+
+            return
+
+        key = group + (entity_name, variable)
+
+        if key not in self.sums:
+
+            self.sums[key] = zeros(len(self.time_axis))
+
+        self.sums[key] += values
+
+    def end_projection(
+        self,
+        scenario: Any,
+        model_points: int = 1
+    ) -> None:
+
+        """
+        Marks a projection's output as completely folded into this aggregate. Running sums need nothing more, so the
+        default behavior is to do nothing.
+
+        :param scenario: Scenario of the projection.
+        :param model_points: Number of model points the projection covers.
+        :return: Nothing.
+        """
+
+        pass
+
+    def merge(
+        self,
+        other: Self
+    ) -> None:
+
+        """
+        Merges another partial aggregate into this aggregate.
+
+        :param other: Partial aggregate, with the same group-by dimensions and time axis.
+        :return: Nothing.
+        """
+
+        for key, values in other.sums.items():
+
+            if key in self.sums:
+
+                self.sums[key] += values
+
+            else:
+
+                self.sums[key] = values.copy()
+
+        for group, scenarios in other.scenarios.items():
+
+            self.scenarios.setdefault(group, set()).update(scenarios)
+
+    def to_dataframe(
+        self
+    ) -> DataFrame:
+
+        """
+        Aggregated values, with one row per group, entity role, variable, and statistic, and one column per time
+        step.
+        Statistics are:
+
+        - ``sum``: Sum across every model point and scenario in the group.
+        - ``scenario_mean``: Sum across model points, averaged across the scenarios in the group.
+
+        :return: Aggregated values.
+        """
+
+        keys = sorted(self.sums)
+        rows = []
+        index = []
+
+        for key in keys:
+
+            group = key[:len(self.group_by)]
+
+            rows.append(self.sums[key])
+            index.append(key + ('sum',))
+
+            rows.append(self.sums[key] / len(self.scenarios[group]))
+            index.append(key + ('scenario_mean',))
+
+        return DataFrame(
+            data=rows,
+            index=MultiIndex.from_tuples(
+                tuples=index,
+                names=self.group_by + ['entity', 'variable', 'statistic']
+            ) if index else None,
+            columns=self.time_axis
+        )
+
+    def write(
+        self,
+        output_dir_path: str
+    ) -> None:
+
+        """
+        Writes aggregated values to a `CSV file <https://en.wikipedia.org/wiki/Comma-separated_values>`_ in an
+        output directory. Existing file will be overwritten.
+
+        :param output_dir_path: Output directory path.
+        :return: Nothing.
+        """
+
+        self.to_dataframe().to_csv(
+            path_or_buf=join(
+                output_dir_path,
+                self.file_name
+            ),
+            index=True
+        )
+
+
+class AggregateOutputWriter(
+    OutputWriter
+):
+
+    """
+    Output writer that folds every projection entity into an :class:`Aggregate`, instead of writing it to disk.
+
+    Values are aligned to the shared time axis and buffered, then folded in when the writer is
+    :meth:`closed <close>`, so an entity can be written in several blocks of time steps, and the aggregate is only
+    updated once the projection's output is complete.
+    """
+
+    aggregate: Aggregate    #: Aggregate to fold values into.
+    group: Tuple            #: Group key of the projection being written.
+    scenario: Any           #: Scenario of the projection being written.
+    columns: Dict[str, Dict[str, Tuple[str, ndarray]]]  #: Buffered column types and values, by entity and column.
+
+    def __init__(
+        self,
+        aggregate: Aggregate,
+        dimensions: Dict[str, Any]
+    ):
+
+        """
+        Constructor method.
+
+        :param aggregate: Aggregate to fold values into.
+        :param dimensions: Every output dimension of the projection being written, by name. Must include
+            ``scenario``.
+        """
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=''
+        )
+
+        self.aggregate = aggregate
+        self.group = self.aggregate.group(
+            dimensions=dimensions
+        )
+        self.scenario = dimensions['scenario']
+        self.columns = {}
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        self.merge_columns(
+            columns=self.columns.setdefault(entity_name, {}),
+            values=values,
+            time_axis_rows=self.aggregate.time_axis_rows
+        )
+
+    def close(
+        self
+    ) -> None:
+
+        """
+        Folds buffered values into the aggregate, then marks the projection's output as
+        :meth:`complete <Aggregate.end_projection>`. Time steps without a value count as zero, and non-numeric
+        variables are skipped. Holds the aggregate's :attr:`~Aggregate.lock` while folding.
+
+        :return: Nothing.
+        """
+
+        with self.aggregate.lock:
+
+            for entity_name, columns in self.columns.items():
+
+                for variable, (column_type, column) in columns.items():
+
+                    if column_type != 'float64':
+
+                        continue
+
+                    self.aggregate.add(
+                        group=self.group,
+                        scenario=self.scenario,
+                        entity_name=entity_name,
+                        variable=variable,
+                        values=nan_to_num(column)
+                    )
+
+            self.aggregate.end_projection(
+                scenario=self.scenario
+            )
+
+        self.columns = {}
@@ -0,0 +1,99 @@
+"""
+`CSV file <https://en.wikipedia.org/wiki/Comma-separated_values>`_ output writer.
+"""
+
+from os.path import join
+from typing import Dict
+
+from pandas import DataFrame
+
+from src.system.output import OutputWriter
+
+
+class CsvOutputWriter(
+    OutputWriter
+):
+
+    r"""
+    Writes one `CSV file <https://en.wikipedia.org/wiki/Comma-separated_values>`_ per projection entity, named
+    after the entity:
+
+    .. code-block:: text
+
+        \ Output directory
+            contract.csv
+            economy.index.SPX.csv
+            ...
+
+    Existing files will be overwritten. If an entity is written more than once, for example when output is streamed
+    in blocks of time steps, later blocks are appended to the entity's file.
+    """
+
+    rows_written: Dict[str, int]    #: Number of rows written so far, by entity name.
+
+    def __init__(
+        self,
+        output_dir_path: str
+    ):
+
+        """
+        Constructor method.
+
+        :param output_dir_path: Output directory path.
+        """
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=output_dir_path
+        )
+
+        self.rows_written = {}
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        """
+        Writes values for a single projection entity to ``<entity name>.csv``, adding a time step ``index`` column.
+
+        :param entity_name: Projection entity name.
+        :param values: Projection entity values.
+        :return: Nothing.
+        """
+
+        output_file_path = join(
+            self.output_dir_path,
+            f'{entity_name}.csv'
+        )
+
+        rows_written = self.rows_written.get(entity_name)
+
+        if not values.empty:
+
+            values = values.copy(
+                deep=False
+            )
+
+            values.insert(
+                loc=0,
+                column='index',
+                value=range(rows_written or 0, (rows_written or 0) + values.shape[0])
+            )
+
+            values.to_csv(
+                path_or_buf=output_file_path,
+                index=True,
+                mode='w' if rows_written is None else 'a',
+                header=rows_written is None
+            )
+
+            self.rows_written[entity_name] = (rows_written or 0) + values.shape[0]
+
+        elif rows_written is None:
+
+            values.to_csv(
+                path_or_buf=output_file_path,
+                index=False
+            )
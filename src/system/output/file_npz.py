@@ -0,0 +1,194 @@
+"""
+Columnar, binary `NumPy .npz file <https://numpy.org/doc/stable/reference/generated/numpy.savez.html>`_ output
+writer.
+"""
+
+from os import replace
+from os.path import join
+from json import (
+    dumps,
+    loads
+)
+from datetime import date
+from typing import (
+    List,
+    Dict
+)
+
+from numpy import (
+    ndarray,
+    array,
+    savez,
+    load
+)
+from pandas import (
+    DataFrame,
+    Index
+)
+
+from src.system.output import OutputWriter
+from src.system.date import dates_to_array
+
+
+class NpzOutputWriter(
+    OutputWriter
+):
+
+    r"""
+    Writes every projection entity in an output directory to a single
+    `NumPy .npz file <https://numpy.org/doc/stable/reference/generated/numpy.savez.html>`_:
+
+    .. code-block:: text
+
+        \ Output directory
+            projection.npz
+
+    The file holds one array per entity and projection value, all aligned to a shared time axis:
+
+    - ``t``: Shared time axis, as ``datetime64[D]``.
+    - ``schema``: JSON document that lists each entity's projection values, in column order, and each column's type.
+    - ``<entity name>/<projection value name>``: One column per projection value. Numeric and boolean values are
+      stored as ``float64``. Other values (for example, durations) are stored as strings. Time steps at which an
+      entity has no value are stored as ``NaN`` (or an empty string).
+
+    Columns are buffered in memory, then written once, when the writer is :meth:`closed <close>`.
+    """
+
+    file_name: str = 'projection.npz'   #: Output file name.
+
+    time_axis: List[date]               #: Shared time axis.
+    time_axis_rows: Dict[date, int]     #: Time step to row position map.
+    schema: Dict[str, Dict[str, str]]   #: Projection value types, by entity and projection value name.
+    columns: Dict[str, ndarray]         #: Buffered columns, by ``<entity name>/<projection value name>``.
+
+    def __init__(
+        self,
+        output_dir_path: str,
+        time_axis: List[date]
+    ):
+
+        """
+        Constructor method.
+
+        :param output_dir_path: Output directory path.
+        :param time_axis: Every time step in the projection, in chronological order.
+        """
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=output_dir_path
+        )
+
+        self.time_axis = time_axis
+        self.time_axis_rows = {t: row for row, t in enumerate(self.time_axis)}
+        self.schema = {}
+        self.columns = {}
+
+    @property
+    def output_file_path(
+        self
+    ) -> str:
+
+        """
+        Path to the output file.
+
+        :return: Output file path.
+        """
+
+        return join(
+            self.output_dir_path,
+            self.file_name
+        )
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        """
+        Buffers values for a single projection entity, aligning them to the shared time axis. If the entity has
+        been written before, values are merged into its buffered columns.
+
+        :param entity_name: Projection entity name.
+        :param values: Projection entity values.
+        :return: Nothing.
+        """
+
+        columns = {
+            column_name: (column_type, self.columns[f'{entity_name}/{column_name}'])
+            for column_name, column_type in self.schema.get(entity_name, {}).items()
+        }
+
+        self.merge_columns(
+            columns=columns,
+            values=values,
+            time_axis_rows=self.time_axis_rows
+        )
+
+        self.schema[entity_name] = {}
+
+        for column_name, (column_type, column) in columns.items():
+
+            self.schema[entity_name][column_name] = column_type
+            self.columns[f'{entity_name}/{column_name}'] = column
+
+    def close(
+        self
+    ) -> None:
+
+        """
+        Writes buffered columns to the output file. The file is written under a temporary name, then renamed, so a
+        partially written file is never read.
+
+        :return: Nothing.
+        """
+
+        temp_file_path = f'{self.output_file_path}.tmp.npz'
+
+        savez(
+            temp_file_path,
+            t=dates_to_array(dates=self.time_axis),
+            schema=array(dumps(self.schema)),
+            **self.columns
+        )
+
+        replace(
+            temp_file_path,
+            self.output_file_path
+        )
+
+        self.schema = {}
+        self.columns = {}
+
+    @staticmethod
+    def read(
+        path: str
+    ) -> Dict[str, DataFrame]:
+
+        """
+        Reads an output file written by this class back into one
+        `DataFrame <https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html>`_ per projection entity,
+        indexed by the shared time axis.
+
+        :param path: Output file path.
+        :return: Projection entity values, by entity name.
+        """
+
+        with load(path, allow_pickle=False) as npz_file:
+
+            index = Index(
+                data=npz_file['t'].astype(object),
+                name='t'
+            )
+
+            schema: Dict[str, Dict[str, str]] = loads(str(npz_file['schema']))
+
+            return {
+                entity_name: DataFrame(
+                    data={
+                        column_name: npz_file[f'{entity_name}/{column_name}'] for column_name in column_types
+                    },
+                    index=index
+                ) for entity_name, column_types in schema.items()
+            }
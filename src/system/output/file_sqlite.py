@@ -0,0 +1,126 @@
+"""
+Output writer that appends to a run-level :class:`results store <src.system.output.results_store.ResultsStore>`.
+"""
+
+from json import dumps
+from datetime import date
+from typing import (
+    List,
+    Dict,
+    Tuple
+)
+
+from numpy import ndarray
+from pandas import DataFrame
+
+from src.system.output import OutputWriter
+from src.system.output.results_store import ResultsStore
+
+
+class SqliteOutputWriter(
+    OutputWriter
+):
+
+    """
+    Appends every projection entity for one model point and scenario to a run-level
+    :class:`results store <src.system.output.results_store.ResultsStore>`. Columns are buffered in memory, then
+    appended as rows in a single transaction when the writer is :meth:`closed <close>`.
+    """
+
+    results_store: ResultsStore         #: Run-level results store.
+    model_point_id: str                 #: Model point ID.
+    scenario_index: int                 #: Scenario number.
+    time_axis_rows: Dict[date, int]     #: Time step to row position map.
+    columns: Dict[str, Dict[str, Tuple[str, ndarray]]]  #: Buffered column types and values, by entity and column.
+
+    def __init__(
+        self,
+        output_dir_path: str,
+        results_store: ResultsStore,
+        model_point_id: str,
+        scenario_index: int,
+        time_axis: List[date]
+    ):
+
+        """
+        Constructor method.
+
+        :param output_dir_path: Output directory path that contains the results store.
+        :param results_store: Run-level results store.
+        :param model_point_id: Model point ID.
+        :param scenario_index: Scenario number.
+        :param time_axis: Every time step in the projection, in chronological order.
+        """
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=output_dir_path
+        )
+
+        self.results_store = results_store
+        self.model_point_id = model_point_id
+        self.scenario_index = scenario_index
+        self.time_axis_rows = {t: row for row, t in enumerate(time_axis)}
+        self.columns = {}
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        """
+        Buffers one column per projection value, aligned to the shared time axis. If the entity has been written
+        before, values are merged into its buffered columns.
+
+        :param entity_name: Projection entity name.
+        :param values: Projection entity values.
+        :return: Nothing.
+        """
+
+        self.merge_columns(
+            columns=self.columns.setdefault(entity_name, {}),
+            values=values,
+            time_axis_rows=self.time_axis_rows
+        )
+
+    def close(
+        self
+    ) -> None:
+
+        """
+        Appends one row per buffered column to the results store, in a single transaction.
+
+        :return: Nothing.
+        """
+
+        rows = []
+
+        for entity_name, columns in self.columns.items():
+
+            for column_name, (column_type, column) in columns.items():
+
+                if column_type == 'float64':
+
+                    data = column.tobytes()
+
+                else:
+
+                    data = dumps(column.tolist()).encode()
+
+                rows.append(
+                    (
+                        entity_name,
+                        column_name,
+                        self.model_point_id,
+                        int(self.scenario_index),
+                        column_type,
+                        data
+                    )
+                )
+
+        self.results_store.append(
+            rows=rows
+        )
+
+        self.columns = {}
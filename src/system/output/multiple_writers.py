@@ -0,0 +1,76 @@
+"""
+Output writer that forwards output to several output writers.
+"""
+
+from typing import List
+
+from pandas import DataFrame
+
+from src.system.enums import OutputScope
+from src.system.output import OutputWriter
+
+
+class MultipleOutputWriter(
+    OutputWriter
+):
+
+    """
+    Forwards every projection entity to several :class:`output writers <src.system.output.OutputWriter>`, in order.
+    For example, this can be used to write seriatim output and aggregate output in a single pass.
+    """
+
+    output_writers: List[OutputWriter]      #: Output writers to forward to.
+
+    def __init__(
+        self,
+        output_writers: List[OutputWriter]
+    ):
+
+        """
+        Constructor method.
+
+        :param output_writers: Output writers to forward to.
+        """
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=''
+        )
+
+        self.output_writers = output_writers
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        for output_writer in self.output_writers:
+
+            output_writer.write_entity(
+                entity_name=entity_name,
+                values=values
+            )
+
+    def write_shared_entity(
+        self,
+        entity_name: str,
+        values: DataFrame,
+        output_scope: OutputScope
+    ) -> None:
+
+        for output_writer in self.output_writers:
+
+            output_writer.write_shared_entity(
+                entity_name=entity_name,
+                values=values,
+                output_scope=output_scope
+            )
+
+    def close(
+        self
+    ) -> None:
+
+        for output_writer in self.output_writers:
+
+            output_writer.close()
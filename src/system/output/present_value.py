@@ -0,0 +1,200 @@
+"""
+Present values and durations of projection cash flows.
+"""
+
+from datetime import date
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Any
+)
+
+from numpy import (
+    ndarray,
+    array,
+    zeros,
+    errstate
+)
+from pandas import (
+    DataFrame,
+    MultiIndex
+)
+
+from src.system.output.aggregate import Aggregate
+from src.system.date import calc_partial_years
+from src.system.actuarial_math import present_value
+from src.system.logger import Logger
+
+
+class PresentValues(
+    Aggregate
+):
+
+    """
+    Present values and Macaulay durations of projection cash flows, grouped by a configurable set of dimensions.
+    By default, groups are model points and scenarios, so there is one present value for each projection.
+
+    Cash flows are discounted in the worker process, as each projection finishes, using the
+    :meth:`discount factors <src.system.projection.Projection.discount_factors>` of the projection's scenario.
+    Only two running sums leave the worker for each group and variable: the present value, and the time-weighted
+    present value.
+    """
+
+    file_name: str = 'present_values.csv'  #: Output file name.
+
+    times: ndarray                          #: Fractional years from the start of the projection, for each time step.
+    discount_factors: Dict[Any, ndarray]    #: Discount factors for each time step, by scenario.
+    time_weighted_discount_factors: Dict[Any, ndarray]  #: Discount factors, multiplied by :attr:`times`, by scenario.
+
+    def __init__(
+        self,
+        group_by: List[str],
+        variables: List[Tuple[str, str]],
+        time_axis: List[date]
+    ):
+
+        """
+        Constructor method. Creates empty present values.
+
+        :param group_by: Group-by dimension names.
+        :param variables: Entity and variable names of cash flows to discount.
+        :param time_axis: Every time step in the projection, in chronological order.
+        """
+
+        Aggregate.__init__(
+            self=self,
+            group_by=group_by,
+            variables=variables,
+            time_axis=time_axis
+        )
+
+        self.times = array(
+            [
+                calc_partial_years(
+                    dt1=t,
+                    dt2=self.time_axis[0]
+                ) for t in self.time_axis
+            ]
+        )
+
+        self.discount_factors = {}
+        self.time_weighted_discount_factors = {}
+
+    def discount(
+        self,
+        scenario: Any,
+        discount_factors: ndarray
+    ) -> None:
+
+        """
+        Sets discount factors for a scenario. Called once per projection, before folding. Discount factors are kept
+        by scenario, so that projections from different scenarios can be written at the same time.
+
+        :param scenario: Scenario of the projection being folded.
+        :param discount_factors: Discount factors, for each time step on the shared time axis.
+        :return: Nothing.
+        """
+
+        self.discount_factors[scenario] = discount_factors
+        self.time_weighted_discount_factors[scenario] = discount_factors * self.times
+
+    def add(
+        self,
+        group: Tuple,
+        scenario: Any,
+        entity_name: str,
+        variable: str,
+        values: ndarray
+    ) -> None:
+
+        """
+        Discounts cash flows for a single variable, already aligned to the shared time axis, and adds the present
+        value and time-weighted present value to the running sums for a group and
+        :meth:`entity role <src.system.output.aggregate.Aggregate.entity_role>`. Variables that are not selected are
+        skipped.
+
+        :param group: Group key.
+        :param scenario: Scenario of the projection that produced the values.
+        :param entity_name: Projection entity name.
+        :param variable: Variable name.
+        :param values: Cash flows, one per time step on the shared time axis.
+        :return: Nothing.
+        """
+
+        self.scenarios.setdefault(group, set()).add(scenario)
+
+        entity_name = self.entity_role(
+            entity_name=entity_name
+        )
+
+        if (entity_name, variable) not in self.variables:
+
+            return
+
+        if scenario not in self.discount_factors:
+
+            Logger().raise_expr(
+                expr=RuntimeError(
+                    f'No discount factors have been set for scenario: {scenario} !'
+                )
+            )
+
+        key = group + (entity_name, variable)
+
+        if key not in self.sums:
+
+            self.sums[key] = zeros(2)
+
+        self.sums[key] += (
+            present_value(
+                cash_flows=values,
+                discount_factors=self.discount_factors[scenario]
+            ),
+            present_value(
+                cash_flows=values,
+                discount_factors=self.time_weighted_discount_factors[scenario]
+            )
+        )
+
+    def to_dataframe(
+        self
+    ) -> DataFrame:
+
+        """
+        Present values, with one row per group, entity, and variable, and these columns:
+
+        - ``present_value``: Present value, summed across every model point and scenario in the group.
+        - ``scenario_mean``: Present value, summed across model points, averaged across the scenarios in the group.
+        - ``duration``: Macaulay duration, in years.
+
+        :return: Present values.
+        """
+
+        keys = sorted(self.sums)
+        rows = []
+
+        for key in keys:
+
+            present_value_sum, time_weighted_sum = self.sums[key]
+
+            with errstate(divide='ignore', invalid='ignore'):
+
+                duration = time_weighted_sum / present_value_sum
+
+            rows.append(
+                (
+                    present_value_sum,
+                    present_value_sum / len(self.scenarios[key[:len(self.group_by)]]),
+                    duration
+                )
+            )
+
+        return DataFrame(
+            data=rows,
+            index=MultiIndex.from_tuples(
+                tuples=keys,
+                names=self.group_by + ['entity', 'variable']
+            ) if keys else None,
+            columns=['present_value', 'scenario_mean', 'duration']
+        )
@@ -0,0 +1,280 @@
+"""
+Run-level results store, backed by a single `SQLite <https://www.sqlite.org/>`_ database.
+"""
+
+from sqlite3 import (
+    Connection,
+    connect
+)
+from contextlib import closing
+from json import loads
+from datetime import date
+from typing import (
+    List,
+    Tuple,
+    Iterable
+)
+
+from numpy import (
+    ndarray,
+    frombuffer,
+    float64,
+    array
+)
+from pandas import (
+    DataFrame,
+    MultiIndex
+)
+
+from src.system.date import (
+    str_to_date,
+    date_to_str
+)
+
+
+class ResultsStore:
+
+    r"""
+    Run-level results store. Holds every projection's output in one
+    `SQLite <https://www.sqlite.org/>`_ database, in place of an output directory tree:
+
+    .. code-block:: text
+
+        \ Output directory
+            results.sqlite
+
+    Each projection value history is stored as one row, keyed by ``(entity, variable, model point, scenario)``,
+    with values aligned to the run's shared time axis. Float values are stored as packed ``float64`` bytes. Other
+    values are stored as a JSON list of strings. Keys are stored in entity and variable order, so reading one
+    variable across every model point and scenario is a single index range scan.
+
+    Rows are only valid for the time axis they were written with, so every row is deleted when a run is set up with
+    a different time axis. Runs with the same time axis, like shards of one run, add to the same store.
+
+    The database uses `write-ahead logging <https://www.sqlite.org/wal.html>`_, so worker processes can append
+    in parallel while the store is being read. Concurrent appends are serialized by SQLite, and each projection's
+    output is appended in a single transaction.
+    """
+
+    file_name: str = 'results.sqlite'       #: Database file name.
+    timeout: float = 600.0                  #: Seconds to wait for another process's write lock.
+
+    path: str                               #: Database path.
+
+    def __init__(
+        self,
+        path: str
+    ):
+
+        """
+        Constructor method. Refers to an existing results store. Connections are opened on demand.
+
+        :param path: Database path.
+        """
+
+        self.path = path
+
+    @property
+    def time_axis(
+        self
+    ) -> List[date]:
+
+        """
+        Shared time axis.
+
+        :return: Every time step in the run, in chronological order.
+        """
+
+        with closing(self.connect()) as connection:
+
+            return [
+                str_to_date(target_str=t) for t, in connection.execute(
+                    'SELECT t FROM time_axis ORDER BY position'
+                )
+            ]
+
+    def connect(
+        self
+    ) -> Connection:
+
+        """
+        Opens a new connection to the database. Each process should open its own connection.
+
+        :return: Database connection.
+        """
+
+        return connect(
+            database=self.path,
+            timeout=self.timeout
+        )
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        time_axis: List[date]
+    ) -> 'ResultsStore':
+
+        """
+        Creates a results store, or opens an existing one, and (re)writes its time axis. Called once per run,
+        before any projection writes output. If an existing store has a different time axis, its rows are deleted,
+        since their values are aligned to the old time axis.
+
+        :param path: Database path.
+        :param time_axis: Every time step in the projection, in chronological order.
+        :return: Results store.
+        """
+
+        time_axis_rows = [(position, date_to_str(target_date=t)) for position, t in enumerate(time_axis)]
+
+        with closing(connect(database=path, timeout=cls.timeout)) as connection, connection:
+
+            connection.execute('PRAGMA journal_mode=WAL')
+
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS time_axis ('
+                'position INTEGER PRIMARY KEY, '
+                't TEXT NOT NULL'
+                ')'
+            )
+
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'entity TEXT NOT NULL, '
+                'variable TEXT NOT NULL, '
+                'model_point TEXT NOT NULL, '
+                'scenario INTEGER NOT NULL, '
+                'value_type TEXT NOT NULL, '
+                'data BLOB NOT NULL, '
+                'PRIMARY KEY (entity, variable, model_point, scenario)'
+                ') WITHOUT ROWID'
+            )
+
+            existing_time_axis_rows = connection.execute(
+                'SELECT position, t FROM time_axis ORDER BY position'
+            ).fetchall()
+
+            if existing_time_axis_rows != time_axis_rows:
+
+                connection.execute(
+                    'DELETE FROM results'
+                )
+
+                connection.execute(
+                    'DELETE FROM time_axis'
+                )
+
+                connection.executemany(
+                    'INSERT INTO time_axis (position, t) VALUES (?, ?)',
+                    time_axis_rows
+                )
+
+        return cls(
+            path=path
+        )
+
+    def append(
+        self,
+        rows: Iterable[Tuple[str, str, str, int, str, bytes]]
+    ) -> None:
+
+        """
+        Appends rows in a single transaction. Rows that already exist for the same key are replaced, so a
+        projection can be re-run into the same store.
+
+        :param rows: Rows, as ``(entity, variable, model point, scenario, value type, data)``.
+        :return: Nothing.
+        """
+
+        with closing(self.connect()) as connection, connection:
+
+            connection.executemany(
+                'INSERT OR REPLACE INTO results '
+                '(entity, variable, model_point, scenario, value_type, data) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    @staticmethod
+    def _decode(
+        value_type: str,
+        data: bytes
+    ) -> ndarray:
+
+        if value_type == 'float64':
+
+            return frombuffer(
+                data,
+                dtype=float64
+            )
+
+        else:
+
+            return array(
+                loads(data),
+                dtype=object
+            )
+
+    def read_variable(
+        self,
+        entity: str,
+        variable: str
+    ) -> DataFrame:
+
+        """
+        Reads one variable for every model point and scenario in the store.
+
+        :param entity: Projection entity name.
+        :param variable: Projection value name.
+        :return: Values, indexed by model point and scenario, with one column per time step.
+        """
+
+        with closing(self.connect()) as connection:
+
+            rows = connection.execute(
+                'SELECT model_point, scenario, value_type, data FROM results '
+                'WHERE entity = ? AND variable = ? ORDER BY model_point, scenario',
+                (entity, variable)
+            ).fetchall()
+
+        return DataFrame(
+            data=[self._decode(value_type=value_type, data=data) for _, _, value_type, data in rows],
+            index=MultiIndex.from_arrays(
+                arrays=[
+                    [model_point for model_point, _, _, _ in rows],
+                    [scenario for _, scenario, _, _ in rows]
+                ],
+                names=['model_point', 'scenario']
+            ),
+            columns=self.time_axis
+        )
+
+    def read_entity(
+        self,
+        model_point: str,
+        scenario: int,
+        entity: str
+    ) -> DataFrame:
+
+        """
+        Reads every variable of one projection entity, for a single model point and scenario.
+
+        :param model_point: Model point ID.
+        :param scenario: Scenario number.
+        :param entity: Projection entity name.
+        :return: Values, indexed by time step, with one column per variable, in variable name order.
+        """
+
+        with closing(self.connect()) as connection:
+
+            rows = connection.execute(
+                'SELECT variable, value_type, data FROM results '
+                'WHERE entity = ? AND model_point = ? AND scenario = ?',
+                (entity, model_point, scenario)
+            ).fetchall()
+
+        return DataFrame(
+            data={variable: self._decode(value_type=value_type, data=data) for variable, value_type, data in rows},
+            index=self.time_axis
+        ).rename_axis(
+            index='t'
+        )
@@ -0,0 +1,152 @@
+"""
+Output writer that writes scenario-invariant and model-point-invariant projection entities once.
+"""
+
+from os.path import (
+    join,
+    relpath
+)
+from typing import (
+    Dict,
+    Tuple,
+    Callable
+)
+
+from pandas import DataFrame
+
+from src.system.enums import OutputScope
+from src.system.output import OutputWriter
+
+
+class SharedOutputWriter(
+    OutputWriter
+):
+
+    """
+    Writes :meth:`shared entities <src.system.output.OutputWriter.write_shared_entity>` (projection entities that
+    depend only on the model point, or only on the scenario) to a shared output location, instead of to each
+    projection's own output. Other entities are forwarded to the projection's output writer.
+
+    Each shared location is written by exactly one projection, its owner, so that each scenario-invariant entity is
+    written once per model point, and each model-point-invariant entity is written once per scenario. Other
+    projections skip the write. Every projection records a link to the shared copy of each entity in
+    :attr:`link_file_name`, in its own output directory.
+    """
+
+    link_file_name: str = 'links.csv'   #: Link file name.
+
+    output_writer: OutputWriter     #: Projection output writer.
+    shared_locations: Dict[OutputScope, Tuple[str, Tuple[str, int], bool]]    #: Shared output locations, by scope.
+    create_output_writer: Callable[[str, Tuple[str, int]], OutputWriter]  #: Output writer factory.
+    write_links: bool               #: Whether to write a link file.
+    shared_output_writers: Dict[OutputScope, OutputWriter]     #: Shared output writers opened so far, by scope.
+    links: Dict[str, Tuple[str, str]]   #: Scope and relative shared directory path, by entity name.
+
+    def __init__(
+        self,
+        output_writer: OutputWriter,
+        shared_locations: Dict[OutputScope, Tuple[str, Tuple[str, int], bool]],
+        create_output_writer: Callable[[str, Tuple[str, int]], OutputWriter],
+        write_links: bool = True
+    ):
+
+        """
+        Constructor method.
+
+        :param output_writer: Projection output writer.
+        :param shared_locations: Shared output directory path, output key, and whether this projection owns the
+            location, by scope. Shared entities with a scope that is not listed are written to the projection output
+            writer.
+        :param create_output_writer: Creates an output writer for a shared output directory path and output key.
+            Only called for owned locations, the first time an entity is written to them.
+        :param write_links: Whether to write a link file to the projection's output directory. Turn off for output
+            formats that do not write to a projection-level directory, like a
+            :class:`run-level results store <src.system.output.results_store.ResultsStore>`, where shared copies
+            are found by their output key instead.
+        """
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=output_writer.output_dir_path
+        )
+
+        self.output_writer = output_writer
+        self.shared_locations = shared_locations
+        self.create_output_writer = create_output_writer
+        self.write_links = write_links
+        self.shared_output_writers = {}
+        self.links = {}
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        self.output_writer.write_entity(
+            entity_name=entity_name,
+            values=values
+        )
+
+    def write_shared_entity(
+        self,
+        entity_name: str,
+        values: DataFrame,
+        output_scope: OutputScope
+    ) -> None:
+
+        if output_scope not in self.shared_locations:
+
+            self.output_writer.write_entity(
+                entity_name=entity_name,
+                values=values
+            )
+
+            return
+
+        shared_dir_path, shared_output_key, owned = self.shared_locations[output_scope]
+
+        if owned:
+
+            if output_scope not in self.shared_output_writers:
+
+                self.shared_output_writers[output_scope] = self.create_output_writer(
+                    shared_dir_path,
+                    shared_output_key
+                )
+
+            self.shared_output_writers[output_scope].write_entity(
+                entity_name=entity_name,
+                values=values
+            )
+
+        self.links[entity_name] = (
+            str(output_scope),
+            relpath(
+                path=shared_dir_path,
+                start=self.output_dir_path
+            )
+        )
+
+    def close(
+        self
+    ) -> None:
+
+        for shared_output_writer in self.shared_output_writers.values():
+
+            shared_output_writer.close()
+
+        if self.write_links and self.links:
+
+            DataFrame(
+                data=[(entity_name,) + link for entity_name, link in self.links.items()],
+                columns=['entity', 'scope', 'path']
+            ).to_csv(
+                path_or_buf=join(
+                    self.output_dir_path,
+                    self.link_file_name
+                ),
+                index=False
+            )
+
+        self.output_writer.close()
@@ -0,0 +1,258 @@
+"""
+Declarative projection output specification.
+"""
+
+from fnmatch import fnmatchcase
+from datetime import date
+from typing import (
+    List,
+    Dict,
+    Set,
+    Any,
+    Self
+)
+
+from pandas import DataFrame
+
+from src.system.enums import OutputScope
+from src.system.output import OutputWriter
+from src.system.logger import Logger
+
+
+class OutputSpec:
+
+    """
+    Declares which :class:`projection values <src.system.projection_entity.projection_value.ProjectionValue>` a
+    projection records and writes, and at which time steps:
+
+    - Entities are selected by name, using `Unix shell-style wildcards <https://docs.python.org/3/library/fnmatch.html>`_,
+      like ``contract`` or ``contract.account.*``. Entities that are not selected are not written.
+    - For each entity pattern, variables are selected by name. If no variable names are listed, every variable is
+      selected.
+    - Seriatim output is subsampled to every :attr:`n-th <time_step_interval>` time step. Aggregate output always uses
+      every time step.
+
+    Values that are not selected do not keep a value history, beyond what is needed to read the prior time step,
+    and are never written. Aggregation level is set separately, using
+    :attr:`~src.system.projection.parameters.ProjectionParameters.write_seriatim` and
+    :attr:`~src.system.projection.parameters.ProjectionParameters.group_by`.
+    """
+
+    variables: Dict[str, List[str] | None]  #: Variable names to record, by entity name pattern.
+    time_step_interval: int                 #: Interval between written time steps.
+
+    def __init__(
+        self,
+        variables: Dict[str, List[str] | None],
+        time_step_interval: int = 1
+    ):
+
+        """
+        Constructor method.
+
+        :param variables: Variable names to record, by entity name pattern. Use ``None`` or an empty list to record
+            every variable for matching entities.
+        :param time_step_interval: Interval between written time steps. For example, ``12`` writes every 12th time
+            step of a monthly projection, starting with the first.
+        """
+
+        if time_step_interval < 1:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid output time step interval: {time_step_interval} ! Expected an interval >= 1.'
+                )
+            )
+
+        self.variables = variables
+        self.time_step_interval = time_step_interval
+
+    def select_entity(
+        self,
+        entity_name: str
+    ) -> bool:
+
+        """
+        Checks whether any values are recorded for an entity.
+
+        :param entity_name: Projection entity name.
+        :return: Whether the entity is selected.
+        """
+
+        return any(fnmatchcase(entity_name, pattern) for pattern in self.variables)
+
+    def select_variable(
+        self,
+        entity_name: str,
+        variable: str
+    ) -> bool:
+
+        """
+        Checks whether a value is recorded for an entity.
+
+        :param entity_name: Projection entity name.
+        :param variable: Variable name.
+        :return: Whether the variable is selected.
+        """
+
+        for pattern, variables in self.variables.items():
+
+            if fnmatchcase(entity_name, pattern) and (not variables or variable in variables):
+
+                return True
+
+        return False
+
+    def select_time_steps(
+        self,
+        time_axis: List[date]
+    ) -> Set[date]:
+
+        """
+        Selects the time steps to write.
+
+        :param time_axis: Every time step in the projection, in chronological order.
+        :return: Time steps to write.
+        """
+
+        return set(time_axis[::self.time_step_interval])
+
+    @classmethod
+    def from_dict(
+        cls,
+        payload: Dict[str, Any]
+    ) -> Self:
+
+        """
+        Class factory that constructs an instance of this class from a
+        `JSON <https://en.wikipedia.org/wiki/JSON>`_ payload, with the keys ``variables`` and, optionally,
+        ``time_step_interval``.
+
+        :param payload: JSON payload.
+        :return: Instance of this class.
+        """
+
+        return cls(
+            variables=payload['variables'],
+            time_step_interval=int(payload.get('time_step_interval', 1))
+        )
+
+
+class OutputSpecWriter(
+    OutputWriter
+):
+
+    """
+    Applies an :class:`output spec <OutputSpec>` to every projection entity, then forwards the selected values to
+    another :class:`output writer <src.system.output.OutputWriter>`.
+    """
+
+    output_writer: OutputWriter     #: Output writer to forward to.
+    output_spec: OutputSpec         #: Output spec.
+    time_steps: Set[date] | None    #: Time steps to write. If ``None``, every time step is written.
+
+    def __init__(
+        self,
+        output_writer: OutputWriter,
+        output_spec: OutputSpec,
+        time_axis: List[date] | None = None
+    ):
+
+        """
+        Constructor method.
+
+        :param output_writer: Output writer to forward to.
+        :param output_spec: Output spec.
+        :param time_axis: Every time step in the projection, in chronological order. If provided, output is
+            subsampled using the spec's :attr:`~OutputSpec.time_step_interval`. Otherwise, every time step is
+            written.
+        """
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=output_writer.output_dir_path
+        )
+
+        self.output_writer = output_writer
+        self.output_spec = output_spec
+
+        if time_axis is None or self.output_spec.time_step_interval == 1:
+
+            self.time_steps = None
+
+        else:
+
+            self.time_steps = self.output_spec.select_time_steps(
+                time_axis=time_axis
+            )
+
+    def _select_values(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> DataFrame | None:
+
+        if not self.output_spec.select_entity(
+            entity_name=entity_name
+        ):
+
+            return None
+
+        values = values[
+            [
+                column for column in values.columns if self.output_spec.select_variable(
+                    entity_name=entity_name,
+                    variable=column
+                )
+            ]
+        ]
+
+        if self.time_steps is not None:
+
+            values = values[values.index.isin(self.time_steps)]
+
+        return values
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        values = self._select_values(
+            entity_name=entity_name,
+            values=values
+        )
+
+        if values is not None:
+
+            self.output_writer.write_entity(
+                entity_name=entity_name,
+                values=values
+            )
+
+    def write_shared_entity(
+        self,
+        entity_name: str,
+        values: DataFrame,
+        output_scope: OutputScope
+    ) -> None:
+
+        values = self._select_values(
+            entity_name=entity_name,
+            values=values
+        )
+
+        if values is not None:
+
+            self.output_writer.write_shared_entity(
+                entity_name=entity_name,
+                values=values,
+                output_scope=output_scope
+            )
+
+    def close(
+        self
+    ) -> None:
+
+        self.output_writer.close()
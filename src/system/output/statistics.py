@@ -0,0 +1,544 @@
+"""
+Streaming stochastic statistics of projection output across economic scenarios.
+"""
+
+from math import pi
+from datetime import date
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Any,
+    Self
+)
+
+from numpy import (
+    ndarray,
+    zeros,
+    ones,
+    full,
+    vstack,
+    arcsin,
+    floor,
+    clip,
+    cumsum,
+    argsort,
+    take_along_axis,
+    bincount,
+    minimum,
+    maximum,
+    quantile,
+    interp,
+    inf,
+    arange
+)
+from pandas import (
+    DataFrame,
+    MultiIndex
+)
+
+from src.system.output.aggregate import Aggregate
+from src.system.logger import Logger
+
+
+class QuantileSketch:
+
+    r"""
+    Bounded-memory sketch of the distribution of a time series across samples (for example, one sample per
+    economic scenario), kept separately for each time step.
+
+    Samples are buffered until there are more than :attr:`compression` of them. Until then, every statistic is
+    exact. Past that point, samples are compressed into a
+    `merging t-digest <https://arxiv.org/abs/1902.04023>`_: at each time step, samples are sorted and merged into
+    weighted centroids, using the :math:`k_1` scale function:
+
+    .. math::
+        k(q) = \frac{\delta}{2 \pi} \arcsin(2q - 1)
+
+    Centroids are small in the tails and large in the middle of the distribution, so tail statistics (like
+    CTE98) stay accurate. Memory use is proportional to :math:`\delta` and the number of time steps, and does not
+    depend on the number of samples. The mean, minimum, and maximum are always exact.
+    """
+
+    compression: int = 200      #: Compression parameter :math:`\delta`.
+
+    count: int                  #: Number of samples.
+    total: ndarray              #: Running sum, by time step.
+    minimum: ndarray            #: Running minimum, by time step.
+    maximum: ndarray            #: Running maximum, by time step.
+    values: ndarray             #: Samples or centroid means, of shape ``(centroids, time steps)``.
+    weights: ndarray            #: Centroid weights, of shape ``(centroids, time steps)``.
+    compressed: bool            #: Whether samples have been compressed into centroids.
+    _buffer: List[ndarray]
+
+    def __init__(
+        self,
+        length: int
+    ):
+
+        """
+        Constructor method. Creates an empty sketch.
+
+        :param length: Number of time steps.
+        """
+
+        self.count = 0
+        self.total = zeros(length)
+        self.minimum = full(length, inf)
+        self.maximum = full(length, -inf)
+        self.values = zeros((0, length))
+        self.weights = zeros((0, length))
+        self.compressed = False
+        self._buffer = []
+
+    def add(
+        self,
+        sample: ndarray
+    ) -> None:
+
+        """
+        Adds a single sample.
+
+        :param sample: Sample values, by time step.
+        :return: Nothing.
+        """
+
+        self.count += 1
+        self.total += sample
+        self.minimum = minimum(self.minimum, sample)
+        self.maximum = maximum(self.maximum, sample)
+
+        self._buffer.append(sample)
+
+        if len(self._buffer) >= self.compression:
+
+            self._flush()
+
+    def merge(
+        self,
+        other: Self
+    ) -> None:
+
+        """
+        Merges another sketch into this sketch.
+
+        :param other: Sketch, with the same number of time steps.
+        :return: Nothing.
+        """
+
+        other._flush()
+        self._flush()
+
+        self.count += other.count
+        self.total += other.total
+        self.minimum = minimum(self.minimum, other.minimum)
+        self.maximum = maximum(self.maximum, other.maximum)
+
+        self.values = vstack([self.values, other.values])
+        self.weights = vstack([self.weights, other.weights])
+        self.compressed = self.compressed or other.compressed
+
+        if self.values.shape[0] > self.compression:
+
+            self._compress()
+
+    def _flush(
+        self
+    ) -> None:
+
+        if not self._buffer:
+
+            return
+
+        self.values = vstack([self.values] + self._buffer)
+        self.weights = vstack([self.weights, ones((len(self._buffer), self.values.shape[1]))])
+        self._buffer = []
+
+        if self.values.shape[0] > self.compression:
+
+            self._compress()
+
+    def _compress(
+        self
+    ) -> None:
+
+        # Sort each time step independently
+        order = argsort(self.values, axis=0, kind='stable')
+        values = take_along_axis(self.values, order, axis=0)
+        weights = take_along_axis(self.weights, order, axis=0)
+
+        # Assign each centroid to a bin, using the k1 scale function at the centroid's quantile
+        total_weight = weights.sum(axis=0)
+        q = (cumsum(weights, axis=0) - weights / 2.0) / total_weight
+        bins = self.compression // 2 + 1
+
+        k = clip(
+            floor(self.compression / (2.0 * pi) * arcsin(2.0 * q - 1.0) + self.compression / 4.0),
+            0,
+            bins - 1
+        ).astype(int)
+
+        # Merge centroids in the same bin, one set of bins per time step
+        length = values.shape[1]
+        flat_bins = (k * length + arange(length)).ravel()
+
+        bin_weights = bincount(flat_bins, weights=weights.ravel(), minlength=bins * length).reshape(bins, length)
+        bin_totals = bincount(
+            flat_bins,
+            weights=(values * weights).ravel(),
+            minlength=bins * length
+        ).reshape(bins, length)
+
+        self.weights = bin_weights
+        self.values = zeros((bins, length))
+        self.values[bin_weights > 0] = bin_totals[bin_weights > 0] / bin_weights[bin_weights > 0]
+        self.compressed = True
+
+    def mean(
+        self
+    ) -> ndarray:
+
+        """
+        Exact mean, by time step.
+
+        :return: Mean.
+        """
+
+        return self.total / self.count
+
+    def quantiles(
+        self,
+        levels: List[float]
+    ) -> ndarray:
+
+        """
+        Quantiles, by time step. Exact (with linear interpolation) until samples are compressed, then estimated by
+        interpolating between centroids.
+
+        :param levels: Quantile levels, between 0 and 1.
+        :return: Quantiles, of shape ``(levels, time steps)``.
+        """
+
+        self._flush()
+
+        if not self.compressed:
+
+            return quantile(self.values, levels, axis=0)
+
+        result = zeros((len(levels), self.values.shape[1]))
+
+        for time_step in range(self.values.shape[1]):
+
+            mask = self.weights[:, time_step] > 0
+            weights = self.weights[mask, time_step]
+            values = self.values[mask, time_step]
+
+            centers = cumsum(weights) - weights / 2.0
+
+            result[:, time_step] = interp(
+                [level * self.count for level in levels],
+                [0.0] + list(centers) + [float(self.count)],
+                [self.minimum[time_step]] + list(values) + [self.maximum[time_step]]
+            )
+
+        return result
+
+    def cte(
+        self,
+        levels: List[float]
+    ) -> ndarray:
+
+        r"""
+        Conditional tail expectations, by time step. :math:`CTE_{\alpha}` is the mean of the highest
+        :math:`1 - \alpha` share of samples. Exact until samples are compressed.
+
+        :param levels: CTE levels :math:`\alpha`, between 0 (inclusive) and 1 (exclusive).
+        :return: Conditional tail expectations, of shape ``(levels, time steps)``.
+        """
+
+        self._flush()
+
+        order = argsort(self.values, axis=0, kind='stable')
+        values = take_along_axis(self.values, order, axis=0)
+        weights = take_along_axis(self.weights, order, axis=0)
+
+        # Weight strictly above each centroid
+        weight_above = self.count - cumsum(weights, axis=0)
+
+        result = zeros((len(levels), self.values.shape[1]))
+
+        for position, level in enumerate(levels):
+
+            tail_weight = (1.0 - level) * self.count
+
+            weight_taken = clip(tail_weight - weight_above, 0.0, weights)
+
+            result[position] = (values * weight_taken).sum(axis=0) / tail_weight
+
+        return result
+
+
+class ScenarioStatistics(
+    Aggregate
+):
+
+    """
+    Stochastic statistics of projection values across economic scenarios, grouped by a configurable set of
+    dimensions. Each group, entity, and variable holds a :class:`QuantileSketch`, so memory use does not depend on
+    the number of scenarios.
+
+    Each scenario is one sample in each group, summed across the model points in the group. Projections that cover
+    only part of a scenario (for example, one model point) are summed into a partial sample, which is added to the
+    sketches once every model point in the scenario has been :meth:`folded in <end_projection>`. Memory use depends
+    on the number of scenarios in progress, not on the total number of scenarios.
+    """
+
+    file_name: str = 'statistics.csv'   #: Output file name.
+
+    percentiles: List[float]            #: Percentile levels to report, between 0 and 1.
+    cte_levels: List[float]             #: CTE levels to report, between 0 (inclusive) and 1 (exclusive).
+    sketches: Dict[Tuple, QuantileSketch]   #: Sketches, by group, entity, and variable.
+    scenario_model_points: Dict[Any, int]   #: Number of model points in each scenario.
+    folded_model_points: Dict[Any, int]     #: Number of model points folded in, by scenario in progress.
+    partial_samples: Dict[Any, Dict[Tuple, ndarray]]    #: Partial samples, by scenario, then group, entity, and variable.
+
+    def __init__(
+        self,
+        group_by: List[str],
+        variables: List[Tuple[str, str]] | None,
+        time_axis: List[date],
+        percentiles: List[float],
+        cte_levels: List[float],
+        scenario_model_points: Dict[Any, int]
+    ):
+
+        """
+        Constructor method. Creates empty statistics.
+
+        :param group_by: Group-by dimension names. Must not include ``scenario``.
+        :param variables: Entity and variable names to summarize. If ``None``, every numeric variable is
+            summarized.
+        :param time_axis: Every time step in the projection, in chronological order.
+        :param percentiles: Percentile levels to report, between 0 and 1.
+        :param cte_levels: CTE levels to report, between 0 (inclusive) and 1 (exclusive).
+        :param scenario_model_points: Number of model points in each scenario, across every projection in the run.
+        """
+
+        if 'scenario' in group_by:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    'Stochastic statistics are calculated across scenarios, and cannot be grouped by scenario !'
+                )
+            )
+
+        Aggregate.__init__(
+            self=self,
+            group_by=group_by,
+            variables=variables,
+            time_axis=time_axis
+        )
+
+        self.percentiles = percentiles
+        self.cte_levels = cte_levels
+        self.sketches = {}
+        self.scenario_model_points = scenario_model_points
+        self.folded_model_points = {}
+        self.partial_samples = {}
+
+    def add(
+        self,
+        group: Tuple,
+        scenario: Any,
+        entity_name: str,
+        variable: str,
+        values: ndarray
+    ) -> None:
+
+        """
+        Adds values for a single variable, already aligned to the shared time axis, to the partial sample of a
+        scenario, for a group and :meth:`entity role <src.system.output.aggregate.Aggregate.entity_role>`. Variables
+        that are not selected are skipped.
+
+        :param group: Group key.
+        :param scenario: Scenario of the projection that produced the values.
+        :param entity_name: Projection entity name.
+        :param variable: Variable name.
+        :param values: Values, one per time step on the shared time axis.
+        :return: Nothing.
+        """
+
+        entity_name = self.entity_role(
+            entity_name=entity_name
+        )
+
+        if self.variables is not None and (entity_name, variable) not in self.variables:
+
+            return
+
+        key = group + (entity_name, variable)
+
+        partial_samples = self.partial_samples.setdefault(scenario, {})
+
+        if key not in partial_samples:
+
+            partial_samples[key] = zeros(len(self.time_axis))
+
+        partial_samples[key] += values
+
+    def end_projection(
+        self,
+        scenario: Any,
+        model_points: int = 1
+    ) -> None:
+
+        """
+        Marks a projection's output as completely folded in. Once every model point in the scenario has been folded
+        in, the scenario's partial samples are added to the sketches.
+
+        :param scenario: Scenario of the projection.
+        :param model_points: Number of model points the projection covers.
+        :return: Nothing.
+        """
+
+        self.folded_model_points[scenario] = self.folded_model_points.get(scenario, 0) + model_points
+
+        self._complete_scenarios()
+
+    def _complete_scenarios(
+        self,
+        incomplete: bool = False
+    ) -> None:
+
+        """
+        Adds the partial samples of every scenario with all its model points folded in to the sketches.
+
+        :param incomplete: Whether to also add the partial samples of scenarios that are still in progress.
+        :return: Nothing.
+        """
+
+        scenarios = set(self.folded_model_points) | set(self.partial_samples) if incomplete else \
+            list(self.folded_model_points)
+
+        for scenario in scenarios:
+
+            if not incomplete and \
+                    self.folded_model_points[scenario] < self.scenario_model_points.get(scenario, 0):
+
+                continue
+
+            for key, sample in self.partial_samples.pop(scenario, {}).items():
+
+                if key not in self.sketches:
+
+                    self.sketches[key] = QuantileSketch(
+                        length=len(self.time_axis)
+                    )
+
+                self.sketches[key].add(
+                    sample=sample
+                )
+
+            self.folded_model_points.pop(scenario, None)
+
+    def merge(
+        self,
+        other: Self
+    ) -> None:
+
+        """
+        Merges other partial statistics into these statistics.
+
+        :param other: Partial statistics, with the same group-by dimensions and time axis.
+        :return: Nothing.
+        """
+
+        for key, sketch in other.sketches.items():
+
+            if key in self.sketches:
+
+                self.sketches[key].merge(
+                    other=sketch
+                )
+
+            else:
+
+                self.sketches[key] = sketch
+
+        for scenario, partial_samples in other.partial_samples.items():
+
+            for key, sample in partial_samples.items():
+
+                if key in self.partial_samples.setdefault(scenario, {}):
+
+                    self.partial_samples[scenario][key] += sample
+
+                else:
+
+                    self.partial_samples[scenario][key] = sample.copy()
+
+        for scenario, model_points in other.folded_model_points.items():
+
+            self.folded_model_points[scenario] = self.folded_model_points.get(scenario, 0) + model_points
+
+        self._complete_scenarios()
+
+    def to_dataframe(
+        self
+    ) -> DataFrame:
+
+        """
+        Summary statistics, with one row per group, entity, variable, and statistic, and one column per time step.
+        Statistics are:
+
+        - ``count``: Number of samples.
+        - ``mean``, ``min``, ``max``: Exact mean, minimum, and maximum.
+        - ``p<level>``: Percentiles, like ``p50`` for the median.
+        - ``cte<level>``: Conditional tail expectations, like ``cte98`` for :math:`CTE_{0.98}`.
+
+        Scenarios that are still in progress, with model points that were never folded in, are added as they are.
+
+        :return: Summary statistics.
+        """
+
+        self._complete_scenarios(
+            incomplete=True
+        )
+
+        rows = []
+        index = []
+
+        for key in sorted(self.sketches):
+
+            sketch = self.sketches[key]
+
+            rows.append(full(len(self.time_axis), float(sketch.count)))
+            index.append(key + ('count',))
+
+            rows.append(sketch.mean())
+            index.append(key + ('mean',))
+
+            rows.append(sketch.minimum)
+            index.append(key + ('min',))
+
+            rows.append(sketch.maximum)
+            index.append(key + ('max',))
+
+            for level, values in zip(self.percentiles, sketch.quantiles(levels=self.percentiles)):
+
+                rows.append(values)
+                index.append(key + (f'p{level * 100:g}',))
+
+            for level, values in zip(self.cte_levels, sketch.cte(levels=self.cte_levels)):
+
+                rows.append(values)
+                index.append(key + (f'cte{level * 100:g}',))
+
+        return DataFrame(
+            data=rows,
+            index=MultiIndex.from_tuples(
+                tuples=index,
+                names=self.group_by + ['entity', 'variable', 'statistic']
+            ) if index else None,
+            columns=self.time_axis
+        )
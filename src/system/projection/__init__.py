@@ -7,11 +7,43 @@ from abc import (
     abstractmethod
 )
 from os.path import join
-
+from os import makedirs
+from numpy import (
+    ndarray,
+    array
+)
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Set,
+    Any
+)
+from src.system.enums import (
+    OutputFormat,
+    OutputScope
+)
 from src.system.projection.parameters import ProjectionParameters
 from src.system.projection.time_steps import TimeSteps
+from src.system.date import calc_partial_years
+from src.system.actuarial_math import discount_factors
 from src.system.data_sources import DataSourcesRoot
 from src.system.projection_entity import ProjectionEntity
+from src.system.output import OutputWriter
+from src.system.output.file_csv import CsvOutputWriter
+from src.system.output.file_npz import NpzOutputWriter
+from src.system.output.file_sqlite import SqliteOutputWriter
+from src.system.output.results_store import ResultsStore
+from src.system.output.aggregate import (
+    Aggregate,
+    AggregateOutputWriter
+)
+from src.system.output.multiple_writers import MultipleOutputWriter
+from src.system.output.present_value import PresentValues
+from src.system.output.spec import OutputSpecWriter
+from src.system.output.shared import SharedOutputWriter
+from src.system.logger import Logger
+from src.system.odometer import span
 
 
 class Projection(
@@ -27,6 +59,8 @@ class Projection(
     time_steps: TimeSteps                           #: Projection-wide timekeeping object.
     data_sources: DataSourcesRoot                   #: Data sources to be read at runtime.
     output_dir_path: str                            #: Output directory path to place projection output.
+    shared_output_owner: Set[Tuple[str, int]]       #: Output keys of the shared output locations this projection writes.
+    streaming_output_writer: OutputWriter | None    #: Output writer that output is streamed to, while running.
 
     def __init__(
         self,
@@ -52,6 +86,9 @@ class Projection(
 
         self.data_sources = data_sources
 
+        self.shared_output_owner = set()
+        self.streaming_output_writer = None
+
     @abstractmethod
     def __str__(
         self
@@ -101,26 +138,458 @@ class Projection(
         Runs the main projection loop, projecting forward one time step at a time.
         :ref:`Override <inheritance_override>` this method to create a custom projection loop.
 
+        If an :attr:`output spec <src.system.projection.parameters.ProjectionParameters.output_spec>` is set,
+        projection values that are not selected stop keeping a value history before the loop starts. The output spec
+        is applied again after each time step, to projection entities created during that time step.
+
+        If output is being :meth:`streamed <stream_output>`, completed time steps are
+        :meth:`flushed <flush_output>` every
+        :attr:`~src.system.projection.parameters.ProjectionParameters.stream_interval` time steps.
+
         :return: Nothing.
         """
 
+        self.apply_output_spec()
+
         for _ in self.time_steps:
 
             self.project_time_step()
 
+            self.apply_output_spec()
+
             if self.halt_projection():
 
                 break
 
-    def write_output(
+            if self.streaming_output_writer is not None and \
+                    (self.time_steps.index + 1) % self.projection_parameters.stream_interval == 0:
+
+                self.flush_output(
+                    output_writer=self.streaming_output_writer
+                )
+
+    def apply_output_spec(
         self
     ) -> None:
 
         """
-        Convenience method that writes output for
-        :class:`projection entity <src.system.projection_entity.ProjectionEntity>` members.
-        Note that this function behaves recursively, and will write output for nested projection entity members as well.
+        Applies the :attr:`output spec <src.system.projection.parameters.ProjectionParameters.output_spec>`, if one is
+        set, to every :class:`~src.system.projection_entity.ProjectionEntity` in this projection that it was not
+        already applied to.
+
+        :return: Nothing.
+        """
+
+        if self.projection_parameters.output_spec is None:
+
+            return
+
+        for attribute in self.__dict__.values():
+
+            if issubclass(type(attribute), ProjectionEntity):
+
+                attribute.apply_output_spec_recursively(
+                    output_spec=self.projection_parameters.output_spec
+                )
+
+    def discount_factors(
+        self
+    ) -> ndarray:
+
+        """
+        Discount factors for every time step in the projection, used to calculate
+        :class:`present values <src.system.output.present_value.PresentValues>`.
+        :ref:`Override <inheritance_override>` this method to discount using scenario rates.
+
+        The default behavior is to discount at the flat
+        :attr:`discount rate <src.system.projection.parameters.ProjectionParameters.discount_rate>`.
+
+        :return: Discount factors, for each time step.
+        """
+
+        return discount_factors(
+            times=array(
+                [
+                    calc_partial_years(
+                        dt1=t,
+                        dt2=self.projection_parameters.start_t
+                    ) for t in self.time_steps.all_t
+                ]
+            ),
+            discount_rate=self.projection_parameters.discount_rate
+        )
+
+    def prepare_aggregates(
+        self,
+        aggregates: List[Aggregate]
+    ) -> None:
+
+        """
+        Prepares aggregates to fold this projection's output. Sets this projection's
+        :meth:`discount factors <discount_factors>` on :class:`present values <src.system.output.present_value.PresentValues>`.
+
+        :param aggregates: Aggregates to fold output into.
+        :return: Nothing.
+        """
+
+        for aggregate in aggregates:
+
+            if isinstance(aggregate, PresentValues):
+
+                discount_factors = self.discount_factors()
+
+                for scenario in {scenario for _, scenario in self.output_keys()}:
+
+                    aggregate.discount(
+                        scenario=scenario,
+                        discount_factors=discount_factors
+                    )
+
+    def output_dimensions(
+        self
+    ) -> Dict[str, Any]:
+
+        """
+        Dimensions that identify this projection's output, by name. Must include ``model_point`` and ``scenario``,
+        and may include others, like ``product_name``. Used to key output in a
+        :class:`run-level results store <src.system.output.results_store.ResultsStore>`, and to group
+        :class:`aggregate output <src.system.output.aggregate.Aggregate>`.
+        :ref:`Override <inheritance_override>` this method to write to a results store or to aggregate output.
+
+        :return: Output dimensions.
+        """
+
+        Logger().raise_expr(
+            expr=NotImplementedError(
+                f'Projection {type(self).__qualname__} does not define output dimensions !'
+            )
+        )
+
+    def output_key(
+        self
+    ) -> Tuple[str, int]:
+
+        """
+        Model point ID and scenario number that identify this projection's output in a
+        :class:`run-level results store <src.system.output.results_store.ResultsStore>`. Taken from
+        :meth:`output_dimensions`.
+
+        :return: Model point ID and scenario number.
+        """
+
+        dimensions = self.output_dimensions()
+
+        return dimensions['model_point'], dimensions['scenario']
+
+    def output_keys(
+        self
+    ) -> List[Tuple[str, int]]:
+
+        """
+        Model point IDs and scenario numbers of every projection output this projection writes.
+        :ref:`Override <inheritance_override>` this method for projections that cover several model points or
+        scenarios.
+
+        The default behavior is to return the single :meth:`output_key`.
+
+        :return: Model point IDs and scenario numbers.
+        """
+
+        return [self.output_key()]
+
+    @staticmethod
+    def shared_output_key(
+        output_scope: OutputScope,
+        output_key: Tuple[str, int]
+    ) -> Tuple[str, int]:
+
+        """
+        Output key of the shared output location for a projection output key and scope. Shared output written to a
+        :class:`run-level results store <src.system.output.results_store.ResultsStore>` uses this key:
+
+        - Model-point scope: the model point ID, with scenario number ``-1``.
+        - Scenario scope: an empty model point ID, with the scenario number.
+
+        :param output_scope: Shared output scope.
+        :param output_key: Model point ID and scenario number of the projection output.
+        :return: Shared output key.
+        """
+
+        model_point_id, scenario_index = output_key
+
+        if output_scope == OutputScope.MODEL_POINT:
+
+            return model_point_id, -1
+
+        return '', scenario_index
+
+    def shared_output_dir_path(
+        self,
+        shared_output_key: Tuple[str, int]
+    ) -> str:
+
+        r"""
+        Directory path of a shared output location, with the following form:
+
+        .. code-block:: text
+
+            \ Model point ID
+                \ shared
+            \ scenarios
+                \ Economic scenario number
+
+        :ref:`Override <inheritance_override>` this method to change the shared output directory structure.
+
+        :param shared_output_key: Output key of the shared output location, from :meth:`shared_output_key`.
+        :return: Shared output directory path.
+        """
+
+        model_point_id, scenario_index = shared_output_key
+
+        if scenario_index == -1:
+
+            return join(
+                self.projection_parameters.output_dir_path,
+                model_point_id,
+                'shared'
+            )
+
+        return join(
+            self.projection_parameters.output_dir_path,
+            'scenarios',
+            str(scenario_index)
+        )
+
+    def _create_shared_output_writer(
+        self,
+        output_dir_path: str,
+        output_key: Tuple[str, int]
+    ) -> OutputWriter:
+
+        if self.projection_parameters.output_format != OutputFormat.SQLITE:
 
+            makedirs(
+                name=output_dir_path,
+                exist_ok=True
+            )
+
+        return self.create_output_writer(
+            output_dir_path=output_dir_path,
+            output_key=output_key
+        )
+
+    def share_output(
+        self,
+        output_writer: OutputWriter,
+        output_key: Tuple[str, int] | None = None
+    ) -> OutputWriter:
+
+        """
+        Wraps a projection output writer, so that projection entities that depend only on the model point, or only
+        on the scenario, are written once to a shared location, if
+        :attr:`~src.system.projection.parameters.ProjectionParameters.share_invariant_output` is turned on. See
+        :class:`~src.system.output.shared.SharedOutputWriter`.
+
+        :param output_writer: Projection output writer.
+        :param output_key: Model point ID and scenario number of the projection output. Defaults to
+            :meth:`output_key`.
+        :return: Output writer.
+        """
+
+        if not self.projection_parameters.share_invariant_output:
+
+            return output_writer
+
+        if output_key is None:
+
+            output_key = self.output_key()
+
+        shared_locations = {}
+
+        for output_scope in (OutputScope.MODEL_POINT, OutputScope.SCENARIO):
+
+            shared_output_key = self.shared_output_key(
+                output_scope=output_scope,
+                output_key=output_key
+            )
+
+            shared_locations[output_scope] = (
+                self.shared_output_dir_path(
+                    shared_output_key=shared_output_key
+                ),
+                shared_output_key,
+                shared_output_key in self.shared_output_owner
+            )
+
+        return SharedOutputWriter(
+            output_writer=output_writer,
+            shared_locations=shared_locations,
+            create_output_writer=self._create_shared_output_writer,
+            write_links=self.projection_parameters.output_format != OutputFormat.SQLITE
+        )
+
+    def create_output_writer(
+        self,
+        output_dir_path: str,
+        output_key: Tuple[str, int] | None = None
+    ) -> OutputWriter:
+
+        """
+        Creates an :class:`output writer <src.system.output.OutputWriter>` for an output directory, using the
+        :attr:`output format <src.system.projection.parameters.ProjectionParameters.output_format>` in the
+        projection parameters. :ref:`Override <inheritance_override>` this method to add a custom output format.
+
+        :param output_dir_path: Output directory path.
+        :param output_key: Model point ID and scenario number, for a results store. Defaults to
+            :meth:`output_key`.
+        :return: Output writer.
+        """
+
+        if self.projection_parameters.output_format == OutputFormat.CSV:
+
+            return CsvOutputWriter(
+                output_dir_path=output_dir_path
+            )
+
+        elif self.projection_parameters.output_format == OutputFormat.NPZ:
+
+            return NpzOutputWriter(
+                output_dir_path=output_dir_path,
+                time_axis=self.time_steps.all_t
+            )
+
+        elif self.projection_parameters.output_format == OutputFormat.SQLITE:
+
+            if output_key is None:
+
+                output_key = self.output_key()
+
+            model_point_id, scenario_index = output_key
+
+            return SqliteOutputWriter(
+                output_dir_path=self.projection_parameters.output_dir_path,
+                results_store=ResultsStore(
+                    path=join(
+                        self.projection_parameters.output_dir_path,
+                        ResultsStore.file_name
+                    )
+                ),
+                model_point_id=model_point_id,
+                scenario_index=scenario_index,
+                time_axis=self.time_steps.all_t
+            )
+
+        else:
+
+            Logger().raise_expr(
+                expr=NotImplementedError(
+                    f'Unhandled output format: {self.projection_parameters.output_format} !'
+                )
+            )
+
+    def select_output(
+        self,
+        output_writer: OutputWriter,
+        subsample: bool = True
+    ) -> OutputWriter:
+
+        """
+        Wraps an output writer, so that it only writes values selected by the
+        :attr:`output spec <src.system.projection.parameters.ProjectionParameters.output_spec>`, if one is set.
+
+        :param output_writer: Output writer.
+        :param subsample: Whether to subsample time steps. Turn off for aggregate output.
+        :return: Output writer.
+        """
+
+        if self.projection_parameters.output_spec is None:
+
+            return output_writer
+
+        return OutputSpecWriter(
+            output_writer=output_writer,
+            output_spec=self.projection_parameters.output_spec,
+            time_axis=self.time_steps.all_t if subsample else None
+        )
+
+    def open_output(
+        self,
+        aggregates: List[Aggregate] | None = None
+    ) -> OutputWriter:
+
+        """
+        Opens an output writer for this projection, which writes seriatim output using an
+        :meth:`output writer <create_output_writer>`, if turned on, and folds output into aggregates (like
+        :class:`stochastic statistics <src.system.output.statistics.ScenarioStatistics>`), if any are provided.
+
+        :param aggregates: Aggregates to fold output into, grouped by :meth:`output_dimensions`.
+        :return: Output writer.
+        """
+
+        output_writers = []
+
+        if self.projection_parameters.write_seriatim:
+
+            output_writers.append(
+                self.select_output(
+                    output_writer=self.share_output(
+                        output_writer=self.create_output_writer(
+                            output_dir_path=self.output_dir_path
+                        )
+                    )
+                )
+            )
+
+        for aggregate in aggregates or []:
+
+            output_writers.append(
+                self.select_output(
+                    output_writer=AggregateOutputWriter(
+                        aggregate=aggregate,
+                        dimensions=self.output_dimensions()
+                    ),
+                    subsample=False
+                )
+            )
+
+        return MultipleOutputWriter(
+            output_writers=output_writers
+        )
+
+    def stream_output(
+        self,
+        aggregates: List[Aggregate] | None = None
+    ) -> None:
+
+        """
+        Streams output while this projection runs, instead of writing it all once the projection finishes. Call
+        before :meth:`run_projection`. Completed time steps are :meth:`flushed <flush_output>` every
+        :attr:`~src.system.projection.parameters.ProjectionParameters.stream_interval` time steps, so projection
+        values only keep the history that later time steps read, and peak memory does not grow with the projection
+        length. Remaining time steps are written by :meth:`write_output`.
+        :ref:`Override <inheritance_override>` this method for projections that do not keep their values in
+        :class:`projection entities <src.system.projection_entity.ProjectionEntity>`.
+
+        :param aggregates: Aggregates to fold output into. Aggregates are only updated by :meth:`write_output`.
+        :return: Nothing.
+        """
+
+        self.streaming_output_writer = self.open_output(
+            aggregates=aggregates
+        )
+
+    @span
+    def flush_output(
+        self,
+        output_writer: OutputWriter
+    ) -> None:
+
+        """
+        Writes values for :class:`projection entity <src.system.projection_entity.ProjectionEntity>` members that
+        have not been written yet, then marks them as written. Note that this function behaves recursively, and will
+        write output for nested projection entity members as well.
+
+        :param output_writer: Output writer.
         :return: Nothing.
         """
 
@@ -128,15 +597,55 @@ class Projection(
 
             if issubclass(type(attribute), ProjectionEntity):
 
-                attribute_output_file_path = join(
-                    self.output_dir_path,
-                    f'{attribute}.csv'
+                attribute.write_projection_values_recursively(
+                    output_writer=output_writer
                 )
 
+                attribute.mark_written_recursively()
+
+    @span
+    def write_output(
+        self,
+        aggregates: List[Aggregate] | None = None
+    ) -> None:
+
+        """
+        Convenience method that writes output for
+        :class:`projection entity <src.system.projection_entity.ProjectionEntity>` members, using an
+        :meth:`output writer <open_output>`, and folds it into aggregates (like
+        :class:`stochastic statistics <src.system.output.statistics.ScenarioStatistics>`), if any are provided.
+        If output is being :meth:`streamed <stream_output>`, only the remaining time steps are written.
+        Note that this function behaves recursively, and will write output for nested projection entity members as well.
+
+        :param aggregates: Aggregates to fold output into, grouped by :meth:`output_dimensions`.
+        :return: Nothing.
+        """
+
+        self.prepare_aggregates(
+            aggregates=aggregates or []
+        )
+
+        if self.streaming_output_writer is not None:
+
+            output_writer = self.streaming_output_writer
+            self.streaming_output_writer = None
+
+        else:
+
+            output_writer = self.open_output(
+                aggregates=aggregates
+            )
+
+        for attribute in self.__dict__.values():
+
+            if issubclass(type(attribute), ProjectionEntity):
+
                 attribute.write_projection_values_recursively(
-                    output_file_path=attribute_output_file_path
+                    output_writer=output_writer
                 )
 
+        output_writer.close()
+
     @abstractmethod
     def setup_output(
         self
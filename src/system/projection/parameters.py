@@ -6,10 +6,21 @@ from os.path import exists
 from json import load
 from datetime import date
 from dateutil.relativedelta import relativedelta
-from typing import Self
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Self,
+    Any
+)
 
 from src.system.logger import Logger
-from src.system.enums import ProcessingType
+from src.system.output.spec import OutputSpec
+from src.system.enums import (
+    ProcessingType,
+    OutputFormat,
+    LoggerLevel
+)
 
 
 class ProjectionParameters:
@@ -30,13 +41,43 @@ class ProjectionParameters:
     resource_dir_path: str                  #: Resource directory path.
     output_dir_path: str                    #: Output directory path.
 
+    # Output
+    output_format: OutputFormat             #: Output format. Controls how projection output is written.
+    write_seriatim: bool                    #: Whether to write output for each projection.
+    share_invariant_output: bool            #: Whether to write scenario- and model-point-invariant entities once.
+    group_by: List[str] | None              #: Aggregate output group-by dimensions. If ``None``, no aggregation.
+    output_spec: OutputSpec | None          #: Values to record and write. If ``None``, every printed value is written.
+    stream_interval: int | None             #: Time steps between output flushes while running. If ``None``, no streaming.
+    aggregate_variables: List[Tuple[str, str]] | None   #: Entity and variable names to aggregate.
+    statistics_group_by: List[str] | None   #: Stochastic statistics group-by dimensions. If ``None``, no statistics.
+    percentiles: List[float]                #: Stochastic statistics percentile levels, between 0 and 1.
+    cte_levels: List[float]                 #: Stochastic statistics CTE levels, between 0 and 1.
+    present_value_variables: List[Tuple[str, str]] | None   #: Cash flows to discount. If ``None``, no present values.
+    present_value_group_by: List[str]       #: Present value group-by dimensions.
+    discount_rate: float                    #: Flat, annual effective discount rate.
+    discount_index: str | None              #: Economic scenario accumulation index to discount with, if set.
+
     # Processing
     processing_type: ProcessingType         #: Processing type. Controls how the projection is run and distributed.
+    output_threads: int                     #: Background output writer threads per process. If ``0``, none.
+    output_queue_size: int                  #: Finished projections that can wait for a background output writer.
+    profile: bool                           #: Whether to profile projection phases.
+    track_memory: bool                      #: Whether to record each projection's memory use.
+    count_operations: bool                  #: Whether to count hot-path operations.
+    bundle_data_sources: bool               #: Whether to load assumption data sources from a compiled bundle.
+    data_source_threads: int                #: Threads that load data sources concurrently. If ``1``, one at a time.
+    log_level: LoggerLevel                  #: Minimum logging level. Lower-level messages are dropped.
 
     # Projection
     projection: str                         #: Projection import path.
     data_source: str                        #: Data source import path.
 
+    # Selection
+    scenarios: List[range] | None           #: Economic scenario number ranges to run. If ``None``, runs all scenarios.
+    model_point_ids: List[str] | None       #: Model point IDs to run. If ``None``, runs all model points.
+    model_point_filter: Dict[str, Any] | None   #: Model point fields and values to match. If ``None``, no filter.
+    shard: Tuple[int, int] | None           #: Shard spec ``(n, k)``: runs shard ``k`` of ``n``. If ``None``, runs all.
+
     def __init__(
         self,
         start_t: date,
@@ -46,7 +87,33 @@ class ProjectionParameters:
         output_dir_path: str,
         processing_type: ProcessingType,
         projection: str,
-        data_source: str
+        data_source: str,
+        scenarios: List[range] | None = None,
+        model_point_ids: List[str] | None = None,
+        model_point_filter: Dict[str, Any] | None = None,
+        shard: Tuple[int, int] | None = None,
+        output_format: OutputFormat = OutputFormat.CSV,
+        write_seriatim: bool = True,
+        share_invariant_output: bool = False,
+        output_spec: OutputSpec | None = None,
+        stream_interval: int | None = None,
+        group_by: List[str] | None = None,
+        aggregate_variables: List[Tuple[str, str]] | None = None,
+        statistics_group_by: List[str] | None = None,
+        percentiles: List[float] | None = None,
+        cte_levels: List[float] | None = None,
+        present_value_variables: List[Tuple[str, str]] | None = None,
+        present_value_group_by: List[str] | None = None,
+        discount_rate: float = 0.0,
+        discount_index: str | None = None,
+        output_threads: int = 0,
+        output_queue_size: int = 2,
+        profile: bool = False,
+        track_memory: bool = False,
+        count_operations: bool = False,
+        bundle_data_sources: bool = False,
+        data_source_threads: int = 1,
+        log_level: LoggerLevel = LoggerLevel.MESSAGE
     ):
         """
         Constructor method. Initializes all variables in this class.
@@ -59,6 +126,72 @@ class ProjectionParameters:
         :param processing_type: Processing type.
         :param projection: Projection import path.
         :param data_source: Data source import path.
+        :param scenarios: Economic scenario number ranges to run.
+        :param model_point_ids: Model point IDs to run.
+        :param model_point_filter: Model point fields and values to match, using values as written in the model
+            point file.
+        :param shard: Shard spec ``(n, k)``. Splits the model point and scenario cross-product into ``n``
+            contiguous, near-equal shards, then runs shard ``k`` (starting at zero).
+        :param output_format: Output format.
+        :param write_seriatim: Whether to write output for each projection. Turn off to produce aggregate output
+            only.
+        :param share_invariant_output: Whether to write projection entities that depend only on the scenario, or only
+            on the model point, once per scenario or once per model point, instead of once per projection. Requires
+            seriatim output. See :class:`~src.system.output.shared.SharedOutputWriter`.
+        :param output_spec: Projection values to record and write, and time steps to write. Values that are not
+            selected skip history retention and output entirely.
+        :param stream_interval: If set, output is streamed while each projection runs, flushing completed time
+            steps every ``stream_interval`` time steps, and projection values only keep the history that later time
+            steps read. Keeps peak memory flat for long projections. See
+            :meth:`~src.system.projection.Projection.stream_output`.
+        :param group_by: Aggregate output group-by dimensions, like ``product_name``, ``product_type``, or
+            ``scenario``. If set, projection output is aggregated as projections finish. See
+            :class:`~src.system.output.aggregate.Aggregate`.
+        :param aggregate_variables: Entity and variable names to aggregate, like ``('contract', 'account_value')``.
+            Entities are named by :meth:`role <src.system.output.aggregate.Aggregate.entity_role>`, without instance
+            IDs, like ``('contract.account', 'account_value')``. If ``None``, every numeric variable is aggregated.
+            Also selects the variables summarized by stochastic statistics. Requires ``group_by`` or
+            ``statistics_group_by``.
+        :param statistics_group_by: Stochastic statistics group-by dimensions. Must not include ``scenario``. If
+            set (even to an empty list, which summarizes the whole run), statistics across scenarios are calculated
+            as projections finish. See :class:`~src.system.output.statistics.ScenarioStatistics`.
+        :param percentiles: Stochastic statistics percentile levels, between 0 and 1. Defaults to 1%, 5%, 50%, 95%,
+            and 99%.
+        :param cte_levels: Stochastic statistics CTE levels, between 0 (inclusive) and 1 (exclusive). Defaults to
+            CTE70 and CTE98.
+        :param present_value_variables: Entity and variable names of cash flows to discount, like
+            ``('contract.riders.gmdb', 'gmdb_charge')``, with entities named by
+            :meth:`role <src.system.output.aggregate.Aggregate.entity_role>`. If set, present values and durations are
+            calculated as projections finish. See :class:`~src.system.output.present_value.PresentValues`.
+        :param present_value_group_by: Present value group-by dimensions. Defaults to ``model_point`` and
+            ``scenario``, which calculates one present value for each projection.
+        :param discount_rate: Flat, annual effective discount rate.
+        :param discount_index: Economic scenario rate to discount with, like a money market index. Index values are
+            treated as an accumulation index, so the discount factor at time :math:`t` is :math:`I_{0} / I_{t}`. If
+            set, the flat discount rate must be left at zero.
+        :param output_threads: Number of background threads in each process that write output for finished
+            projections, while the next projection runs. If ``0``, output is written before the next projection
+            starts. See :class:`~src.system.projection.processor.background_output.BackgroundOutput`.
+        :param output_queue_size: Number of finished projections that can wait for a background output writer
+            thread. Once the queue is full, the next finished projection waits for space.
+        :param profile: Whether to profile projection phases, like crediting interest or updating decrements. If
+            set, writes a per-phase report and a flame graph file to the output directory. See
+            :class:`~src.system.odometer.Profiler`.
+        :param track_memory: Whether to record the memory each projection allocates, and each process's peak
+            resident set size. If set, writes a memory report to the output directory, and logs a recommended number
+            of CPU's. Slows down projections. See :class:`~src.system.projection.processor.memory.MemoryReport`.
+        :param count_operations: Whether to count hot-path operations, like projection value writes and data source
+            lookups, and how often a lookup repeats within a projection. If set, writes a counter report to the
+            output directory. See :class:`~src.system.odometer.Counters`.
+        :param bundle_data_sources: Whether to load assumption data sources, like mortality and product tables, from
+            a compiled bundle in the resource directory, instead of parsing their files. The bundle is written on the
+            first run, and any assumption whose files change is parsed again. See
+            :class:`~src.system.data_sources.bundle.DataSourceBundle`.
+        :param data_source_threads: Number of threads that load data sources, like economic scenarios, model points
+            and assumption tables, concurrently at startup. If ``1``, data sources are loaded one at a time. See
+            :meth:`~src.system.data_sources.namespace.DataSourceNamespace.load_data_sources`.
+        :param log_level: Minimum logging level, in every process. Lower-level messages are dropped before they are
+            formatted.
         """
 
         # Time
@@ -71,13 +204,233 @@ class ProjectionParameters:
         self.resource_dir_path = resource_dir_path
         self.output_dir_path = output_dir_path
 
+        # Output
+        self.output_format = output_format
+        self.write_seriatim = write_seriatim
+        self.share_invariant_output = share_invariant_output
+        self.output_spec = output_spec
+        self.stream_interval = stream_interval
+        self.group_by = group_by
+        self.aggregate_variables = aggregate_variables
+        self.statistics_group_by = statistics_group_by
+        self.percentiles = [0.01, 0.05, 0.5, 0.95, 0.99] if percentiles is None else percentiles
+        self.cte_levels = [0.7, 0.98] if cte_levels is None else cte_levels
+        self.present_value_variables = present_value_variables
+        self.present_value_group_by = ['model_point', 'scenario'] if present_value_group_by is None \
+            else present_value_group_by
+        self.discount_rate = discount_rate
+        self.discount_index = discount_index
+
         # Processing
         self.processing_type = processing_type
+        self.output_threads = output_threads
+        self.output_queue_size = output_queue_size
+        self.profile = profile
+        self.track_memory = track_memory
+        self.count_operations = count_operations
+        self.bundle_data_sources = bundle_data_sources
+        self.data_source_threads = data_source_threads
+        self.log_level = log_level
+
+        if self.stream_interval is not None and self.stream_interval < 1:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid stream interval: {self.stream_interval} ! Expected an interval >= 1.'
+                )
+            )
+
+        if self.output_threads < 0 or self.output_queue_size < 1:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid output threads: {self.output_threads}, or output queue size: '
+                    f'{self.output_queue_size} ! Expected threads >= 0 and queue size >= 1.'
+                )
+            )
+
+        if self.data_source_threads < 1:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid data source threads: {self.data_source_threads} ! Expected threads >= 1.'
+                )
+            )
+
+        if self.start_t + self.time_step <= self.start_t or self.end_t < self.start_t:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid time step: {self.time_step}, or projection length: {self.projection_length} ! '
+                    f'Expected a time step that moves forward, and a projection length that is not negative.'
+                )
+            )
+
+        if self.share_invariant_output and not self.write_seriatim:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    'Shared invariant output is only written with seriatim output ! Turn on write_seriatim, or turn '
+                    'off share_invariant_output.'
+                )
+            )
+
+        if self.aggregate_variables is not None and self.group_by is None and self.statistics_group_by is None:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    'Aggregate variables are set, but neither aggregate output nor stochastic statistics are turned '
+                    'on ! Set group_by or statistics_group_by.'
+                )
+            )
+
+        if self.statistics_group_by is not None and 'scenario' in self.statistics_group_by:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    'Stochastic statistics are calculated across scenarios, and cannot be grouped by scenario !'
+                )
+            )
+
+        if not all(0.0 <= percentile <= 1.0 for percentile in self.percentiles) or \
+                not all(0.0 <= cte_level < 1.0 for cte_level in self.cte_levels):
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid percentiles: {self.percentiles}, or CTE levels: {self.cte_levels} ! Expected '
+                    f'percentiles between 0 and 1, and CTE levels between 0 (inclusive) and 1 (exclusive).'
+                )
+            )
+
+        if self.discount_rate <= -1.0:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid discount rate: {self.discount_rate} ! Expected a rate > -1.'
+                )
+            )
+
+        if self.discount_index is not None and self.discount_rate != 0.0:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Both a discount index: {self.discount_index}, and a discount rate: {self.discount_rate} are '
+                    f'set ! The discount index overrides the discount rate, so set only one.'
+                )
+            )
 
         # Projection
         self.projection = projection
         self.data_source = data_source
 
+        # Selection
+        self.scenarios = scenarios
+        self.model_point_ids = model_point_ids
+        self.model_point_filter = model_point_filter
+        self.shard = shard
+
+        if self.scenarios is not None and \
+                (len(self.scenarios) == 0 or any(
+                    len(scenario_range) == 0 or scenario_range.start < 0 for scenario_range in self.scenarios
+                )):
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    f'Invalid scenario ranges: {self.scenarios} ! Expected at least one range, and ranges that are not '
+                    f'empty and start at scenario 0 or later.'
+                )
+            )
+
+        if self.model_point_ids is not None and len(self.model_point_ids) == 0:
+
+            Logger().raise_expr(
+                expr=ValueError(
+                    'No model point IDs selected ! Use None to run all model points.'
+                )
+            )
+
+        if self.shard is not None:
+
+            shard_count, shard_index = self.shard
+
+            if shard_count < 1 or not 0 <= shard_index < shard_count:
+
+                Logger().raise_expr(
+                    expr=ValueError(
+                        f'Invalid shard spec: {self.shard} ! Expected (n, k), where n >= 1 and 0 <= k < n.'
+                    )
+                )
+
+    def select_scenario(
+        self,
+        scenario_index: int
+    ) -> bool:
+
+        """
+        Checks whether an economic scenario falls within the :attr:`scenario ranges <scenarios>` to run.
+
+        :param scenario_index: Scenario number.
+        :return: Whether the scenario is selected.
+        """
+
+        if self.scenarios is None:
+
+            return True
+
+        return any(scenario_index in scenario_range for scenario_range in self.scenarios)
+
+    def select_model_point(
+        self,
+        data: Dict[str, Any]
+    ) -> bool:
+
+        """
+        Checks whether a model point matches the :attr:`model point IDs <model_point_ids>` and
+        :attr:`model point filter <model_point_filter>` to run. Checks use unparsed model point data, so that
+        excluded model points are never parsed.
+
+        :param data: Unparsed data for a single model point.
+        :return: Whether the model point is selected.
+        """
+
+        if self.model_point_ids is not None and data['id'] not in self.model_point_ids:
+
+            return False
+
+        if self.model_point_filter is not None:
+
+            for field, value in self.model_point_filter.items():
+
+                if data[field] != value:
+
+                    return False
+
+        return True
+
+    def shard_range(
+        self,
+        count: int
+    ) -> range:
+
+        """
+        Positions of the run configurations that belong to this :attr:`shard`, out of ``count`` run configurations.
+        Shards are contiguous and near-equal in size, so the same spec always selects the same positions.
+
+        :param count: Total number of run configurations, across all shards.
+        :return: Run configuration positions in this shard.
+        """
+
+        if self.shard is None:
+
+            return range(count)
+
+        shard_count, shard_index = self.shard
+
+        return range(
+            count * shard_index // shard_count,
+            count * (shard_index + 1) // shard_count
+        )
+
     @classmethod
     def from_json(
         cls,
@@ -89,6 +442,10 @@ class ProjectionParameters:
         `deserializing <https://en.wikipedia.org/wiki/Serialization>`_ a
         `JSON file <https://en.wikipedia.org/wiki/JSON>`_.
 
+        Selection and output keys are optional. Scenario ranges are written as inclusive ``[first, last]`` pairs,
+        the shard spec is written as ``[n, k]``, and aggregate and present value variables are written as
+        ``[entity, variable]`` pairs.
+
         :param path: Input JSON file path.
         :return: Instance of this class.
         """
@@ -129,7 +486,50 @@ class ProjectionParameters:
                 json_payload['processing_type']
             ),
             projection=json_payload['projection'],
-            data_source=json_payload['data_source']
+            data_source=json_payload['data_source'],
+            scenarios=[
+                range(
+                    int(first_scenario),
+                    int(last_scenario) + 1
+                ) for first_scenario, last_scenario in json_payload['scenarios']
+            ] if 'scenarios' in json_payload else None,
+            model_point_ids=json_payload.get('model_point_ids'),
+            model_point_filter=json_payload.get('model_point_filter'),
+            shard=tuple(
+                int(value) for value in json_payload['shard']
+            ) if 'shard' in json_payload else None,
+            output_format=OutputFormat(
+                json_payload.get('output_format', OutputFormat.CSV)
+            ),
+            write_seriatim=bool(json_payload.get('write_seriatim', True)),
+            share_invariant_output=bool(json_payload.get('share_invariant_output', False)),
+            output_spec=OutputSpec.from_dict(
+                payload=json_payload['output_spec']
+            ) if 'output_spec' in json_payload else None,
+            stream_interval=int(json_payload['stream_interval']) if 'stream_interval' in json_payload else None,
+            group_by=json_payload.get('group_by'),
+            aggregate_variables=[
+                (entity, variable) for entity, variable in json_payload['aggregate_variables']
+            ] if 'aggregate_variables' in json_payload else None,
+            statistics_group_by=json_payload.get('statistics_group_by'),
+            percentiles=json_payload.get('percentiles'),
+            cte_levels=json_payload.get('cte_levels'),
+            present_value_variables=[
+                (entity, variable) for entity, variable in json_payload['present_value_variables']
+            ] if 'present_value_variables' in json_payload else None,
+            present_value_group_by=json_payload.get('present_value_group_by'),
+            discount_rate=float(json_payload.get('discount_rate', 0.0)),
+            discount_index=json_payload.get('discount_index'),
+            output_threads=int(json_payload.get('output_threads', 0)),
+            output_queue_size=int(json_payload.get('output_queue_size', 2)),
+            profile=bool(json_payload.get('profile', False)),
+            track_memory=bool(json_payload.get('track_memory', False)),
+            count_operations=bool(json_payload.get('count_operations', False)),
+            bundle_data_sources=bool(json_payload.get('bundle_data_sources', False)),
+            data_source_threads=int(json_payload.get('data_source_threads', 1)),
+            log_level=LoggerLevel(
+                json_payload.get('log_level', LoggerLevel.MESSAGE)
+            )
         )
 
         return projection_parameters
@@ -11,13 +11,37 @@ from typing import (
     Type
 )
 from copy import deepcopy
-from os.path import splitext
+from collections import Counter
+from os.path import (
+    join,
+    splitext
+)
 from importlib import import_module
 
 from src.system.projection import Projection
 from src.system.projection.parameters import ProjectionParameters
+from src.system.projection.time_steps import TimeSteps
+from src.system.output.results_store import ResultsStore
+from src.system.output.aggregate import Aggregate
+from src.system.output.statistics import ScenarioStatistics
+from src.system.output.present_value import PresentValues
+from src.system.projection.processor.background_output import BackgroundOutput
+from src.system.projection.processor.memory import (
+    MemoryReport,
+    MemoryTracker
+)
+from src.system.enums import (
+    OutputFormat,
+    OutputScope,
+    LoggerLevel
+)
 from src.system.data_sources import DataSourcesRoot
 from src.system.logger import Logger
+from src.system.odometer import (
+    Profile,
+    Counts,
+    Counters
+)
 
 
 class ProjectionProcessor(
@@ -32,6 +56,9 @@ class ProjectionProcessor(
     projections: List[Projection]   #: List of :class:`projections <src.system.projection.Projection>` to run.
     data_sources: DataSourcesRoot   #: Data sources to be read at runtime.
     projection: Type                #: :class:`~src.system.projection.Projection` class definition.
+    aggregates: List[Aggregate]     #: Aggregate output, like aggregate totals and stochastic statistics, if turned on.
+    memory_tracker: MemoryTracker | None    #: Memory tracker for this process, if memory tracking is turned on.
+    recommended_cpus: int | None    #: Recommended number of CPU's, once a run with memory tracking has finished.
 
     def __init__(
         self,
@@ -47,6 +74,10 @@ class ProjectionProcessor(
 
         self.projection_parameters = projection_parameters
 
+        Logger().set_level(
+            level=self.projection_parameters.log_level
+        )
+
         # Create data sources
         Logger().print(
             message=f'Compiling data sources from: {self.projection_parameters.data_source} ...'
@@ -68,16 +99,86 @@ class ProjectionProcessor(
         )
 
         self.projections = []
+        self.recommended_cpus = None
+
+        if self.projection_parameters.track_memory:
+
+            self.memory_tracker = MemoryTracker()
+
+        else:
+
+            self.memory_tracker = None
 
         for configured_data_sources in self.data_sources.configured_data_sources():
 
-            self.projections.append(
-                self.projection(
-                    projection_parameters=self.projection_parameters,
-                    data_sources=deepcopy(
-                        configured_data_sources
+            if self.memory_tracker is not None:
+
+                self.projections.append(
+                    self.memory_tracker.measure_size(
+                        create_projection=lambda: self.projection(
+                            projection_parameters=self.projection_parameters,
+                            data_sources=deepcopy(
+                                configured_data_sources
+                            )
+                        )
+                    )
+                )
+
+            else:
+
+                self.projections.append(
+                    self.projection(
+                        projection_parameters=self.projection_parameters,
+                        data_sources=deepcopy(
+                            configured_data_sources
+                        )
                     )
                 )
+
+        # Create aggregates
+        self.aggregates = []
+
+        time_axis = TimeSteps(
+            start_t=self.projection_parameters.start_t,
+            end_t=self.projection_parameters.end_t,
+            time_step=self.projection_parameters.time_step
+        ).all_t
+
+        if self.projection_parameters.group_by is not None:
+
+            self.aggregates.append(
+                Aggregate(
+                    group_by=self.projection_parameters.group_by,
+                    variables=self.projection_parameters.aggregate_variables,
+                    time_axis=time_axis
+                )
+            )
+
+        if self.projection_parameters.statistics_group_by is not None:
+
+            self.aggregates.append(
+                ScenarioStatistics(
+                    group_by=self.projection_parameters.statistics_group_by,
+                    variables=self.projection_parameters.aggregate_variables,
+                    time_axis=time_axis,
+                    percentiles=self.projection_parameters.percentiles,
+                    cte_levels=self.projection_parameters.cte_levels,
+                    scenario_model_points=Counter(
+                        scenario
+                        for projection in self.projections
+                        for _, scenario in projection.output_keys()
+                    )
+                )
+            )
+
+        if self.projection_parameters.present_value_variables is not None:
+
+            self.aggregates.append(
+                PresentValues(
+                    group_by=self.projection_parameters.present_value_group_by,
+                    variables=self.projection_parameters.present_value_variables,
+                    time_axis=time_axis
+                )
             )
 
     @staticmethod
@@ -107,21 +208,64 @@ class ProjectionProcessor(
 
     @staticmethod
     def run_projection(
-        projection: Projection
+        projection: Projection,
+        aggregates: List[Aggregate] | None = None,
+        background_output: BackgroundOutput | None = None,
+        memory_tracker: MemoryTracker | None = None
     ) -> None:
 
         """
-        Runs a single projection and writes output.
+        Runs a single projection and writes output. If background output is provided, output is handed off to be
+        written on a background thread instead, and folded into the background output's aggregates. If
+        :attr:`~src.system.projection.parameters.ProjectionParameters.stream_interval` is set, output is
+        :meth:`streamed <src.system.projection.Projection.stream_output>` while the projection runs.
 
         :param projection: Projection to run.
+        :param aggregates: Aggregates to fold the projection's output into.
+        :param background_output: Background output writer threads.
+        :param memory_tracker: Memory tracker that records the projection's memory use.
         :return: Nothing.
         """
 
+        if memory_tracker is not None:
+
+            memory_tracker.begin()
+
         # Run projection
+        if projection.projection_parameters.stream_interval is not None:
+
+            projection.stream_output(
+                aggregates=aggregates
+            )
+
         projection.run_projection()
 
+        if memory_tracker is not None:
+
+            memory_tracker.projected()
+
         # Write output
-        projection.write_output()
+        if background_output is not None:
+
+            background_output.submit(
+                projection=projection
+            )
+
+        else:
+
+            projection.write_output(
+                aggregates=aggregates
+            )
+
+        if memory_tracker is not None:
+
+            memory_tracker.end(
+                projection=projection
+            )
+
+        if Counters.enabled:
+
+            Counters().end_projection()
 
     def setup_output(
         self
@@ -129,7 +273,12 @@ class ProjectionProcessor(
 
         """
         Calls :meth:`~src.system.projection.Projection.setup_output` for each projection in
-        :attr:`~src.system.projection.processor.ProjectionProcessor.projections`.
+        :attr:`~src.system.projection.processor.ProjectionProcessor.projections`. If output is written to a
+        :class:`run-level results store <src.system.output.results_store.ResultsStore>`, creates the store first.
+
+        If :attr:`~src.system.projection.parameters.ProjectionParameters.share_invariant_output` is turned on, also
+        assigns each shared output location to a single projection, which writes it. Locations are assigned here,
+        serially and in projection order, so that each one is written exactly once, even across processes.
 
         :return: Nothing.
         """
@@ -138,10 +287,175 @@ class ProjectionProcessor(
             message=f'Setting up projection output ...'
         )
 
+        if self.projection_parameters.output_format == OutputFormat.SQLITE:
+
+            ResultsStore.create(
+                path=join(
+                    self.projection_parameters.output_dir_path,
+                    ResultsStore.file_name
+                ),
+                time_axis=TimeSteps(
+                    start_t=self.projection_parameters.start_t,
+                    end_t=self.projection_parameters.end_t,
+                    time_step=self.projection_parameters.time_step
+                ).all_t
+            )
+
+        if self.projection_parameters.share_invariant_output:
+
+            assigned = set()
+
+            for projection in self.projections:
+
+                for output_key in projection.output_keys():
+
+                    for output_scope in (OutputScope.MODEL_POINT, OutputScope.SCENARIO):
+
+                        shared_output_key = projection.shared_output_key(
+                            output_scope=output_scope,
+                            output_key=output_key
+                        )
+
+                        if shared_output_key not in assigned:
+
+                            assigned.add(shared_output_key)
+                            projection.shared_output_owner.add(shared_output_key)
+
         for projection in self.projections:
 
             projection.setup_output()
 
+    def write_aggregates(
+        self
+    ) -> None:
+
+        """
+        Writes each of the :attr:`aggregates` to the output directory.
+
+        :return: Nothing.
+        """
+
+        for aggregate in self.aggregates:
+
+            Logger().print(
+                message=f'Writing aggregate output to: {aggregate.file_name} ...'
+            )
+
+            aggregate.write(
+                output_dir_path=self.projection_parameters.output_dir_path
+            )
+
+    def write_profile(
+        self,
+        profile: Profile
+    ) -> None:
+
+        """
+        Writes a :class:`profile <src.system.odometer.Profile>` of projection phases to the output directory, and
+        logs the time spent in each outermost phase.
+
+        :param profile: Profile, merged across every process.
+        :return: Nothing.
+        """
+
+        Logger().print(
+            message=f'Writing profile to: {Profile.report_file_name}, {Profile.folded_file_name} ...'
+        )
+
+        profile.write(
+            output_dir_path=self.projection_parameters.output_dir_path
+        )
+
+        if not Logger().enabled(level=LoggerLevel.MESSAGE):
+
+            return
+
+        report = profile.to_dataframe()
+
+        for _, row in report[report['depth'] <= 1].iterrows():
+
+            Logger().print(
+                message=f'{"  " * row["depth"]}{row["span"]}: {row["total_ns"] / 1e9:.3f} s '
+                        f'({row["share"]:.1%}, {row["calls"]} calls)'
+            )
+
+    def write_counters(
+        self,
+        counts: Counts
+    ) -> None:
+
+        """
+        Writes :class:`counts <src.system.odometer.Counts>` of hot-path operations to the output directory, and logs
+        the most frequent operations.
+
+        :param counts: Counts, merged across every process.
+        :return: Nothing.
+        """
+
+        Logger().print(
+            message=f'Writing counters to: {Counts.report_file_name} ...'
+        )
+
+        counts.write(
+            output_dir_path=self.projection_parameters.output_dir_path
+        )
+
+        if not Logger().enabled(level=LoggerLevel.MESSAGE):
+
+            return
+
+        report = counts.to_dataframe()
+
+        for _, row in report.head(10).iterrows():
+
+            Logger().print(
+                message=f'{row["counter"]}: {row["count"]} calls ({row["per_projection"]:.1f} per projection, '
+                        f'{row["hit_rate"]:.1%} repeated)'
+            )
+
+    def write_memory_report(
+        self,
+        memory_report: MemoryReport
+    ) -> None:
+
+        """
+        Writes a :class:`memory report <src.system.projection.processor.memory.MemoryReport>` to the output
+        directory, then sets and logs :attr:`recommended_cpus`, which can be passed to
+        :meth:`~src.system.projection.processor.multiple_process.MultiProcessProjectionProcessor.run_projections` for
+        the next run of a similar size.
+
+        :param memory_report: Memory report, merged across every process.
+        :return: Nothing.
+        """
+
+        Logger().print(
+            message=f'Writing memory report to: {MemoryReport.report_file_name}, '
+                    f'{MemoryReport.process_file_name} ...'
+        )
+
+        memory_report.write(
+            output_dir_path=self.projection_parameters.output_dir_path
+        )
+
+        projections_in_flight = 1
+
+        if self.projection_parameters.output_threads > 0:
+
+            projections_in_flight += self.projection_parameters.output_threads + \
+                self.projection_parameters.output_queue_size
+
+        self.recommended_cpus = memory_report.recommend_cpus(
+            projections_in_flight=projections_in_flight,
+            projection_count=len(self.projections)
+        )
+
+        Logger().print(
+            message=lambda: f'Largest projection footprint: {memory_report.projection_footprint() / 2 ** 20:.1f} MiB, '
+                            f'peak process RSS: '
+                            f'{max(peak for _, peak, _ in memory_report.processes.values()) / 2 ** 20:.1f} MiB, '
+                            f'recommended CPU\'s: {self.recommended_cpus}'
+        )
+
     @abstractmethod
     def run_projections(
         self
@@ -0,0 +1,148 @@
+"""
+Background output writing for finished :class:`projections <src.system.projection.Projection>`.
+"""
+
+from queue import Queue
+from threading import Thread
+from traceback import format_exc
+from typing import List
+
+from src.system.projection import Projection
+from src.system.output.aggregate import Aggregate
+from src.system.logger import Logger
+from src.system.enums import LoggerLevel
+
+
+class BackgroundOutput:
+
+    """
+    Writes output for finished :class:`projections <src.system.projection.Projection>` on background threads, so
+    that output is serialized and written to disk while the next projection runs.
+
+    Finished projections wait in a bounded queue. Once the queue is full, :meth:`submit` blocks until a writer
+    thread takes a projection from the queue, so finished projections do not pile up in memory when output is
+    slower than the projections themselves.
+
+    Output is written concurrently. Only folding a projection's output into an aggregate is serialized, using the
+    aggregate's :attr:`~src.system.output.aggregate.Aggregate.lock`, so seriatim output is never held up by another
+    thread's folding.
+
+    If a projection's output fails to write, the error is logged right away and the writer threads keep draining the
+    queue. Once every projection has been written, :meth:`close` raises an error.
+    """
+
+    aggregates: List[Aggregate]     #: Aggregates to fold projection output into.
+    queue: Queue                    #: Finished projections waiting to be written.
+    threads: List[Thread]           #: Writer threads.
+    errors: List[BaseException]     #: Errors raised while writing output, in order.
+
+    def __init__(
+        self,
+        aggregates: List[Aggregate] | None = None,
+        threads: int = 1,
+        queue_size: int = 2
+    ):
+
+        """
+        Constructor method. Starts the writer threads.
+
+        :param aggregates: Aggregates to fold projection output into.
+        :param threads: Number of writer threads.
+        :param queue_size: Number of finished projections that can wait to be written.
+        """
+
+        self.aggregates = aggregates or []
+        self.queue = Queue(
+            maxsize=queue_size
+        )
+        self.errors = []
+
+        self.threads = [
+            Thread(
+                target=self._write,
+                name=f'output-writer-{thread}',
+                daemon=True
+            ) for thread in range(threads)
+        ]
+
+        for thread in self.threads:
+
+            thread.start()
+
+    def _write(
+        self
+    ) -> None:
+
+        while True:
+
+            projection = self.queue.get()
+
+            if projection is None:
+
+                self.queue.task_done()
+
+                break
+
+            try:
+
+                projection.write_output(
+                    aggregates=self.aggregates
+                )
+
+            except Exception as error:
+
+                Logger().print(
+                    message=f'Failed to write output for projection: {projection} !\n{format_exc()}',
+                    level=LoggerLevel.ERROR
+                )
+
+                self.errors.append(error)
+
+            self.queue.task_done()
+
+    def submit(
+        self,
+        projection: Projection
+    ) -> None:
+
+        """
+        Queues a finished projection to be written. Blocks while the queue is full.
+
+        :param projection: Finished projection.
+        :return: Nothing.
+        """
+
+        self.queue.put(
+            item=projection
+        )
+
+    def close(
+        self
+    ) -> None:
+
+        """
+        Waits for every queued projection to be written, then stops the writer threads. Raises an error if any
+        projection's output failed to write.
+
+        :return: Nothing.
+        """
+
+        for _ in self.threads:
+
+            self.queue.put(
+                item=None
+            )
+
+        for thread in self.threads:
+
+            thread.join()
+
+        self.threads = []
+
+        if self.errors:
+
+            Logger().raise_expr(
+                expr=RuntimeError(
+                    f'Failed to write output for {len(self.errors)} projection(s) ! First error: {self.errors[0]!r}'
+                )
+            )
@@ -0,0 +1,424 @@
+"""
+Memory accounting for :class:`projections <src.system.projection.Projection>`.
+"""
+
+from os import getpid
+from os.path import join
+from statistics import median
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Tuple,
+    Self
+)
+import tracemalloc
+
+from pandas import DataFrame
+
+from src.system.projection import Projection
+if TYPE_CHECKING:
+    from psutil import Process
+
+
+class MemoryReport:
+
+    """
+    Memory used by each :class:`projection <src.system.projection.Projection>`, and by each process that runs
+    projections. Reports from different processes can be :meth:`merged <merge>`.
+
+    Projection memory is measured with
+    `tracemalloc <https://docs.python.org/3/library/tracemalloc.html>`_, which counts Python and NumPy allocations:
+
+    - Size: Bytes allocated to create the projection, including its deep-copied data sources.
+    - Peak: Highest bytes allocated, above the starting point, while the projection runs and writes output.
+    - Retained: Bytes still allocated once the projection has run, before output is written. This is mostly value
+      histories, which grow with the number of projection values and the projection length.
+
+    Process memory is the resident set size (RSS) of each process, sampled after each projection.
+    """
+
+    report_file_name: str = 'memory.csv'                #: Per-projection report file name.
+    process_file_name: str = 'memory_processes.csv'     #: Per-process report file name.
+    headroom: float = 0.9   #: Share of available memory that :meth:`recommended CPU's <recommend_cpus>` may use.
+
+    sizes: Dict[str, int]                           #: Bytes allocated to create each projection, by projection name.
+    projections: Dict[str, Tuple[int, int, int, int]]   #: Process ID, peak, retained, and RSS bytes, by projection.
+    processes: Dict[int, Tuple[int, int, int]]      #: Baseline RSS, peak RSS, and projection count, by process ID.
+
+    def __init__(
+        self
+    ):
+
+        """
+        Constructor method. Creates an empty report.
+        """
+
+        self.sizes = {}
+        self.projections = {}
+        self.processes = {}
+
+    def merge(
+        self,
+        other: Self
+    ) -> None:
+
+        """
+        Merges another report into this report.
+
+        :param other: Report to merge.
+        :return: Nothing.
+        """
+
+        self.sizes.update(other.sizes)
+        self.projections.update(other.projections)
+        self.processes.update(other.processes)
+
+    def to_dataframe(
+        self
+    ) -> DataFrame:
+
+        """
+        Per-projection report, with one row per projection, and these columns:
+
+        - ``projection``: Projection name.
+        - ``process_id``: ID of the process that ran the projection.
+        - ``size_bytes``: Bytes allocated to create the projection.
+        - ``peak_bytes``: Peak bytes allocated while running the projection and writing its output.
+        - ``retained_bytes``: Bytes still allocated once the projection has run, before output is written.
+        - ``footprint_bytes``: Size plus peak bytes, the most memory the projection holds at once.
+        - ``rss_bytes``: Resident set size of the process, once the projection is done.
+
+        :return: Per-projection report.
+        """
+
+        return DataFrame(
+            data=[
+                (
+                    projection_name,
+                    process_id,
+                    self.sizes.get(projection_name, 0),
+                    peak_bytes,
+                    retained_bytes,
+                    self.sizes.get(projection_name, 0) + peak_bytes,
+                    rss_bytes
+                ) for projection_name, (process_id, peak_bytes, retained_bytes, rss_bytes) in self.projections.items()
+            ],
+            columns=[
+                'projection',
+                'process_id',
+                'size_bytes',
+                'peak_bytes',
+                'retained_bytes',
+                'footprint_bytes',
+                'rss_bytes'
+            ]
+        )
+
+    def process_dataframe(
+        self
+    ) -> DataFrame:
+
+        """
+        Per-process report, with one row per process, and these columns:
+
+        - ``process_id``: Process ID.
+        - ``baseline_rss_bytes``: Resident set size when the process started tracking memory.
+        - ``peak_rss_bytes``: Highest resident set size sampled.
+        - ``projections``: Number of projections run.
+
+        :return: Per-process report.
+        """
+
+        return DataFrame(
+            data=[
+                (process_id,) + process for process_id, process in self.processes.items()
+            ],
+            columns=['process_id', 'baseline_rss_bytes', 'peak_rss_bytes', 'projections']
+        )
+
+    def projection_footprint(
+        self
+    ) -> int:
+
+        """
+        Largest projection footprint: the most memory any one projection holds at once.
+
+        :return: Largest projection size plus peak bytes.
+        """
+
+        return max(
+            (
+                self.sizes.get(projection_name, 0) + peak_bytes
+                for projection_name, (_, peak_bytes, _, _) in self.projections.items()
+            ),
+            default=0
+        )
+
+    def recommend_cpus(
+        self,
+        projections_in_flight: int = 1,
+        projection_count: int | None = None,
+        available_memory: int | None = None,
+        core_count: int | None = None
+    ) -> int:
+
+        """
+        Recommends a number of CPU's (worker processes) for
+        :meth:`~src.system.projection.processor.multiple_process.MultiProcessProjectionProcessor.run_projections`,
+        so that every worker fits in the memory that is available now, less some :attr:`headroom`.
+
+        Each worker is expected to need its baseline RSS (the median across processes that ran projections), plus
+        the :meth:`largest projection footprint <projection_footprint>` for every projection it holds at once. The
+        recommendation never exceeds the physical core count - 1 (or the logical core count - 1, where the platform
+        cannot report physical cores), or the number of projections.
+
+        .. note::
+            On platforms that fork worker processes, baseline RSS includes memory shared with the parent process,
+            so the recommendation is conservative.
+
+        :param projections_in_flight: Number of projections each worker holds at once. With background output,
+            finished projections also wait to be written.
+        :param projection_count: Number of projections to run, if known.
+        :param available_memory: Available memory in bytes. If ``None``, the memory available now.
+        :param core_count: Number of cores. If ``None``, the physical core count.
+        :return: Recommended number of CPU's, at least ``1``.
+        """
+
+        from psutil import (
+            cpu_count,
+            virtual_memory
+        )
+
+        if available_memory is None:
+
+            available_memory = virtual_memory().available
+
+        if core_count is None:
+
+            core_count = cpu_count(logical=False) or cpu_count() or 1
+
+        baselines = [baseline for baseline, _, projections in self.processes.values() if projections > 0] or \
+            [baseline for baseline, _, _ in self.processes.values()] or [0]
+
+        worker_bytes = median(baselines) + self.projection_footprint() * projections_in_flight
+
+        cpus = max(
+            core_count - 1,
+            1
+        )
+
+        if worker_bytes > 0:
+
+            cpus = min(
+                cpus,
+                int(available_memory * self.headroom // worker_bytes)
+            )
+
+        if projection_count is not None:
+
+            cpus = min(
+                cpus,
+                projection_count
+            )
+
+        return max(
+            cpus,
+            1
+        )
+
+    def write(
+        self,
+        output_dir_path: str
+    ) -> None:
+
+        """
+        Writes the :meth:`per-projection report <to_dataframe>` to :attr:`report_file_name`, and the
+        :meth:`per-process report <process_dataframe>` to :attr:`process_file_name`. Existing files will be
+        overwritten.
+
+        :param output_dir_path: Output directory path.
+        :return: Nothing.
+        """
+
+        self.to_dataframe().to_csv(
+            path_or_buf=join(
+                output_dir_path,
+                self.report_file_name
+            ),
+            index=False
+        )
+
+        self.process_dataframe().to_csv(
+            path_or_buf=join(
+                output_dir_path,
+                self.process_file_name
+            ),
+            index=False
+        )
+
+
+class MemoryTracker:
+
+    """
+    Tracks the memory used by the :class:`projections <src.system.projection.Projection>` that one process creates or
+    runs, and samples that process's resident set size. Starts
+    `tracemalloc <https://docs.python.org/3/library/tracemalloc.html>`_, which slows down allocation-heavy code, so
+    memory tracking is meant for sizing runs rather than production runs.
+    """
+
+    report: MemoryReport        #: Memory report for this process.
+    process: 'Process'          #: This process.
+    baseline_rss: int           #: Resident set size when tracking started.
+    peak_rss: int               #: Highest resident set size sampled so far.
+    projection_count: int       #: Number of projections run so far.
+    _started: bool
+    _start_bytes: int
+    _retained_bytes: int
+
+    def __init__(
+        self
+    ):
+
+        """
+        Constructor method. Starts tracemalloc, if it is not already tracing, and samples the baseline resident set
+        size.
+        """
+
+        # Psutil is imported on first use, so that processes that never track memory never import it
+        from psutil import Process
+
+        self.report = MemoryReport()
+        self.process = Process()
+        self.baseline_rss = self.process.memory_info().rss
+        self.peak_rss = self.baseline_rss
+        self.projection_count = 0
+
+        self._started = not tracemalloc.is_tracing()
+
+        if self._started:
+
+            tracemalloc.start()
+
+        self._start_bytes = 0
+        self._retained_bytes = 0
+
+    def sample_rss(
+        self
+    ) -> int:
+
+        """
+        Samples this process's resident set size, and updates the peak. Where the platform reports a peak working
+        set (like Windows), it is used as well.
+
+        :return: Current resident set size.
+        """
+
+        memory_info = self.process.memory_info()
+
+        self.peak_rss = max(
+            self.peak_rss,
+            memory_info.rss,
+            getattr(memory_info, 'peak_wset', 0)
+        )
+
+        return memory_info.rss
+
+    def measure_size(
+        self,
+        create_projection: Callable[[], Projection]
+    ) -> Projection:
+
+        """
+        Creates a projection, and records the bytes allocated to create it.
+
+        :param create_projection: Creates the projection.
+        :return: The projection.
+        """
+
+        start_bytes, _ = tracemalloc.get_traced_memory()
+
+        projection = create_projection()
+
+        end_bytes, _ = tracemalloc.get_traced_memory()
+
+        self.report.sizes[str(projection)] = end_bytes - start_bytes
+
+        return projection
+
+    def begin(
+        self
+    ) -> None:
+
+        """
+        Marks the start of a projection run.
+
+        :return: Nothing.
+        """
+
+        tracemalloc.reset_peak()
+
+        self._start_bytes, _ = tracemalloc.get_traced_memory()
+
+    def projected(
+        self
+    ) -> None:
+
+        """
+        Marks the end of a projection run, before output is written.
+
+        :return: Nothing.
+        """
+
+        current_bytes, _ = tracemalloc.get_traced_memory()
+
+        self._retained_bytes = current_bytes - self._start_bytes
+
+    def end(
+        self,
+        projection: Projection
+    ) -> None:
+
+        """
+        Marks the end of a projection, once output is written or handed off, and records its memory use.
+
+        :param projection: Projection that has ended.
+        :return: Nothing.
+        """
+
+        _, peak_bytes = tracemalloc.get_traced_memory()
+
+        self.projection_count += 1
+
+        self.report.projections[str(projection)] = (
+            getpid(),
+            max(peak_bytes - self._start_bytes, 0),
+            self._retained_bytes,
+            self.sample_rss()
+        )
+
+    def stop(
+        self
+    ) -> MemoryReport:
+
+        """
+        Stops tracemalloc, if this tracker started it, and records this process's resident set sizes.
+
+        :return: Memory report for this process.
+        """
+
+        self.sample_rss()
+
+        if self._started:
+
+            tracemalloc.stop()
+
+            self._started = False
+
+        self.report.processes[getpid()] = (
+            self.baseline_rss,
+            self.peak_rss,
+            self.projection_count
+        )
+
+        return self.report
@@ -3,18 +3,32 @@
 using Python's `multiprocessing <https://docs.python.org/3/library/multiprocessing.html>`_ module.
 """
 
-from tqdm import tqdm
-from psutil import cpu_count
 from multiprocessing import (
     Manager,
     Pool,
     Queue
 )
 from traceback import format_exc
+from typing import (
+    List,
+    Tuple
+)
 
 from src.system.projection.processor import ProjectionProcessor
 from src.system.projection.parameters import ProjectionParameters
+from src.system.output.aggregate import Aggregate
+from src.system.projection.processor.background_output import BackgroundOutput
+from src.system.projection.processor.memory import (
+    MemoryReport,
+    MemoryTracker
+)
 from src.system.logger import Logger
+from src.system.odometer import (
+    Profile,
+    Profiler,
+    Counts,
+    Counters
+)
 from src.system.enums import LoggerLevel
 
 
@@ -65,6 +79,9 @@ class MultiProcessProjectionProcessor(
         :return: Nothing.
         """
 
+        # Progress bar and hardware libraries are imported on first use, so that worker processes never import them
+        from tqdm import tqdm
+
         progress_bar = tqdm(total=projection_count, desc=r'Progress: ', unit=r' projection(s) ')
         poison_pills = 0
 
@@ -90,36 +107,102 @@ class MultiProcessProjectionProcessor(
     def worker(
         cls,
         in_queue: Queue,
-        out_queue: Queue
-    ) -> None:
+        out_queue: Queue,
+        aggregates: List[Aggregate] | None = None,
+        output_threads: int = 0,
+        output_queue_size: int = 2,
+        profile: bool = False,
+        track_memory: bool = False,
+        count_operations: bool = False
+    ) -> Tuple[List[Aggregate] | None, Profile | None, MemoryReport | None, Counts | None]:
 
         """
         Worker that consumes work from a queue, and executes work. If the worker consumes a :class:`PoisonPill`,
         the worker quits and "dies".
 
+        Each worker folds its projections into its own copy of the aggregates, and returns them when it dies. If
+        ``output_threads`` is set, each worker writes output on its own
+        :class:`background output <src.system.projection.processor.background_output.BackgroundOutput>` threads,
+        and waits for them to finish before it dies. Output that could not be written is reported when the background
+        output threads finish, and fails the run, like it does in the
+        :class:`single process processor <src.system.projection.processor.single_process.SingleProcessProjectionProcessor>`.
+        If ``profile`` is set, each worker profiles its projections,
+        and returns its profile when it dies. If ``track_memory`` is set, each worker records the memory used by its
+        projections and its peak resident set size, and returns its memory report when it dies. If
+        ``count_operations`` is set, each worker counts hot-path operations, and returns its counts when it dies.
+        Logging is set up once per worker process, by :meth:`initialize_worker`.
+
         :param in_queue: Work input queue.
         :param out_queue: Work output queue.
-        :return: Nothing.
+        :param aggregates: Empty aggregates to fold projection output into.
+        :param output_threads: Number of background output writer threads.
+        :param output_queue_size: Number of finished projections that can wait for a background output writer.
+        :param profile: Whether to profile projection phases.
+        :param track_memory: Whether to record memory use.
+        :param count_operations: Whether to count hot-path operations.
+        :return: Partial aggregates, this worker's profile, if profiling is turned on, this worker's memory
+            report, if memory tracking is turned on, and this worker's counts, if counting is turned on.
         """
 
+        if profile:
+
+            Profiler().start()
+
+        if count_operations:
+
+            Counters().start()
+
+        if track_memory:
+
+            memory_tracker = MemoryTracker()
+
+        else:
+
+            memory_tracker = None
+
+        if output_threads > 0:
+
+            background_output = BackgroundOutput(
+                aggregates=aggregates,
+                threads=output_threads,
+                queue_size=output_queue_size
+            )
+
+        else:
+
+            background_output = None
+
+        close_error = None
+
         while True:
 
             work_item = in_queue.get()
 
-            if not isinstance(work_item, PoisonPill):
+            try:
 
-                try:
+                if not isinstance(work_item, PoisonPill):
 
                     cls.run_projection(
-                        projection=work_item
+                        projection=work_item,
+                        aggregates=aggregates,
+                        background_output=background_output,
+                        memory_tracker=memory_tracker
                     )
 
-                except Exception:
+                elif background_output is not None:
 
-                    Logger().print(
-                        message=format_exc(),
-                        level=LoggerLevel.ERROR
-                    )
+                    background_output.close()
+
+            except Exception as error:
+
+                Logger().print(
+                    message=format_exc(),
+                    level=LoggerLevel.ERROR
+                )
+
+                if isinstance(work_item, PoisonPill):
+
+                    close_error = error
 
             out_queue.put(
                 work_item
@@ -131,6 +214,37 @@ class MultiProcessProjectionProcessor(
 
                 break
 
+        # Raised once the queues are released, so that the parent process re-raises it when it collects this worker
+        if close_error is not None:
+
+            raise close_error
+
+        return aggregates, \
+            Profiler().stop() if profile else None, \
+            memory_tracker.stop() if memory_tracker is not None else None, \
+            Counters().stop() if count_operations else None
+
+    @staticmethod
+    def initialize_worker(
+        log_queue: Queue,
+        log_level: LoggerLevel
+    ) -> None:
+
+        """
+        Pool initializer, run once in each worker process. :meth:`Connects <src.system.logger.Logger.connect>` the
+        worker's logger to the parent process's log queue, so that the parent process writes every worker's log
+        records to a single run log.
+
+        :param log_queue: Log record queue, shared with the parent process.
+        :param log_level: Minimum logging level.
+        :return: Nothing.
+        """
+
+        Logger().connect(
+            queue=log_queue,
+            level=log_level
+        )
+
     def run_projections(
         self,
         cpus: int = None
@@ -141,11 +255,18 @@ class MultiProcessProjectionProcessor(
         `multiprocessing <https://docs.python.org/3/library/multiprocessing.html>`_ module, by:
 
         #. Creating `Queue <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.Queue>`_ objects.
+           Work queues are managed, so that they can be joined. The log queue is a plain multiprocessing queue,
+           handed to each worker by the pool initializer, so that pushing a log record does not make a round trip
+           to a manager process.
+        #. :meth:`Listening <src.system.logger.Logger.listen>` to the log queue, so that every worker's log records
+           are written to this process's log.
         #. Feeding :attr:`~src.system.projection.processor.ProjectionProcessor.projections` into the Queue.
         #. Feeding :class:`poison pills <PoisonPill>` into the Queue, one for each worker process.
         #. Spinning up workers using a
            `Pool <https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool>`_.
         #. Processing all items in the Queue using the Pool.
+        #. Merging each worker's partial aggregates, profiles, memory reports and counts, then writing aggregate
+           output, the profile, the memory report and the counters.
         
         .. note::
             If ``cpus`` is ``None``, allow the system to determine the number of CPU's to use. Typically,
@@ -163,9 +284,16 @@ class MultiProcessProjectionProcessor(
 
         in_queue: Queue = manager.Queue()
         out_queue: Queue = manager.Queue()
+        log_queue: Queue = Queue()
+
+        Logger().listen(
+            queue=log_queue
+        )
 
         if cpus is None:
 
+            from psutil import cpu_count
+
             cpus = min(
                 max(
                     cpu_count(logical=False) - 1,
@@ -179,7 +307,12 @@ class MultiProcessProjectionProcessor(
         )
 
         pool: Pool = Pool(
-            processes=cpus
+            processes=cpus,
+            initializer=self.initialize_worker,
+            initargs=(
+                log_queue,
+                self.projection_parameters.log_level
+            )
         )
 
         Logger().print(
@@ -202,14 +335,24 @@ class MultiProcessProjectionProcessor(
             message='Processing queue ...'
         )
 
+        worker_results = []
+
         for _ in range(cpus):
 
-            pool.apply_async(
-                func=self.worker,
-                kwds={
-                    'in_queue': in_queue,
-                    'out_queue': out_queue
-                }
+            worker_results.append(
+                pool.apply_async(
+                    func=self.worker,
+                    kwds={
+                        'in_queue': in_queue,
+                        'out_queue': out_queue,
+                        'aggregates': self.aggregates,
+                        'output_threads': self.projection_parameters.output_threads,
+                        'output_queue_size': self.projection_parameters.output_queue_size,
+                        'profile': self.projection_parameters.profile,
+                        'track_memory': self.projection_parameters.track_memory,
+                        'count_operations': self.projection_parameters.count_operations
+                    }
+                )
             )
 
         pool.close()
@@ -236,3 +379,64 @@ class MultiProcessProjectionProcessor(
         # Join pools
         pool.join()
         progress_bar_pool.join()
+
+        Logger().stop_listening(
+            queue=log_queue
+        )
+
+        # Merge partial aggregates, profiles, memory reports and counts
+        profile = Profile()
+        memory_report = MemoryReport()
+        counts = Counts()
+
+        for worker_result in worker_results:
+
+            partial_aggregates, partial_profile, partial_memory_report, partial_counts = worker_result.get()
+
+            for aggregate, partial_aggregate in zip(self.aggregates, partial_aggregates):
+
+                aggregate.merge(
+                    other=partial_aggregate
+                )
+
+            if partial_profile is not None:
+
+                profile.merge(
+                    other=partial_profile
+                )
+
+            if partial_memory_report is not None:
+
+                memory_report.merge(
+                    other=partial_memory_report
+                )
+
+            if partial_counts is not None:
+
+                counts.merge(
+                    other=partial_counts
+                )
+
+        if self.projection_parameters.profile:
+
+            self.write_profile(
+                profile=profile
+            )
+
+        if self.projection_parameters.count_operations:
+
+            self.write_counters(
+                counts=counts
+            )
+
+        if self.memory_tracker is not None:
+
+            memory_report.merge(
+                other=self.memory_tracker.stop()
+            )
+
+            self.write_memory_report(
+                memory_report=memory_report
+            )
+
+        self.write_aggregates()
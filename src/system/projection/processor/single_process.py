@@ -2,11 +2,14 @@
 :class:`~src.system.projection.Projection` processing, using a single process.
 """
 
-from tqdm import tqdm
-
 from src.system.projection.processor import ProjectionProcessor
 from src.system.projection.parameters import ProjectionParameters
+from src.system.projection.processor.background_output import BackgroundOutput
 from src.system.logger import Logger
+from src.system.odometer import (
+    Profiler,
+    Counters
+)
 
 
 class SingleProcessProjectionProcessor(
@@ -34,7 +37,15 @@ class SingleProcessProjectionProcessor(
 
         """
         Loops through and runs :class:`projections <src.system.projection.Projection>`, until
-        all projections are calculated.
+        all projections are calculated, then writes aggregate output. If
+        :attr:`~src.system.projection.parameters.ProjectionParameters.output_threads` is set, output is written on
+        background threads while the next projection runs. If
+        :attr:`~src.system.projection.parameters.ProjectionParameters.profile` is set, projection phases are
+        profiled, and the profile is written to the output directory. If
+        :attr:`~src.system.projection.parameters.ProjectionParameters.track_memory` is set, each projection's memory
+        use is recorded, and a memory report is written to the output directory. If
+        :attr:`~src.system.projection.parameters.ProjectionParameters.count_operations` is set, hot-path operations
+        are counted, and a counter report is written to the output directory.
 
         :return: Nothing.
         """
@@ -43,10 +54,60 @@ class SingleProcessProjectionProcessor(
             message=f'Running projections ...'
         )
 
+        if self.projection_parameters.output_threads > 0:
+
+            background_output = BackgroundOutput(
+                aggregates=self.aggregates,
+                threads=self.projection_parameters.output_threads,
+                queue_size=self.projection_parameters.output_queue_size
+            )
+
+        else:
+
+            background_output = None
+
+        if self.projection_parameters.profile:
+
+            Profiler().start()
+
+        if self.projection_parameters.count_operations:
+
+            Counters().start()
+
+        # Progress bar library is imported on first use, like in the multi-process processor
+        from tqdm import tqdm
+
         projections = tqdm(self.projections, desc=r'Progress: ', unit=r' projection(s) ')
 
         for projection in projections:
 
             self.run_projection(
-                projection=projection
+                projection=projection,
+                aggregates=self.aggregates,
+                background_output=background_output,
+                memory_tracker=self.memory_tracker
             )
+
+        if background_output is not None:
+
+            background_output.close()
+
+        if self.projection_parameters.profile:
+
+            self.write_profile(
+                profile=Profiler().stop()
+            )
+
+        if self.projection_parameters.count_operations:
+
+            self.write_counters(
+                counts=Counters().stop()
+            )
+
+        if self.memory_tracker is not None:
+
+            self.write_memory_report(
+                memory_report=self.memory_tracker.stop()
+            )
+
+        self.write_aggregates()
@@ -7,6 +7,8 @@ from typing import List
 from dateutil.relativedelta import relativedelta
 from math import floor
 
+from src.system.odometer import Counters
+
 
 def get_xversaries(
     issue_date: date,
@@ -27,6 +29,13 @@ def get_xversaries(
     :return: List of X-iversaries between two dates.
     """
 
+    if Counters.enabled:
+
+        Counters().increment(
+            name='get_xversaries',
+            key=(issue_date, start_date, end_date, frequency)
+        )
+
     start_date_range = relativedelta(
         dt1=start_date,
         dt2=issue_date
@@ -72,6 +72,58 @@ class TimeSteps:
 
             raise StopIteration
 
+    def __len__(
+        self
+    ) -> int:
+
+        return len(
+            self._time_steps
+        )
+
+    @property
+    def all_t(
+        self
+    ) -> List[date]:
+
+        """
+        Every time step in the projection, in chronological order.
+
+        :return: List of time steps.
+        """
+
+        return list(
+            self._time_steps
+        )
+
+    @property
+    def index(
+        self
+    ) -> int:
+
+        """
+        Position of the current time step within the projection, starting at zero.
+
+        :return: Current time step position.
+        """
+
+        return self._index
+
+    @property
+    def prev_index(
+        self
+    ) -> int:
+
+        """
+        Position of the previous time step within the projection, starting at zero.
+
+        :return: Previous time step position.
+        """
+
+        return max(
+            self._index - 1,
+            0
+        )
+
     @property
     def min_t(
         self
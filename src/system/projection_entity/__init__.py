@@ -7,17 +7,19 @@ from abc import (
     abstractmethod
 )
 from datetime import date
-from os.path import (
-    join,
-    dirname
-)
+from typing import Iterator
 
-from pandas import DataFrame
+from pandas import (
+    DataFrame,
+    concat
+)
 
 from src.system.projection.time_steps import TimeSteps
 from src.system.data_sources import DataSourcesRoot
 from src.system.projection_entity.projection_value import ProjectionValue
-from src.system.constants import DEFAULT_COL
+from src.system.output import OutputWriter
+from src.system.output.spec import OutputSpec
+from src.system.enums import OutputScope
 
 
 class ProjectionEntity(
@@ -48,6 +50,9 @@ class ProjectionEntity(
     data_sources: DataSourcesRoot   #: Data sources to initialize projection values.
     init_t: date                    #: Initial time step. Marks when this entity first came into existence.
 
+    output_scope: OutputScope = OutputScope.PROJECTION  #: Dimensions that this entity's values depend on.
+    output_spec_applied: bool = False                   #: Whether an output spec was applied to this entity.
+
     def __init__(
         self,
         time_steps: TimeSteps,
@@ -82,7 +87,7 @@ class ProjectionEntity(
 
         """
         Abstract method that provides a string representation of the projection entity. Used as the
-        file name when writing output.
+        entity name when writing output.
 
         :return: String representation of this object.
         """
@@ -91,65 +96,66 @@ class ProjectionEntity(
 
     def write_projection_values(
         self,
-        output_file_path: str
+        output_writer: OutputWriter
     ) -> None:
 
         """
         Writes all :class:`~src.system.projection_entity.projection_value.ProjectionValue` attributes in this
-        projection entity to a `CSV file <https://en.wikipedia.org/wiki/Comma-separated_values>`_.
-        Existing file will be overwritten.
-
-        :param output_file_path: Output file path.
-        :return: Nothing.
-        """
+        projection entity using an :class:`output writer <src.system.output.OutputWriter>`.
 
-        # Combine all values into single DataFrame
-        output_dataframe = DataFrame()
+        Value histories are collected in a single pass, then aligned on the union of their time steps in a single
+        step, so assembly cost grows linearly with the number of values.
 
-        for attribute_name, attribute in self.__dict__.items():
+        Only values that have not been :meth:`marked as written <mark_written_recursively>` are written, so output
+        can be streamed in blocks of time steps while a projection runs.
 
-            if issubclass(type(attribute), ProjectionValue):
+        Entities whose values depend only on the model point, or only on the scenario (see :attr:`output_scope`),
+        are written as :meth:`shared entities <src.system.output.OutputWriter.write_shared_entity>`.
 
-                if attribute.print_values:
+        :param output_writer: Output writer.
+        :return: Nothing.
+        """
 
-                    output_dataframe = output_dataframe.join(
-                        other=attribute.history.rename(
-                            columns={
-                                DEFAULT_COL: attribute_name
-                            }
-                        ),
-                        how='outer'
-                    )
+        # Collect all printed value histories
+        histories = {
+            attribute_name: attribute.unwritten_history
+            for attribute_name, attribute in self.__dict__.items()
+            if issubclass(type(attribute), ProjectionValue) and attribute.print_values
+        }
 
-        # Write DataFrame to disk
-        if not output_dataframe.empty:
+        # Combine all values into single DataFrame
+        if histories:
 
-            output_dataframe.insert(
-                loc=0,
-                column='index',
-                value=range(output_dataframe.shape[0])
+            output_dataframe = concat(
+                objs=histories,
+                axis=1,
+                join='outer',
+                sort=True
             )
 
-            output_dataframe.set_index(
-                keys=['index'],
-                append=True
-            )
+        else:
+
+            output_dataframe = DataFrame()
 
-            output_dataframe.to_csv(
-                path_or_buf=output_file_path,
-                index=True
+        # Write DataFrame
+        if self.output_scope == OutputScope.PROJECTION:
+
+            output_writer.write_entity(
+                entity_name=str(self),
+                values=output_dataframe
             )
 
         else:
 
-            output_dataframe.to_csv(
-                path_or_buf=output_file_path,
-                index=False
+            output_writer.write_shared_entity(
+                entity_name=str(self),
+                values=output_dataframe,
+                output_scope=self.output_scope
             )
 
     def write_projection_values_recursively(
         self,
-        output_file_path: str
+        output_writer: OutputWriter
     ) -> None:
 
         """
@@ -160,36 +166,63 @@ class ProjectionEntity(
         This function behaves recursively, writing output for all nested projection entities no matter
         how deeply they are nested.
 
-        :param output_file_path: Output file path
+        :param output_writer: Output writer.
         :return: Nothing.
         """
 
-        def _call_write_projection_values_recursively(
-            projection_entity: ProjectionEntity
-        ):
-
-            projection_entity_output_file_path = join(
-                dirname(output_file_path),
-                f'{projection_entity}.csv'
-            )
-
-            projection_entity.write_projection_values_recursively(
-                output_file_path=projection_entity_output_file_path
-            )
-
         # Write values for this object
         self.write_projection_values(
-            output_file_path=output_file_path
+            output_writer=output_writer
         )
 
         # Write values for all child objects
+        for child_entity in self.child_entities():
+
+            child_entity.write_projection_values_recursively(
+                output_writer=output_writer
+            )
+
+    def mark_written_recursively(
+        self
+    ) -> None:
+
+        """
+        :meth:`Marks <src.system.projection_entity.projection_value.ProjectionValue.mark_written>` every
+        :class:`~src.system.projection_entity.projection_value.ProjectionValue` attribute as written, dropping
+        value histories that later time steps no longer read. Applies to this projection entity and all nested
+        projection entities.
+
+        :return: Nothing.
+        """
+
+        for attribute in self.__dict__.values():
+
+            if issubclass(type(attribute), ProjectionValue):
+
+                attribute.mark_written()
+
+        for child_entity in self.child_entities():
+
+            child_entity.mark_written_recursively()
+
+    def child_entities(
+        self
+    ) -> Iterator['ProjectionEntity']:
+
+        """
+        Iterates through :class:`~src.system.projection_entity.ProjectionEntity` attributes nested directly within
+        this projection entity, including those held in
+        `lists <https://docs.python.org/3/tutorial/datastructures.html#more-on-lists>`_ and
+        `dictionaries <https://docs.python.org/3/tutorial/datastructures.html#dictionaries>`_.
+
+        :return: Child projection entities.
+        """
+
         for attribute in self.__dict__.values():
 
             if issubclass(type(attribute), ProjectionEntity):
 
-                _call_write_projection_values_recursively(
-                    projection_entity=attribute
-                )
+                yield attribute
 
             elif isinstance(attribute, list):
 
@@ -197,9 +230,7 @@ class ProjectionEntity(
 
                     if issubclass(type(element), ProjectionEntity):
 
-                        _call_write_projection_values_recursively(
-                            projection_entity=element
-                        )
+                        yield element
 
             elif isinstance(attribute, dict):
 
@@ -207,6 +238,46 @@ class ProjectionEntity(
 
                     if issubclass(type(element), ProjectionEntity):
 
-                        _call_write_projection_values_recursively(
-                            projection_entity=element
-                        )
+                        yield element
+
+    def apply_output_spec_recursively(
+        self,
+        output_spec: OutputSpec
+    ) -> None:
+
+        """
+        :meth:`Excludes <src.system.projection_entity.projection_value.ProjectionValue.exclude_from_output>`
+        :class:`~src.system.projection_entity.projection_value.ProjectionValue` attributes that are not selected by
+        an :class:`output spec <src.system.output.spec.OutputSpec>`, so that they neither keep a value history nor
+        get written. Applies to this projection entity and all nested projection entities.
+
+        Projection entities that the output spec was already applied to are skipped, but their nested projection
+        entities are not, so this method can be called again to apply the output spec to projection entities that
+        were created since.
+
+        :param output_spec: Output spec.
+        :return: Nothing.
+        """
+
+        if not self.output_spec_applied:
+
+            entity_name = str(self)
+
+            for attribute_name, attribute in self.__dict__.items():
+
+                if issubclass(type(attribute), ProjectionValue):
+
+                    if not output_spec.select_variable(
+                        entity_name=entity_name,
+                        variable=attribute_name
+                    ):
+
+                        attribute.exclude_from_output()
+
+            self.output_spec_applied = True
+
+        for child_entity in self.child_entities():
+
+            child_entity.apply_output_spec_recursively(
+                output_spec=output_spec
+            )
@@ -5,14 +5,21 @@ Modeling framework :ref:`object model <object_model>` :ref:`Projection Value <pr
 from typing import (
     Any,
     Self,
-    Callable
+    Callable,
+    Dict
 )
 from datetime import date
 from functools import wraps
 
-from pandas import DataFrame
+from numpy import ndarray
+from pandas import (
+    DataFrame,
+    Series,
+    Index
+)
 
 from src.system.constants import DEFAULT_COL
+from src.system.odometer import Counters
 
 
 class ProjectionValue:
@@ -65,7 +72,10 @@ class ProjectionValue:
     """
 
     _history: DataFrame
+    _recent: Dict[date, Any] | None
     _print_values: bool
+    _retain_history: bool
+    _written_t: date | None
 
     def __init__(
         self,
@@ -91,7 +101,10 @@ class ProjectionValue:
             inplace=True
         )
 
+        self._recent = None
         self._print_values = print_values
+        self._retain_history = True
+        self._written_t = None
 
         self[init_t] = init_value
 
@@ -200,10 +213,32 @@ class ProjectionValue:
         value: Any
     ) -> None:
 
+        if Counters.enabled:
+
+            Counters().increment(
+                name='ProjectionValue.__setitem__'
+            )
+
         value = self._parse_other(
             other=value
         )
 
+        if self._recent is not None:
+
+            # Store values the way a value history row does, which unpacks single-element lists, like [[]], into
+            # their only element
+            if isinstance(value, (list, tuple, ndarray)) and len(value) == 1:
+
+                value = value[0]
+
+            self._recent[key] = value
+
+            if len(self._recent) > 2:
+
+                del self._recent[min(self._recent)]
+
+            return
+
         self._history.loc[key] = value
 
     def __getitem__(
@@ -211,6 +246,16 @@ class ProjectionValue:
         item: date
     ) -> Any:
 
+        if Counters.enabled:
+
+            Counters().increment(
+                name='ProjectionValue.__getitem__'
+            )
+
+        if self._recent is not None:
+
+            return self._recent[item]
+
         return self._history[DEFAULT_COL][item]
 
     def __delitem__(
@@ -218,6 +263,12 @@ class ProjectionValue:
         key: date
     ) -> None:
 
+        if self._recent is not None:
+
+            del self._recent[key]
+
+            return
+
         self._history.drop(
             key,
             inplace=True
@@ -687,6 +738,10 @@ class ProjectionValue:
         :return: Latest value from history.
         """
 
+        if self._recent is not None:
+
+            return self._recent[max(self._recent)]
+
         return self._history[DEFAULT_COL][self._history.index.max()]
 
     @latest_value.setter
@@ -695,6 +750,12 @@ class ProjectionValue:
         value: Any
     ) -> None:
 
+        if self._recent is not None:
+
+            self._recent[max(self._recent)] = value
+
+            return
+
         self._history[DEFAULT_COL][self._history.index.max()] = value
 
     @property
@@ -708,8 +769,82 @@ class ProjectionValue:
         :return: Value history of this projection value.
         """
 
+        if self._recent is not None:
+
+            history = DataFrame(
+                data={
+                    DEFAULT_COL: list(self._recent.values())
+                },
+                index=Index(
+                    data=list(self._recent.keys()),
+                    name='t'
+                )
+            )
+
+            return history.sort_index()
+
         return self._history
 
+    @property
+    def unwritten_history(
+        self
+    ) -> Series:
+
+        """
+        Values from the value history that have not been :meth:`written <mark_written>` yet. Unless output is
+        streamed while the projection runs, this is the complete value history.
+
+        :return: Unwritten values, indexed by time step.
+        """
+
+        history = self.history[DEFAULT_COL]
+
+        if self._written_t is None:
+
+            return history
+
+        return history[history.index > self._written_t]
+
+    def mark_written(
+        self
+    ) -> None:
+
+        """
+        Marks every value in the value history as written, then drops all but the two latest values, which is enough
+        to read the latest value and the value at the prior time step. Used to stream output while a projection
+        runs.
+
+        Note that changes to an already written value (for example, updating the latest value in place at a later
+        time step, without first recording a new value) are not written again.
+
+        :return: Nothing.
+        """
+
+        if self._recent is not None:
+
+            if len(self._recent) > 0:
+
+                self._written_t = max(self._recent)
+
+            return
+
+        if len(self._history) > 0:
+
+            self._written_t = self._history.index.max()
+
+        self._trim_history()
+
+    def _trim_history(
+        self
+    ) -> None:
+
+        if len(self._history) > 2:
+
+            self._history.drop(
+                self._history.index.sort_values()[:-2],
+                inplace=True
+            )
+
     @property
     def print_values(
         self
@@ -723,6 +858,48 @@ class ProjectionValue:
 
         return self._print_values
 
+    @property
+    def retain_history(
+        self
+    ) -> bool:
+
+        """
+        Boolean flag used to indicate whether this object keeps its complete value history. If not, only the two
+        latest values are kept, which is enough to read the latest value and the value at the prior time step.
+
+        :return: History retention flag.
+        """
+
+        return self._retain_history
+
+    def exclude_from_output(
+        self
+    ) -> None:
+
+        """
+        Stops printing this projection value, and stops keeping its complete value history. Used to skip values that
+        are not selected by an :class:`output spec <src.system.output.spec.OutputSpec>`.
+
+        From then on, only the two latest values are kept, in a dictionary rather than the value history
+        `DataFrame <https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html>`_, so that recording a value
+        does not enlarge and trim the DataFrame at every time step.
+
+        :return: Nothing.
+        """
+
+        self._print_values = False
+        self._retain_history = False
+
+        if self._recent is None:
+
+            self._trim_history()
+
+            self._recent = dict(
+                self._history[DEFAULT_COL].sort_index().items()
+            )
+
+            self._history = self._history.iloc[0:0]
+
 
 def compare_latest_value(
     element: Any
@@ -758,6 +935,9 @@ def use_latest_value(
     :class:`~src.system.projection_entity.projection_value.ProjectionValue`'s
     :attr:`~src.system.projection_entity.projection_value.ProjectionValue.latest_value` property.
 
+    If :class:`counters <src.system.odometer.Counters>` are enabled, each call is counted as a lookup, and calls that
+    repeat earlier arguments within the same projection are counted as repeats.
+
     :param function: Function to wrap.
     :return: A wrapped function.
     """
@@ -774,6 +954,23 @@ def use_latest_value(
             key: item.latest_value if issubclass(type(item), ProjectionValue) else item for key, item in kwargs.items()
         }
 
+        if Counters.enabled:
+
+            lookup_key = (tuple(args), tuple(sorted(kwargs.items())))
+
+            try:
+
+                hash(lookup_key)
+
+            except TypeError:
+
+                lookup_key = None
+
+            Counters().increment(
+                name=function.__qualname__,
+                key=lookup_key
+            )
+
         return_value = function(
             *args,
             **kwargs
@@ -0,0 +1,211 @@
+"""
+Shared test fixtures. Projections run over a small subset of the bundled annuity resources, copied to a temporary
+directory so that generated files, like economic scenario stores, never touch the repository.
+"""
+
+from os import (
+    makedirs,
+    walk,
+    sep
+)
+from os.path import (
+    join,
+    relpath,
+    dirname,
+    abspath
+)
+from shutil import copytree
+from datetime import date
+from typing import (
+    Callable,
+    Dict,
+    Tuple
+)
+
+from pandas import (
+    DataFrame,
+    read_csv
+)
+from pandas.errors import EmptyDataError
+from dateutil.relativedelta import relativedelta
+from pytest import fixture
+
+# Imported first, to resolve a circular import between the projection and projection entity packages
+import src.system.projection  # noqa: F401
+
+from src.system.projection.parameters import ProjectionParameters
+from src.system.projection.processor import ProjectionProcessor
+from src.system.projection.processor.single_process import SingleProcessProjectionProcessor
+from src.system.projection.processor.multiple_process import MultiProcessProjectionProcessor
+from src.system.enums import ProcessingType
+
+
+REPOSITORY_DIR_PATH = abspath(join(dirname(__file__), '..'))   #: Repository root.
+START_T = date(2023, 3, 16)     #: Projection start date.
+
+#: Model points in test runs. The second one receives a premium after the first time step.
+MODEL_POINT_IDS = [
+    '29807d23-e7ae-412d-bb46-06f93969af94',
+    '3aac167f-3504-4e50-b49e-e056f1e3e816'
+]
+
+SCENARIOS = [range(0, 2)]   #: Economic scenarios in test runs.
+
+#: Projection and data source import paths, by engine.
+ENGINES = {
+    'entity': (
+        'src.projections.annuity.base.economic_liability.EconomicLiabilityProjection',
+        'src.data_sources.annuity.AnnuityDataSources'
+    ),
+    'batch': (
+        'src.projections.annuity.base.batch.BatchEconomicLiabilityProjection',
+        'src.data_sources.annuity.batch.AnnuityBatchDataSources'
+    )
+}
+
+
+@fixture
+def resource_dir_path(
+    tmp_path
+) -> str:
+
+    """
+    Copies the repository's resources to a temporary directory.
+
+    :param tmp_path: Temporary directory.
+    :return: Resource directory path.
+    """
+
+    return copytree(
+        src=join(REPOSITORY_DIR_PATH, 'resource'),
+        dst=join(tmp_path, 'resource')
+    )
+
+
+@fixture
+def run_projections(
+    tmp_path,
+    resource_dir_path
+) -> Callable[..., ProjectionProcessor]:
+
+    """
+    Runs projections over the test model points and scenarios, in a single process, or across worker processes.
+
+    :param tmp_path: Temporary directory.
+    :param resource_dir_path: Resource directory path.
+    :return: Function that takes an output directory name, an engine (``entity`` or ``batch``), a projection length
+        in years, a number of worker processes (``None`` runs in a single process), and any other
+        :class:`~src.system.projection.parameters.ProjectionParameters` keyword arguments, and returns the processor
+        after its projections have run.
+    """
+
+    def run(
+        output_dir_name: str,
+        engine: str = 'entity',
+        years: int = 1,
+        cpus: int | None = None,
+        **kwargs
+    ) -> ProjectionProcessor:
+
+        projection, data_source = ENGINES[engine]
+
+        output_dir_path = str(tmp_path / output_dir_name)
+
+        makedirs(
+            name=output_dir_path
+        )
+
+        projection_parameters = ProjectionParameters(
+            **{
+                'start_t': START_T,
+                'projection_length': relativedelta(
+                    years=years
+                ),
+                'time_step': relativedelta(
+                    months=1
+                ),
+                'resource_dir_path': resource_dir_path,
+                'output_dir_path': output_dir_path,
+                'processing_type': ProcessingType.SINGLE_PROCESS if cpus is None else ProcessingType.MULTI_PROCESS,
+                'projection': projection,
+                'data_source': data_source,
+                'scenarios': SCENARIOS,
+                'model_point_ids': MODEL_POINT_IDS
+            } | kwargs
+        )
+
+        if cpus is None:
+
+            projection_processor = SingleProcessProjectionProcessor(
+                projection_parameters=projection_parameters
+            )
+
+            projection_processor.setup_output()
+            projection_processor.run_projections()
+
+        else:
+
+            projection_processor = MultiProcessProjectionProcessor(
+                projection_parameters=projection_parameters
+            )
+
+            projection_processor.setup_output()
+            projection_processor.run_projections(
+                cpus=cpus
+            )
+
+        return projection_processor
+
+    return run
+
+
+@fixture
+def read_csv_output() -> Callable[[str], Dict[Tuple[str, str, str], DataFrame]]:
+
+    """
+    Reads every entity written by the CSV output writer under an output directory.
+
+    :return: Function that takes an output directory path, and returns entity values, by model point, scenario, and
+        entity name.
+    """
+
+    def read(
+        output_dir_path: str
+    ) -> Dict[Tuple[str, str, str], DataFrame]:
+
+        entities = {}
+
+        for walk_dir_path, _, file_names in walk(output_dir_path):
+
+            output_key = relpath(walk_dir_path, output_dir_path).split(sep)
+
+            # Run-level output, like aggregates, is written to the output directory itself
+            if len(output_key) != 2:
+
+                continue
+
+            model_point_id, scenario = output_key
+
+            for file_name in file_names:
+
+                if not file_name.endswith('.csv'):
+
+                    continue
+
+                try:
+
+                    values = read_csv(
+                        join(walk_dir_path, file_name),
+                        index_col=0,
+                        float_precision='round_trip'
+                    )
+
+                except EmptyDataError:
+
+                    values = DataFrame()
+
+                entities[(model_point_id, scenario, file_name[:-len('.csv')])] = values
+
+        return entities
+
+    return read
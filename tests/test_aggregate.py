@@ -0,0 +1,290 @@
+"""
+Tests for :mod:`streaming aggregation <src.system.output.aggregate>` of projection output.
+"""
+
+from datetime import (
+    date,
+    datetime
+)
+from pickle import (
+    loads,
+    dumps
+)
+
+from numpy import (
+    array,
+    zeros
+)
+from numpy.testing import (
+    assert_array_equal,
+    assert_allclose
+)
+from pandas import DataFrame
+from pytest import raises
+
+from src.system.output.aggregate import (
+    Aggregate,
+    AggregateOutputWriter
+)
+
+
+TIME_AXIS = [date(2023, 3, 16), date(2023, 4, 16), date(2023, 5, 16)]     #: Shared time axis.
+
+
+def write_projection(
+    aggregate: Aggregate,
+    product_name: str,
+    scenario: int,
+    premiums: float
+) -> None:
+
+    """
+    Folds one projection into an aggregate, with a premium entity at each time step, written in two blocks of time
+    steps.
+
+    :param aggregate: Aggregate.
+    :param product_name: Product name dimension.
+    :param scenario: Scenario dimension.
+    :param premiums: Premium amount of each premium entity.
+    :return: Nothing.
+    """
+
+    output_writer = AggregateOutputWriter(
+        aggregate=aggregate,
+        dimensions={
+            'model_point': 'mp',
+            'scenario': scenario,
+            'product_name': product_name
+        }
+    )
+
+    for t in TIME_AXIS:
+
+        output_writer.write_entity(
+            entity_name=f'contract.account.29807d23-e7ae-412d-bb46-06f93969af94.premium.{t.isoformat()}',
+            values=DataFrame(
+                data={
+                    'premium_amount': [premiums],
+                    'premium_age': ['relativedelta()']
+                },
+                index=[t]
+            )
+        )
+
+    for block in (TIME_AXIS[:2], TIME_AXIS[2:]):
+
+        output_writer.write_entity(
+            entity_name='contract',
+            values=DataFrame(
+                data={
+                    'account_value': [100.0 * scenario] * len(block)
+                },
+                index=block
+            )
+        )
+
+    output_writer.close()
+
+
+def test_entity_role():
+
+    """
+    Instance IDs, like UUIDs and dates, are stripped from entity names.
+    """
+
+    assert Aggregate.entity_role(
+        entity_name='contract.account.dbcf7504-8305-454c-b1ea-52753bce2a02.premium.2023-03-16'
+    ) == 'contract.account.premium'
+
+    assert Aggregate.entity_role(
+        entity_name='annuitant.fb0e852a-3387-4866-879c-25a65fd8b413'
+    ) == 'annuitant'
+
+    assert Aggregate.entity_role(
+        entity_name='contract.riders.gmdb'
+    ) == 'contract.riders.gmdb'
+
+
+def test_sums_by_group_and_entity_role():
+
+    """
+    Values are summed by group and entity role, across blocks of time steps and scenarios, with time steps without a
+    value counted as zero. Non-numeric variables are skipped.
+    """
+
+    aggregate = Aggregate(
+        group_by=['product_name'],
+        variables=None,
+        time_axis=TIME_AXIS
+    )
+
+    write_projection(
+        aggregate=aggregate,
+        product_name='base',
+        scenario=0,
+        premiums=10.0
+    )
+
+    write_projection(
+        aggregate=aggregate,
+        product_name='base',
+        scenario=1,
+        premiums=20.0
+    )
+
+    write_projection(
+        aggregate=aggregate,
+        product_name='gmdb',
+        scenario=0,
+        premiums=1.0
+    )
+
+    assert sorted(aggregate.sums) == [
+        ('base', 'contract', 'account_value'),
+        ('base', 'contract.account.premium', 'premium_amount'),
+        ('gmdb', 'contract', 'account_value'),
+        ('gmdb', 'contract.account.premium', 'premium_amount')
+    ]
+
+    assert_array_equal(aggregate.sums[('base', 'contract.account.premium', 'premium_amount')], array([30.0] * 3))
+    assert_array_equal(aggregate.sums[('base', 'contract', 'account_value')], array([100.0] * 3))
+    assert_array_equal(aggregate.sums[('gmdb', 'contract', 'account_value')], zeros(3))
+
+    values = aggregate.to_dataframe()
+
+    assert_array_equal(
+        values.loc[('base', 'contract.account.premium', 'premium_amount', 'scenario_mean')].to_numpy(),
+        array([15.0] * 3)
+    )
+
+    assert_array_equal(
+        values.loc[('gmdb', 'contract.account.premium', 'premium_amount', 'scenario_mean')].to_numpy(),
+        array([1.0] * 3)
+    )
+
+
+def test_selected_variables():
+
+    """
+    Only selected variables are aggregated, selected by entity role.
+    """
+
+    aggregate = Aggregate(
+        group_by=[],
+        variables=[('contract.account.premium', 'premium_amount')],
+        time_axis=TIME_AXIS
+    )
+
+    write_projection(
+        aggregate=aggregate,
+        product_name='base',
+        scenario=0,
+        premiums=10.0
+    )
+
+    assert list(aggregate.sums) == [('contract.account.premium', 'premium_amount')]
+
+
+def test_missing_group_by_dimension():
+
+    """
+    Grouping by a dimension the projection does not have raises an error.
+    """
+
+    aggregate = Aggregate(
+        group_by=['fund'],
+        variables=None,
+        time_axis=TIME_AXIS
+    )
+
+    with raises(KeyError):
+
+        aggregate.group(
+            dimensions={
+                'model_point': 'mp',
+                'scenario': 0
+            }
+        )
+
+
+def test_merge_partial_aggregates():
+
+    """
+    Merging partial aggregates, including pickled ones, gives the same result as folding every projection into one
+    aggregate.
+    """
+
+    aggregate = Aggregate(
+        group_by=['product_name'],
+        variables=None,
+        time_axis=TIME_AXIS
+    )
+
+    partial_aggregates = [
+        Aggregate(
+            group_by=['product_name'],
+            variables=None,
+            time_axis=TIME_AXIS
+        ) for _ in range(2)
+    ]
+
+    for scenario, partial_aggregate in enumerate(partial_aggregates):
+
+        for target in (aggregate, partial_aggregate):
+
+            write_projection(
+                aggregate=target,
+                product_name='base',
+                scenario=scenario,
+                premiums=10.0 * (scenario + 1)
+            )
+
+    merged_aggregate = loads(dumps(partial_aggregates[0]))
+
+    merged_aggregate.merge(
+        other=loads(dumps(partial_aggregates[1]))
+    )
+
+    assert merged_aggregate.to_dataframe().equals(aggregate.to_dataframe())
+
+
+def test_matches_seriatim_output(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    Aggregate sums match seriatim output summed by entity role.
+    """
+
+    processor = run_projections(
+        output_dir_name='output',
+        group_by=[]
+    )
+
+    aggregate, = processor.aggregates
+
+    expected_sums = {}
+
+    for (_, _, entity_name), values in read_csv_output(
+        processor.projection_parameters.output_dir_path
+    ).items():
+
+        rows = [aggregate.time_axis_rows[datetime.strptime(t, '%Y-%m-%d').date()] for t in values.index]
+
+        for variable, column in values.drop(columns='index', errors='ignore').items():
+
+            if column.dtype.kind not in 'fib':
+
+                continue
+
+            key = (Aggregate.entity_role(entity_name=entity_name), variable)
+
+            expected_sums.setdefault(key, zeros(len(aggregate.time_axis)))[rows] += column.fillna(0.0)
+
+    assert sorted(aggregate.sums) == sorted(expected_sums)
+
+    for key, values in expected_sums.items():
+
+        assert_allclose(aggregate.sums[key], values, rtol=1e-12, err_msg=str(key))
+
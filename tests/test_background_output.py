@@ -0,0 +1,263 @@
+"""
+Tests for :mod:`background output writing <src.system.projection.processor.background_output>`.
+"""
+
+from queue import Queue
+from threading import (
+    Event,
+    Thread
+)
+from types import SimpleNamespace
+from typing import List
+
+from pandas.testing import assert_frame_equal
+from pytest import raises
+
+from src.system.output.aggregate import Aggregate
+from src.system.projection.processor.background_output import BackgroundOutput
+from src.system.projection.processor.multiple_process import (
+    MultiProcessProjectionProcessor,
+    PoisonPill
+)
+
+
+class StubProjection:
+
+    """
+    Finished projection that records when its output is written, optionally waiting for an event first, or failing.
+    """
+
+    written: List[str]          #: Names of projections written so far, shared between stubs.
+    name: str                   #: Projection name.
+    release: Event | None       #: Event to wait for before writing.
+    fail: bool                  #: Whether writing fails.
+
+    def __init__(
+        self,
+        written: List[str],
+        name: str,
+        release: Event | None = None,
+        fail: bool = False
+    ):
+
+        self.written = written
+        self.name = name
+        self.release = release
+        self.fail = fail
+
+    def __str__(
+        self
+    ) -> str:
+
+        return self.name
+
+    def write_output(
+        self,
+        aggregates: List[Aggregate]
+    ) -> None:
+
+        if self.release is not None:
+
+            self.release.wait()
+
+        if self.fail:
+
+            raise ValueError(
+                f'Cannot write {self.name} !'
+            )
+
+        self.written.append(self.name)
+
+
+def test_writes_every_projection():
+
+    """
+    Every submitted projection is written by the time the background output is closed.
+    """
+
+    written = []
+
+    background_output = BackgroundOutput(
+        threads=3
+    )
+
+    for position in range(10):
+
+        background_output.submit(
+            projection=StubProjection(
+                written=written,
+                name=str(position)
+            )
+        )
+
+    background_output.close()
+
+    assert sorted(written, key=int) == [str(position) for position in range(10)]
+    assert not background_output.threads
+
+
+def test_errors_are_raised_on_close():
+
+    """
+    A projection that fails to write does not stop other projections from being written, and the error is raised
+    once the background output is closed.
+    """
+
+    written = []
+
+    background_output = BackgroundOutput()
+
+    for position in range(3):
+
+        background_output.submit(
+            projection=StubProjection(
+                written=written,
+                name=str(position),
+                fail=position == 1
+            )
+        )
+
+    with raises(RuntimeError, match='1 projection'):
+
+        background_output.close()
+
+    assert written == ['0', '2']
+
+
+def test_worker_raises_errors_on_close():
+
+    """
+    A multi-process worker whose background output fails to write a projection still releases its queues, then
+    raises the error, so the run fails like it does in a single process.
+    """
+
+    written = []
+
+    in_queue = Queue()
+    out_queue = Queue()
+
+    for position in range(3):
+
+        projection = StubProjection(
+            written=written,
+            name=str(position),
+            fail=position == 1
+        )
+
+        # Nothing to project
+        projection.projection_parameters = SimpleNamespace(stream_interval=None)
+        projection.run_projection = lambda: None
+
+        in_queue.put(projection)
+
+    in_queue.put(PoisonPill())
+
+    with raises(RuntimeError, match='1 projection'):
+
+        MultiProcessProjectionProcessor.worker(
+            in_queue=in_queue,
+            out_queue=out_queue,
+            output_threads=1
+        )
+
+    assert written == ['0', '2']
+    assert out_queue.qsize() == 4
+    assert in_queue.unfinished_tasks == 0
+
+
+def test_submit_blocks_while_queue_is_full():
+
+    """
+    Submitting a projection blocks while the queue is full, until a writer thread takes a projection from the queue.
+    """
+
+    written = []
+    release = Event()
+
+    background_output = BackgroundOutput(
+        threads=1,
+        queue_size=1
+    )
+
+    background_output.submit(
+        projection=StubProjection(
+            written=written,
+            name='0',
+            release=release
+        )
+    )
+
+    def submit() -> None:
+
+        for position in (1, 2):
+
+            background_output.submit(
+                projection=StubProjection(
+                    written=written,
+                    name=str(position)
+                )
+            )
+
+    submitter = Thread(
+        target=submit
+    )
+
+    submitter.start()
+    submitter.join(
+        timeout=0.5
+    )
+
+    assert submitter.is_alive()
+
+    release.set()
+
+    submitter.join()
+    background_output.close()
+
+    assert written == ['0', '1', '2']
+
+
+def test_matches_synchronous_output(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    Output and aggregates written on background threads match output written synchronously.
+    """
+
+    processors = [
+        run_projections(
+            output_dir_name=f'{output_threads}',
+            output_threads=output_threads,
+            group_by=['product_name'],
+            statistics_group_by=[],
+            present_value_variables=[('contract', 'premium_new')],
+            discount_rate=0.05
+        ) for output_threads in (0, 2)
+    ]
+
+    synchronous_output, background_output = [
+        read_csv_output(processor.projection_parameters.output_dir_path) for processor in processors
+    ]
+
+    assert synchronous_output.keys() == background_output.keys()
+
+    for output_key, values in synchronous_output.items():
+
+        assert_frame_equal(
+            left=background_output[output_key],
+            right=values,
+            obj=str(output_key)
+        )
+
+    assert [len(processor.aggregates) for processor in processors] == [3, 3]
+
+    for synchronous_aggregate, background_aggregate in zip(*[processor.aggregates for processor in processors]):
+
+        assert_frame_equal(
+            left=background_aggregate.to_dataframe(),
+            right=synchronous_aggregate.to_dataframe(),
+            check_exact=False,
+            rtol=1e-12
+        )
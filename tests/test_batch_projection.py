@@ -0,0 +1,50 @@
+"""
+Tests for the :mod:`batch projection engine <src.projections.annuity.base.batch>`, against the entity projection
+engine it vectorizes.
+"""
+
+from pandas.testing import assert_frame_equal
+
+
+def test_batch_matches_entity_projection(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    Every entity the batch engine writes matches the same entity written by the entity engine, for model points with
+    and without premiums after the first time step.
+    """
+
+    entity_processor = run_projections(
+        output_dir_name='entity',
+        years=2
+    )
+
+    batch_processor = run_projections(
+        output_dir_name='batch',
+        engine='batch',
+        years=2
+    )
+
+    entity_output = read_csv_output(entity_processor.projection_parameters.output_dir_path)
+    batch_output = read_csv_output(batch_processor.projection_parameters.output_dir_path)
+
+    assert {entity_name for _, _, entity_name in batch_output} == {
+        'contract',
+        'annuitants',
+        'contract.riders.gmdb',
+        'contract.riders.gmwb'
+    }
+
+    assert len(batch_output) == 4 * 2 * 2
+
+    for output_key, batch_values in batch_output.items():
+
+        assert_frame_equal(
+            left=batch_values,
+            right=entity_output[output_key],
+            check_exact=False,
+            rtol=1e-9,
+            obj=str(output_key)
+        )
@@ -0,0 +1,143 @@
+"""
+Tests for the :class:`hot-path operation counters <src.system.odometer.Counters>`.
+"""
+
+from os.path import join
+from typing import Iterator
+
+from pandas import read_csv
+from pandas.testing import assert_frame_equal
+from pytest import fixture
+
+from src.system.odometer import (
+    Counts,
+    Counters
+)
+
+
+@fixture
+def counters() -> Iterator[Counters]:
+
+    """
+    Turns counting on for a test, and off again afterwards.
+
+    :return: Counters.
+    """
+
+    counters = Counters()
+
+    counters.start()
+
+    yield counters
+
+    counters.stop()
+
+
+def test_totals_and_repeats(
+    counters
+):
+
+    """
+    Every operation is counted, and operations are counted as repeats only if the same counter saw the same key
+    earlier in the same projection.
+    """
+
+    counters.increment(name='a', key=1)
+    counters.increment(name='a', key=1)
+    counters.increment(name='a', key=2)
+    counters.increment(name='a')
+    counters.increment(name='a')
+    counters.increment(name='b', key=1)
+    counters.end_projection()
+
+    counters.increment(name='a', key=1)
+    counters.increment(name='b', key=1)
+    counters.increment(name='b', key=1)
+    counters.end_projection()
+
+    counts = counters.stop()
+
+    assert counts.counts == {
+        'a': [6, 1],
+        'b': [3, 1]
+    }
+    assert counts.projections == 2
+
+
+def test_report(
+    counters
+):
+
+    """
+    The report is sorted by count, with counts per projection, and the share of operations that repeated.
+    """
+
+    for _ in range(2):
+
+        for key in (1, 1, 1, 2):
+
+            counters.increment(name='lookup', key=key)
+
+        counters.increment(name='write')
+        counters.end_projection()
+
+    report = counters.stop().to_dataframe()
+
+    assert list(report['counter']) == ['lookup', 'write']
+    assert list(report['count']) == [8, 2]
+    assert list(report['per_projection']) == [4.0, 1.0]
+    assert list(report['repeats']) == [4, 0]
+    assert list(report['hit_rate']) == [0.5, 0.0]
+
+
+def test_merge():
+
+    """
+    Merged counts add up operations, repeats and projections.
+    """
+
+    counts = Counts()
+    counts.counts = {'a': [4, 1], 'b': [2, 0]}
+    counts.projections = 1
+
+    other = Counts()
+    other.counts = {'a': [6, 3], 'c': [1, 0]}
+    other.projections = 2
+
+    counts.merge(
+        other=other
+    )
+
+    assert counts.counts == {'a': [10, 4], 'b': [2, 0], 'c': [1, 0]}
+    assert counts.projections == 3
+    assert list(counts.to_dataframe()['hit_rate']) == [0.4, 0.0, 0.0]
+
+
+def test_counts_merged_across_processes(
+    run_projections
+):
+
+    """
+    Counts merged from worker processes have the same totals and repeats as a single process run, since repeats are
+    only tracked within a projection.
+    """
+
+    reports = [
+        read_csv(
+            join(
+                run_projections(
+                    output_dir_name=output_dir_name,
+                    cpus=cpus,
+                    count_operations=True
+                ).projection_parameters.output_dir_path,
+                Counts.report_file_name
+            )
+        ).sort_values(
+            by='counter',
+            ignore_index=True
+        ) for output_dir_name, cpus in (('single_process', None), ('multi_process', 2))
+    ]
+
+    assert reports[0]['repeats'].sum() > 0
+
+    assert_frame_equal(*reports)
@@ -0,0 +1,330 @@
+"""
+Tests for :mod:`compiled data source bundles <src.system.data_sources.bundle>`.
+"""
+
+from os import (
+    makedirs,
+    stat
+)
+from os.path import join
+from sys import modules
+from importlib import import_module
+from textwrap import dedent
+from typing import Type
+
+from pandas.testing import assert_frame_equal
+from pytest import fixture
+
+from src.system.data_sources.bundle import DataSourceBundle
+from src.system.data_sources.namespace import DataSourceNamespace
+
+
+#: Namespace module, written to a temporary package so that its code can be changed.
+NAMESPACE_MODULE = dedent(
+    '''
+    from os.path import join
+
+    from src.system.data_sources.namespace import DataSourceNamespace
+
+
+    class TableNamespace(
+        DataSourceNamespace
+    ):
+
+        created = 0
+
+        def __init__(
+            self,
+            path
+        ):
+
+            DataSourceNamespace.__init__(
+                self=self,
+                path=path
+            )
+
+            TableNamespace.created += 1
+
+            with open(join(path, 'table.csv')) as table_file:
+
+                self.table = table_file.read()
+    '''
+)
+
+
+@fixture
+def namespace_type(
+    tmp_path,
+    monkeypatch
+) -> Type[DataSourceNamespace]:
+
+    """
+    Writes a namespace module to a temporary package, and imports it.
+
+    :param tmp_path: Temporary directory.
+    :param monkeypatch: Used to add the package to the import path.
+    :return: Namespace class, which counts how many times it was created.
+    """
+
+    package_dir_path = join(tmp_path, 'code', 'bundle_test_namespaces')
+
+    makedirs(package_dir_path)
+
+    with open(join(package_dir_path, '__init__.py'), 'w') as init_file:
+
+        init_file.write('')
+
+    with open(join(package_dir_path, 'table.py'), 'w') as module_file:
+
+        module_file.write(NAMESPACE_MODULE)
+
+    monkeypatch.syspath_prepend(join(tmp_path, 'code'))
+
+    # Each test imports its own copy of the package, from its own temporary directory
+    for module_name in ('bundle_test_namespaces', 'bundle_test_namespaces.table'):
+
+        monkeypatch.delitem(
+            modules,
+            module_name,
+            raising=False
+        )
+
+    return import_module('bundle_test_namespaces.table').TableNamespace
+
+
+@fixture
+def namespace_path(
+    tmp_path
+) -> str:
+
+    """
+    Writes a namespace's source files.
+
+    :param tmp_path: Temporary directory.
+    :return: Namespace path.
+    """
+
+    path = join(tmp_path, 'resource', 'table')
+
+    makedirs(path)
+
+    with open(join(path, 'table.csv'), 'w') as table_file:
+
+        table_file.write('age,rate\n65,0.01\n')
+
+    return path
+
+
+def load(
+    namespace_type: Type[DataSourceNamespace],
+    namespace_path: str
+) -> DataSourceNamespace:
+
+    """
+    Loads a namespace through a fresh bundle, then writes the bundle.
+
+    :param namespace_type: Namespace class.
+    :param namespace_path: Namespace path.
+    :return: Namespace.
+    """
+
+    bundle = DataSourceBundle(
+        dir_path=join(namespace_path, '..')
+    )
+
+    namespace = bundle.load(
+        data_source_type=namespace_type,
+        path=namespace_path
+    )
+
+    bundle.write()
+
+    return namespace
+
+
+def test_loads_unchanged_namespace(
+    namespace_type,
+    namespace_path
+):
+
+    """
+    A namespace is compiled once, then loaded from the bundle while neither its files nor its code change. Bundle
+    files are excluded from source file hashes.
+    """
+
+    first_namespace = load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    second_namespace = load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    assert namespace_type.created == 1
+    assert second_namespace.table == first_namespace.table
+
+    digest = DataSourceBundle.digest(
+        path=join(namespace_path, '..')
+    )
+
+    with open(join(namespace_path, '..', DataSourceBundle.file_name), 'ab') as bundle_file:
+
+        bundle_file.write(b'\0')
+
+    assert DataSourceBundle.digest(path=join(namespace_path, '..')) == digest
+
+
+def test_source_change_invalidates(
+    namespace_type,
+    namespace_path
+):
+
+    """
+    Changing, adding, or renaming a source file invalidates the namespace.
+    """
+
+    load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    with open(join(namespace_path, 'table.csv'), 'w') as table_file:
+
+        table_file.write('age,rate\n65,0.02\n')
+
+    namespace = load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    assert namespace_type.created == 2
+    assert '0.02' in namespace.table
+
+    with open(join(namespace_path, 'notes.txt'), 'w') as notes_file:
+
+        notes_file.write('')
+
+    load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    assert namespace_type.created == 3
+
+
+def test_code_change_invalidates(
+    namespace_type,
+    namespace_path,
+    monkeypatch
+):
+
+    """
+    Changing the namespace's module, or its bundle version, invalidates the namespace.
+    """
+
+    load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    with open(import_module(namespace_type.__module__).__file__, 'a') as module_file:
+
+        module_file.write('\n# Parsing changed\n')
+
+    load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    assert namespace_type.created == 2
+
+    monkeypatch.setattr(
+        namespace_type,
+        'bundle_version',
+        2
+    )
+
+    load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    assert namespace_type.created == 3
+
+
+def test_unreadable_bundle_is_rewritten(
+    namespace_type,
+    namespace_path
+):
+
+    """
+    A bundle that cannot be read is ignored, and rewritten.
+    """
+
+    with open(join(namespace_path, '..', DataSourceBundle.file_name), 'wb') as bundle_file:
+
+        bundle_file.write(b'not a bundle')
+
+    load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    load(
+        namespace_type=namespace_type,
+        namespace_path=namespace_path
+    )
+
+    assert namespace_type.created == 1
+
+
+def test_bundled_run_matches_unbundled_run(
+    run_projections,
+    read_csv_output,
+    resource_dir_path
+):
+
+    """
+    Runs that load data sources from a bundle match a run that parses every file. The bundle is written by the first
+    run, and left untouched by the next.
+    """
+
+    unbundled_processor = run_projections(
+        output_dir_name='unbundled'
+    )
+
+    bundled_processors = []
+    bundle_modified_times = []
+
+    for run in range(2):
+
+        bundled_processors.append(
+            run_projections(
+                output_dir_name=f'bundled_{run}',
+                bundle_data_sources=True
+            )
+        )
+
+        bundle_modified_times.append(
+            stat(join(resource_dir_path, 'annuity', DataSourceBundle.file_name)).st_mtime_ns
+        )
+
+    assert bundle_modified_times[0] == bundle_modified_times[1]
+
+    unbundled_output = read_csv_output(unbundled_processor.projection_parameters.output_dir_path)
+
+    for bundled_processor in bundled_processors:
+
+        bundled_output = read_csv_output(bundled_processor.projection_parameters.output_dir_path)
+
+        assert bundled_output.keys() == unbundled_output.keys()
+
+        for output_key, values in unbundled_output.items():
+
+            assert_frame_equal(
+                left=bundled_output[output_key],
+                right=values,
+                obj=str(output_key)
+            )
@@ -0,0 +1,336 @@
+"""
+Tests for :meth:`data source loading <src.system.data_sources.namespace.DataSourceNamespace.load_data_sources>`.
+"""
+
+from os import remove
+from os.path import (
+    join,
+    exists
+)
+from threading import (
+    Barrier,
+    Event
+)
+from typing import (
+    Dict,
+    List
+)
+
+from pandas.testing import assert_frame_equal
+from pytest import (
+    mark,
+    raises
+)
+
+from src.system.data_sources.namespace import (
+    DataSourceLoader,
+    DataSourceNamespace
+)
+from src.data_sources.annuity import AnnuityDataSources
+from src.data_sources.economic_scenarios.store import EconomicScenarioStore
+
+
+def create_loaders(
+    namespace: DataSourceNamespace,
+    created: List[str]
+) -> Dict[str, DataSourceLoader]:
+
+    """
+    Declares data sources ``a``, ``b``, and ``c``, where ``c`` reads ``a`` and ``b``. Each one records its name when
+    it is created.
+
+    :param namespace: Namespace the data sources are set on.
+    :param created: Names of data sources created so far.
+    :return: Loaders, by name.
+    """
+
+    def create(
+        name: str,
+        value: int
+    ) -> int:
+
+        created.append(name)
+
+        return value
+
+    return {
+        'c': DataSourceLoader(
+            create=lambda: create(name='c', value=namespace.a + namespace.b),
+            depends_on=['a', 'b']
+        ),
+        'a': DataSourceLoader(
+            create=lambda: create(name='a', value=1)
+        ),
+        'b': DataSourceLoader(
+            create=lambda: create(name='b', value=2),
+            depends_on=['a']
+        )
+    }
+
+
+def test_load_order(
+    tmp_path
+):
+
+    """
+    Data sources load after their dependencies, in declaration order otherwise.
+    """
+
+    namespace = DataSourceNamespace(
+        path=str(tmp_path)
+    )
+
+    assert namespace._load_order(
+        loaders=create_loaders(
+            namespace=namespace,
+            created=[]
+        )
+    ) == ['a', 'b', 'c']
+
+
+def test_circular_dependencies(
+    tmp_path
+):
+
+    """
+    Circular dependencies raise an error, before any data source is created.
+    """
+
+    created = []
+
+    namespace = DataSourceNamespace(
+        path=str(tmp_path)
+    )
+
+    loaders = create_loaders(
+        namespace=namespace,
+        created=created
+    )
+
+    loaders['a'].depends_on = ['c']
+
+    with raises(ValueError, match='circular'):
+
+        namespace.load_data_sources(
+            loaders=loaders
+        )
+
+    assert not created
+
+
+def test_undeclared_dependencies(
+    tmp_path
+):
+
+    """
+    Dependencies on data sources that are not declared raise an error, before any data source is created.
+    """
+
+    created = []
+
+    namespace = DataSourceNamespace(
+        path=str(tmp_path)
+    )
+
+    loaders = create_loaders(
+        namespace=namespace,
+        created=created
+    )
+
+    loaders['b'].depends_on = ['d']
+
+    with raises(KeyError, match='undeclared'):
+
+        namespace.load_data_sources(
+            loaders=loaders,
+            threads=4
+        )
+
+    assert not created
+
+
+@mark.parametrize(
+    argnames='threads',
+    argvalues=[1, 4]
+)
+def test_loads_dependencies_first(
+    tmp_path,
+    threads
+):
+
+    """
+    Every data source is set on the namespace, after its dependencies, whether loaded on one thread or several.
+    """
+
+    created = []
+
+    namespace = DataSourceNamespace(
+        path=str(tmp_path)
+    )
+
+    namespace.load_data_sources(
+        loaders=create_loaders(
+            namespace=namespace,
+            created=created
+        ),
+        threads=threads
+    )
+
+    assert (namespace.a, namespace.b, namespace.c) == (1, 2, 3)
+    assert created == ['a', 'b', 'c']
+
+
+@mark.parametrize(
+    argnames='threads',
+    argvalues=[1, 4]
+)
+def test_errors_are_raised(
+    tmp_path,
+    threads
+):
+
+    """
+    An error raised while creating a data source is raised by the loader, and data sources that depend on it are
+    never created.
+    """
+
+    created = []
+
+    namespace = DataSourceNamespace(
+        path=str(tmp_path)
+    )
+
+    loaders = create_loaders(
+        namespace=namespace,
+        created=created
+    )
+
+    def fail() -> int:
+
+        raise FileNotFoundError(
+            'Missing table !'
+        )
+
+    loaders['b'].create = fail
+
+    with raises(FileNotFoundError, match='Missing table'):
+
+        namespace.load_data_sources(
+            loaders=loaders,
+            threads=threads
+        )
+
+    assert created == ['a']
+
+
+def test_independent_data_sources_load_concurrently(
+    tmp_path
+):
+
+    """
+    Data sources that do not depend on each other are created at the same time. Each one waits for the others, so
+    loading would time out if they were created one at a time.
+    """
+
+    barrier = Barrier(
+        parties=3,
+        timeout=10.0
+    )
+
+    namespace = DataSourceNamespace(
+        path=str(tmp_path)
+    )
+
+    namespace.load_data_sources(
+        loaders={
+            name: DataSourceLoader(
+                create=barrier.wait
+            ) for name in ('a', 'b', 'c')
+        },
+        threads=3
+    )
+
+    assert sorted([namespace.a, namespace.b, namespace.c]) == [0, 1, 2]
+
+
+def test_threaded_run_matches_serial_run(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    Runs that load data sources on several threads match a run that loads them one at a time.
+    """
+
+    serial_output, threaded_output = [
+        read_csv_output(
+            run_projections(
+                output_dir_name=f'{threads}',
+                data_source_threads=threads
+            ).projection_parameters.output_dir_path
+        ) for threads in (1, 4)
+    ]
+
+    assert serial_output.keys() == threaded_output.keys()
+
+    for output_key, values in serial_output.items():
+
+        assert_frame_equal(
+            left=threaded_output[output_key],
+            right=values,
+            obj=str(output_key)
+        )
+
+
+def test_model_points_load_while_scenarios_convert(
+    run_projections,
+    resource_dir_path,
+    monkeypatch
+):
+
+    """
+    Model points are selected and sharded while the economic scenario store is being converted. Conversion waits for
+    model points to be selected, so loading would time out if either loader waited for the other.
+    """
+
+    for extension in ('npy', 'json'):
+
+        store_file_path = join(resource_dir_path, 'annuity', f'economic_scenarios.{extension}')
+
+        if exists(store_file_path):
+
+            remove(store_file_path)
+
+    model_points_selected = Event()
+
+    convert = EconomicScenarioStore.convert
+    select_model_points = AnnuityDataSources._select_model_points
+
+    def convert_after_model_points(
+        **kwargs
+    ) -> None:
+
+        assert model_points_selected.wait(timeout=10.0), 'Model points were not selected during conversion !'
+
+        convert(**kwargs)
+
+    def select_model_points_and_signal(
+        self,
+        data
+    ):
+
+        selected_data = select_model_points(self, data)
+
+        model_points_selected.set()
+
+        return selected_data
+
+    monkeypatch.setattr(EconomicScenarioStore, 'convert', staticmethod(convert_after_model_points))
+    monkeypatch.setattr(AnnuityDataSources, '_select_model_points', select_model_points_and_signal)
+
+    processor = run_projections(
+        output_dir_name='output',
+        data_source_threads=2
+    )
+
+    assert len(processor.projections) == 2 * 2
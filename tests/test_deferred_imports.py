@@ -0,0 +1,57 @@
+"""
+Tests for :mod:`deferred imports <src.main>`, which keep heavy libraries out of interpreter startup.
+"""
+
+from sys import executable
+from os.path import (
+    join,
+    dirname,
+    abspath
+)
+from subprocess import run
+
+from pytest import mark
+
+
+REPOSITORY_DIR_PATH = abspath(join(dirname(__file__), '..'))   #: Repository root, to import modules from.
+
+
+@mark.parametrize(
+    argnames=('modules', 'deferred_modules'),
+    argvalues=[
+        (['src.main'], ['pandas', 'tqdm', 'psutil']),
+        (
+            [
+                'src.system.projection',
+                'src.system.projection.processor.single_process',
+                'src.system.projection.processor.multiple_process'
+            ],
+            ['tqdm', 'psutil']
+        )
+    ]
+)
+def test_heavy_modules_are_not_imported(
+    modules,
+    deferred_modules
+):
+
+    """
+    Importing the entry point, or either projection processor, in a fresh interpreter does not import libraries that
+    are only used once projections run.
+    """
+
+    imports = '; '.join(f'import {module}' for module in modules)
+
+    result = run(
+        args=[
+            executable,
+            '-c',
+            f'import sys; {imports}; print(sorted(set({deferred_modules!r}) & set(sys.modules)))'
+        ],
+        cwd=REPOSITORY_DIR_PATH,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,165 @@
+"""
+Tests for :mod:`economic scenario rate lookups <src.data_sources.economic_scenarios.economic_scenario>`.
+"""
+
+from os.path import join
+from datetime import date
+
+from numpy import array
+from numpy.testing import assert_array_equal
+from pytest import (
+    fixture,
+    raises
+)
+
+from src.data_sources.economic_scenarios import EconomicScenarios
+
+
+#: Two scenarios, the second of which is missing its last date.
+CSV_DATA = '''path,t,SPX,SJIM
+0,3/16/2023,100.0,10.0
+0,4/16/2023,101.0,11.0
+0,5/16/2023,102.0,12.0
+1,3/16/2023,200.0,20.0
+1,4/16/2023,201.0,21.0
+'''
+
+#: Projection time steps. The last one is not in the scenario file.
+TIME_STEPS = [date(2023, 3, 16), date(2023, 4, 16), date(2023, 5, 16), date(2023, 6, 16)]
+
+
+@fixture
+def economic_scenarios(
+    tmp_path
+) -> EconomicScenarios:
+
+    """
+    Loads economic scenarios from a small CSV file, and maps them to projection time steps.
+
+    :param tmp_path: Temporary directory.
+    :return: Economic scenarios.
+    """
+
+    csv_path = join(tmp_path, 'economic_scenarios.csv')
+
+    with open(csv_path, 'w') as csv_file:
+
+        csv_file.write(CSV_DATA)
+
+    economic_scenarios = EconomicScenarios(
+        path=csv_path
+    )
+
+    economic_scenarios.map_time_steps(
+        time_steps=TIME_STEPS
+    )
+
+    return economic_scenarios
+
+
+def test_rate_by_date_and_step(
+    economic_scenarios
+):
+
+    """
+    Rates looked up by date, and by projection time step position, are the same.
+    """
+
+    economic_scenario = economic_scenarios[0]
+
+    for step, t in enumerate(TIME_STEPS[:3]):
+
+        for name in ('SPX', 'SJIM'):
+
+            rate = economic_scenario.get_rate(
+                name=name,
+                t=t
+            )
+
+            assert rate == economic_scenario.get_rate(
+                name=name,
+                t=t,
+                step=step
+            )
+
+            assert rate == economic_scenarios.cache.loc[(0, t), name]
+
+
+def test_get_rates(
+    economic_scenarios
+):
+
+    """
+    Vectorized lookups match scalar lookups, in the order of the time step positions requested.
+    """
+
+    economic_scenario = economic_scenarios[0]
+
+    assert_array_equal(
+        economic_scenario.get_rates(
+            name='SJIM',
+            steps=array([2, 0, 1, 1])
+        ),
+        [12.0, 10.0, 11.0, 11.0]
+    )
+
+
+def test_padded_date_raises(
+    economic_scenarios
+):
+
+    """
+    Dates that are only stored because another scenario has them, and dates missing from every scenario, raise an
+    error, whether looked up by date, by time step position, or vectorized.
+    """
+
+    economic_scenario = economic_scenarios[1]
+
+    for t, step in ((TIME_STEPS[2], 2), (TIME_STEPS[3], 3)):
+
+        with raises(KeyError, match='no SPX rate'):
+
+            economic_scenario.get_rate(
+                name='SPX',
+                t=t
+            )
+
+        with raises(KeyError, match='no SPX rate'):
+
+            economic_scenario.get_rate(
+                name='SPX',
+                t=t,
+                step=step
+            )
+
+        with raises(KeyError, match='no SPX rate'):
+
+            economic_scenario.get_rates(
+                name='SPX',
+                steps=array([0, step])
+            )
+
+    assert economic_scenario.get_rate(name='SPX', t=TIME_STEPS[1], step=1) == 201.0
+
+
+def test_unmapped_time_steps(
+    economic_scenarios
+):
+
+    """
+    Vectorized lookups need projection time steps to be mapped. Scalar lookups by time step position fall back to
+    looking up the date.
+    """
+
+    economic_scenarios.store.step_rows = None
+
+    economic_scenario = economic_scenarios[0]
+
+    with raises(RuntimeError, match='not been mapped'):
+
+        economic_scenario.get_rates(
+            name='SPX',
+            steps=array([0])
+        )
+
+    assert economic_scenario.get_rate(name='SPX', t=TIME_STEPS[1], step=1) == 101.0
@@ -0,0 +1,273 @@
+"""
+Tests for the :mod:`economic scenario store <src.data_sources.economic_scenarios.store>`.
+"""
+
+from os import (
+    listdir,
+    utime
+)
+from os.path import join
+from threading import Thread
+from datetime import date
+
+from numpy import isnan
+from numpy.testing import assert_array_equal
+from pytest import (
+    fixture,
+    raises
+)
+
+from src.data_sources.economic_scenarios import EconomicScenarios
+from src.data_sources.economic_scenarios.store import EconomicScenarioStore
+
+
+#: Two scenarios, the second of which is missing its last date.
+CSV_DATA = '''path,t,SPX,SJIM
+0,3/16/2023,100.0,10.0
+0,4/16/2023,101.0,11.0
+0,5/16/2023,102.0,12.0
+1,3/16/2023,200.0,20.0
+1,4/16/2023,201.0,21.0
+'''
+
+
+@fixture
+def csv_path(
+    tmp_path
+) -> str:
+
+    """
+    Writes a small economic scenario CSV file.
+
+    :param tmp_path: Temporary directory.
+    :return: CSV file path.
+    """
+
+    csv_path = join(tmp_path, 'economic_scenarios.csv')
+
+    with open(csv_path, 'w') as csv_file:
+
+        csv_file.write(CSV_DATA)
+
+    return csv_path
+
+
+@fixture
+def digests(
+    monkeypatch
+) -> list:
+
+    """
+    Records every CSV file that is hashed.
+
+    :param monkeypatch: Patches the store's hash function.
+    :return: Hashed CSV file paths.
+    """
+
+    hashed = []
+    digest = EconomicScenarioStore.digest
+
+    def record_digest(
+        csv_path: str
+    ) -> str:
+
+        hashed.append(csv_path)
+
+        return digest(csv_path=csv_path)
+
+    monkeypatch.setattr(EconomicScenarioStore, 'digest', staticmethod(record_digest))
+
+    return hashed
+
+
+def test_converts_csv_file(
+    csv_path
+):
+
+    """
+    Values are stored as ``(rates, scenarios, time steps)``, and dates missing from a scenario are stored as ``NaN``.
+    """
+
+    store = EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    assert store.scenario_indices == [0, 1]
+    assert store.dates == [date(2023, 3, 16), date(2023, 4, 16), date(2023, 5, 16)]
+    assert store.rates == ['SPX', 'SJIM']
+    assert store.values.shape == (2, 2, 3)
+
+    assert_array_equal(store.scenario_values(scenario_index=0)[:, 1], [10.0, 11.0, 12.0])
+    assert isnan(store.values[0, 1, 2])
+
+
+def test_unchanged_csv_file_is_not_hashed(
+    csv_path,
+    digests
+):
+
+    """
+    Opening a store whose CSV file has the same size and modification time does not read the CSV file.
+    """
+
+    EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    assert digests == [csv_path]
+
+    EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    assert digests == [csv_path]
+
+
+def test_touched_csv_file_is_hashed_once(
+    csv_path,
+    digests,
+    monkeypatch
+):
+
+    """
+    A CSV file with a new modification time, but the same contents, is hashed once, and is not converted again.
+    """
+
+    EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    utime(csv_path, ns=(0, 0))
+
+    def convert(
+        **kwargs
+    ) -> None:
+
+        raise AssertionError('Store converted again !')
+
+    monkeypatch.setattr(EconomicScenarioStore, 'convert', staticmethod(convert))
+
+    store = EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    assert store.source_stat == EconomicScenarioStore.stat(csv_path=csv_path)
+
+    EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    assert digests == [csv_path, csv_path]
+
+
+def test_changed_csv_file_is_converted(
+    csv_path
+):
+
+    """
+    A CSV file with new contents is converted again.
+    """
+
+    EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    with open(csv_path, 'a') as csv_file:
+
+        csv_file.write('1,5/16/2023,202.0,22.0\n')
+
+    store = EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    assert store.values[0, 1, 2] == 202.0
+
+
+def test_concurrent_conversions(
+    csv_path
+):
+
+    """
+    Conversions of the same store at the same time write to their own temporary files, and leave a complete store and
+    no temporary files behind.
+    """
+
+    path = csv_path[:-len('.csv')]
+
+    threads = [
+        Thread(
+            target=EconomicScenarioStore.convert,
+            kwargs={
+                'csv_path': csv_path,
+                'path': path
+            }
+        ) for _ in range(4)
+    ]
+
+    for thread in threads:
+
+        thread.start()
+
+    for thread in threads:
+
+        thread.join()
+
+    assert sorted(listdir(path=csv_path[:-len('economic_scenarios.csv')])) == [
+        'economic_scenarios.csv',
+        'economic_scenarios.json',
+        'economic_scenarios.npy'
+    ]
+
+    assert EconomicScenarioStore.from_csv(csv_path=csv_path).values.shape == (2, 2, 3)
+
+
+def test_read_scenario_indices(
+    csv_path,
+    digests
+):
+
+    """
+    Scenario numbers are read without hashing the CSV file, from the metadata while it is current, and from the CSV
+    file otherwise.
+    """
+
+    assert EconomicScenarioStore.read_scenario_indices(csv_path=csv_path) == [0, 1]
+
+    EconomicScenarioStore.from_csv(
+        csv_path=csv_path
+    )
+
+    assert EconomicScenarioStore.read_scenario_indices(csv_path=csv_path) == [0, 1]
+
+    with open(csv_path, 'a') as csv_file:
+
+        csv_file.write('2,3/16/2023,300.0,30.0\n')
+
+    assert EconomicScenarioStore.read_scenario_indices(csv_path=csv_path) == [0, 1, 2]
+    assert digests == [csv_path]
+
+
+def test_economic_scenarios(
+    csv_path
+):
+
+    """
+    Economic scenarios open the store directly, select scenarios, and build their cache from the store on first
+    access.
+    """
+
+    economic_scenarios = EconomicScenarios(
+        path=csv_path,
+        select=lambda scenario_index: scenario_index == 1
+    )
+
+    assert economic_scenarios.keys == [1]
+    assert economic_scenarios._cache is None
+    assert economic_scenarios.cache.shape == (6, 2)
+    assert isnan(economic_scenarios.cache.loc[(1, date(2023, 5, 16)), 'SPX'])
+
+    with raises(FileNotFoundError):
+
+        EconomicScenarios(
+            path=csv_path + '.missing'
+        )
@@ -0,0 +1,69 @@
+"""
+Tests for :meth:`projection entity output assembly
+<src.system.projection_entity.ProjectionEntity.write_projection_values>`.
+"""
+
+from typing import (
+    Iterator,
+    List
+)
+
+from pandas.testing import assert_frame_equal
+
+from src.system.projection_entity import ProjectionEntity
+from src.benchmarks.entity_output import (
+    join_projection_values,
+    assemble_projection_values
+)
+
+
+def projection_entities(
+    projection_entity: ProjectionEntity
+) -> Iterator[ProjectionEntity]:
+
+    """
+    Iterates through a projection entity and every projection entity nested within it.
+
+    :param projection_entity: Projection entity.
+    :return: Projection entities.
+    """
+
+    yield projection_entity
+
+    for child_entity in projection_entity.child_entities():
+
+        yield from projection_entities(
+            projection_entity=child_entity
+        )
+
+
+def test_single_pass_matches_joined_output(
+    run_projections
+):
+
+    """
+    Every entity in a projection assembles the same values, columns, index and types in a single pass as it did by
+    outer-joining each value history in turn.
+    """
+
+    projection = run_projections(
+        output_dir_name='output'
+    ).projections[0]
+
+    entities: List[ProjectionEntity] = [
+        entity
+        for attribute in projection.__dict__.values() if issubclass(type(attribute), ProjectionEntity)
+        for entity in projection_entities(projection_entity=attribute)
+    ]
+
+    assert len(entities) > 1
+
+    for entity in entities:
+
+        assert_frame_equal(
+            left=assemble_projection_values(entity),
+            right=join_projection_values(entity),
+            check_exact=True
+        )
+
+    assert any(len(join_projection_values(entity).columns) > 1 for entity in entities)
@@ -0,0 +1,152 @@
+"""
+Tests for the :mod:`columnar .npz output writer <src.system.output.file_npz>`.
+"""
+
+from os.path import join
+from datetime import (
+    date,
+    datetime
+)
+
+from numpy import (
+    array,
+    nan
+)
+from numpy.testing import assert_array_equal
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from src.system.enums import OutputFormat
+from src.system.output.file_npz import NpzOutputWriter
+
+
+TIME_AXIS = [date(2023, 3, 16), date(2023, 4, 16), date(2023, 5, 16), date(2023, 6, 16)]   #: Shared time axis.
+
+
+def test_round_trip_aligns_to_time_axis(
+    tmp_path
+):
+
+    """
+    Values read back from an output file are aligned to the shared time axis, with ``NaN`` or empty strings at time
+    steps without a value, and numeric, boolean and other values stored as ``float64`` or strings.
+    """
+
+    output_writer = NpzOutputWriter(
+        output_dir_path=str(tmp_path),
+        time_axis=TIME_AXIS
+    )
+
+    output_writer.write_entity(
+        entity_name='contract',
+        values=DataFrame(
+            data={
+                'account_value': [100.0, 101.5],
+                'lapsed': [False, True],
+                'duration': ['1 month', '2 months']
+            },
+            index=TIME_AXIS[1:3]
+        )
+    )
+
+    output_writer.write_entity(
+        entity_name='economy',
+        values=DataFrame()
+    )
+
+    output_writer.close()
+
+    entities = NpzOutputWriter.read(
+        path=join(tmp_path, NpzOutputWriter.file_name)
+    )
+
+    assert sorted(entities) == ['contract', 'economy']
+    assert list(entities['contract'].index) == TIME_AXIS
+    assert entities['economy'].shape == (len(TIME_AXIS), 0)
+
+    assert_array_equal(
+        entities['contract']['account_value'].to_numpy(),
+        array([nan, 100.0, 101.5, nan])
+    )
+
+    assert_array_equal(
+        entities['contract']['lapsed'].to_numpy(),
+        array([nan, 0.0, 1.0, nan])
+    )
+
+    assert_array_equal(
+        entities['contract']['duration'].to_numpy(),
+        array(['', '1 month', '2 months', ''])
+    )
+
+
+def test_matches_csv_output(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    A projection written as ``.npz`` files holds the same entities and values as the same projection written as CSV
+    files.
+    """
+
+    csv_processor = run_projections(
+        output_dir_name='csv'
+    )
+
+    npz_processor = run_projections(
+        output_dir_name='npz',
+        output_format=OutputFormat.NPZ
+    )
+
+    csv_output = read_csv_output(csv_processor.projection_parameters.output_dir_path)
+
+    for projection in npz_processor.projections:
+
+        for model_point_id, scenario in projection.output_keys():
+
+            entities = NpzOutputWriter.read(
+                path=join(
+                    npz_processor.projection_parameters.output_dir_path,
+                    model_point_id,
+                    str(scenario),
+                    NpzOutputWriter.file_name
+                )
+            )
+
+            csv_entity_names = {
+                entity_name for csv_model_point_id, csv_scenario, entity_name in csv_output
+                if (csv_model_point_id, csv_scenario) == (model_point_id, str(scenario))
+            }
+
+            assert set(entities) == csv_entity_names
+
+            for entity_name, values in entities.items():
+
+                csv_values = csv_output[(model_point_id, str(scenario), entity_name)]
+
+                if csv_values.empty:
+
+                    continue
+
+                csv_values = csv_values.drop(
+                    columns='index'
+                ).set_axis(
+                    [datetime.strptime(t, '%Y-%m-%d').date() for t in csv_values.index]
+                )
+
+                values = values.loc[list(csv_values.index)]
+
+                assert_frame_equal(
+                    left=values.select_dtypes(exclude='float64'),
+                    right=csv_values.select_dtypes(exclude=['float64', 'int64', 'bool']).fillna('').astype(str),
+                    check_names=False,
+                    obj=entity_name
+                )
+
+                assert_frame_equal(
+                    left=values.select_dtypes(include='float64'),
+                    right=csv_values.select_dtypes(include=['float64', 'int64', 'bool']).astype('float64'),
+                    check_names=False,
+                    obj=entity_name
+                )
@@ -0,0 +1,51 @@
+"""
+Tests for :mod:`logging levels <src.system.logger>`.
+"""
+
+from queue import Queue
+
+from src.system.logger import Logger
+from src.system.enums import LoggerLevel
+
+
+def test_filtered_messages_are_not_formatted(
+    monkeypatch
+):
+
+    """
+    Callable messages below the logging level are never called. Messages at or above it are called once, in this
+    process, and only the formatted message is pushed onto the log queue.
+    """
+
+    log_queue = Queue()
+
+    monkeypatch.setattr(Logger, 'queue', log_queue)
+    monkeypatch.setattr(Logger, 'level', LoggerLevel.WARNING)
+
+    calls = []
+
+    def message() -> str:
+
+        calls.append(len(calls))
+
+        return 'Formatted !'
+
+    assert not Logger().enabled(level=LoggerLevel.MESSAGE)
+    assert Logger().enabled(level=LoggerLevel.ERROR)
+
+    Logger().print(
+        message=message
+    )
+
+    assert not calls
+    assert log_queue.empty()
+
+    Logger().print(
+        message=message,
+        level=LoggerLevel.ERROR
+    )
+
+    level, _, formatted_message, console = log_queue.get_nowait()
+
+    assert calls == [0]
+    assert (level, formatted_message, console) == (LoggerLevel.ERROR, 'Formatted !', True)
@@ -0,0 +1,187 @@
+"""
+Tests for :mod:`memory accounting <src.system.projection.processor.memory>`.
+"""
+
+from os import getpid
+from os.path import join
+
+import psutil
+from pandas import read_csv
+from pytest import fixture
+
+from src.system.projection.processor.memory import (
+    MemoryReport,
+    MemoryTracker
+)
+
+
+@fixture
+def memory_report() -> MemoryReport:
+
+    """
+    Memory report for three processes, one of which ran no projections. Baseline RSS has a median of ``200`` bytes
+    across the processes that ran projections, and the largest projection footprint is ``80`` bytes.
+
+    :return: Memory report.
+    """
+
+    memory_report = MemoryReport()
+
+    memory_report.sizes = {'a': 50, 'b': 0}
+    memory_report.projections = {'a': (1, 30, 10, 0), 'b': (2, 70, 5, 0)}
+    memory_report.processes = {1: (100, 200, 1), 2: (300, 400, 1), 3: (1000, 1000, 0)}
+
+    return memory_report
+
+
+def test_recommend_cpus(
+    memory_report
+):
+
+    """
+    Each worker needs the median baseline RSS plus the largest footprint for each projection in flight, and the
+    recommendation is capped by available memory less headroom, cores - 1, and the number of projections.
+    """
+
+    assert memory_report.projection_footprint() == 80
+
+    # 9,000 usable bytes // 280 bytes per worker = 32, capped at 8 - 1 cores
+    assert memory_report.recommend_cpus(available_memory=10000, core_count=8) == 7
+    assert memory_report.recommend_cpus(available_memory=10000, core_count=8, projection_count=3) == 3
+
+    # 900 usable bytes // 280 bytes per worker, and // 440 bytes with three projections in flight
+    assert memory_report.recommend_cpus(available_memory=1000, core_count=16) == 3
+    assert memory_report.recommend_cpus(available_memory=1000, core_count=16, projections_in_flight=3) == 2
+
+    # Always at least one
+    assert memory_report.recommend_cpus(available_memory=100, core_count=16) == 1
+    assert memory_report.recommend_cpus(available_memory=10000, core_count=1) == 1
+
+    # Without any measurements, only cores limit the recommendation
+    assert MemoryReport().recommend_cpus(available_memory=0, core_count=4) == 3
+
+
+def test_recommend_cpus_without_physical_core_count(
+    memory_report,
+    monkeypatch
+):
+
+    """
+    Where the platform cannot report physical cores, the logical core count is used.
+    """
+
+    def cpu_count(
+        logical: bool = True
+    ) -> int | None:
+
+        return 6 if logical else None
+
+    monkeypatch.setattr(psutil, 'cpu_count', cpu_count)
+
+    assert memory_report.recommend_cpus(available_memory=10000) == 5
+
+
+def test_merge(
+    memory_report
+):
+
+    """
+    Merged reports include every projection and process.
+    """
+
+    other = MemoryReport()
+
+    other.sizes = {'c': 500}
+    other.projections = {'c': (4, 100, 0, 0)}
+    other.processes = {4: (200, 300, 1)}
+
+    memory_report.merge(
+        other=other
+    )
+
+    assert list(memory_report.to_dataframe()['projection']) == ['a', 'b', 'c']
+    assert list(memory_report.process_dataframe()['process_id']) == [1, 2, 3, 4]
+    assert memory_report.projection_footprint() == 600
+
+
+class StubProjection:
+
+    """
+    Stands in for a projection, holding a list of floats.
+    """
+
+    def __init__(
+        self,
+        size: int
+    ):
+
+        self.values = [float(value) for value in range(size)]
+
+    def __str__(
+        self
+    ) -> str:
+
+        return 'stub'
+
+
+def test_memory_tracker():
+
+    """
+    The tracker records the bytes allocated to create a projection, the peak and retained bytes while it runs, and
+    the process's resident set sizes.
+    """
+
+    memory_tracker = MemoryTracker()
+
+    projection = memory_tracker.measure_size(
+        create_projection=lambda: StubProjection(size=10000)
+    )
+
+    memory_tracker.begin()
+
+    history = [float(value) for value in range(10000)]
+    temporary = [float(value) for value in range(20000)]
+
+    del temporary
+
+    memory_tracker.projected()
+
+    memory_tracker.end(
+        projection=projection
+    )
+
+    memory_report = memory_tracker.stop()
+
+    process_id, peak_bytes, retained_bytes, rss_bytes = memory_report.projections['stub']
+
+    assert process_id == getpid()
+    assert memory_report.sizes['stub'] > 10000 * 8
+    assert retained_bytes > 10000 * 8
+    assert peak_bytes > retained_bytes + 20000 * 8
+    assert rss_bytes > 0
+
+    baseline_rss, peak_rss, projection_count = memory_report.processes[getpid()]
+
+    assert 0 < baseline_rss <= peak_rss
+    assert projection_count == 1
+    assert len(history) == 10000
+
+
+def test_memory_report_written(
+    run_projections
+):
+
+    """
+    Runs that track memory write one report row per projection, and recommend at least one CPU.
+    """
+
+    projection_processor = run_projections(
+        output_dir_name='output',
+        track_memory=True
+    )
+
+    output_dir_path = projection_processor.projection_parameters.output_dir_path
+
+    assert len(read_csv(join(output_dir_path, MemoryReport.report_file_name))) == 4
+    assert len(read_csv(join(output_dir_path, MemoryReport.process_file_name))) == 1
+    assert projection_processor.recommended_cpus >= 1
@@ -0,0 +1,295 @@
+"""
+Tests for the :mod:`output spec <src.system.output.spec>`, which selects the projection values that are recorded and
+written.
+"""
+
+from datetime import (
+    date,
+    datetime
+)
+from typing import (
+    Dict,
+    List
+)
+
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest import raises
+
+from src.system.output import OutputWriter
+from src.system.output.spec import (
+    OutputSpec,
+    OutputSpecWriter
+)
+from src.system.projection_entity.projection_value import ProjectionValue
+
+
+TIME_AXIS = [date(2023, 3, 16), date(2023, 4, 16), date(2023, 5, 16), date(2023, 6, 16)]   #: Shared time axis.
+
+#: Output spec used in projection runs: contract account values, and premium amounts for every premium.
+OUTPUT_SPEC = OutputSpec(
+    variables={
+        'contract': ['account_value'],
+        'contract.account.*.premium.*': ['premium_amount']
+    },
+    time_step_interval=3
+)
+
+
+class RecordingOutputWriter(
+    OutputWriter
+):
+
+    """
+    Output writer that keeps every entity it is given, in memory.
+    """
+
+    entities: Dict[str, List[DataFrame]]    #: Written values, by entity name.
+
+    def __init__(
+        self
+    ):
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=''
+        )
+
+        self.entities = {}
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        self.entities.setdefault(entity_name, []).append(values)
+
+
+def test_select():
+
+    """
+    Entities are selected by wildcard pattern, and variables by name. An empty variable list, or ``None``, selects
+    every variable.
+    """
+
+    output_spec = OutputSpec(
+        variables={
+            'contract': ['account_value'],
+            'contract.account.*': None,
+            'annuitants': []
+        }
+    )
+
+    assert output_spec.select_entity(entity_name='contract')
+    assert output_spec.select_entity(entity_name='contract.account.29807d23-e7ae-412d-bb46-06f93969af94')
+    assert not output_spec.select_entity(entity_name='contract.riders.gmdb')
+
+    assert output_spec.select_variable(entity_name='contract', variable='account_value')
+    assert not output_spec.select_variable(entity_name='contract', variable='withdrawal')
+    assert output_spec.select_variable(entity_name='contract.account.x.premium.2023-03-16', variable='premium_amount')
+    assert output_spec.select_variable(entity_name='annuitants', variable='l_xy')
+
+
+def test_time_step_interval():
+
+    """
+    Every n-th time step is selected, starting with the first. Intervals below one are rejected.
+    """
+
+    output_spec = OutputSpec.from_dict(
+        payload={
+            'variables': {
+                'contract': None
+            },
+            'time_step_interval': '2'
+        }
+    )
+
+    assert output_spec.select_time_steps(time_axis=TIME_AXIS) == {TIME_AXIS[0], TIME_AXIS[2]}
+
+    with raises(ValueError):
+
+        OutputSpec(
+            variables={},
+            time_step_interval=0
+        )
+
+
+def test_writer_filters_entities_variables_and_time_steps():
+
+    """
+    Only selected entities, variables, and time steps are forwarded to the underlying output writer.
+    """
+
+    output_writer = RecordingOutputWriter()
+
+    output_spec_writer = OutputSpecWriter(
+        output_writer=output_writer,
+        output_spec=OutputSpec(
+            variables={
+                'contract': ['account_value']
+            },
+            time_step_interval=2
+        ),
+        time_axis=TIME_AXIS
+    )
+
+    for entity_name in ('contract', 'annuitants'):
+
+        output_spec_writer.write_entity(
+            entity_name=entity_name,
+            values=DataFrame(
+                data={
+                    'account_value': [1.0, 2.0, 3.0, 4.0],
+                    'withdrawal': [0.0, 0.0, 0.0, 0.0]
+                },
+                index=TIME_AXIS
+            )
+        )
+
+    assert list(output_writer.entities) == ['contract']
+
+    values, = output_writer.entities['contract']
+
+    assert list(values.columns) == ['account_value']
+    assert list(values.index) == [TIME_AXIS[0], TIME_AXIS[2]]
+
+
+def test_excluded_projection_value():
+
+    """
+    An excluded projection value is no longer printed, and keeps only its two latest values, which can still be read
+    and updated.
+    """
+
+    projection_value = ProjectionValue(
+        init_t=TIME_AXIS[0],
+        init_value=1.0
+    )
+
+    projection_value[TIME_AXIS[1]] = 2.0
+
+    projection_value.exclude_from_output()
+
+    assert not projection_value.print_values
+    assert not projection_value.retain_history
+
+    projection_value[TIME_AXIS[2]] = 3.0
+    projection_value[TIME_AXIS[3]] = 4.0
+    projection_value.latest_value += 1.0
+
+    assert projection_value.latest_value == 5.0
+    assert projection_value[TIME_AXIS[2]] == 3.0
+    assert list(projection_value.history.index) == TIME_AXIS[2:]
+
+    with raises(KeyError):
+
+        _ = projection_value[TIME_AXIS[1]]
+
+
+def test_excluded_list_projection_value():
+
+    """
+    An excluded projection value stores lists the same way as its value history, which unpacks a list wrapped in
+    another list.
+    """
+
+    projection_value = ProjectionValue(
+        init_t=TIME_AXIS[0],
+        init_value=[[]]
+    )
+
+    projection_value.exclude_from_output()
+
+    assert projection_value.latest_value == []
+
+    projection_value[TIME_AXIS[1]] = [[TIME_AXIS[0], TIME_AXIS[1]]]
+
+    assert projection_value.latest_value == [TIME_AXIS[0], TIME_AXIS[1]]
+
+
+def test_projection_output(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    A projection run with an output spec writes only the selected values, at the selected time steps, and they match
+    a run without an output spec. The spec also applies to entities created while the projection runs, like
+    premiums received after the first time step.
+    """
+
+    full_processor = run_projections(
+        output_dir_name='full'
+    )
+
+    spec_processor = run_projections(
+        output_dir_name='spec',
+        output_spec=OUTPUT_SPEC
+    )
+
+    full_output = read_csv_output(full_processor.projection_parameters.output_dir_path)
+    spec_output = read_csv_output(spec_processor.projection_parameters.output_dir_path)
+
+    assert {entity_name for _, _, entity_name in spec_output} == {
+        entity_name for _, _, entity_name in full_output if OUTPUT_SPEC.select_entity(entity_name=entity_name)
+    }
+
+    assert ('3aac167f-3504-4e50-b49e-e056f1e3e816', '0',
+            'contract.account.951e6654-d1f5-432d-99d7-6a86ae3e9ee0.premium.2023-04-16') in spec_output
+
+    time_axis = [
+        datetime.strptime(t, '%Y-%m-%d').date()
+        for t in full_output[('29807d23-e7ae-412d-bb46-06f93969af94', '0', 'contract')].index
+    ]
+
+    time_steps = {t.isoformat() for t in OUTPUT_SPEC.select_time_steps(time_axis=time_axis)}
+
+    for output_key, values in spec_output.items():
+
+        full_values = full_output[output_key]
+
+        # Time steps at which only unselected values were recorded are not written
+        full_values = full_values[
+            [
+                column for column in full_values.columns
+                if OUTPUT_SPEC.select_variable(entity_name=output_key[2], variable=column)
+            ]
+        ].dropna(
+            how='all'
+        )
+
+        if values.empty:
+
+            assert not set(full_values.index) & time_steps
+
+            continue
+
+        values = values.drop(
+            columns='index'
+        )
+
+        assert set(values.columns) == set(full_values.columns) != set()
+        assert set(values.index) == set(full_values.index) & time_steps
+
+        assert_frame_equal(
+            left=values,
+            right=full_values.loc[values.index, values.columns],
+            obj=str(output_key)
+        )
+
+    # Values of premiums received after the first time step are excluded too
+    projection = next(
+        projection for projection in spec_processor.projections
+        if projection.output_key() == ('3aac167f-3504-4e50-b49e-e056f1e3e816', 0)
+    )
+
+    premium = next(
+        premium for account in projection.base_contract.accounts for premium in account.premiums
+        if str(premium).endswith('2023-04-16')
+    )
+
+    assert premium.output_spec_applied
+    assert premium.premium_amount.retain_history
+    assert not premium.surrender_charge.retain_history
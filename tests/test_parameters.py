@@ -0,0 +1,192 @@
+"""
+Tests for :class:`projection parameter <src.system.projection.parameters.ProjectionParameters>` validation and
+selection.
+"""
+
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from pytest import (
+    mark,
+    raises
+)
+
+from src.system.projection.parameters import ProjectionParameters
+from src.system.enums import (
+    ProcessingType,
+    OutputFormat
+)
+
+
+def projection_parameters(
+    **kwargs
+) -> ProjectionParameters:
+
+    """
+    Constructs projection parameters for a one year, monthly projection, with any parameter overridden.
+
+    :param kwargs: Projection parameters to override.
+    :return: Projection parameters.
+    """
+
+    return ProjectionParameters(
+        **{
+            'start_t': date(2023, 3, 16),
+            'projection_length': relativedelta(years=1),
+            'time_step': relativedelta(months=1),
+            'resource_dir_path': 'resource',
+            'output_dir_path': 'output',
+            'processing_type': ProcessingType.SINGLE_PROCESS,
+            'projection': 'projection',
+            'data_source': 'data_source',
+            **kwargs
+        }
+    )
+
+
+def test_select_scenario():
+
+    """
+    Scenarios are selected if they fall within any scenario range, and every scenario is selected without ranges.
+    """
+
+    selected = projection_parameters(
+        scenarios=[range(0, 2), range(5, 10, 2)]
+    )
+
+    assert [scenario for scenario in range(10) if selected.select_scenario(scenario_index=scenario)] == [0, 1, 5, 7, 9]
+    assert all(projection_parameters().select_scenario(scenario_index=scenario) for scenario in range(10))
+
+
+def test_select_model_point():
+
+    """
+    Model points are selected if their ID is selected and every filter field matches, using unparsed values.
+    """
+
+    data = [
+        {'id': 'a', 'product_name': 'VA', 'state': 'NY'},
+        {'id': 'b', 'product_name': 'VA', 'state': 'CA'},
+        {'id': 'c', 'product_name': 'FIA', 'state': 'NY'}
+    ]
+
+    def selected(
+        **kwargs
+    ) -> list:
+
+        return [
+            model_point['id'] for model_point in data
+            if projection_parameters(**kwargs).select_model_point(data=model_point)
+        ]
+
+    assert selected() == ['a', 'b', 'c']
+    assert selected(model_point_ids=['c', 'a']) == ['a', 'c']
+    assert selected(model_point_filter={'product_name': 'VA'}) == ['a', 'b']
+    assert selected(model_point_filter={'product_name': 'VA', 'state': 'NY'}) == ['a']
+    assert selected(model_point_ids=['b', 'c'], model_point_filter={'state': 'NY'}) == ['c']
+
+
+@mark.parametrize(
+    argnames='count',
+    argvalues=[0, 1, 2, 3, 7, 10, 100]
+)
+def test_shard_range(
+    count
+):
+
+    """
+    Shards partition every run configuration exactly once, in order, with sizes that differ by at most one. Shards
+    beyond the number of run configurations are empty.
+    """
+
+    assert projection_parameters().shard_range(count=count) == range(count)
+
+    for shard_count in (1, 2, 3, 4, 8):
+
+        shard_ranges = [
+            projection_parameters(
+                shard=(shard_count, shard_index)
+            ).shard_range(count=count) for shard_index in range(shard_count)
+        ]
+
+        assert [position for shard_range in shard_ranges for position in shard_range] == list(range(count))
+
+        sizes = [len(shard_range) for shard_range in shard_ranges]
+
+        assert max(sizes) - min(sizes) <= 1
+
+        if count < shard_count:
+
+            assert sizes.count(0) == shard_count - count
+
+
+@mark.parametrize(
+    argnames='kwargs',
+    argvalues=[
+        {'shard': (0, 0)},
+        {'shard': (2, 2)},
+        {'shard': (2, -1)},
+        {'stream_interval': 0},
+        {'output_threads': -1},
+        {'output_queue_size': 0},
+        {'data_source_threads': 0},
+        {'time_step': relativedelta(months=0)},
+        {'time_step': relativedelta(months=-1)},
+        {'projection_length': relativedelta(years=-1)},
+        {'scenarios': []},
+        {'scenarios': [range(0, 2), range(3, 3)]},
+        {'scenarios': [range(-1, 2)]},
+        {'model_point_ids': []},
+        {'write_seriatim': False, 'share_invariant_output': True},
+        {'aggregate_variables': [('contract', 'account_value')]},
+        {'statistics_group_by': ['product_name', 'scenario']},
+        {'statistics_group_by': [], 'percentiles': [0.5, 1.5]},
+        {'statistics_group_by': [], 'cte_levels': [1.0]},
+        {'statistics_group_by': [], 'cte_levels': [-0.1]},
+        {'discount_rate': -1.0},
+        {'discount_rate': 0.05, 'discount_index': 'SJIM'}
+    ]
+)
+def test_invalid_parameters(
+    kwargs
+):
+
+    """
+    Out-of-range and incompatible parameters are rejected when the parameters are constructed.
+    """
+
+    with raises(ValueError):
+
+        projection_parameters(**kwargs)
+
+
+def test_valid_combinations():
+
+    """
+    Sharding applies to the selected run configurations, so it can be combined with model point selection, output can
+    be streamed in every output format, and aggregate-only runs accept boundary statistics levels.
+    """
+
+    projection_parameters(
+        model_point_ids=['a'],
+        model_point_filter={'product_name': 'VA'},
+        scenarios=[range(0, 1)],
+        shard=(2, 1)
+    )
+
+    for output_format in OutputFormat:
+
+        projection_parameters(
+            output_format=output_format,
+            stream_interval=1
+        )
+
+    projection_parameters(
+        write_seriatim=False,
+        group_by=[],
+        aggregate_variables=[('contract', 'account_value')],
+        statistics_group_by=[],
+        percentiles=[0.0, 1.0],
+        cte_levels=[0.0],
+        discount_index='SJIM'
+    )
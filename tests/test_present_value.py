@@ -0,0 +1,216 @@
+"""
+Tests for :mod:`present values <src.system.output.present_value>` of projection cash flows.
+"""
+
+from datetime import (
+    date,
+    datetime
+)
+
+from numpy import (
+    array,
+    zeros
+)
+from numpy.testing import assert_allclose
+from pandas.testing import assert_frame_equal
+from pytest import raises
+
+from src.system.output.present_value import PresentValues
+from src.system.actuarial_math import (
+    discount_factors,
+    index_discount_factors
+)
+from src.system.date import calc_partial_years
+
+
+TIME_AXIS = [date(2023, 3, 16), date(2024, 3, 16), date(2025, 3, 16)]     #: Shared time axis, one year apart.
+
+#: Cash flows to discount in projection runs.
+PRESENT_VALUE_VARIABLES = [
+    ('contract', 'premium_new'),
+    ('contract', 'withdrawal'),
+    ('contract.riders.gmdb', 'charge_amount')
+]
+
+
+def create_present_values() -> PresentValues:
+
+    """
+    Creates empty present values of premiums, by model point.
+
+    :return: Present values.
+    """
+
+    present_values = PresentValues(
+        group_by=['model_point'],
+        variables=[('contract.account.premium', 'premium_amount')],
+        time_axis=TIME_AXIS
+    )
+
+    for scenario, discount_rate in enumerate([0.0, 0.1]):
+
+        present_values.discount(
+            scenario=scenario,
+            discount_factors=discount_factors(
+                times=present_values.times,
+                discount_rate=discount_rate
+            )
+        )
+
+    return present_values
+
+
+def test_discount_factors():
+
+    """
+    Flat-rate discount factors are annual effective, and index discount factors are relative to the first index
+    value.
+    """
+
+    assert_allclose(discount_factors(times=array([0.0, 1.0, 2.5]), discount_rate=0.1), [1.0, 1.1 ** -1, 1.1 ** -2.5])
+    assert_allclose(index_discount_factors(index_values=array([100.0, 110.0, 121.0])), [1.0, 1.0 / 1.1, 1.0 / 1.21])
+
+
+def test_present_value_and_duration():
+
+    """
+    Cash flows are discounted with their own scenario's discount factors, summed by entity role, and averaged across
+    scenarios. Variables that are not selected are skipped.
+    """
+
+    present_values = create_present_values()
+
+    for scenario in (0, 1):
+
+        for entity_name, cash_flows in [
+            ('contract.account.29807d23-e7ae-412d-bb46-06f93969af94.premium.2023-03-16', array([100.0, 0.0, 0.0])),
+            ('contract.account.29807d23-e7ae-412d-bb46-06f93969af94.premium.2025-03-16', array([0.0, 0.0, 121.0]))
+        ]:
+
+            present_values.add(
+                group=('mp',),
+                scenario=scenario,
+                entity_name=entity_name,
+                variable='premium_amount',
+                values=cash_flows
+            )
+
+        present_values.add(
+            group=('mp',),
+            scenario=scenario,
+            entity_name='contract',
+            variable='account_value',
+            values=array([1.0, 1.0, 1.0])
+        )
+
+    values = present_values.to_dataframe()
+
+    assert list(values.index) == [('mp', 'contract.account.premium', 'premium_amount')]
+
+    present_value, scenario_mean, duration = values.iloc[0]
+
+    assert_allclose(present_value, 221.0 + 200.0)
+    assert_allclose(scenario_mean, (221.0 + 200.0) / 2)
+    assert_allclose(duration, (2.0 * 121.0 + 2.0 * 100.0) / (221.0 + 200.0))
+
+
+def test_missing_discount_factors():
+
+    """
+    Cash flows from a scenario without discount factors raise an error.
+    """
+
+    present_values = create_present_values()
+
+    with raises(RuntimeError):
+
+        present_values.add(
+            group=('mp',),
+            scenario=2,
+            entity_name='contract.account.29807d23-e7ae-412d-bb46-06f93969af94.premium.2023-03-16',
+            variable='premium_amount',
+            values=zeros(3)
+        )
+
+
+def test_matches_seriatim_output(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    Present values of a projection run match cash flows discounted directly from seriatim output.
+    """
+
+    processor = run_projections(
+        output_dir_name='output',
+        present_value_variables=PRESENT_VALUE_VARIABLES,
+        discount_rate=0.05
+    )
+
+    present_values, = processor.aggregates
+
+    values = present_values.to_dataframe()
+
+    assert len(values) == 2 * 2 * len(PRESENT_VALUE_VARIABLES)
+
+    for (model_point_id, scenario, entity_name), cash_flows in read_csv_output(
+        processor.projection_parameters.output_dir_path
+    ).items():
+
+        for variable in cash_flows.columns:
+
+            if (entity_name, variable) not in PRESENT_VALUE_VARIABLES:
+
+                continue
+
+            times = array(
+                [
+                    calc_partial_years(
+                        dt1=datetime.strptime(t, '%Y-%m-%d').date(),
+                        dt2=processor.projection_parameters.start_t
+                    ) for t in cash_flows.index
+                ]
+            )
+
+            present_value = (cash_flows[variable].fillna(0.0).to_numpy() * 1.05 ** -times).sum()
+
+            assert_allclose(
+                values.loc[(model_point_id, int(scenario), entity_name, variable), 'present_value'],
+                present_value,
+                rtol=1e-12
+            )
+
+
+def test_discount_index_matches_across_engines(
+    run_projections
+):
+
+    """
+    Discounting with an economic scenario index gives the same present values in both projection engines.
+    """
+
+    entity_processor = run_projections(
+        output_dir_name='entity',
+        present_value_variables=PRESENT_VALUE_VARIABLES,
+        present_value_group_by=['scenario'],
+        discount_index='SJIM'
+    )
+
+    batch_processor = run_projections(
+        output_dir_name='batch',
+        engine='batch',
+        present_value_variables=PRESENT_VALUE_VARIABLES,
+        present_value_group_by=['scenario'],
+        discount_index='SJIM'
+    )
+
+    entity_present_values, = entity_processor.aggregates
+    batch_present_values, = batch_processor.aggregates
+
+    assert_frame_equal(
+        left=batch_present_values.to_dataframe(),
+        right=entity_present_values.to_dataframe(),
+        check_exact=False,
+        rtol=1e-9
+    )
@@ -0,0 +1,235 @@
+"""
+Tests for the :class:`span profiler <src.system.odometer.Profiler>`.
+"""
+
+from os.path import join
+from threading import Thread
+from typing import Iterator
+
+from pandas import read_csv
+from pandas.testing import assert_frame_equal
+from pytest import (
+    fixture,
+    raises
+)
+
+from src.system.odometer import (
+    Profile,
+    Profiler,
+    span
+)
+
+
+@span
+def inner(
+    fail: bool = False
+) -> int:
+
+    """
+    Profiled function, nested within :func:`outer`.
+
+    :param fail: Whether to raise an error.
+    :return: One.
+    """
+
+    if fail:
+
+        raise ValueError('Failed !')
+
+    return 1
+
+
+@span
+def outer() -> int:
+
+    """
+    Profiled function that calls :func:`inner` twice.
+
+    :return: Two.
+    """
+
+    return inner() + inner()
+
+
+@fixture
+def profiler() -> Iterator[Profiler]:
+
+    """
+    Turns profiling on for a test, and off again afterwards.
+
+    :return: Profiler.
+    """
+
+    profiler = Profiler()
+
+    profiler.start()
+
+    yield profiler
+
+    profiler.stop()
+
+
+def test_nested_spans(
+    profiler
+):
+
+    """
+    Spans are keyed by their call stack, count every call, and nested spans are subtracted from the exclusive time of
+    the span that encloses them.
+    """
+
+    assert outer() == 2
+    assert inner() == 1
+
+    profile = profiler.stop()
+
+    assert {stack: calls for stack, (calls, _) in profile.spans.items()} == {
+        ('outer',): 1,
+        ('outer', 'inner'): 2,
+        ('inner',): 1
+    }
+
+    self_ns = profile.self_time()
+
+    assert self_ns[('outer',)] == profile.spans[('outer',)][1] - profile.spans[('outer', 'inner')][1]
+    assert self_ns[('outer', 'inner')] == profile.spans[('outer', 'inner')][1]
+
+
+def test_disabled_profiler_records_nothing(
+    profiler
+):
+
+    """
+    Profiled functions call straight through while profiling is off.
+    """
+
+    profile = profiler.stop()
+
+    outer()
+
+    assert profile.spans == {}
+
+
+def test_stack_restored_after_error(
+    profiler
+):
+
+    """
+    A span that raises is still recorded, and does not stay on the call stack.
+    """
+
+    with raises(ValueError):
+
+        inner(fail=True)
+
+    inner()
+
+    assert profiler.stop().spans[('inner',)][0] == 2
+
+
+def test_threads_keep_their_own_stacks(
+    profiler
+):
+
+    """
+    Spans on different threads are not nested within each other.
+    """
+
+    threads = [Thread(target=outer) for _ in range(4)]
+
+    for thread in threads:
+
+        thread.start()
+
+    for thread in threads:
+
+        thread.join()
+
+    assert {stack: calls for stack, (calls, _) in profiler.stop().spans.items()} == {
+        ('outer',): 4,
+        ('outer', 'inner'): 8
+    }
+
+
+def test_merge():
+
+    """
+    Merged profiles add up calls and times for each call stack.
+    """
+
+    profile = Profile()
+    profile.add(stack=('a',), elapsed_ns=10)
+    profile.add(stack=('a', 'b'), elapsed_ns=4)
+
+    other = Profile()
+    other.add(stack=('a',), elapsed_ns=20)
+    other.add(stack=('c',), elapsed_ns=5)
+
+    profile.merge(
+        other=other
+    )
+
+    assert profile.spans == {
+        ('a',): [2, 30],
+        ('a', 'b'): [1, 4],
+        ('c',): [1, 5]
+    }
+
+    report = profile.to_dataframe()
+
+    assert list(report['stack']) == ['a', 'a;b', 'c']
+    assert list(report['depth']) == [0, 1, 0]
+    assert list(report['self_ns']) == [26, 4, 5]
+    assert list(report['mean_ns']) == [15.0, 4.0, 5.0]
+    assert list(report['share']) == [30 / 35, 4 / 35, 5 / 35]
+
+
+def test_folded_file(
+    tmp_path
+):
+
+    """
+    The folded file has one line per call stack, with span names separated by ``;``, followed by the exclusive time.
+    Exclusive times that timer resolution makes negative are written as zero.
+    """
+
+    profile = Profile()
+    profile.add(stack=('a',), elapsed_ns=10)
+    profile.add(stack=('a', 'b'), elapsed_ns=4)
+    profile.add(stack=('a', 'b', 'c'), elapsed_ns=5)
+
+    profile.write(
+        output_dir_path=str(tmp_path)
+    )
+
+    with open(join(tmp_path, Profile.folded_file_name)) as folded_file:
+
+        assert folded_file.read() == 'a 6\na;b 0\na;b;c 5\n'
+
+    assert list(read_csv(join(tmp_path, Profile.report_file_name))['stack']) == ['a', 'a;b', 'a;b;c']
+
+
+def test_profile_merged_across_processes(
+    run_projections
+):
+
+    """
+    Profiles merged from worker processes count the same calls, for the same call stacks, as a single process run.
+    """
+
+    reports = [
+        read_csv(
+            join(
+                run_projections(
+                    output_dir_name=output_dir_name,
+                    cpus=cpus,
+                    profile=True
+                ).projection_parameters.output_dir_path,
+                Profile.report_file_name
+            )
+        )[['stack', 'calls']] for output_dir_name, cpus in (('single_process', None), ('multi_process', 2))
+    ]
+
+    assert len(reports[0]) > 1
+
+    assert_frame_equal(*reports)
@@ -0,0 +1,283 @@
+"""
+Tests for the :mod:`run-level results store <src.system.output.results_store>` and the
+:mod:`SQLite output writer <src.system.output.file_sqlite>` that fills it.
+"""
+
+from os.path import (
+    join,
+    dirname
+)
+from sqlite3 import (
+    Connection,
+    OperationalError,
+    ProgrammingError
+)
+from datetime import (
+    date,
+    datetime
+)
+
+from numpy import (
+    array,
+    nan
+)
+from numpy.testing import assert_array_equal
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest import raises
+
+from src.system.enums import OutputFormat
+from src.system.output.results_store import ResultsStore
+from src.system.output.file_sqlite import SqliteOutputWriter
+
+
+TIME_AXIS = [date(2023, 3, 16), date(2023, 4, 16), date(2023, 5, 16)]     #: Shared time axis.
+
+
+def write_projection(
+    results_store: ResultsStore,
+    model_point_id: str,
+    scenario_index: int,
+    account_value: float
+) -> None:
+
+    """
+    Appends a ``contract`` entity for one model point and scenario, with values from the second time step.
+
+    :param results_store: Results store.
+    :param model_point_id: Model point ID.
+    :param scenario_index: Scenario number.
+    :param account_value: Account value at the second time step.
+    :return: Nothing.
+    """
+
+    output_writer = SqliteOutputWriter(
+        output_dir_path=dirname(results_store.path),
+        results_store=results_store,
+        model_point_id=model_point_id,
+        scenario_index=scenario_index,
+        time_axis=TIME_AXIS
+    )
+
+    output_writer.write_entity(
+        entity_name='contract',
+        values=DataFrame(
+            data={
+                'account_value': [account_value, account_value + 1.0],
+                'duration': ['1 month', '2 months']
+            },
+            index=TIME_AXIS[1:]
+        )
+    )
+
+    output_writer.close()
+
+
+def test_round_trip(
+    tmp_path
+):
+
+    """
+    Values appended by several writers are read back by variable, across model points and scenarios, and by entity,
+    aligned to the shared time axis. Appending the same key again replaces it.
+    """
+
+    results_store = ResultsStore.create(
+        path=join(tmp_path, ResultsStore.file_name),
+        time_axis=TIME_AXIS
+    )
+
+    write_projection(
+        results_store=results_store,
+        model_point_id='b',
+        scenario_index=0,
+        account_value=0.0
+    )
+
+    write_projection(
+        results_store=results_store,
+        model_point_id='a',
+        scenario_index=1,
+        account_value=10.0
+    )
+
+    write_projection(
+        results_store=results_store,
+        model_point_id='b',
+        scenario_index=0,
+        account_value=20.0
+    )
+
+    assert results_store.time_axis == TIME_AXIS
+
+    account_value = results_store.read_variable(
+        entity='contract',
+        variable='account_value'
+    )
+
+    assert list(account_value.index) == [('a', 1), ('b', 0)]
+    assert list(account_value.columns) == TIME_AXIS
+
+    assert_array_equal(
+        account_value.to_numpy(),
+        array([[nan, 10.0, 11.0], [nan, 20.0, 21.0]])
+    )
+
+    contract = results_store.read_entity(
+        model_point='a',
+        scenario=1,
+        entity='contract'
+    )
+
+    assert sorted(contract.columns) == ['account_value', 'duration']
+    assert list(contract.index) == TIME_AXIS
+    assert list(contract['duration']) == ['', '1 month', '2 months']
+
+
+def test_time_axis_change_deletes_rows(
+    tmp_path
+):
+
+    """
+    Setting up a run with the same time axis keeps existing rows, like those of another shard. Setting up a run with
+    another time axis deletes them, since their values are aligned to the old time axis.
+    """
+
+    path = join(tmp_path, ResultsStore.file_name)
+
+    write_projection(
+        results_store=ResultsStore.create(
+            path=path,
+            time_axis=TIME_AXIS
+        ),
+        model_point_id='a',
+        scenario_index=0,
+        account_value=0.0
+    )
+
+    results_store = ResultsStore.create(
+        path=path,
+        time_axis=TIME_AXIS
+    )
+
+    assert results_store.read_variable(entity='contract', variable='account_value').shape == (1, 3)
+
+    results_store = ResultsStore.create(
+        path=path,
+        time_axis=TIME_AXIS[:2]
+    )
+
+    assert results_store.time_axis == TIME_AXIS[:2]
+    assert results_store.read_variable(entity='contract', variable='account_value').empty
+
+
+def test_connections_are_closed_on_error(
+    tmp_path,
+    monkeypatch
+):
+
+    """
+    Connections are closed even if a query fails.
+    """
+
+    results_store = ResultsStore(
+        path=join(tmp_path, ResultsStore.file_name)
+    )
+
+    connections = []
+    connect = ResultsStore.connect
+
+    def record_connection(
+        self
+    ) -> Connection:
+
+        connections.append(connect(self))
+
+        return connections[-1]
+
+    monkeypatch.setattr(ResultsStore, 'connect', record_connection)
+
+    with raises(OperationalError):
+
+        results_store.read_variable(
+            entity='contract',
+            variable='account_value'
+        )
+
+    with raises(OperationalError):
+
+        results_store.append(
+            rows=[('contract', 'account_value', 'a', 0, 'float64', b'')]
+        )
+
+    assert len(connections) == 2
+
+    for connection in connections:
+
+        with raises(ProgrammingError, match='closed'):
+
+            connection.execute('SELECT 1')
+
+
+def test_matches_csv_output(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    A run written to a results store holds the same entities and values as the same run written as CSV files.
+    """
+
+    csv_processor = run_projections(
+        output_dir_name='csv'
+    )
+
+    sqlite_processor = run_projections(
+        output_dir_name='sqlite',
+        output_format=OutputFormat.SQLITE
+    )
+
+    results_store = ResultsStore(
+        path=join(sqlite_processor.projection_parameters.output_dir_path, ResultsStore.file_name)
+    )
+
+    for (model_point_id, scenario, entity_name), csv_values in read_csv_output(
+        csv_processor.projection_parameters.output_dir_path
+    ).items():
+
+        if csv_values.empty:
+
+            continue
+
+        csv_values = csv_values.drop(
+            columns='index'
+        ).set_axis(
+            [datetime.strptime(t, '%Y-%m-%d').date() for t in csv_values.index]
+        )
+
+        values = results_store.read_entity(
+            model_point=model_point_id,
+            scenario=int(scenario),
+            entity=entity_name
+        ).loc[list(csv_values.index), csv_values.columns]
+
+        assert_frame_equal(
+            left=values.select_dtypes(include='float64'),
+            right=csv_values.select_dtypes(include=['float64', 'int64', 'bool']).astype('float64'),
+            check_names=False,
+            obj=entity_name
+        )
+
+        assert_frame_equal(
+            left=values.select_dtypes(exclude='float64').astype(str),
+            right=csv_values.select_dtypes(exclude=['float64', 'int64', 'bool']).fillna('').astype(str),
+            check_names=False,
+            obj=entity_name
+        )
+
+    account_value = results_store.read_variable(
+        entity='contract',
+        variable='account_value'
+    )
+
+    assert account_value.shape == (4, 13)
@@ -0,0 +1,344 @@
+"""
+Tests for :mod:`write-once output <src.system.output.shared>` of scenario-invariant and model-point-invariant
+projection entities.
+"""
+
+from os import makedirs
+from os.path import (
+    join,
+    exists,
+    normpath
+)
+from typing import (
+    Dict,
+    List,
+    Tuple
+)
+
+from pandas import (
+    DataFrame,
+    read_csv
+)
+from pandas.testing import assert_frame_equal
+
+from src.system.enums import (
+    OutputScope,
+    OutputFormat
+)
+from src.system.output import OutputWriter
+from src.system.output.shared import SharedOutputWriter
+from src.system.output.results_store import ResultsStore
+from src.system.projection import Projection
+
+
+class RecordingOutputWriter(
+    OutputWriter
+):
+
+    """
+    Output writer that keeps every entity it is given, in memory.
+    """
+
+    entities: Dict[str, DataFrame]  #: Written values, by entity name.
+    closed: bool                    #: Whether the writer was closed.
+
+    def __init__(
+        self,
+        output_dir_path: str
+    ):
+
+        OutputWriter.__init__(
+            self=self,
+            output_dir_path=output_dir_path
+        )
+
+        self.entities = {}
+        self.closed = False
+
+    def write_entity(
+        self,
+        entity_name: str,
+        values: DataFrame
+    ) -> None:
+
+        self.entities[entity_name] = values
+
+    def close(
+        self
+    ) -> None:
+
+        self.closed = True
+
+
+def write_shared_entities(
+    tmp_path,
+    owned: bool
+) -> Tuple[RecordingOutputWriter, List[RecordingOutputWriter]]:
+
+    """
+    Writes a model-point-invariant, a scenario-invariant, and a projection entity through a shared output writer
+    that shares model-point-invariant entities only.
+
+    :param tmp_path: Temporary directory.
+    :param owned: Whether the projection owns the shared location.
+    :return: Projection output writer, and shared output writers created.
+    """
+
+    output_writer = RecordingOutputWriter(
+        output_dir_path=join(tmp_path, 'mp', '0')
+    )
+
+    makedirs(
+        name=output_writer.output_dir_path,
+        exist_ok=True
+    )
+
+    shared_output_writers = []
+
+    def create_output_writer(
+        output_dir_path: str,
+        output_key: Tuple[str, int]
+    ) -> OutputWriter:
+
+        shared_output_writers.append(
+            RecordingOutputWriter(
+                output_dir_path=output_dir_path
+            )
+        )
+
+        return shared_output_writers[-1]
+
+    shared_output_writer = SharedOutputWriter(
+        output_writer=output_writer,
+        shared_locations={
+            OutputScope.MODEL_POINT: (join(tmp_path, 'mp', 'shared'), ('mp', -1), owned)
+        },
+        create_output_writer=create_output_writer
+    )
+
+    for entity_name, output_scope in [
+        ('annuitants', OutputScope.MODEL_POINT),
+        ('economy', OutputScope.SCENARIO)
+    ]:
+
+        shared_output_writer.write_shared_entity(
+            entity_name=entity_name,
+            values=DataFrame(),
+            output_scope=output_scope
+        )
+
+    shared_output_writer.write_entity(
+        entity_name='contract',
+        values=DataFrame()
+    )
+
+    shared_output_writer.close()
+
+    return output_writer, shared_output_writers
+
+
+def test_owner_writes_shared_entities(
+    tmp_path
+):
+
+    """
+    Only the owner of a shared location writes to it. Entities with a scope that is not shared are written to the
+    projection's own output, and every projection links to the shared copy.
+    """
+
+    for owned in (True, False):
+
+        output_writer, shared_output_writers = write_shared_entities(
+            tmp_path=tmp_path,
+            owned=owned
+        )
+
+        assert sorted(output_writer.entities) == ['contract', 'economy']
+        assert output_writer.closed
+
+        if owned:
+
+            shared_output_writer, = shared_output_writers
+
+            assert list(shared_output_writer.entities) == ['annuitants']
+            assert shared_output_writer.closed
+
+        else:
+
+            assert not shared_output_writers
+
+        links = read_csv(
+            join(tmp_path, 'mp', '0', SharedOutputWriter.link_file_name)
+        )
+
+        assert links.values.tolist() == [['annuitants', 'model_point', '../shared']]
+
+
+def test_each_location_has_one_owner(
+    run_projections
+):
+
+    """
+    Each shared output location is owned by exactly one projection.
+    """
+
+    processor = run_projections(
+        output_dir_name='shared',
+        share_invariant_output=True
+    )
+
+    owners = {}
+
+    for projection in processor.projections:
+
+        for output_key in projection.output_keys():
+
+            for output_scope in (OutputScope.MODEL_POINT, OutputScope.SCENARIO):
+
+                owners.setdefault(
+                    Projection.shared_output_key(
+                        output_scope=output_scope,
+                        output_key=output_key
+                    ),
+                    set()
+                )
+
+        for shared_output_key in projection.shared_output_owner:
+
+            owners[shared_output_key].add(id(projection))
+
+    assert len(owners) == 2 + 2
+    assert all(len(projection_ids) == 1 for projection_ids in owners.values())
+
+
+def test_shared_output_matches_full_output(
+    run_projections,
+    read_csv_output
+):
+
+    """
+    Shared entities are written once, to their shared location, and match the same entities written by every
+    projection. Every projection links to each shared entity it did not write.
+    """
+
+    full_processor = run_projections(
+        output_dir_name='full'
+    )
+
+    shared_processor = run_projections(
+        output_dir_name='shared',
+        share_invariant_output=True
+    )
+
+    output_dir_path = shared_processor.projection_parameters.output_dir_path
+
+    full_output = read_csv_output(full_processor.projection_parameters.output_dir_path)
+    shared_output = read_csv_output(output_dir_path)
+
+    shared_entities = {
+        (model_point_id, scenario, entity_name) for model_point_id, scenario, entity_name in full_output
+        if entity_name == 'economy' or entity_name.startswith('annuitant') or '.premium.' in entity_name
+    }
+
+    assert shared_entities
+
+    for (model_point_id, scenario, entity_name), values in full_output.items():
+
+        if (model_point_id, scenario, entity_name) not in shared_entities:
+
+            assert_frame_equal(
+                left=shared_output[(model_point_id, scenario, entity_name)],
+                right=values
+            )
+
+            continue
+
+        assert (model_point_id, scenario, entity_name) not in shared_output
+
+        # Link files are read like entities, indexed by entity name
+        shared_file_path = normpath(
+            join(
+                output_dir_path,
+                model_point_id,
+                scenario,
+                shared_output[(model_point_id, scenario, 'links')].loc[entity_name, 'path'],
+                f'{entity_name}.csv'
+            )
+        )
+
+        assert exists(shared_file_path)
+
+        if values.empty:
+
+            continue
+
+        shared_values = read_csv(
+            shared_file_path,
+            index_col=0,
+            float_precision='round_trip'
+        )
+
+        assert_frame_equal(
+            left=shared_values,
+            right=values,
+            obj=entity_name
+        )
+
+
+def test_shared_output_in_results_store(
+    run_projections
+):
+
+    """
+    Shared entities written to a results store are keyed by their shared output key, and match the same entities
+    written by every projection.
+    """
+
+    full_processor = run_projections(
+    output_dir_name='full',
+    output_format=OutputFormat.SQLITE
+    )
+
+    shared_processor = run_projections(
+    output_dir_name='shared',
+    output_format=OutputFormat.SQLITE,
+    share_invariant_output=True
+    )
+
+    full_results_store = ResultsStore(
+    path=join(full_processor.projection_parameters.output_dir_path, ResultsStore.file_name)
+    )
+
+    shared_results_store = ResultsStore(
+    path=join(shared_processor.projection_parameters.output_dir_path, ResultsStore.file_name)
+    )
+
+    annuitants = shared_results_store.read_variable(
+    entity='annuitants',
+    variable='l_xy'
+    )
+
+    assert list(annuitants.index) == [
+    ('29807d23-e7ae-412d-bb46-06f93969af94', -1),
+    ('3aac167f-3504-4e50-b49e-e056f1e3e816', -1)
+    ]
+
+    assert_frame_equal(
+    left=annuitants.droplevel('scenario'),
+    right=full_results_store.read_variable(
+        entity='annuitants',
+        variable='l_xy'
+    ).xs(1, level='scenario')
+    )
+
+    assert list(
+    shared_results_store.read_variable(
+        entity='contract',
+        variable='account_value'
+    ).index
+    ) == list(
+    full_results_store.read_variable(
+        entity='contract',
+        variable='account_value'
+    ).index
+    )
@@ -0,0 +1,340 @@
+"""
+Tests for :mod:`streaming stochastic statistics <src.system.output.statistics>`.
+"""
+
+from datetime import date
+from pickle import (
+    loads,
+    dumps
+)
+
+from numpy import (
+    ndarray,
+    array,
+    sort,
+    quantile
+)
+from numpy.random import default_rng
+from numpy.testing import (
+    assert_allclose,
+    assert_array_equal
+)
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest import (
+    fixture,
+    raises
+)
+
+from src.system.output.aggregate import Aggregate
+from src.system.output.statistics import (
+    QuantileSketch,
+    ScenarioStatistics
+)
+
+
+LEVELS = [0.001, 0.01, 0.05, 0.5, 0.95, 0.99, 0.999]    #: Quantile levels to check.
+CTE_LEVELS = [0.7, 0.98]                                #: CTE levels to check.
+TIME_AXIS = [date(2023, 3, 16), date(2023, 4, 16)]      #: Shared time axis.
+
+
+@fixture(
+    params=['normal', 'lognormal', 'uniform']
+)
+def samples(
+    request
+) -> ndarray:
+
+    """
+    Samples from a symmetric, a skewed, and a bounded distribution.
+
+    :param request: Distribution name.
+    :return: Samples, of shape ``(samples, time steps)``.
+    """
+
+    return getattr(default_rng(seed=0), request.param)(size=(20000, 3))
+
+
+def sketch_of(
+    samples: ndarray,
+    sketches: int = 1
+) -> QuantileSketch:
+
+    """
+    Adds samples to one or more sketches, in turn, then merges the sketches.
+
+    :param samples: Samples, of shape ``(samples, time steps)``.
+    :param sketches: Number of sketches to split the samples between.
+    :return: Merged sketch.
+    """
+
+    partial_sketches = [QuantileSketch(length=samples.shape[1]) for _ in range(sketches)]
+
+    for position, sample in enumerate(samples):
+
+        partial_sketches[position % sketches].add(
+            sample=sample
+        )
+
+    sketch = partial_sketches[0]
+
+    for partial_sketch in partial_sketches[1:]:
+
+        sketch.merge(
+            other=loads(dumps(partial_sketch))
+        )
+
+    return sketch
+
+
+def exact_cte(
+    samples: ndarray,
+    levels: list
+) -> ndarray:
+
+    """
+    Exact conditional tail expectations, as the mean of the highest samples.
+
+    :param samples: Samples, of shape ``(samples, time steps)``.
+    :param levels: CTE levels.
+    :return: Conditional tail expectations, of shape ``(levels, time steps)``.
+    """
+
+    sorted_samples = sort(samples, axis=0)
+
+    return array([sorted_samples[round(level * len(samples)):].mean(axis=0) for level in levels])
+
+
+def test_exact_until_compressed():
+
+    """
+    Every statistic is exact while there are fewer samples than the compression parameter.
+    """
+
+    samples = default_rng(seed=1).normal(size=(100, 3))
+
+    sketch = sketch_of(
+        samples=samples
+    )
+
+    assert not sketch.compressed
+    assert sketch.count == 100
+
+    assert_allclose(sketch.quantiles(levels=LEVELS), quantile(samples, LEVELS, axis=0))
+    assert_allclose(sketch.cte(levels=CTE_LEVELS), exact_cte(samples=samples, levels=CTE_LEVELS))
+
+
+def test_quantile_error_bounds(
+    samples
+):
+
+    """
+    Once compressed, each estimated quantile's rank is within 0.5% of its level, and the mean, minimum, and maximum
+    stay exact, whether samples are added to one sketch or merged from several.
+    """
+
+    for sketches in (1, 4):
+
+        sketch = sketch_of(
+            samples=samples,
+            sketches=sketches
+        )
+
+        assert sketch.compressed
+        assert sketch.values.shape[0] <= QuantileSketch.compression
+        assert sketch.count == len(samples)
+
+        ranks = (samples[None, :, :] <= sketch.quantiles(levels=LEVELS)[:, None, :]).mean(axis=1)
+
+        assert_allclose(ranks, array([LEVELS] * samples.shape[1]).T, rtol=0.0, atol=0.005)
+
+        assert_allclose(sketch.mean(), samples.mean(axis=0))
+        assert_array_equal(sketch.minimum, samples.min(axis=0))
+        assert_array_equal(sketch.maximum, samples.max(axis=0))
+
+
+def test_cte_accuracy(
+    samples
+):
+
+    """
+    Once compressed, conditional tail expectations are within 1% of their exact values, whether samples are added to
+    one sketch or merged from several.
+    """
+
+    for sketches in (1, 4):
+
+        sketch = sketch_of(
+            samples=samples,
+            sketches=sketches
+        )
+
+        assert_allclose(
+            sketch.cte(levels=CTE_LEVELS),
+            exact_cte(samples=samples, levels=CTE_LEVELS),
+            rtol=0.01
+        )
+
+
+def fold(
+    statistics: ScenarioStatistics,
+    scenario: int,
+    account_value: float
+) -> None:
+
+    """
+    Folds one model point's projection into statistics.
+
+    :param statistics: Statistics.
+    :param scenario: Scenario of the projection.
+    :param account_value: Account value, at every time step.
+    :return: Nothing.
+    """
+
+    statistics.fold(
+        group=(),
+        scenario=scenario,
+        entity_name='contract',
+        values=DataFrame(
+            data={
+                'account_value': [account_value] * len(TIME_AXIS)
+            },
+            index=TIME_AXIS
+        )
+    )
+
+    statistics.end_projection(
+        scenario=scenario
+    )
+
+
+def create_statistics() -> ScenarioStatistics:
+
+    """
+    Creates empty statistics for two model points in each of three scenarios.
+
+    :return: Statistics.
+    """
+
+    return ScenarioStatistics(
+        group_by=[],
+        variables=None,
+        time_axis=TIME_AXIS,
+        percentiles=[0.5],
+        cte_levels=[0.5],
+        scenario_model_points={0: 2, 1: 2, 2: 2}
+    )
+
+
+def test_one_sample_per_scenario():
+
+    """
+    Model points in the same scenario are summed into a single sample, in whatever order they are folded in, and
+    across partial statistics.
+    """
+
+    statistics = create_statistics()
+    partial_statistics = create_statistics()
+
+    for target, scenario, account_value in [
+        (statistics, 0, 1.0),
+        (statistics, 1, 10.0),
+        (partial_statistics, 0, 2.0),
+        (statistics, 2, 100.0),
+        (statistics, 1, 20.0),
+        (partial_statistics, 2, 200.0)
+    ]:
+
+        fold(
+            statistics=target,
+            scenario=scenario,
+            account_value=account_value
+        )
+
+    sketch = statistics.sketches[('contract', 'account_value')]
+
+    assert sketch.count == 1
+    assert set(statistics.partial_samples) == {0, 2}
+
+    statistics.merge(
+        other=loads(dumps(partial_statistics))
+    )
+
+    assert sketch.count == 3
+    assert not statistics.partial_samples
+    assert not statistics.folded_model_points
+
+    values = statistics.to_dataframe()
+
+    assert_array_equal(values.loc[('contract', 'account_value', 'mean')], [111.0, 111.0])
+    assert_array_equal(values.loc[('contract', 'account_value', 'p50')], [30.0, 30.0])
+    assert_array_equal(values.loc[('contract', 'account_value', 'max')], [300.0, 300.0])
+
+
+def test_incomplete_scenarios_are_reported():
+
+    """
+    Scenarios with model points that were never folded in are added as they are.
+    """
+
+    statistics = create_statistics()
+
+    fold(
+        statistics=statistics,
+        scenario=0,
+        account_value=1.0
+    )
+
+    values = statistics.to_dataframe()
+
+    assert_array_equal(values.loc[('contract', 'account_value', 'count')], [1.0, 1.0])
+    assert_array_equal(values.loc[('contract', 'account_value', 'mean')], [1.0, 1.0])
+
+
+def test_group_by_scenario():
+
+    """
+    Statistics cannot be grouped by scenario.
+    """
+
+    with raises(ValueError):
+
+        ScenarioStatistics(
+            group_by=['scenario'],
+            variables=None,
+            time_axis=TIME_AXIS,
+            percentiles=[0.5],
+            cte_levels=[0.5],
+            scenario_model_points={}
+        )
+
+
+def test_mean_matches_scenario_mean(
+    run_projections
+):
+
+    """
+    Each scenario sample is the sum across model points, so the mean matches the aggregate scenario mean.
+    """
+
+    processor = run_projections(
+        output_dir_name='output',
+        group_by=[],
+        statistics_group_by=[]
+    )
+
+    aggregate, statistics = processor.aggregates
+
+    assert type(aggregate) is Aggregate
+    assert type(statistics) is ScenarioStatistics
+
+    values = statistics.to_dataframe()
+
+    assert (values.xs('count', level='statistic') == 2.0).all(axis=None)
+
+    assert_frame_equal(
+        left=values.xs('mean', level='statistic'),
+        right=aggregate.to_dataframe().xs('scenario_mean', level='statistic'),
+        check_exact=False,
+        rtol=1e-12
+    )
@@ -0,0 +1,244 @@
+"""
+Tests for output streamed in blocks of time steps while a projection runs, and for
+:meth:`~src.system.output.OutputWriter.merge_columns`, which merges the blocks.
+"""
+
+from os.path import join
+from datetime import date
+from typing import (
+    Callable,
+    Dict,
+    Tuple
+)
+
+from numpy import (
+    array,
+    nan
+)
+from numpy.testing import assert_array_equal
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest import (
+    mark,
+    raises
+)
+
+from src.system.enums import OutputFormat
+from src.system.output import OutputWriter
+from src.system.output.file_npz import NpzOutputWriter
+from src.system.output.results_store import ResultsStore
+from src.system.projection.processor.single_process import SingleProcessProjectionProcessor
+
+
+TIME_AXIS = [date(2023, 3, 16), date(2023, 4, 16), date(2023, 5, 16), date(2023, 6, 16)]   #: Shared time axis.
+TIME_AXIS_ROWS = {t: row for row, t in enumerate(TIME_AXIS)}    #: Time step to row position map.
+
+
+def test_merge_blocks():
+
+    """
+    Blocks of time steps are merged into the same aligned columns, including columns that only appear in later
+    blocks, and string columns whose values grow longer.
+    """
+
+    columns = {}
+
+    for values in [
+        DataFrame(
+            data={
+                'account_value': [1.0, 2.0],
+                'duration': ['1 month', '2 months']
+            },
+            index=TIME_AXIS[:2]
+        ),
+        DataFrame(
+            data={
+                'account_value': [3.0],
+                'duration': ['12 months'],
+                'withdrawal': [0.5]
+            },
+            index=TIME_AXIS[3:]
+        )
+    ]:
+
+        OutputWriter.merge_columns(
+            columns=columns,
+            values=values,
+            time_axis_rows=TIME_AXIS_ROWS
+        )
+
+    assert {column_name: column_type for column_name, (column_type, _) in columns.items()} == {
+        'account_value': 'float64',
+        'duration': 'str',
+        'withdrawal': 'float64'
+    }
+
+    assert_array_equal(columns['account_value'][1], array([1.0, 2.0, nan, 3.0]))
+    assert_array_equal(columns['duration'][1], array(['1 month', '2 months', '', '12 months']))
+    assert_array_equal(columns['withdrawal'][1], array([nan, nan, nan, 0.5]))
+
+
+def test_merge_blocks_without_values():
+
+    """
+    A block without any values for a string column is aligned as ``float64``, and does not change the column's type,
+    whether it comes before or after the block with values.
+    """
+
+    for blocks in [
+        ([None, None], ['a', 'b']),
+        (['a', 'b'], [None, None])
+    ]:
+
+        columns = {}
+
+        for position, block in enumerate(blocks):
+
+            OutputWriter.merge_columns(
+                columns=columns,
+                values=DataFrame(
+                    data={
+                        'duration': block
+                    },
+                    index=TIME_AXIS[position * 2:position * 2 + 2]
+                ),
+                time_axis_rows=TIME_AXIS_ROWS
+            )
+
+        column_type, column = columns['duration']
+
+        assert column_type == 'str'
+        assert [value for value in column if value] == ['a', 'b']
+
+
+def test_merge_blocks_type_change():
+
+    """
+    A column that changes type between blocks raises an error.
+    """
+
+    columns = {}
+
+    OutputWriter.merge_columns(
+        columns=columns,
+        values=DataFrame(
+            data={
+                'duration': ['a']
+            },
+            index=TIME_AXIS[:1]
+        ),
+        time_axis_rows=TIME_AXIS_ROWS
+    )
+
+    with raises(TypeError):
+
+        OutputWriter.merge_columns(
+            columns=columns,
+            values=DataFrame(
+                data={
+                    'duration': [1.0]
+                },
+                index=TIME_AXIS[1:2]
+            ),
+            time_axis_rows=TIME_AXIS_ROWS
+        )
+
+
+def read_output(
+    processor: SingleProcessProjectionProcessor,
+    output_format: OutputFormat,
+    read_csv_output: Callable[[str], Dict[Tuple, DataFrame]]
+) -> Dict[Tuple, DataFrame]:
+
+    """
+    Reads a run's output back, whatever its output format. Results stores are read by variable, for a few variables.
+
+    :param processor: Processor, after its projections have run.
+    :param output_format: Output format.
+    :param read_csv_output: Reads CSV output.
+    :return: Values, by output key and entity name, or by entity and variable name.
+    """
+
+    output_dir_path = processor.projection_parameters.output_dir_path
+
+    if output_format == OutputFormat.CSV:
+
+        return read_csv_output(output_dir_path)
+
+    if output_format == OutputFormat.NPZ:
+
+        return {
+            (model_point_id, scenario, entity_name): values
+            for projection in processor.projections
+            for model_point_id, scenario in projection.output_keys()
+            for entity_name, values in NpzOutputWriter.read(
+                path=join(output_dir_path, model_point_id, str(scenario), NpzOutputWriter.file_name)
+            ).items()
+        }
+
+    results_store = ResultsStore(
+        path=join(output_dir_path, ResultsStore.file_name)
+    )
+
+    return {
+        (entity_name, variable): results_store.read_variable(
+            entity=entity_name,
+            variable=variable
+        ) for entity_name, variable in [
+            ('contract', 'account_value'),
+            ('annuitants', 'l_xy'),
+            ('contract.account.951e6654-d1f5-432d-99d7-6a86ae3e9ee0.premium.2023-04-16', 'premium_age')
+        ]
+    }
+
+
+@mark.parametrize(
+    argnames='output_format',
+    argvalues=[OutputFormat.CSV, OutputFormat.NPZ, OutputFormat.SQLITE]
+)
+def test_matches_unstreamed_output(
+    run_projections,
+    read_csv_output,
+    output_format
+):
+
+    """
+    Output streamed in blocks of time steps, with premiums received in the middle of a block, matches output written
+    once at the end of each projection, in every output format, and so do aggregates.
+    """
+
+    unstreamed_processor, streamed_processor = [
+        run_projections(
+            output_dir_name=f'{stream_interval}',
+            output_format=output_format,
+            stream_interval=stream_interval,
+            group_by=[]
+        ) for stream_interval in (None, 5)
+    ]
+
+    unstreamed_output, streamed_output = [
+        read_output(
+            processor=processor,
+            output_format=output_format,
+            read_csv_output=read_csv_output
+        ) for processor in (unstreamed_processor, streamed_processor)
+    ]
+
+    assert unstreamed_output
+    assert unstreamed_output.keys() == streamed_output.keys()
+
+    for output_key, values in unstreamed_output.items():
+
+        assert_frame_equal(
+            left=streamed_output[output_key],
+            right=values,
+            obj=str(output_key)
+        )
+
+    unstreamed_aggregate, = unstreamed_processor.aggregates
+    streamed_aggregate, = streamed_processor.aggregates
+
+    assert_frame_equal(
+        left=streamed_aggregate.to_dataframe(),
+        right=unstreamed_aggregate.to_dataframe()
+    )